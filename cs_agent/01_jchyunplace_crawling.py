@@ -4,6 +4,8 @@ import logging
 import time
 import json
 from datetime import datetime
+from crawl_parsers import parse_product_links
+from page_store import PageStore, list_page_url
 
 # 로깅 설정
 log_filename = f'crawling_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
@@ -123,25 +125,13 @@ def find_all_categories():
     return valid_categories
 
 def extract_product_links(html_content):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    product_links = []
-    
-    # 제품 리스트 찾기
-    products = soup.select('.prd_view_type li.list')
-    
-    for product in products:
-        # 제품 상세 링크 찾기 (name 클래스를 가진 a 태그)
-        link_element = product.select_one('a.name')
-        if link_element and 'href' in link_element.attrs:
-            product_url = link_element['href']
-            # URL에서 pd_no 파라미터만 추출
-            if 'pd_no=' in product_url:
-                product_links.append(product_url)
-                logging.info(f"제품 링크 발견: {product_url}")
-    
+    # 제품 상세 링크 (pd_no 파라미터가 있는 링크만)
+    product_links = parse_product_links(html_content)
+    for product_url in product_links:
+        logging.info(f"제품 링크 발견: {product_url}")
     return product_links
 
-def crawl_category_products(category_info):
+def crawl_category_products(category_info, page_store=None):
     base_url = "https://www.jchyunplace.co.kr"
     api_url = "https://www.jchyunplace.co.kr/skin/shop/basic/product_list_include_plist.php"
     session = requests.Session()
@@ -178,11 +168,12 @@ def crawl_category_products(category_info):
                 logging.warning(f"{category_info['name']}의 {page}페이지 로드 실패 (status: {response.status_code})")
                 break
             
-            # 디버깅을 위한 응답 저장
-            debug_filename = f"debug_{category_info['name'].replace('/', '_')}_page{page}.html"
-            with open(debug_filename, 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            logging.info(f"HTML 내용이 {debug_filename}에 저장되었습니다.")
+            # 디버깅/재파싱을 위한 응답 보관 (같은 내용은 한 번만 압축 저장)
+            if page_store:
+                page_store.put(
+                    list_page_url("/skin/shop/basic/product_list_include_plist.php", category_info['params'], page),
+                    response.text, 'list', category_info['name'], page
+                )
             
             # 페이지 렌더링을 위한 대기
             # time.sleep(2)
@@ -213,13 +204,14 @@ if __name__ == "__main__":
     
     # 각 카테고리의 제품 수집
     pc_categories = 0
-    for category_key, category in categories.items():
-        if is_pc_related(category['name']):
-            pc_categories += 1
-            print(f"\n[{pc_categories}] {category['name']} 크롤링 중...")
-            product_links = crawl_category_products(category)
-            category['products'] = product_links
-            print(f"✅ {category['name']}에서 {len(product_links)}개의 제품 링크를 찾았습니다.")
+    with PageStore() as page_store:
+        for category_key, category in categories.items():
+            if is_pc_related(category['name']):
+                pc_categories += 1
+                print(f"\n[{pc_categories}] {category['name']} 크롤링 중...")
+                product_links = crawl_category_products(category, page_store)
+                category['products'] = product_links
+                print(f"✅ {category['name']}에서 {len(product_links)}개의 제품 링크를 찾았습니다.")
     
     # 결과를 JSON 파일로 저장
     result_filename = f'crawling_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
@@ -5,8 +5,12 @@ import logging
 from datetime import datetime
 import time
 import pandas as pd
-import re
 import os
+import sys
+from crawl_parsers import parse_last_page, parse_product_info
+from crawl_journal import CrawlJournal
+from crawl_staging import STAGING_DIR, write_category_frame, export_xlsx, index_xlsx_files, current_snapshot, read_sheet
+from crawl_workers import REQUESTS_PER_SECOND, run_category_workers
 
 # raw_xlsx 폴더 생성
 os.makedirs('./cs_agent/raw_xlsx', exist_ok=True)
@@ -34,36 +38,25 @@ def load_categories():
         logging.error("❌ valid_categories.json 파일을 찾을 수 없습니다.")
         return None
 
-def get_last_page(soup):
-    last_page_link = soup.select_one('a.next:contains("마지막")')
-    if not last_page_link:
-        # "마지막" 텍스트가 포함된 링크 찾기
-        last_page_link = soup.find('a', class_='next', string='마지막')
-    
-    if last_page_link and 'href' in last_page_link.attrs:
-        href = last_page_link['href']
-        # 예: javascript:pageMove(30); 에서 30 추출
-        if match := re.search(r'pageMove\((\d+)\)', href):
-            return int(match.group(1))
-    
-    # 마지막 페이지 링크를 찾지 못한 경우 페이지네이션에서 가장 큰 숫자 찾기
-    page_links = soup.select('div.paginate a')
-    max_page = 1
-    for link in page_links:
-        if 'href' in link.attrs and 'pageMove' in link['href']:
-            if match := re.search(r'pageMove\((\d+)\)', link['href']):
-                page_num = int(match.group(1))
-                max_page = max(max_page, page_num)
-    
-    return max_page
+def wait_for_request(limiter):
+    """병렬 모드에서는 공유 토큰 버킷 순서를 기다림 (순차 모드는 기존처럼 요청 뒤 sleep)"""
+    if limiter:
+        limiter.acquire()
 
-def check_category_products(session, category_info):
+def check_category_products(session, category_info, journal=None, limiter=None, progress=None):
+    """카테고리 전체 제품 상세 정보 DataFrame (제품이 없으면 None)
+
+    limiter(crawl_workers.TokenBucket)를 주면 요청 사이 고정 sleep 대신 공유 속도 제한을 따르고,
+    progress(crawl_workers.CrawlProgress)에 처리한 페이지/제품 수를 기록합니다.
+    """
     api_url = "https://www.jchyunplace.co.kr/skin/shop/basic/product_list_include_plist.php"
     page = 1
     product_details = []
     max_retries = 3  # 최대 재시도 횟수
     
     logging.info(f"=== {category_info['name']} 분석 시작 ===")
+    if progress:
+        progress.start(category_info['name'])
     
     # 첫 페이지 요청으로 마지막 페이지 확인
     data = {
@@ -87,10 +80,12 @@ def check_category_products(session, category_info):
     # 첫 페이지 요청 (재시도 로직 추가)
     for attempt in range(max_retries):
         try:
+            wait_for_request(limiter)
             response = session.post(api_url, headers=headers, data=data, timeout=30)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            last_page = get_last_page(soup)
+            last_page = parse_last_page(response.text)
             logging.info(f"총 페이지 수: {last_page}")
+            if progress:
+                progress.set_total_pages(category_info['name'], last_page)
             break
         except Exception as e:
             if attempt < max_retries - 1:
@@ -99,15 +94,30 @@ def check_category_products(session, category_info):
                 time.sleep(retry_wait)
             else:
                 logging.error(f"첫 페이지 요청 최종 실패: {str(e)}")
+                if progress:
+                    progress.finish(category_info['name'])
                 return None
     
     while page <= last_page:
         data['page'] = str(page)
+
+        # 진행 기록상 이미 끝난 페이지는 요청하지 않고 기록된 제품 정보 사용 (중단 후 재실행 시)
+        if journal and journal.completed_page(category_info['name'], page) is not None:
+            restored = journal.page_products(category_info['name'], page)
+            product_details.extend(restored)
+            logging.info(f"페이지 {page}/{last_page} 진행 기록에서 복원")
+            if progress:
+                progress.page_done(category_info['name'])
+                progress.product_done(category_info['name'], len(restored))
+            page += 1
+            continue
+
         logging.info(f"페이지 {page}/{last_page} 처리 중...")
         
         # 페이지 요청 (재시도 로직 추가)
         for attempt in range(max_retries):
             try:
+                wait_for_request(limiter)
                 response = session.post(api_url, headers=headers, data=data, timeout=30)
                 if response.status_code != 200:
                     logging.error(f"❌ 페이지 로드 실패 (status: {response.status_code})")
@@ -115,6 +125,9 @@ def check_category_products(session, category_info):
                 
                 soup = BeautifulSoup(response.text, 'html.parser')
                 products = soup.select('.prd_view_type li.list')
+                page_complete = True
+                if journal:
+                    journal.start_page(category_info['name'], page)
                 
                 for idx, product in enumerate(products, 1):
                     name_elem = product.select_one('a.name')
@@ -125,14 +138,32 @@ def check_category_products(session, category_info):
                         if len(product_details) % 50 == 0 and len(product_details) > 0:
                             logging.info(f"현재까지 {len(product_details)}개 제품 처리 완료")
                         
+                        # 신선도 기간 안에 파싱한 제품은 다시 요청하지 않음
+                        cached_info = journal.fresh_product(product_url) if journal else None
+                        if cached_info is not None:
+                            journal.reuse_product(category_info['name'], page, idx, product_url)
+                            product_details.append(cached_info)
+                            if progress:
+                                progress.product_done(category_info['name'])
+                            continue
+                        
                         # 제품 정보 추출 (재시도 로직은 extract_product_info 내부에 있음)
-                        product_info = extract_product_info(session, product_url)
+                        product_info = extract_product_info(session, product_url, limiter)
                         if product_info:
                             product_details.append(product_info)
+                            if journal:
+                                journal.record_product(category_info['name'], page, idx, product_url, product_info)
+                            if progress:
+                                progress.product_done(category_info['name'])
+                        else:
+                            page_complete = False
                         
-                        time.sleep(1)
+                        if not limiter:
+                            time.sleep(1)
                 
-                # 페이지 처리 성공
+                # 페이지 처리 성공 (실패한 제품이 없을 때만 완료로 기록해 다음 실행에서 다시 시도)
+                if journal and page_complete:
+                    journal.record_page(category_info['name'], page, response.text, last_page, len(products))
                 break
                 
             except Exception as e:
@@ -144,9 +175,14 @@ def check_category_products(session, category_info):
                     logging.error(f"페이지 {page} 처리 최종 실패: {str(e)}")
                     # 마지막 시도에서도 실패했지만, 다음 페이지로 계속 진행
         
+        if progress:
+            progress.page_done(category_info['name'])
         page += 1
-        time.sleep(2)  # 페이지 간 대기 시간 증가
+        if not limiter:
+            time.sleep(2)  # 페이지 간 대기 시간 증가
     
+    if progress:
+        progress.finish(category_info['name'])
     # DataFrame 생성
     if product_details:
         df = pd.DataFrame(product_details)
@@ -154,48 +190,21 @@ def check_category_products(session, category_info):
         return df
     return None
 
-def extract_product_info(session, product_url):
+def extract_product_info(session, product_url, limiter=None):
     base_url = "https://www.jchyunplace.co.kr"
     full_url = base_url + product_url if not product_url.startswith('http') else product_url
     max_retries = 3  # 최대 재시도 횟수
     
     for attempt in range(max_retries):
         try:
+            wait_for_request(limiter)
             response = session.get(full_url, timeout=30)
             
             if response.status_code != 200:
                 logging.error(f"제품 페이지 로드 실패: {full_url}")
                 raise Exception(f"HTTP 오류: {response.status_code}")
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            info_dict = {}
-            
-            # 제품명 추출 (span.name에서 가져오기)
-            product_name_elem = soup.select_one('span.name')
-            if product_name_elem:
-                info_dict['제품명(전체)'] = product_name_elem.get_text(strip=True)
-            
-            # 상세 정보 테이블 찾기
-            table = soup.select_one('.more_info.info table')
-            
-            if table:
-                for row in table.find_all('tr'):
-                    th = row.find('th')
-                    if th:
-                        continue
-                    
-                    cells = row.find_all('td')
-                    for i in range(0, len(cells), 2):
-                        if i + 1 < len(cells):
-                            key = cells[i].get_text(strip=True)
-                            value = cells[i+1].get_text(strip=True)
-                            if key and value:
-                                info_dict[key] = value
-            else:
-                # 테이블을 찾지 못했지만 오류로 처리하지 않고 빈 정보 반환
-                logging.warning("제품 상세 테이블을 찾을 수 없습니다.")
-            
-            return info_dict
+            return parse_product_info(response.text)
         
         except Exception as e:
             if attempt < max_retries - 1:
@@ -208,7 +217,60 @@ def extract_product_info(session, product_url):
     
     return {}  # 모든 시도 실패 시 빈 딕셔너리 반환
 
-def analyze_all_categories():
+def load_today_snapshot(category, today_date):
+    """오늘 크롤링한 스냅숏이 매니페스트에 있으면 DataFrame 으로 읽어 반환 (없거나 읽기 실패면 None)"""
+    snapshot = current_snapshot(category['name'], use_pin=False)
+    if not snapshot or snapshot['crawl_date'] != today_date:
+        return None
+    
+    # 오늘 날짜 스냅숏이 이미 존재하는 경우
+    existing_file = os.path.normpath(os.path.join(STAGING_DIR, snapshot['path']))
+    logging.info(f"✅ '{category['name']}' 카테고리는 오늘({today_date}) 이미 처리되었습니다: {existing_file}")
+    print(f"✅ '{category['name']}' 카테고리는 오늘 이미 처리되었습니다: {existing_file}")
+    
+    # 이미 생성된 파일 로드
+    try:
+        df = read_sheet(existing_file)
+        print(f"기존 파일에서 {len(df)}개 제품 데이터를 로드했습니다.")
+        logging.info(f"기존 파일에서 {len(df)}개 제품 데이터를 로드했습니다.")
+        return df
+    except Exception as e:
+        logging.error(f"기존 파일 로드 중 오류: {str(e)}")
+        return None
+
+def save_category_result(category, df, category_dataframes):
+    """수집한 카테고리 결과를 Parquet 스테이징과 엑셀로 저장"""
+    if df is None or df.empty:
+        print(f"카테고리 '{category['name']}'에서 데이터를 찾지 못했습니다.")
+        logging.warning(f"카테고리 '{category['name']}'에서 데이터를 찾지 못했습니다.")
+        return
+    category_dataframes[category['name']] = df
+    
+    # 로더용 Parquet 스테이징 저장 (03/05-x 는 read_parquet 로 읽음)
+    crawled_at = datetime.now()
+    write_category_frame(category['name'], df, crawled_at=crawled_at)
+    
+    # 각 카테고리별로 Excel 파일 저장 (사람이 보는 용도)
+    timestamp = crawled_at.strftime("%Y%m%d_%H%M%S")
+    excel_filename = export_xlsx(category['name'], df, stamp=timestamp)
+    print(f"✅ '{category['name']}' 데이터를 {excel_filename}에 저장했습니다.")
+    
+    # 각 카테고리 처리 후 현재 상태 출력
+    print(f"\n현재까지 처리된 카테고리: {list(category_dataframes.keys())}")
+    print(f"마지막으로 처리된 카테고리 '{category['name']}'의 데이터 샘플 (처음 5개 행):")
+    print(df.head())
+    
+    # 주요 정보 요약 출력
+    print(f"총 {len(df)}개 제품, 컬럼: {list(df.columns)[:5]}...")
+
+def crawl_category_worker(category, limiter, progress):
+    """병렬 모드 작업자: 세션과 진행 기록 연결은 스레드마다 따로 사용"""
+    session = requests.Session()
+    with CrawlJournal() as journal:
+        return check_category_products(session, category, journal, limiter, progress)
+
+def analyze_all_categories(workers=1, requests_per_second=REQUESTS_PER_SECOND):
+    """모든 카테고리 수집. workers 가 2 이상이면 카테고리 workers 개를 동시에 수집 (공유 속도 제한)"""
     categories = load_categories()
     if not categories:
         logging.error("유효한 카테고리가 없습니다.")
@@ -218,69 +280,49 @@ def analyze_all_categories():
     print(f"처리할 카테고리 목록: {list(categories.keys())}")
     logging.info(f"처리할 카테고리 목록: {list(categories.keys())}")
     
-    session = requests.Session()
     category_dataframes = {}
     
     # 오늘 날짜 형식 지정
     today_date = datetime.now().strftime("%Y%m%d")
+    # 매니페스트에 없는 기존 엑셀은 한 번만 등록 (카테고리마다 디렉터리를 훑지 않음)
+    index_xlsx_files()
+    
+    # 오늘 이미 처리한 카테고리는 기존 스냅숏 사용
+    pending = []
+    for category_key, category in categories.items():
+        df = load_today_snapshot(category, today_date)
+        if df is not None:
+            category_dataframes[category['name']] = df
+        else:
+            pending.append(category)
     
     try:
-        for category_key, category in categories.items():
-            logging.info("="*50)
-            logging.info(f"카테고리 '{category['name']}' 처리 시작")
-            print(f"\n카테고리 '{category['name']}' 처리 시작...")
-            
-            # 오늘 날짜로 생성된 파일이 있는지 확인
-            category_files = [f for f in os.listdir('./cs_agent/raw_xlsx') 
-                              if f.startswith(f"{category['name']}_") and 
-                              today_date in f and 
-                              f.endswith('.xlsx')]
-            
-            if category_files:
-                # 오늘 날짜 파일이 이미 존재하는 경우
-                logging.info(f"✅ '{category['name']}' 카테고리는 오늘({today_date}) 이미 처리되었습니다: {category_files[0]}")
-                print(f"✅ '{category['name']}' 카테고리는 오늘 이미 처리되었습니다: {category_files[0]}")
-                
-                # 이미 생성된 파일 로드
-                existing_file = os.path.join('./cs_agent/raw_xlsx', category_files[0])
-                try:
-                    df = pd.read_excel(existing_file)
-                    category_dataframes[category['name']] = df
-                    print(f"기존 파일에서 {len(df)}개 제품 데이터를 로드했습니다.")
-                    logging.info(f"기존 파일에서 {len(df)}개 제품 데이터를 로드했습니다.")
-                except Exception as e:
-                    logging.error(f"기존 파일 로드 중 오류: {str(e)}")
-                
-                continue  # 다음 카테고리로 진행
-            
-            try:
-                df = check_category_products(session, category)
-                if df is not None and not df.empty:
-                    category_dataframes[category['name']] = df
+        if workers > 1:
+            logging.info(f"병렬 모드: 작업자 {workers}개, 전체 초당 {requests_per_second}건 제한")
+            for category, df, error in run_category_workers(pending, crawl_category_worker, workers, requests_per_second):
+                if error:
+                    logging.error(f"카테고리 {category['name']} 처리 중 오류 발생: {str(error)}")
+                    print(f"오류 발생: {str(error)}")
+                    continue
+                save_category_result(category, df, category_dataframes)
+                logging.info(f"카테고리 '{category['name']}' 처리 완료")
+        else:
+            session = requests.Session()
+            with CrawlJournal() as journal:
+                for category in pending:
+                    logging.info("="*50)
+                    logging.info(f"카테고리 '{category['name']}' 처리 시작")
+                    print(f"\n카테고리 '{category['name']}' 처리 시작...")
                     
-                    # 각 카테고리별로 Excel 파일 저장
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    excel_filename = f"./cs_agent/raw_xlsx/{category['name']}_{timestamp}.xlsx"
-                    df.to_excel(excel_filename, index=False)
-                    logging.info(f"✅ '{category['name']}' 데이터를 {excel_filename}에 저장했습니다.")
-                    print(f"✅ '{category['name']}' 데이터를 {excel_filename}에 저장했습니다.")
+                    try:
+                        df = check_category_products(session, category, journal)
+                        save_category_result(category, df, category_dataframes)
+                    except Exception as e:
+                        logging.error(f"카테고리 {category['name']} 처리 중 오류 발생: {str(e)}")
+                        print(f"오류 발생: {str(e)}")
                     
-                    # 각 카테고리 처리 후 현재 상태 출력
-                    print(f"\n현재까지 처리된 카테고리: {list(category_dataframes.keys())}")
-                    print(f"마지막으로 처리된 카테고리 '{category['name']}'의 데이터 샘플 (처음 5개 행):")
-                    print(df.head())
-                    
-                    # 주요 정보 요약 출력
-                    print(f"총 {len(df)}개 제품, 컬럼: {list(df.columns)[:5]}...")
-                else:
-                    print(f"카테고리 '{category['name']}'에서 데이터를 찾지 못했습니다.")
-                    logging.warning(f"카테고리 '{category['name']}'에서 데이터를 찾지 못했습니다.")
-            except Exception as e:
-                logging.error(f"카테고리 {category['name']} 처리 중 오류 발생: {str(e)}")
-                print(f"오류 발생: {str(e)}")
-            
-            logging.info(f"카테고리 '{category['name']}' 처리 완료")
-            logging.info("="*50)
+                    logging.info(f"카테고리 '{category['name']}' 처리 완료")
+                    logging.info("="*50)
     except KeyboardInterrupt:
         logging.info("키보드 인터럽트 감지! 현재까지 수집된 데이터를 반환합니다.")
         print("\n키보드 인터럽트로 중단되었습니다.")
@@ -289,8 +331,16 @@ def analyze_all_categories():
     return category_dataframes
 
 if __name__ == "__main__":
+    # 사용법: python cs_agent/02_analyze_categories.py [--workers N] [--rps 초당요청수]
+    args = sys.argv[1:]
+    workers = 1
+    requests_per_second = REQUESTS_PER_SECOND
+    if '--workers' in args:
+        workers = int(args[args.index('--workers') + 1])
+    if '--rps' in args:
+        requests_per_second = float(args[args.index('--rps') + 1])
     try:
-        category_dfs = analyze_all_categories()
+        category_dfs = analyze_all_categories(workers, requests_per_second)
         
         if category_dfs:
             logging.info("=== 최종 결과 ===")
@@ -49,6 +49,7 @@ try:
     # PSU 테이블에 form_factor 컬럼 추가 (없는 경우)
     add_column_if_not_exists("power_supply", "form_factor", "VARCHAR")
 
+    # 호환성 테이블에는 외래 키를 두지 않습니다 (DuckDB는 참조되는 부품 행을 다시 적재할 수 없음)
     # 1. CPU와 메인보드 호환성 테이블 생성
     logging.info("CPU-메인보드 호환성 테이블 생성 중...")
     conn.execute("""
@@ -56,9 +57,7 @@ try:
         id INTEGER PRIMARY KEY,
         cpu_id INTEGER,
         mb_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (cpu_id) REFERENCES cpu (cpu_id),
-        FOREIGN KEY (mb_id) REFERENCES motherboard (mb_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("CPU-메인보드 호환성 테이블 생성 완료")
@@ -70,9 +69,7 @@ try:
         id INTEGER PRIMARY KEY,
         cpu_id INTEGER,
         cooler_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (cpu_id) REFERENCES cpu (cpu_id),
-        FOREIGN KEY (cooler_id) REFERENCES cpu_cooler (cooler_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("CPU-쿨러 호환성 테이블 생성 완료")
@@ -84,9 +81,7 @@ try:
         id INTEGER PRIMARY KEY,
         cooler_id INTEGER,
         case_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (cooler_id) REFERENCES cpu_cooler (cooler_id),
-        FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("쿨러-케이스 호환성 테이블 생성 완료")
@@ -98,9 +93,7 @@ try:
         id INTEGER PRIMARY KEY,
         mb_id INTEGER,
         case_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (mb_id) REFERENCES motherboard (mb_id),
-        FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("메인보드-케이스 호환성 테이블 생성 완료")
@@ -112,9 +105,7 @@ try:
         id INTEGER PRIMARY KEY,
         mb_id INTEGER,
         memory_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (mb_id) REFERENCES motherboard (mb_id),
-        FOREIGN KEY (memory_id) REFERENCES memory (memory_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("메인보드-메모리 호환성 테이블 생성 완료")
@@ -126,9 +117,7 @@ try:
         id INTEGER PRIMARY KEY,
         gpu_id INTEGER,
         case_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (gpu_id) REFERENCES gpu (gpu_id),
-        FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("GPU-케이스 호환성 테이블 생성 완료")
@@ -140,9 +129,7 @@ try:
         id INTEGER PRIMARY KEY,
         psu_id INTEGER,
         case_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (psu_id) REFERENCES power_supply (psu_id),
-        FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("PSU-케이스 호환성 테이블 생성 완료")
@@ -154,9 +141,7 @@ try:
         id INTEGER PRIMARY KEY,
         gpu_id INTEGER,
         psu_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (gpu_id) REFERENCES gpu (gpu_id),
-        FOREIGN KEY (psu_id) REFERENCES power_supply (psu_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("GPU-PSU 호환성 테이블 생성 완료")
@@ -168,9 +153,7 @@ try:
         id INTEGER PRIMARY KEY,
         mb_id INTEGER,
         storage_id INTEGER,
-        compatible BOOLEAN,
-        FOREIGN KEY (mb_id) REFERENCES motherboard (mb_id),
-        FOREIGN KEY (storage_id) REFERENCES storage (storage_id)
+        compatible BOOLEAN
     )
     """)
     logging.info("메인보드-스토리지 호환성 테이블 생성 완료")
@@ -189,15 +172,7 @@ try:
         case_id INTEGER,
         psu_id INTEGER,
         compatible BOOLEAN,
-        compatibility_issues TEXT,
-        FOREIGN KEY (cpu_id) REFERENCES cpu (cpu_id),
-        FOREIGN KEY (mb_id) REFERENCES motherboard (mb_id),
-        FOREIGN KEY (cooler_id) REFERENCES cpu_cooler (cooler_id),
-        FOREIGN KEY (memory_id) REFERENCES memory (memory_id),
-        FOREIGN KEY (gpu_id) REFERENCES gpu (gpu_id),
-        FOREIGN KEY (storage_id) REFERENCES storage (storage_id),
-        FOREIGN KEY (case_id) REFERENCES case_chassis (case_id),
-        FOREIGN KEY (psu_id) REFERENCES power_supply (psu_id)
+        compatibility_issues TEXT
     )
     """)
     logging.info("시스템 호환성 테이블 생성 완료")
@@ -1,120 +1,118 @@
 import duckdb
 import pandas as pd
 import json
-import os
+from crawl_staging import find_latest_sheet, read_sheet
 
-# 엑셀 파일 로드 (파일 존재 여부 확인)
+# 원본 시트 로드 (파일 존재 여부 확인)
+# Parquet 스테이징(raw_parquet)을 우선 read_parquet 로 읽고, 더 최신 엑셀이 있으면 엑셀을 읽습니다.
 raw_xlsx_dir = "./cs_agent/raw_xlsx/"
 
 # 파일 패턴으로 가장 최신 파일 찾기 함수
 def find_latest_file(directory, prefix):
-    files = [f for f in os.listdir(directory) if f.startswith(prefix) and f.endswith('.xlsx')]
-    if not files:
-        return None
-    return max(files)  # 파일명 기준으로 가장 최신 파일 반환
+    return find_latest_sheet(prefix, directory)
 
 # CPU 파일 로드
 cpu_file = find_latest_file(raw_xlsx_dir, "CPU_")
 if cpu_file:
     try:
-        cpu = pd.read_excel(f"{raw_xlsx_dir}{cpu_file}")
+        cpu = read_sheet(cpu_file)
         print(f"CPU 파일 로드: {cpu_file}")
     except Exception as e:
         print(f"CPU 파일 로드 중 오류 발생: {e}")
         cpu = pd.DataFrame()
 else:
-    print("경고: CPU 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: CPU 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     cpu = pd.DataFrame()
 
 # 메인보드 파일 로드
 mb_file = find_latest_file(raw_xlsx_dir, "Mainboard_")
 if mb_file:
     try:
-        motherboard = pd.read_excel(f"{raw_xlsx_dir}{mb_file}")
+        motherboard = read_sheet(mb_file)
         print(f"메인보드 파일 로드: {mb_file}")
     except Exception as e:
         print(f"메인보드 파일 로드 중 오류 발생: {e}")
         motherboard = pd.DataFrame()
 else:
-    print("경고: 메인보드 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: 메인보드 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     motherboard = pd.DataFrame()
 
 # 메모리 파일 로드
 memory_file = find_latest_file(raw_xlsx_dir, "Memory_")
 if memory_file:
     try:
-        memory = pd.read_excel(f"{raw_xlsx_dir}{memory_file}")
+        memory = read_sheet(memory_file)
         print(f"메모리 파일 로드: {memory_file}")
     except Exception as e:
         print(f"메모리 파일 로드 중 오류 발생: {e}")
         memory = pd.DataFrame()
 else:
-    print("경고: 메모리 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: 메모리 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     memory = pd.DataFrame()
 
 # 케이스 파일 로드
 case_file = find_latest_file(raw_xlsx_dir, "Case_")
 if case_file:
     try:
-        case = pd.read_excel(f"{raw_xlsx_dir}{case_file}")
+        case = read_sheet(case_file)
         print(f"케이스 파일 로드: {case_file}")
     except Exception as e:
         print(f"케이스 파일 로드 중 오류 발생: {e}")
         case = pd.DataFrame()
 else:
-    print("경고: 케이스 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: 케이스 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     case = pd.DataFrame()
 
 # GPU 파일 로드
 gpu_file = find_latest_file(raw_xlsx_dir, "VGA_")
 if gpu_file:
     try:
-        gpu = pd.read_excel(f"{raw_xlsx_dir}{gpu_file}")
+        gpu = read_sheet(gpu_file)
         print(f"GPU 파일 로드: {gpu_file}")
     except Exception as e:
         print(f"GPU 파일 로드 중 오류 발생: {e}")
         gpu = pd.DataFrame()
 else:
-    print("경고: GPU 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: GPU 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     gpu = pd.DataFrame()
 
 # 파워 파일 로드
 power_file = find_latest_file(raw_xlsx_dir, "Power_")
 if power_file:
     try:
-        power = pd.read_excel(f"{raw_xlsx_dir}{power_file}")
+        power = read_sheet(power_file)
         print(f"파워 파일 로드: {power_file}")
     except Exception as e:
         print(f"파워 파일 로드 중 오류 발생: {e}")
         power = pd.DataFrame()
 else:
-    print("경고: 파워 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: 파워 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     power = pd.DataFrame()
 
 # 스토리지 파일 로드
 storage_file = find_latest_file(raw_xlsx_dir, "SSD_")
 if storage_file:
     try:
-        storage = pd.read_excel(f"{raw_xlsx_dir}{storage_file}")
+        storage = read_sheet(storage_file)
         print(f"스토리지 파일 로드: {storage_file}")
     except Exception as e:
         print(f"스토리지 파일 로드 중 오류 발생: {e}")
         storage = pd.DataFrame()
 else:
-    print("경고: 스토리지 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: 스토리지 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     storage = pd.DataFrame()
 
 # CPU 쿨러 파일 로드
 cooler_file = find_latest_file(raw_xlsx_dir, "CpuCooler_")
 if cooler_file:
     try:
-        cooler = pd.read_excel(f"{raw_xlsx_dir}{cooler_file}")
+        cooler = read_sheet(cooler_file)
         print(f"CPU 쿨러 파일 로드: {cooler_file}")
     except Exception as e:
         print(f"CPU 쿨러 파일 로드 중 오류 발생: {e}")
         cooler = pd.DataFrame()
 else:
-    print("경고: CPU 쿨러 엑셀 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
+    print("경고: CPU 쿨러 원본 파일을 찾을 수 없습니다. 빈 DataFrame을 생성합니다.")
     cooler = pd.DataFrame()
 
 # JSON 파일에서 컬럼 정보 로드
@@ -660,14 +658,13 @@ CREATE TABLE IF NOT EXISTS cpu_cooler (
 ''')
 
 # 호환성 테이블들 생성
+# (외래 키 없음: DuckDB는 참조되는 부품 행을 다시 적재할 수 없습니다. 바뀐 부품의 쌍은 05-8 이 다시 계산합니다)
 conn.execute('''
 CREATE TABLE IF NOT EXISTS cpu_mb_compatibility (
     id INTEGER PRIMARY KEY,
     cpu_id INTEGER,
     mb_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (cpu_id) REFERENCES cpu(cpu_id),
-    FOREIGN KEY (mb_id) REFERENCES motherboard(mb_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -676,9 +673,7 @@ CREATE TABLE IF NOT EXISTS mb_memory_compatibility (
     id INTEGER PRIMARY KEY,
     mb_id INTEGER,
     memory_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (mb_id) REFERENCES motherboard(mb_id),
-    FOREIGN KEY (memory_id) REFERENCES memory(memory_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -687,9 +682,7 @@ CREATE TABLE IF NOT EXISTS mb_case_compatibility (
     id INTEGER PRIMARY KEY,
     mb_id INTEGER,
     case_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (mb_id) REFERENCES motherboard(mb_id),
-    FOREIGN KEY (case_id) REFERENCES case_chassis(case_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -698,9 +691,7 @@ CREATE TABLE IF NOT EXISTS gpu_psu_compatibility (
     id INTEGER PRIMARY KEY,
     gpu_id INTEGER,
     psu_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (gpu_id) REFERENCES gpu(gpu_id),
-    FOREIGN KEY (psu_id) REFERENCES power_supply(psu_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -709,9 +700,7 @@ CREATE TABLE IF NOT EXISTS gpu_case_compatibility (
     id INTEGER PRIMARY KEY,
     gpu_id INTEGER,
     case_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (gpu_id) REFERENCES gpu(gpu_id),
-    FOREIGN KEY (case_id) REFERENCES case_chassis(case_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -720,9 +709,7 @@ CREATE TABLE IF NOT EXISTS cooler_case_compatibility (
     id INTEGER PRIMARY KEY,
     cooler_id INTEGER,
     case_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (cooler_id) REFERENCES cpu_cooler(cooler_id),
-    FOREIGN KEY (case_id) REFERENCES case_chassis(case_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -731,9 +718,7 @@ CREATE TABLE IF NOT EXISTS cpu_cooler_compatibility (
     id INTEGER PRIMARY KEY,
     cpu_id INTEGER,
     cooler_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (cpu_id) REFERENCES cpu(cpu_id),
-    FOREIGN KEY (cooler_id) REFERENCES cpu_cooler(cooler_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -742,9 +727,7 @@ CREATE TABLE IF NOT EXISTS mb_storage_compatibility (
     id INTEGER PRIMARY KEY,
     mb_id INTEGER,
     storage_id INTEGER,
-    compatible BOOLEAN,
-    FOREIGN KEY (mb_id) REFERENCES motherboard(mb_id),
-    FOREIGN KEY (storage_id) REFERENCES storage(storage_id)
+    compatible BOOLEAN
 );
 ''')
 
@@ -763,14 +746,6 @@ CREATE TABLE IF NOT EXISTS system_compatibility (
     total_power_consumption INTEGER,     -- 전체 시스템 소비 전력
     compatible BOOLEAN,                  -- 전체 호환성 여부
     compatibility_issues TEXT,           -- 호환성 문제 설명
-    FOREIGN KEY (cpu_id) REFERENCES cpu(cpu_id),
-    FOREIGN KEY (mb_id) REFERENCES motherboard(mb_id),
-    FOREIGN KEY (memory_id) REFERENCES memory(memory_id),
-    FOREIGN KEY (gpu_id) REFERENCES gpu(gpu_id),
-    FOREIGN KEY (storage_id) REFERENCES storage(storage_id),
-    FOREIGN KEY (psu_id) REFERENCES power_supply(psu_id),
-    FOREIGN KEY (case_id) REFERENCES case_chassis(case_id),
-    FOREIGN KEY (cooler_id) REFERENCES cpu_cooler(cooler_id)
 );
 ''')
 
@@ -3,8 +3,14 @@ import pandas as pd
 import logging
 from datetime import datetime
 import os
-import numpy as np
-import re
+from compatibility_engine import (
+    socket_matrix, socket_support_matrix, fit_matrix,
+    form_factor_matrix, memory_type_matrix, psu_form_matrix, power_matrix,
+    refresh_pair_table
+)
+from spec_normalize import normalized_column
+from build_solver import SOLVER_PARTS, solve_builds
+import sys
 
 # 로깅 설정
 log_filename = f'compatibility_update_{datetime.now().strftime("%Y%m%d")}.log'
@@ -14,12 +20,24 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# 데이터베이스 연결
-conn = duckdb.connect('./cs_agent/db/pc_parts.db')
+# 데이터베이스 연결 (--db <경로> 로 다른 DB 파일 지정, 예: catalog_refresh 의 스테이징 DB)
+DB_PATH = sys.argv[sys.argv.index('--db') + 1] if '--db' in sys.argv else './cs_agent/db/pc_parts.db'
+conn = duckdb.connect(DB_PATH)
 
 # 마지막 업데이트 시간 저장 파일
 LAST_UPDATE_FILE = 'last_compatibility_update.txt'
 
+# 호환성 저장 모드
+# False: 모든 쌍을 compatible 0/1 로 저장 (기존 방식)
+# True: 호환 쌍만 *_compatibility_pairs 에 저장하고 *_compatibility 는 같은 형태의 뷰로 제공
+SPARSE_MODE = '--sparse' in sys.argv
+
+# 부품 행 해시 비교 없이 모든 쌍을 다시 계산
+FULL_REFRESH = '--full' in sys.argv
+
+# system_compatibility 에 저장할 상위 조합 수
+SYSTEM_BUILD_LIMIT = 100
+
 def get_last_update_time():
     """마지막 업데이트 시간 가져오기"""
     if os.path.exists(LAST_UPDATE_FILE):
@@ -46,37 +64,13 @@ def get_table_data(table_name):
         logging.error(f"{table_name} 테이블 데이터 가져오기 실패: {e}")
         return pd.DataFrame()
 
-def check_if_update_needed(compatibility_table, source_tables):
-    """호환성 테이블 업데이트가 필요한지 확인"""
-    last_update = get_last_update_time()
-    
-    # 호환성 테이블에 데이터가 없는지 확인
-    try:
-        conn.execute(f'SELECT COUNT(*) FROM "{compatibility_table}"')
-        count = conn.fetchone()[0]
-        if count == 0:
-            logging.info(f"{compatibility_table} 테이블이 비어 있습니다.")
-            return True
-    except Exception as e:
-        logging.error(f"{compatibility_table} 테이블 확인 중 오류: {e}")
-        return True
-    
-    if not last_update:
-        return False  # 이미 데이터가 있고 마지막 업데이트 시간이 없으면 업데이트 불필요
-    
-    # 소스 테이블 중 하나라도 마지막 업데이트 이후 변경되었는지 확인
-    for table in source_tables:
-        try:
-            conn.execute(f'SELECT MAX(updated_at) FROM "{table}"')
-            result = conn.fetchone()
-            if result and result[0] and result[0] > last_update:
-                logging.info(f"{table} 테이블이 마지막 호환성 업데이트 이후 변경되었습니다.")
-                return True
-        except:
-            pass  # updated_at 컬럼이 없을 수 있음
-    
-    logging.info(f"{compatibility_table} 테이블은 이미 최신 상태입니다.")
-    return False
+def log_refresh_result(label, table_name, stats):
+    """호환성 테이블 갱신 결과 로깅"""
+    if stats['mode'] == 'incremental' and stats['evaluated'] == 0:
+        logging.info(f"{table_name} 테이블은 이미 최신 상태입니다.")
+        return
+    mode = "전체 재계산" if stats['mode'] == 'full' else "증분 갱신"
+    logging.info(f"{label} 호환성 테이블 업데이트 완료({mode}): {stats['saved']}개 항목 저장 (평가 {stats['evaluated']}개 쌍)")
 
 # 필요한 테이블 데이터 가져오기
 cases = get_table_data("case_chassis")
@@ -109,151 +103,8 @@ def get_column_names(df, expected_columns):
     
     return actual_columns
 
-# 데이터 전처리 및 정규화 함수들
-def normalize_socket_type(socket_str):
-    """소켓 타입 문자열을 정규화하여 일관성 있게 만듭니다."""
-    if socket_str is None or pd.isna(socket_str):
-        return ""
-    
-    socket_str = str(socket_str).strip().upper()
-    
-    # 공백 제거 및 일관성 있는 형식으로 변환
-    socket_str = socket_str.replace(" ", "")
-    
-    # LGA 소켓 정규화
-    if "LGA" in socket_str:
-        # LGA1700, LGA 1700 등을 LGA1700으로 통일
-        socket_str = re.sub(r'LGA\s*(\d+)', r'LGA\1', socket_str)
-    
-    # AM4, AM 4 등을 AM4로 통일
-    if "AM" in socket_str:
-        socket_str = re.sub(r'AM\s*(\d+)', r'AM\1', socket_str)
-    
-    return socket_str
-
-def normalize_form_factor(form_str):
-    """폼팩터 문자열을 정규화합니다."""
-    if form_str is None or pd.isna(form_str):
-        return ""
-    
-    form_str = str(form_str).strip().upper()
-    
-    # 공백 및 하이픈 처리
-    normalized = form_str.replace(" ", "").replace("-", "")
-    
-    # 일반적인 폼팩터 정규화
-    mapping = {
-        "MATX": "MICROATX",
-        "MICRO-ATX": "MICROATX",
-        "MICRO ATX": "MICROATX",
-        "M-ATX": "MICROATX",
-        "ITX": "MINIITX",
-        "MINI-ITX": "MINIITX",
-        "MINI ITX": "MINIITX",
-        "EATX": "EXTENDEDATX",
-        "E-ATX": "EXTENDEDATX",
-        "EXTENDED ATX": "EXTENDEDATX",
-        "EXTENDED-ATX": "EXTENDEDATX"
-    }
-    
-    for key, value in mapping.items():
-        if key in normalized:
-            return value
-    
-    # ATX는 그대로 유지
-    if "ATX" in normalized and not any(k in normalized for k in mapping.keys()):
-        return "ATX"
-    
-    return normalized
-
-def convert_dimension_to_mm(dimension_str):
-    """차원 문자열(높이, 길이 등)을 밀리미터(mm) 단위로 변환합니다."""
-    if dimension_str is None or pd.isna(dimension_str):
-        return None
-    
-    try:
-        # 숫자만 추출
-        dimension_str = str(dimension_str).strip().lower()
-        num_match = re.search(r'(\d+(\.\d+)?)', dimension_str)
-        
-        if not num_match:
-            return None
-        
-        value = float(num_match.group(1))
-        
-        # 단위 확인 및 변환
-        if 'cm' in dimension_str:
-            return value * 10  # cm -> mm
-        elif 'in' in dimension_str or 'inch' in dimension_str:
-            return value * 25.4  # inch -> mm
-        elif 'mm' in dimension_str:
-            return value  # 이미 mm
-        else:
-            # 단위가 명시되지 않은 경우 기본적으로 mm로 가정
-            return value
-    except (ValueError, TypeError):
-        logging.warning(f"차원 변환 실패: {dimension_str}")
-        return None
-
-def normalize_power_rating(power_str):
-    """전력 문자열을 와트(W) 단위로 변환합니다."""
-    if power_str is None or pd.isna(power_str):
-        return None
-    
-    try:
-        # 숫자만 추출
-        power_str = str(power_str).strip().lower()
-        num_match = re.search(r'(\d+(\.\d+)?)', power_str)
-        
-        if not num_match:
-            return None
-        
-        value = float(num_match.group(1))
-        
-        # 단위 확인
-        if 'kw' in power_str:
-            return value * 1000  # kW -> W
-        else:
-            # 단위가 없거나 W인 경우
-            return value
-    except (ValueError, TypeError):
-        logging.warning(f"전력 변환 실패: {power_str}")
-        return None
-
-# 호환성 판단 함수 개선
-def is_compatible_socket(cpu_socket, mb_socket):
-    """CPU 소켓과 메인보드 소켓의 호환성을 판단합니다."""
-    if not cpu_socket or not mb_socket:
-        return False, "소켓 정보 부족"
-    
-    cpu_socket = normalize_socket_type(cpu_socket)
-    mb_socket = normalize_socket_type(mb_socket)
-    
-    if cpu_socket == mb_socket:
-        return True, "소켓 일치"
-    
-    # 소켓 패밀리 호환성 (예: LGA1200과 LGA1155 등)
-    socket_compatibility = {
-        "LGA1700": ["LGA1700"],
-        "LGA1200": ["LGA1200", "LGA1151", "LGA1150"],
-        "LGA1151": ["LGA1151", "LGA1150", "LGA1155"],
-        "LGA1150": ["LGA1150", "LGA1155", "LGA1156"],
-        "LGA1155": ["LGA1155", "LGA1156"],
-        "LGA2066": ["LGA2066"],
-        "AM4": ["AM4"],
-        "AM5": ["AM5"]
-    }
-    
-    if cpu_socket in socket_compatibility and mb_socket in socket_compatibility.get(cpu_socket, []):
-        return True, "소켓 패밀리 호환"
-    
-    return False, "소켓 불일치"
-
 # 1. CPU와 메인보드 호환성 (소켓 타입 기준)
 def update_cpu_mb_compatibility():
-    if not check_if_update_needed("cpu_mb_compatibility", ["cpu", "motherboard"]):
-        return
-        
     if cpus.empty or motherboards.empty:
         logging.warning("CPU 또는 메인보드 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -274,52 +125,27 @@ def update_cpu_mb_compatibility():
         logging.warning(f"CPU 또는 메인보드 테이블에 필요한 컬럼이 없습니다. CPU 컬럼: {cpu_cols}, MB 컬럼: {mb_cols}")
         return
     
-    compatibility_data = []
+    # 테이블 스키마 확인 및 필요시 ALTER TABLE (sparse 모드에서는 뷰가 reason 컬럼을 제공)
+    columns = conn.execute("PRAGMA table_info(cpu_mb_compatibility)").fetchall()
+    column_names = [col[1] for col in columns]
     
-    for cpu_id, cpu_socket in zip(cpus[cpu_cols['cpu_id']], cpus[cpu_cols['socket_type']]):
-        for mb_id, mb_socket in zip(motherboards[mb_cols['mb_id']], motherboards[mb_cols['socket_type']]):
-            is_compatible, reason = is_compatible_socket(cpu_socket, mb_socket)
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'cpu_id': cpu_id,
-                'mb_id': mb_id,
-                'compatible': 1 if is_compatible else 0,
-                'reason': reason  # 호환성 이유 저장
-            })
-    
-    if compatibility_data:
-        # 테이블 스키마 확인 및 필요시 ALTER TABLE
-        columns = conn.execute("PRAGMA table_info(cpu_mb_compatibility)").fetchall()
-        column_names = [col[1] for col in columns]
-        
-        # reason 컬럼이 없으면 추가
-        if 'reason' not in column_names:
-            conn.execute("ALTER TABLE cpu_mb_compatibility ADD COLUMN reason TEXT")
-            logging.info("cpu_mb_compatibility 테이블에 reason 컬럼 추가 완료")
-        
-        df = pd.DataFrame(compatibility_data)
-        
-        # 기존 데이터 삭제 대신 증분 업데이트 (예시)
-        conn.execute("BEGIN TRANSACTION")
-        try:
-            # 기존 데이터 삭제
-            conn.execute("DELETE FROM cpu_mb_compatibility")
-            # 새 데이터 삽입
-            conn.execute("INSERT INTO cpu_mb_compatibility SELECT * FROM df")
-            conn.execute("COMMIT")
-            logging.info(f"CPU-메인보드 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-        except Exception as e:
-            conn.execute("ROLLBACK")
-            logging.error(f"CPU-메인보드 호환성 업데이트 오류: {e}")
-    else:
-        logging.warning("CPU-메인보드 호환성 데이터가 없습니다.")
+    # reason 컬럼이 없으면 추가
+    if not SPARSE_MODE and column_names and 'reason' not in column_names:
+        conn.execute("ALTER TABLE cpu_mb_compatibility ADD COLUMN reason TEXT")
+        logging.info("cpu_mb_compatibility 테이블에 reason 컬럼 추가 완료")
+    
+    # 적재 때 저장한 정규화 소켓(socket_norm)으로 쌍을 행렬로 계산 (변경된 부품만 다시 평가)
+    def compute(left, right):
+        return socket_matrix(normalized_column(left, 'cpu', cpu_cols['socket_type']),
+                             normalized_column(right, 'motherboard', mb_cols['socket_type']), normalized=True)
+    
+    stats = refresh_pair_table(conn, "cpu_mb_compatibility", cpus, cpu_cols['cpu_id'],
+                               motherboards, mb_cols['mb_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("CPU-메인보드", "cpu_mb_compatibility", stats)
 
 # 2. CPU와 쿨러 호환성 (소켓 지원 기준)
 def update_cpu_cooler_compatibility():
-    if not check_if_update_needed("cpu_cooler_compatibility", ["cpu", "cpu_cooler"]):
-        return
-        
     if cpus.empty or coolers.empty:
         logging.warning("CPU 또는 쿨러 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -340,36 +166,21 @@ def update_cpu_cooler_compatibility():
         logging.warning(f"CPU 또는 쿨러 테이블에 필요한 컬럼이 없습니다. CPU 컬럼: {cpu_cols}, 쿨러 컬럼: {cooler_cols}")
         return
     
-    compatibility_data = []
-    
-    for cpu_id, cpu_socket in zip(cpus[cpu_cols['cpu_id']], cpus[cpu_cols['socket_type']]):
-        for cooler_id, socket_support in zip(coolers[cooler_cols['cooler_id']], coolers[cooler_cols['socket_support']]):
-            # 쿨러의 socket_support에 CPU 소켓이 포함되어 있으면 호환됨
-            compatible = 0
-            if socket_support is not None and isinstance(socket_support, str):
-                if cpu_socket in socket_support:
-                    compatible = 1
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'cpu_id': cpu_id,
-                'cooler_id': cooler_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM cpu_cooler_compatibility")
-        conn.execute("INSERT INTO cpu_cooler_compatibility SELECT * FROM df")
-        logging.info(f"CPU-쿨러 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("CPU-쿨러 호환성 데이터가 없습니다.")
+    # 쿨러의 socket_support에 CPU 소켓이 포함되어 있으면 호환됨 (적재 때 저장한 소켓 비트마스크의 AND)
+    def compute(left, right):
+        return socket_support_matrix(
+            normalized_column(left, 'cpu', cpu_cols['socket_type'], 'cooler_socket_mask'),
+            normalized_column(right, 'cpu_cooler', cooler_cols['socket_support'], 'socket_support_mask'),
+            normalized=True
+        )
+    
+    stats = refresh_pair_table(conn, "cpu_cooler_compatibility", cpus, cpu_cols['cpu_id'],
+                               coolers, cooler_cols['cooler_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("CPU-쿨러", "cpu_cooler_compatibility", stats)
 
 # 3. 쿨러와 케이스 호환성 (쿨러 높이와 케이스 지원 높이 기준)
 def update_cooler_case_compatibility():
-    if not check_if_update_needed("cooler_case_compatibility", ["cpu_cooler", "case_chassis"]):
-        return
-        
     if coolers.empty or cases.empty:
         logging.warning("쿨러 또는 케이스 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -403,40 +214,17 @@ def update_cooler_case_compatibility():
         logging.warning(f"쿨러 또는 케이스 테이블에 필요한 컬럼이 없습니다. 쿨러 컬럼: {cooler_cols}, 케이스 컬럼: {case_cols}")
         return
     
-    compatibility_data = []
+    # 쿨러 높이 <= 케이스 장착 높이 (mm 단위로 한 번만 변환 후 브로드캐스팅)
+    def compute(left, right):
+        return fit_matrix(left[cooler_cols['height']], right[case_cols['cpu_cooler_height']])
     
-    for cooler_id, cooler_height in zip(coolers[cooler_cols['cooler_id']], coolers[cooler_cols['height']]):
-        for case_id, case_cooler_height in zip(cases[case_cols['case_id']], cases[case_cols['cpu_cooler_height']]):
-            compatible = 0
-            
-            # 둘 다 숫자 값이 있는 경우에만 비교
-            if cooler_height is not None and case_cooler_height is not None:
-                try:
-                    if float(cooler_height) <= float(case_cooler_height):
-                        compatible = 1
-                except (ValueError, TypeError):
-                    pass
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'cooler_id': cooler_id,
-                'case_id': case_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM cooler_case_compatibility")
-        conn.execute("INSERT INTO cooler_case_compatibility SELECT * FROM df")
-        logging.info(f"쿨러-케이스 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("쿨러-케이스 호환성 데이터가 없습니다.")
+    stats = refresh_pair_table(conn, "cooler_case_compatibility", coolers, cooler_cols['cooler_id'],
+                               cases, case_cols['case_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("쿨러-케이스", "cooler_case_compatibility", stats)
 
 # 4. 메인보드와 케이스 호환성 (폼팩터 기준)
 def update_mb_case_compatibility():
-    if not check_if_update_needed("mb_case_compatibility", ["motherboard", "case_chassis"]):
-        return
-        
     if motherboards.empty or cases.empty:
         logging.warning("메인보드 또는 케이스 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -464,54 +252,23 @@ def update_mb_case_compatibility():
         logging.warning(f"메인보드 또는 케이스 테이블에 필요한 컬럼이 없습니다: {missing_cols}")
         return
     
-    compatibility_data = []
-    
-    for mb_id, mb_form_factor in zip(motherboards[mb_cols['mb_id']], motherboards[mb_cols['form_factor']]):
-        for case_id, atx_support, matx_support, itx_support, eatx_support in zip(
-            cases[case_cols['case_id']], 
-            cases[case_cols['atx_support']], 
-            cases[case_cols['matx_support']], 
-            cases[case_cols['itx_support']], 
-            cases[case_cols['eatx_support']]):
-            
-            compatible = 0
-            
-            # NA 값을 False로 처리
-            atx_support = False if pd.isna(atx_support) else bool(atx_support)
-            matx_support = False if pd.isna(matx_support) else bool(matx_support)
-            itx_support = False if pd.isna(itx_support) else bool(itx_support)
-            eatx_support = False if pd.isna(eatx_support) else bool(eatx_support)
-            
-            # 폼팩터에 따른 호환성 확인
-            if mb_form_factor == 'ATX' and atx_support:
-                compatible = 1
-            elif mb_form_factor == 'm-ATX' and matx_support:
-                compatible = 1
-            elif mb_form_factor == 'ITX' and itx_support:
-                compatible = 1
-            elif mb_form_factor == 'E-ATX' and eatx_support:
-                compatible = 1
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'mb_id': mb_id,
-                'case_id': case_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM mb_case_compatibility")
-        conn.execute("INSERT INTO mb_case_compatibility SELECT * FROM df")
-        logging.info(f"메인보드-케이스 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("메인보드-케이스 호환성 데이터가 없습니다.")
+    # 정규화 폼팩터(form_factor_norm)에 따른 호환성 확인 (NA 지원 값은 False로 처리)
+    def compute(left, right):
+        return form_factor_matrix(
+            normalized_column(left, 'motherboard', mb_cols['form_factor']),
+            right[case_cols['atx_support']],
+            right[case_cols['matx_support']],
+            right[case_cols['itx_support']],
+            right[case_cols['eatx_support']],
+            normalized=True)
+    
+    stats = refresh_pair_table(conn, "mb_case_compatibility", motherboards, mb_cols['mb_id'],
+                               cases, case_cols['case_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("메인보드-케이스", "mb_case_compatibility", stats)
 
 # 5. 메인보드와 메모리 호환성 (메모리 타입 기준)
 def update_mb_memory_compatibility():
-    if not check_if_update_needed("mb_memory_compatibility", ["motherboard", "memory"]):
-        return
-        
     if motherboards.empty or memories.empty:
         logging.warning("메인보드 또는 메모리 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -538,38 +295,18 @@ def update_mb_memory_compatibility():
         logging.warning(f"메인보드 또는 메모리 테이블에 필요한 컬럼이 없습니다. MB 컬럼: {mb_cols}, 메모리 컬럼: {memory_cols}")
         return
     
-    compatibility_data = []
+    # 메모리 타입 호환성 확인 (정규화한 DDR4/DDR5 일치)
+    def compute(left, right):
+        return memory_type_matrix(normalized_column(left, 'motherboard', mb_cols['memory_support']),
+                                  normalized_column(right, 'memory', memory_cols['memory_type']))
     
-    for mb_id, mb_memory_support in zip(motherboards[mb_cols['mb_id']], motherboards[mb_cols['memory_support']]):
-        for memory_id, memory_type in zip(memories[memory_cols['memory_id']], memories[memory_cols['memory_type']]):
-            compatible = 0
-            
-            # 메모리 타입 호환성 확인
-            if mb_memory_support == 'DDR4' and memory_type == 'DDR4':
-                compatible = 1
-            elif mb_memory_support == 'DDR5' and memory_type == 'DDR5':
-                compatible = 1
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'mb_id': mb_id,
-                'memory_id': memory_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM mb_memory_compatibility")
-        conn.execute("INSERT INTO mb_memory_compatibility SELECT * FROM df")
-        logging.info(f"메인보드-메모리 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("메인보드-메모리 호환성 데이터가 없습니다.")
+    stats = refresh_pair_table(conn, "mb_memory_compatibility", motherboards, mb_cols['mb_id'],
+                               memories, memory_cols['memory_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("메인보드-메모리", "mb_memory_compatibility", stats)
 
 # 6. GPU와 케이스 호환성 (GPU 길이와 케이스 지원 길이 기준)
 def update_gpu_case_compatibility():
-    if not check_if_update_needed("gpu_case_compatibility", ["gpu", "case_chassis"]):
-        return
-        
     if gpus.empty or cases.empty:
         logging.warning("GPU 또는 케이스 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -603,56 +340,30 @@ def update_gpu_case_compatibility():
         logging.warning(f"GPU 또는 케이스 테이블에 필요한 컬럼이 없습니다. GPU 컬럼: {gpu_cols}, 케이스 컬럼: {case_cols}")
         return
     
-    compatibility_data = []
+    # GPU 길이 <= 케이스 VGA 장착 길이 (mm 단위로 한 번만 변환 후 브로드캐스팅)
+    def compute(left, right):
+        return fit_matrix(left[gpu_cols['length']], right[case_cols['vga_length']])
     
-    for gpu_id, gpu_length in zip(gpus[gpu_cols['gpu_id']], gpus[gpu_cols['length']]):
-        for case_id, case_vga_length in zip(cases[case_cols['case_id']], cases[case_cols['vga_length']]):
-            compatible = 0
-            
-            # 둘 다 숫자 값이 있는 경우에만 비교
-            if gpu_length is not None and case_vga_length is not None:
-                try:
-                    if float(gpu_length) <= float(case_vga_length):
-                        compatible = 1
-                except (ValueError, TypeError):
-                    pass
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'gpu_id': gpu_id,
-                'case_id': case_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        # GPU-케이스 호환성 테이블이 없는 경우 생성
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS gpu_case_compatibility (
-                    id INTEGER PRIMARY KEY,
-                    gpu_id INTEGER,
-                    case_id INTEGER,
-                    compatible BOOLEAN,
-                    FOREIGN KEY (gpu_id) REFERENCES gpu (gpu_id),
-                    FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
-                )
-            """)
-            logging.info("GPU-케이스 호환성 테이블 생성 완료")
-        except Exception as e:
-            logging.warning(f"GPU-케이스 호환성 테이블 생성 중 오류: {e}")
-        
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM gpu_case_compatibility")
-        conn.execute("INSERT INTO gpu_case_compatibility SELECT * FROM df")
-        logging.info(f"GPU-케이스 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("GPU-케이스 호환성 데이터가 없습니다.")
+    # GPU-케이스 호환성 테이블이 없는 경우 생성
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS gpu_case_compatibility (
+                id INTEGER PRIMARY KEY,
+                gpu_id INTEGER,
+                case_id INTEGER,
+                compatible BOOLEAN
+            )
+        """)
+    except Exception as e:
+        logging.warning(f"GPU-케이스 호환성 테이블 생성 중 오류: {e}")
+    
+    stats = refresh_pair_table(conn, "gpu_case_compatibility", gpus, gpu_cols['gpu_id'],
+                               cases, case_cols['case_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("GPU-케이스", "gpu_case_compatibility", stats)
 
 # 7. PSU와 케이스 호환성 (PSU 폼팩터와 케이스 지원 폼팩터 기준)
 def update_psu_case_compatibility():
-    if not check_if_update_needed("psu_case_compatibility", ["power_supply", "case_chassis"]):
-        return
-        
     if psus.empty or cases.empty:
         logging.warning("PSU 또는 케이스 데이터가 없어 호환성 업데이트를 건너뜁니다.")
         return
@@ -679,114 +390,179 @@ def update_psu_case_compatibility():
         logging.warning(f"PSU 또는 케이스 테이블에 필요한 컬럼이 없습니다. PSU 컬럼: {psu_cols}, 케이스 컬럼: {case_cols}")
         return
     
-    compatibility_data = []
+    # PSU 폼팩터가 케이스 지원 타입에 포함되어 있으면 호환됨 (ATX-ATX, SFX-SFX, 적재 때 저장한 규격 비트마스크의 AND)
+    def compute(left, right):
+        return psu_form_matrix(
+            normalized_column(left, 'power_supply', psu_cols['form_factor'], 'psu_form_mask'),
+            normalized_column(right, 'case_chassis', case_cols['power_supply_type'], 'psu_support_mask'),
+            normalized=True
+        )
     
-    for psu_id, psu_form_factor in zip(psus[psu_cols['psu_id']], psus[psu_cols['form_factor']]):
-        for case_id, case_psu_support in zip(cases[case_cols['case_id']], cases[case_cols['power_supply_type']]):
-            compatible = 0
-            
-            # PSU 폼팩터가 케이스 지원 타입에 포함되어 있으면 호환됨
-            if psu_form_factor is not None and case_psu_support is not None:
-                try:
-                    psu_form_lower = str(psu_form_factor).lower()
-                    case_support_lower = str(case_psu_support).lower()
-                    
-                    # ATX PSU는 대부분의 케이스와 호환됨
-                    if 'atx' in psu_form_lower and 'atx' in case_support_lower:
-                        compatible = 1
-                    # SFX PSU는 SFX 지원 케이스와만 호환됨
-                    elif 'sfx' in psu_form_lower and 'sfx' in case_support_lower:
-                        compatible = 1
-                except (ValueError, TypeError):
-                    pass
-            
-            compatibility_data.append({
-                'id': len(compatibility_data) + 1,
-                'psu_id': psu_id,
-                'case_id': case_id,
-                'compatible': compatible
-            })
-    
-    if compatibility_data:
-        # PSU-케이스 호환성 테이블이 없는 경우 생성
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS psu_case_compatibility (
-                    id INTEGER PRIMARY KEY,
-                    psu_id INTEGER,
-                    case_id INTEGER,
-                    compatible BOOLEAN,
-                    FOREIGN KEY (psu_id) REFERENCES power_supply (psu_id),
-                    FOREIGN KEY (case_id) REFERENCES case_chassis (case_id)
-                )
-            """)
-            logging.info("PSU-케이스 호환성 테이블 생성 완료")
-        except Exception as e:
-            logging.warning(f"PSU-케이스 호환성 테이블 생성 중 오류: {e}")
-        
-        df = pd.DataFrame(compatibility_data)
-        conn.execute("DELETE FROM psu_case_compatibility")
-        conn.execute("INSERT INTO psu_case_compatibility SELECT * FROM df")
-        logging.info(f"PSU-케이스 호환성 테이블 업데이트 완료: {len(df)}개 항목")
-    else:
-        logging.warning("PSU-케이스 호환성 데이터가 없습니다.")
+    # PSU-케이스 호환성 테이블이 없는 경우 생성
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS psu_case_compatibility (
+                id INTEGER PRIMARY KEY,
+                psu_id INTEGER,
+                case_id INTEGER,
+                compatible BOOLEAN
+            )
+        """)
+    except Exception as e:
+        logging.warning(f"PSU-케이스 호환성 테이블 생성 중 오류: {e}")
+    
+    stats = refresh_pair_table(conn, "psu_case_compatibility", psus, psu_cols['psu_id'],
+                               cases, case_cols['case_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("PSU-케이스", "psu_case_compatibility", stats)
+
+# 8. GPU와 PSU 호환성 (GPU 권장 파워와 PSU 정격출력 기준)
+def update_gpu_psu_compatibility():
+    if gpus.empty or psus.empty:
+        logging.warning("GPU 또는 PSU 데이터가 없어 호환성 업데이트를 건너뜁니다.")
+        return
+    
+    # 컬럼 이름 확인
+    gpu_cols = get_column_names(gpus, ['gpu_id', 'recommended_psu'])
+    psu_cols = get_column_names(psus, ['psu_id', 'wattage'])
+    
+    # ID 컬럼 이름이 다를 수 있음
+    if gpu_cols['gpu_id'] is None:
+        for possible_id in ['id', 'vga_id']:
+            if possible_id in gpus.columns:
+                gpu_cols['gpu_id'] = possible_id
+                break
+                
+    if psu_cols['psu_id'] is None:
+        for possible_id in ['id', 'power_id', 'power_supply_id']:
+            if possible_id in psus.columns:
+                psu_cols['psu_id'] = possible_id
+                break
+    
+    # 필요한 컬럼이 없으면 건너뛰기
+    if None in gpu_cols.values() or None in psu_cols.values():
+        logging.warning(f"GPU 또는 PSU 테이블에 필요한 컬럼이 없습니다. GPU 컬럼: {gpu_cols}, PSU 컬럼: {psu_cols}")
+        return
+    
+    # GPU 권장 파워 <= PSU 정격출력 (W 단위로 한 번만 변환 후 브로드캐스팅)
+    def compute(left, right):
+        return power_matrix(left[gpu_cols['recommended_psu']], right[psu_cols['wattage']])
+    
+    stats = refresh_pair_table(conn, "gpu_psu_compatibility", gpus, gpu_cols['gpu_id'],
+                               psus, psu_cols['psu_id'], compute,
+                               sparse=SPARSE_MODE, force_full=FULL_REFRESH)
+    log_refresh_result("GPU-PSU", "gpu_psu_compatibility", stats)
 
 # 10. 시스템 호환성 (전체 시스템 호환성 종합)
 def update_system_compatibility():
     # 시스템 호환성은 다른 호환성 테이블을 기반으로 계산하므로
     # 다른 호환성 테이블이 모두 업데이트된 후에 실행해야 함
-    logging.info("시스템 호환성 테이블은 필요할 때 동적으로 계산됩니다.")
-    pass
+    # 모든 조합을 저장할 수는 없으므로 솔버가 찾은 상위 조합만 기록하고,
+    # 조건별 견적은 build_solver.solve_builds()로 필요할 때 계산합니다.
+    columns = [col[1] for col in conn.execute("PRAGMA table_info(system_compatibility)").fetchall()]
+    if not columns:
+        logging.warning("system_compatibility 테이블이 없어 시스템 호환성 업데이트를 건너뜁니다.")
+        return
+    
+    builds = solve_builds(conn, top_k=SYSTEM_BUILD_LIMIT)
+    id_col = 'system_id' if 'system_id' in columns else 'id'
+    rows = []
+    for index, build in enumerate(builds, 1):
+        row = {id_col: index, 'compatible': True}
+        for table, part in build['parts'].items():
+            row[SOLVER_PARTS[table]] = part['id']
+        rows.append(row)
+    df = pd.DataFrame(rows, columns=[id_col] + list(SOLVER_PARTS.values()) + ['compatible'])
+    
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute("DELETE FROM system_compatibility")
+        if not df.empty:
+            conn.register('system_builds_df', df)
+            conn.execute(f"INSERT INTO system_compatibility ({', '.join(df.columns)}) SELECT * FROM system_builds_df")
+            conn.unregister('system_builds_df')
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    logging.info(f"시스템 호환성 테이블 업데이트 완료: 상위 {len(df)}개 조합 저장")
 
 # 모든 호환성 테이블 업데이트 함수 수정 - 오류 처리 개선
 def update_all_compatibility_tables():
+    """모든 호환성 테이블 업데이트, 실패한 항목 이름 목록을 반환"""
     logging.info("호환성 테이블 업데이트 시작")
+    failed = []
     
     # 각 호환성 테이블 업데이트 함수 호출
     try:
         update_cpu_mb_compatibility()
     except Exception as e:
         logging.error(f"CPU-메인보드 호환성 업데이트 중 오류: {e}")
+        failed.append("CPU-메인보드 호환성")
     
     try:
         update_cpu_cooler_compatibility()
     except Exception as e:
         logging.error(f"CPU-쿨러 호환성 업데이트 중 오류: {e}")
+        failed.append("CPU-쿨러 호환성")
     
     try:
         update_cooler_case_compatibility()
     except Exception as e:
         logging.error(f"쿨러-케이스 호환성 업데이트 중 오류: {e}")
+        failed.append("쿨러-케이스 호환성")
     
     try:
         update_mb_case_compatibility()
     except Exception as e:
         logging.error(f"메인보드-케이스 호환성 업데이트 중 오류: {e}")
+        failed.append("메인보드-케이스 호환성")
     
     try:
         update_mb_memory_compatibility()
     except Exception as e:
         logging.error(f"메인보드-메모리 호환성 업데이트 중 오류: {e}")
+        failed.append("메인보드-메모리 호환성")
     
     try:
         update_gpu_case_compatibility()
     except Exception as e:
         logging.error(f"GPU-케이스 호환성 업데이트 중 오류: {e}")
+        failed.append("GPU-케이스 호환성")
     
     try:
         update_psu_case_compatibility()
     except Exception as e:
         logging.error(f"PSU-케이스 호환성 업데이트 중 오류: {e}")
+        failed.append("PSU-케이스 호환성")
+    
+    try:
+        update_gpu_psu_compatibility()
+    except Exception as e:
+        logging.error(f"GPU-PSU 호환성 업데이트 중 오류: {e}")
+        failed.append("GPU-PSU 호환성")
+    
+    try:
+        update_system_compatibility()
+    except Exception as e:
+        logging.error(f"시스템 호환성 업데이트 중 오류: {e}")
+        failed.append("시스템 호환성")
     
     # 마지막 업데이트 시간 저장
     save_last_update_time()
     
     logging.info("호환성 테이블 업데이트 완료")
+    return failed
 
 if __name__ == "__main__":
     try:
-        update_all_compatibility_tables()
+        failed = update_all_compatibility_tables()
         conn.close()
     except Exception as e:
         logging.error(f"호환성 테이블 업데이트 중 오류 발생: {e}")
-        conn.close()
\ No newline at end of file
+        conn.close()
+        sys.exit(1)
+    # 일부 테이블이 실패하면 0이 아닌 종료 코드 (catalog_refresh 는 이 경우 교체하지 않음)
+    if failed:
+        logging.error(f"업데이트 실패: {', '.join(failed)}")
+        sys.exit(1)
\ No newline at end of file
@@ -6,12 +6,17 @@ from langchain.agents import AgentExecutor, create_react_agent
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, List, Dict, Any, Optional
 import json
-import duckdb
 import pandas as pd
 import re
 import os
 import logging
 from datetime import datetime
+from sql_templates import QUERY_TEMPLATES, render_query, search_table
+from model_resolver import PART_ID_COLUMNS, get_resolver
+from entity_extractor import EXTRACTOR_MIN_CONFIDENCE, get_extractor
+from query_executor import execute_parallel, fetch_df
+from sql_preflight import TABLE_SYNONYMS
+from schema_cache import get_metadata, table_columns, schema_text
 
 # Ollama 모델 초기화 - 온도 추가
 llm = OllamaLLM(
@@ -31,74 +36,23 @@ class PCCompatibilityState(TypedDict):
     errors: List[str]
     final_result: Optional[Dict[str, Any]]
 
-# 데이터베이스 샘플 가져오기
+# 데이터베이스 샘플/스키마 정보 (schema_cache: 카탈로그 버전별로 한 번만 읽고, 카탈로그 갱신 후 자동으로 다시 읽음)
 def get_db_samples():
-    samples = {}
     try:
-        # 함수 내에서 연결 생성
-        with duckdb.connect(DB_PATH, read_only=True) as conn:
-            # CPU 샘플
-            samples['cpu'] = conn.execute("SELECT model_name FROM cpu LIMIT 5").fetchall()
-            # GPU 샘플
-            samples['gpu'] = conn.execute("SELECT model_name FROM gpu LIMIT 5").fetchall()
-            # 마더보드 샘플
-            samples['motherboard'] = conn.execute("SELECT model_name FROM motherboard LIMIT 5").fetchall()
-            
-            # 리스트로 변환
-            for key in samples:
-                samples[key] = [item[0] for item in samples[key]]
+        return get_metadata(DB_PATH)['samples']
     except Exception as e:
         print(f"Error getting samples: {str(e)}")
-    
-    return samples
-
-# 데이터베이스 샘플 가져오기
-db_samples = get_db_samples()
+        return {}
 
-# 데이터베이스 스키마 정보 가져오기
 def get_db_schema():
-    schema_info = {}
-    
-    # 함수 내에서 연결 생성
-    with duckdb.connect(DB_PATH, read_only=True) as conn:
-        tables = conn.execute("SHOW TABLES").fetchall()
-        
-        for table in tables:
-            table_name = table[0]
-            columns = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-            schema_info[table_name] = [col[1] for col in columns]
-    
-    return schema_info
+    return table_columns(DB_PATH)
 
-# 스키마 정보 가져오기
-db_schema = get_db_schema()
+# 테이블 이름 매핑 (sql_preflight.TABLE_SYNONYMS, 사전 검사와 같은 매핑)
+table_mapping = TABLE_SYNONYMS
 
-# 테이블 이름 매핑 확장
-table_mapping = {
-    "cpu_support": "cpu_mb_compatibility",
-    "motherboard_compatibility": "cpu_mb_compatibility",
-    "cpu_motherboard": "cpu_mb_compatibility",
-    "mb": "motherboard",
-    "mainboard": "motherboard",
-    "case": "case_chassis",
-    "case_product": "case_chassis",
-    "cooler": "cpu_cooler",
-    "psu": "power_supply",
-    "ram": "memory",
-    "gpu_compatibility": "gpu_case_compatibility",
-    "cpu_compatibility": "cpu_mb_compatibility",
-    "gpu_mb_compatibility": "mb_gpu_compatibility",
-    "memory_mb_compatibility": "mb_memory_compatibility",
-    "cpu_cooler_compatibility": "cpu_cooler_compatibility",
-    "psu_compatibility": "psu_case_compatibility",
-    "storage_compatibility": "mb_storage_compatibility"
-}
-
-# 스키마 정보를 문자열로 변환
-schema_str = "Database Schema:\n"
-for table, columns in db_schema.items():
-    schema_str += f"Table: {table}\n"
-    schema_str += f"Columns: {', '.join(columns)}\n\n"
+# 스키마 정보 문자열 (프롬프트용, 미리 만들어 둔 블록)
+def get_schema_str():
+    return schema_text(DB_PATH)
 
 # LLM 호출 로깅 함수 추가
 def log_llm_call(prompt, response, prompt_name=""):
@@ -157,6 +111,15 @@ def analyze_question(state: PCCompatibilityState) -> PCCompatibilityState:
     # 상태 로깅 (함수 시작)
     log_state(state, "analyze_question_start")
     
+    # 가제티어로 먼저 추출하고, 확신도가 높으면 LLM 호출 생략
+    extracted = get_extractor(DB_PATH).extract(question)
+    logger.info(f"가제티어 추출: {extracted['search_keywords']} {extracted['part_types']} (확신도 {extracted['confidence']})")
+    if extracted["confidence"] >= EXTRACTOR_MIN_CONFIDENCE:
+        state["search_keywords"] = extracted["search_keywords"]
+        state["part_types"] = extracted["part_types"]
+        log_state(state, "analyze_question_end")
+        return state
+    
     # 모델 키워드 추출 프롬프트
     extract_prompt = """
     You are an expert in PC hardware compatibility analysis. Extract key information from the user's question.
@@ -365,138 +328,31 @@ def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     # SQL 쿼리 생성
     queries = {}
     
-    # 테이블과 쿼리 매핑을 명확히 정의
-    query_templates = {
-        # GPU와 케이스 호환성 (수정됨)
-        "gpu_case": """
-            WITH RankedCases AS (
-                SELECT 
-                    g.model_name AS gpu_model, 
-                    g.length AS gpu_length, 
-                    c.model_name AS case_model,
-                    c.vga_length AS available_gpu_length,
-                    g.manufacturer AS gpu_manufacturer,
-                    c.manufacturer AS case_manufacturer,
-                    (c.vga_length - g.length) AS space_difference,
-                    ROW_NUMBER() OVER (PARTITION BY g.model_name ORDER BY (c.vga_length - g.length)) AS rank
-                FROM 
-                    gpu g, case_chassis c
-                WHERE 
-                    g.model_name LIKE '%{pattern}%' 
-                    AND g.length <= c.vga_length
-            )
-            SELECT 
-                gpu_model, 
-                gpu_length, 
-                case_model,
-                available_gpu_length,
-                gpu_manufacturer,
-                case_manufacturer,
-                space_difference
-            FROM 
-                RankedCases
-            WHERE 
-                rank = 1
-            ORDER BY 
-                CASE WHEN gpu_model LIKE '%Ti%' THEN 1 ELSE 0 END,
-                gpu_model
-            LIMIT 10
-        """,
-        
-        # GPU와 전원 호환성 (수정됨)
-        "gpu_psu": """
-            SELECT 
-                g.model_name AS gpu_model, 
-                g.power_consumption AS gpu_power,
-                p.model_name AS psu_model,
-                p.wattage AS psu_wattage,
-                g.manufacturer AS gpu_manufacturer,
-                p.manufacturer AS psu_manufacturer
-            FROM 
-                gpu g, power_supply p
-            WHERE 
-                g.model_name LIKE '{pattern}' 
-                AND g.power_consumption <= (p.wattage * 0.7)
-            LIMIT 10
-        """,
-        
-        # CPU와 메인보드 호환성 (수정됨)
-        "cpu_motherboard": """
-            SELECT 
-                c.model_name AS cpu_model, 
-                c.socket_type AS cpu_socket, 
-                m.model_name AS motherboard_model,
-                m.socket_type AS mb_socket,
-                c.manufacturer AS cpu_manufacturer,
-                m.manufacturer AS mb_manufacturer
-            FROM 
-                cpu c, motherboard m
-            WHERE 
-                (c.model_name LIKE '{pattern}' OR c.socket_type = '{pattern}')
-                AND c.socket_type = m.socket_type
-            LIMIT 10
-        """,
-        
-        # 메인보드와 케이스 호환성 (수정됨)
-        "motherboard_case": """
-            SELECT 
-                m.model_name AS motherboard_model, 
-                m.form_factor AS mb_form_factor, 
-                c.model_name AS case_model,
-                c.supported_mb_types AS case_supported_mb_types,
-                m.manufacturer AS mb_manufacturer,
-                c.manufacturer AS case_manufacturer
-            FROM 
-                motherboard m, case_chassis c
-            WHERE 
-                m.model_name LIKE '{pattern}'
-                AND (
-                    (m.form_factor = 'ATX' AND c.supported_mb_types LIKE '%ATX%') OR
-                    (m.form_factor = 'mATX' AND c.supported_mb_types LIKE '%mATX%') OR
-                    (m.form_factor = 'ITX' AND c.supported_mb_types LIKE '%ITX%')
-                )
-            LIMIT 10
-        """,
-        
-        # 기본 쿼리 템플릿 (변경 없음)
-        "default": """
-            SELECT * FROM {table_name} 
-            WHERE model_name LIKE '{pattern}'
-            LIMIT 10
-        """
-    }
+    # 모델명 해석기 (검색 키워드 -> 부품 ID, 한글/영문 표기 차이 흡수)
+    resolver = get_resolver(DB_PATH)
 
-    
     # 각 관계에 대한 쿼리 생성
     for relation in relations:
-        # 각 검색 패턴에 대해 시도
-        query = None
-        for pattern in search_patterns:
-            # 쿼리 템플릿 선택
-            if relation in query_templates:
-                query = query_templates[relation].format(pattern=pattern)
-            else:
-                # 관계에 해당하는 테이블 찾기
-                table_name = relation
-                # 매핑된 테이블 이름 확인
-                if table_name in table_mapping:
-                    table_name = table_mapping[table_name]
-                
-                # 테이블이 존재하는지 확인
-                if table_name in db_schema:
-                    query = query_templates["default"].format(
-                        table_name=table_name,
-                        pattern=pattern
-                    )
-                else:
-                    # 테이블이 없으면 다음 패턴으로 넘어감
-                    continue
-            
-            # 쿼리가 생성되었으면 저장하고 루프 종료
-            if query:
-                queries[relation] = query
-                logger.debug(f"생성된 SQL 쿼리 ({relation}): \n{query}")
-                break
+        table_name = None
+        if relation not in QUERY_TEMPLATES:
+            # 관계에 해당하는 테이블 찾기 (매핑된 테이블 이름 확인)
+            table_name = table_mapping.get(relation, relation)
+            # 테이블이 없으면 건너뜀
+            if table_name not in get_db_schema():
+                continue
+
+        # 검색 부품 ID를 먼저 해석하고, 찾으면 ID로 조회
+        part_table = search_table(relation, table_name)
+        ids = resolver.resolve_ids(keyword, part_table) if part_table in PART_ID_COLUMNS else []
+        if ids:
+            query = render_query(relation, ids=ids, table_name=table_name)
+            logger.info(f"모델명 해석 ({relation}): '{keyword}' -> {part_table} ID {ids}")
+        else:
+            # 해석하지 못하면 모델명 패턴 검색 (첫 번째 패턴)
+            query = render_query(relation, pattern=search_patterns[0], table_name=table_name)
+
+        queries[relation] = query
+        logger.debug(f"생성된 SQL 쿼리 ({relation}): \n{query}")
     
     logger.info(f"생성된 쿼리 관계: {list(queries.keys())}")
     
@@ -576,34 +432,29 @@ def execute_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     # 결과가 충분한지 확인하는 임계값
     SUFFICIENT_RESULTS = 5
     
-    # 데이터베이스 연결
+    # 관계별 쿼리는 서로 독립적이므로 동시에 실행 (스레드마다 읽기 전용 풀 커서, 결과는 관계 순서대로, 같은 쿼리는 결과 캐시)
     try:
-        with duckdb.connect(database=DB_PATH, read_only=True) as conn:
-            for relation, query in queries.items():
-                try:
-                    logger.debug(f"===== 쿼리 실행 ({relation}) =====")
-                    logger.debug(f"SQL:\n{query}")
-                    
-                    # 쿼리 실행
-                    df = conn.execute(query).fetchdf()
-                    
-                    # 결과 변환
-                    if not df.empty:
-                        records = df.to_dict('records')
-                        results[relation] = records
-                        logger.debug(f"쿼리 결과 ({relation}): {len(records)} 개 레코드")
-                        
-                        # 처음 몇 개 결과 샘플 로깅
-                        for i, record in enumerate(records[:3]):
-                            logger.debug(f"  결과 {i+1}: {record}")
-                    else:
-                        logger.debug(f"쿼리 결과 ({relation}): 결과 없음")
-                        
-                except Exception as e:
-                    error_msg = f"Error executing query for {relation}: {str(e)}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-                    logger.exception(f"쿼리 실행 중 예외 발생 ({relation})")
+        outcomes = execute_parallel(queries, DB_PATH, fetch=fetch_df, cache=True)
+        for relation, (df, error) in outcomes.items():
+            logger.debug(f"===== 쿼리 실행 ({relation}) =====")
+            logger.debug(f"SQL:\n{queries[relation]}")
+            if error is not None:
+                error_msg = f"Error executing query for {relation}: {str(error)}"
+                errors.append(error_msg)
+                logger.error(error_msg)
+                continue
+            
+            # 결과 변환
+            if not df.empty:
+                records = df.to_dict('records')
+                results[relation] = records
+                logger.debug(f"쿼리 결과 ({relation}): {len(records)} 개 레코드")
+                
+                # 처음 몇 개 결과 샘플 로깅
+                for i, record in enumerate(records[:3]):
+                    logger.debug(f"  결과 {i+1}: {record}")
+            else:
+                logger.debug(f"쿼리 결과 ({relation}): 결과 없음")
     except Exception as e:
         error_msg = f"데이터베이스 연결 오류: {str(e)}"
         errors.append(error_msg)
@@ -1,10 +1,17 @@
+import os
 import sys
 sys.path.append('/home/wlsdud022/AgentFactory/cs_agent/ProtoType_JYK')
+sys.path.append('/home/wlsdud022/AgentFactory/cs_agent')
 from cs_agent.ProtoType_JYK.old.pc_check_graph import run_pc_check
+from cs_agent.ProtoType_JYK.pc_check_func import DB_PATH
 from web_search_langraph import run_web_search
 from orchestrator_agent import orchestrator_agent, sumary_answer_agent
 from typing import TypedDict, List, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
+from answer_cache import AnswerCache
+
+# 질문 -> 최종 답변 캐시 (라우팅/요약 프롬프트 파일이 바뀌면 비움)
+answer_cache = AnswerCache(DB_PATH, [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'orchestrator_agent.py')])
 
 # web agent 선택 질의
 test = orchestrator_agent("배틀그라운드 권장사양을 알고싶어. 난 CPU는 5600x 사용하고 있고 GPU는 RTX 3080사용하고 있는데 잘 돌아갈지 궁금하거든")
@@ -148,6 +155,11 @@ def orchestrator_graph(user_query: str) -> str:
     print(f"시작: 오케스트레이터 그래프 (질문: {user_query})")
     print(f"{'*'*60}")
     
+    cached = answer_cache.lookup(user_query)
+    if cached is not None:
+        print(f"답변 캐시 적중 (유사도 {cached['similarity']:.3f}, 이전 질문: {cached['question']})")
+        return cached['answer']
+    
     # 초기 상태 설정
     state: OrchestratorState = {
         "user_query": user_query,
@@ -217,6 +229,7 @@ def orchestrator_graph(user_query: str) -> str:
         print(f"\n{'*'*60}")
         print(f"완료: 오케스트레이터 그래프")
         print(f"{'*'*60}")
+        answer_cache.store(user_query, final_state["final_answer"])
         return final_state["final_answer"]
     except Exception as e:
         print(f"\n{'*'*60}")
@@ -1,15 +1,19 @@
+import os
 import sys
 import time
 import json
 import logging
 from datetime import datetime
 sys.path.append('/home/wlsdud022/AgentFactory/cs_agent/ProtoType_JYK')
+sys.path.append('/home/wlsdud022/AgentFactory/cs_agent')
 from cs_agent.ProtoType_JYK.pc_check_graph import run_pc_check
+from cs_agent.ProtoType_JYK.pc_check_func import DB_PATH
 from scenario_agents import jeplmall_infor_agent, recomended_AIPC_agent
 from web_search_langraph import run_web_search
 from orchestrator_agent import orchestrator_agent, web_search_based_pc_check, sumary_answer_agent
 from typing import TypedDict, List, Dict, Any, Optional, Union
 from langgraph.graph import StateGraph, END
+from answer_cache import AnswerCache
 
 # 로깅 설정
 logging.basicConfig(
@@ -19,6 +23,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger("orchestrator")
 
+# 질문 -> 최종 답변 캐시 (제플몰 안내/라우팅 프롬프트 파일이 바뀌면 비움)
+POLICY_FILES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    for name in ('scenario_agents.py', 'orchestrator_agent.py')
+]
+answer_cache = AnswerCache(DB_PATH, POLICY_FILES)
+
 # 오케스트레이터 그래프 상태 정의 
 class OrchestratorState(TypedDict):
     user_query: str                           # 사용자 원본 질의
@@ -431,6 +442,15 @@ def orchestrator_graph(user_query: str, chat_history: Optional[List[Dict[str, st
         print(f"대화 기록: {len(chat_history)}개 메시지 있음")
     print(f"{'*'*60}")
     
+    # 대화 기록에 기대는 후속 질문은 답변 캐시를 쓰지 않음
+    use_answer_cache = not chat_history
+    if use_answer_cache:
+        cached = answer_cache.lookup(user_query)
+        if cached is not None:
+            print(f"답변 캐시 적중 (유사도 {cached['similarity']:.3f}, 이전 질문: {cached['question']})")
+            logger.info(f"질의 처리 완료 (답변 캐시): {user_query}")
+            return cached['answer']
+    
     # 초기 상태 설정 (기존 코드와 동일하게 유지)
     state: OrchestratorState = {
         "user_query": user_query,
@@ -570,6 +590,9 @@ def orchestrator_graph(user_query: str, chat_history: Optional[List[Dict[str, st
         print(f"{'*'*60}")
         
         logger.info(f"질의 처리 완료: {user_query} (소요 시간: {total_time:.2f}초)")
+        if use_answer_cache and not final_state["errors"]:
+            answer_cache.store(user_query, final_state["final_answer"])
+        print(f"답변 캐시: {answer_cache.format_stats()}")
         return final_state["final_answer"]
     except Exception as e:
         print(f"\n{'*'*60}")
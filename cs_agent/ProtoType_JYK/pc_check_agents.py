@@ -114,6 +114,9 @@ def query_optimize_agent(user_query, table_info):
     
     # 유효한 테이블의 컬럼 정보 가져오기
     table_columns = get_db_samples(valid_tables)
+
+    # 질문의 모델명을 부품 ID로 먼저 해석
+    resolved_parts = resolve_part_mentions(user_query, valid_tables)
     
     query_optimize_prompt = PromptTemplate.from_template("""
     You are an SQL query expert. Write a query to resolve the user's question using available database tables.
@@ -122,7 +125,7 @@ def query_optimize_agent(user_query, table_info):
     1. Start with simple queries for each product type instead of complex joins.
     2. Only use tables and columns that actually exist in the database (shown below).
     3. For RAM queries, use the 'capacity' column to filter by GB size (e.g., WHERE capacity >= 16 for 16GB or more).
-    4. For partial name matches, use LIKE with wildcards (e.g., '%5600%' not '5600').
+    4. If a product is listed in Resolved parts below, filter it by its ID condition (e.g., WHERE cpu_id IN (12, 15)) instead of LIKE on model_name. Otherwise, for partial name matches, use LIKE with wildcards (e.g., '%5600%' not '5600').
     5. Avoid complex join structures until you've verified basic queries work.
     6. Limit each query result to 5 items unless specified otherwise.
     7. Don't try to join tables that don't have clear relationships.
@@ -134,6 +137,9 @@ def query_optimize_agent(user_query, table_info):
     ```
     
     Valid tables for this query: {valid_tables}
+
+    Resolved parts (product names in the user query matched to IDs):
+    {resolved_parts}
     
     Your response must be a JSON object with these keys:
         reason:
@@ -156,10 +162,13 @@ def query_optimize_agent(user_query, table_info):
         "user_query": user_query, 
         "user_meaning": table_info["user_meaning"], 
         "table_columns": table_columns,
-        "valid_tables": valid_tables
+        "valid_tables": valid_tables,
+        "resolved_parts": format_resolved_parts(resolved_parts)
     })
     
-    fixed_query = fix_union_query(query_info['query'])
+    # EXPLAIN 사전 검사로 고친 쿼리를 이후 수정 라운드의 previous_query 로 사용
+    fixed_query = preflight_query(query_info['query'])
+    query_info['query'] = fixed_query
     result = sql(fixed_query)
     return query_info, result
 
@@ -187,6 +196,9 @@ def query_modify_agent(user_query, table_info, query_info, result, attempt_histo
     # 유효한 테이블의 컬럼 정보 가져오기
     table_columns = get_db_samples(valid_tables)
 
+    # 질문의 모델명을 부품 ID로 먼저 해석
+    resolved_parts = resolve_part_mentions(user_query, valid_tables)
+
     query_modify_prompt = PromptTemplate.from_template("""
     You are an SQL query writing and optimization expert.
 
@@ -196,7 +208,7 @@ def query_modify_agent(user_query, table_info, query_info, result, attempt_histo
     1. Start with basic SELECT statements without complex joins
     2. Only use tables and columns that actually exist in the database
     3. For each component category, create a separate simple query
-    4. Use LIKE with wildcards for flexible matching (e.g., '%3060%' not '3060')
+    4. Filter products listed in Resolved parts by their ID condition; otherwise use LIKE with wildcards for flexible matching (e.g., '%3060%' not '3060')
     5. For RAM queries, use the 'capacity' column to filter by GB size (e.g., WHERE capacity >= 16 for 16GB or more)
     6. For RAM compatibility with motherboards, check the memory_standard or memory_type columns
     7. Create separate queries for each component type (e.g., one for motherboards, one for cases)
@@ -210,6 +222,9 @@ def query_modify_agent(user_query, table_info, query_info, result, attempt_histo
     
     Valid tables for this query: {valid_tables}
 
+    Resolved parts (product names in the user query matched to IDs):
+    {resolved_parts}
+
     Your response must be a JSON object with two keys:
         reason:
             - Explain why the query is not working and how to fix it.
@@ -241,7 +256,8 @@ def query_modify_agent(user_query, table_info, query_info, result, attempt_histo
         "problem": problem,
         "attempt_history": attempt_history,
         "table_columns": table_columns,
-        "valid_tables": valid_tables
+        "valid_tables": valid_tables,
+        "resolved_parts": format_resolved_parts(resolved_parts)
     })
     results = multiple_sql(query_modify_info['queries'])
     return query_modify_info, results
@@ -1,61 +1,60 @@
+import sys
 import json
-import duckdb
 import re
+sys.path.append('/home/wlsdud022/AgentFactory/cs_agent')
+from build_solver import get_solver_data, solve_builds, format_builds
+from model_resolver import PART_ID_COLUMNS, get_resolver, id_filter
+from db_pool import pooled_cursor
+from schema_cache import table_names, table_columns, cached_json
+from query_executor import execute_parallel, fetch_rows
+from result_cache import cached_fetch
+from sql_preflight import preflight, fix_union_query
 
 DB_PATH = '/home/wlsdud022/AgentFactory/cs_agent/db/pc_parts.db'
 
 # DB 스키마 정보 가져오기
+# (테이블/컬럼 목록은 카탈로그 버전별로 캐시한 schema_cache 메타데이터, DB 연결은 db_pool 의 읽기 전용 커서)
 def get_db_table():
-    conn = duckdb.connect(DB_PATH)
-    tables = conn.execute("SHOW TABLES").fetchall()
-    conn.close()
-    return tables
+    return [(table,) for table in table_names(DB_PATH)]
 
 def get_db_samples(tables):
-    conn = duckdb.connect(DB_PATH)
-    table_columns = {}
-    for table in tables:
-        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
-        table_columns[table] = [col[1] for col in columns]
-    conn.close()
-    return table_columns
+    return table_columns(DB_PATH, tables)
+
+# 실행 전에 EXPLAIN 사전 검사로 흔한 오류(컬럼/테이블 이름, LIMIT ... UNION ALL)를 고쳐 LLM 수정 라운드를 줄임
+def preflight_query(query):
+    with pooled_cursor(DB_PATH) as conn:
+        return preflight(conn, query, DB_PATH)['sql']
 
 def sql(query):
-    conn = duckdb.connect(DB_PATH)
-    fixed_query = fix_union_query(query)
-    try:
-        result = conn.sql(fixed_query).fetchall()
-        conn.close()
-        return result
-    except Exception as e:
-        print(f"Error executing query: {e}")
-        # print(f"Query: {query}")
-        conn.close()
-        return [e]
+    fixed_query = preflight_query(query)
+    with pooled_cursor(DB_PATH) as conn:
+        try:
+            return cached_fetch(conn, fixed_query, fetch_rows, DB_PATH)
+        except Exception as e:
+            print(f"Error executing query: {e}")
+            # print(f"Query: {query}")
+            return [e]
 
+# 서로 독립적인 쿼리이므로 query_executor 로 동시에 실행하고 입력 순서대로 결과를 합침 (같은 쿼리 결과는 result_cache)
 def multiple_sql(queries):
-    conn = duckdb.connect(DB_PATH)
     all_results = []
-    for query_item in queries:
+    outcomes = execute_parallel({index: preflight_query(query_item['sql']) for index, query_item in enumerate(queries)}, DB_PATH, cache=True)
+    for index, query_item in enumerate(queries):
         query_type = query_item['type']
-        query_sql = query_item['sql']
-        try:
-            query_results = conn.sql(query_sql).fetchall()
+        query_results, error = outcomes[index]
+        if error is None:
             all_results.extend(query_results)
             print(f"Successfully executed {query_type} query, found {len(query_results)} results")
-        except Exception as e:
-            print(f"Error executing {query_type} query: {e}")
-            # print(f"Query: {query_sql}")
-            all_results.extend([e])
-    conn.close()
+        else:
+            print(f"Error executing {query_type} query: {error}")
+            # print(f"Query: {query_item['sql']}")
+            all_results.extend([error])
     return all_results
 
 def load_db_description():
     db_desc_path = '/home/wlsdud022/AgentFactory/cs_agent/ProtoType_JYK/db_desc.json'
     try:
-        with open(db_desc_path, 'r', encoding='utf-8') as f:
-            db_description = json.load(f)
-        return db_description
+        return cached_json(db_desc_path)
     except FileNotFoundError:
         print(f"경고: {db_desc_path} 파일을 찾을 수 없습니다.")
         return {}
@@ -63,8 +62,40 @@ def load_db_description():
         print(f"경고: {db_desc_path} 파일의 JSON 형식이 올바르지 않습니다.")
         return {}
     
-def fix_union_query(query):
-    pattern = r'(.*)\s+LIMIT\s+\d+\s+UNION ALL\s+(.*)'
-    replacement = r'\1 UNION ALL \2'
-    fixed_query = re.sub(pattern, replacement, query, flags=re.IGNORECASE)
-    return fixed_query
+# 질문에서 견적 요구사항 추출 (예: "VRAM 16GB 이상", "8코어 이상")
+def parse_build_requirements(user_query):
+    requirements = {}
+    vram = re.search(r'(?:VRAM|그래픽\s*메모리|비디오\s*메모리)\D{0,10}(\d+)\s*GB|(\d+)\s*GB\s*(?:VRAM|그래픽\s*메모리)', user_query, re.IGNORECASE)
+    if vram:
+        requirements['min_vram'] = int(vram.group(1) or vram.group(2))
+    cores = re.search(r'(\d+)\s*(?:코어|cores?)', user_query, re.IGNORECASE)
+    if cores:
+        requirements['min_cores'] = int(cores.group(1))
+    return requirements
+
+# 호환성 테이블 기반 완성형 견적 (LLM 조인 쿼리 생성 없이 솔버로 계산)
+# 부품/비트셋 데이터는 카탈로그 버전별로 캐시하므로 요청마다 탐색만 합니다. DB를 열 수 없으면 빈 목록.
+def recommend_builds(top_k=3, budget=None, requirements=None, fixed_parts=None):
+    try:
+        return solve_builds(data=get_solver_data(DB_PATH), top_k=top_k, budget=budget, requirements=requirements, fixed_parts=fixed_parts)
+    except Exception as e:
+        print(f"Error solving builds: {e}")
+        return []
+
+# 질문에 나온 모델명을 부품 ID로 해석 (LIKE 전체 검색 대신 ID로 조회하도록)
+def resolve_part_mentions(user_query, tables=None):
+    tables = [table for table in (tables or PART_ID_COLUMNS) if table in PART_ID_COLUMNS]
+    try:
+        return get_resolver(DB_PATH).resolve_mentions(user_query, tables)
+    except Exception as e:
+        print(f"Error resolving part names: {e}")
+        return {}
+
+def format_resolved_parts(resolved):
+    if not resolved:
+        return "None"
+    lines = []
+    for table, hits in resolved.items():
+        names = ', '.join(f"{hit['id']}: {hit['model_name']}" for hit in hits)
+        lines.append(f"- {table}: {id_filter(table, [hit['id'] for hit in hits])}  ({names})")
+    return '\n'.join(lines)
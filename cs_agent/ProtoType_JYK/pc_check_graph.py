@@ -2,6 +2,7 @@ import sys
 import json
 sys.path.append('/home/wlsdud022/AgentFactory/cs_agent/ProtoType_JYK')
 from cs_agent.ProtoType_JYK.pc_check_agents import *
+from sql_preflight import format_preflight_stats
 from typing import TypedDict, List, Dict, Any, Optional
 from langgraph.graph import StateGraph, END
 
@@ -221,6 +222,7 @@ def pc_check_graph(user_query: str) -> AgentState:
         final_state = app.invoke(state)
         print(f"\n{'*'*60}")
         print(f"완료: PC 체크 그래프")
+        print(f"SQL 사전 검사: {format_preflight_stats()}")
         print(f"{'*'*60}")
         return final_state
     except Exception as e:
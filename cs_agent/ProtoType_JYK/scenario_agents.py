@@ -1,5 +1,6 @@
 from langchain_ollama import OllamaLLM
 from langchain_core.prompts import PromptTemplate
+from cs_agent.ProtoType_JYK.pc_check_func import recommend_builds, parse_build_requirements, format_builds
 
 llm = OllamaLLM(model="qwq:latest", base_url="http://192.168.110.102:11434", temperature=0.3)
 
@@ -236,13 +237,22 @@ def recomended_AIPC_agent(user_query):
     - Conclude with a phrase such as: "제플몰에 있는 AI PC를 구매해보시는 건 어떠신가요? 자세한 사항은 아래 링크를 참고해 주세요." and provide the following link:
     https://www.jchyunplace.co.kr/shop/event.html?ev_no=138
 
+    ────────────────────────────────────────────────────────
+    7. Compatible Builds From Our Parts Database
+    ────────────────────────────────────────────────────────
+    - The following builds were verified part-by-part against the compatibility tables. When suggesting alternative configurations, prefer these parts over guessing.
+    {db_builds}
+
     Follow these guidelines to advise and recommend AI PC configurations that meet the customer's needs while subtly promoting the Zepl Private LLM AI PC – RTX 5090 product.
     
     user_query: {user_query}
     """)
 
+    # 질문의 요구사항(VRAM, 코어 수)으로 호환 조합을 미리 계산해 프롬프트에 제공
+    db_builds = format_builds(recommend_builds(top_k=3, requirements=parse_build_requirements(user_query)))
+
     chain = prompt | llm
-    result = chain.invoke({"user_query": user_query})
+    result = chain.invoke({"user_query": user_query, "db_builds": db_builds})
     
     # 응답에서 <think> 태그나 'think' 문자열이 포함된 부분 제거
     if "<think>" in result and "</think>" in result:
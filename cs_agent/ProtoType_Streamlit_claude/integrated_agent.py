@@ -10,12 +10,17 @@ import logging
 from datetime import datetime
 import time
 import traceback
+import os
+import sys
+
+sys.path.append('/home/wlsdud022/AgentFactory/cs_agent')
 
 # 기존 에이전트 임포트
 from agents import AgentSystem
-from pc_check_agent import process_pc_compatibility_query
+from pc_check_agent import DB_PATH, process_pc_compatibility_query
 import config
 from utils import search_cache
+from answer_cache import AnswerCache
 
 # 로깅 설정
 from logging_config import get_logger
@@ -23,6 +28,12 @@ from logging_config import get_logger
 # 모듈별 로거 가져오기
 logger = get_logger("IntegratedAgent")
 
+# 질문 -> 최종 답변 캐시 (카탈로그 DB 나 답변 프롬프트 파일이 바뀌면 비움)
+answer_cache = AnswerCache(
+    DB_PATH,
+    [os.path.join(os.path.dirname(os.path.abspath(__file__)), name) for name in ('integrated_agent.py', 'agents.py')]
+)
+
 # 상태 정의
 class IntegratedAgentState(TypedDict):
     question: str
@@ -539,6 +550,19 @@ class IntegratedAgentGraph:
         """워크플로우 실행 - 상태 초기화 개선"""
         logger.info(f"워크플로우 실행: {question}")
         
+        # 대화 기록에 기대는 후속 질문은 답변 캐시를 쓰지 않음
+        use_answer_cache = not chat_history
+        if use_answer_cache:
+            cached = answer_cache.lookup(question)
+            if cached is not None:
+                logger.info(f"답변 캐시 사용 (유사도 {cached['similarity']:.3f}, 이전 질문: {cached['question']})")
+                return {
+                    "answer": cached["answer"],
+                    "query_type": cached["metadata"].get("query_type", "unknown"),
+                    "collected_information": [],
+                    "errors": []
+                }
+        
         # 초기 상태 설정 - 모든 필수 키를 미리 정의하여 누락 방지
         inputs = {
             "question": question,
@@ -562,6 +586,10 @@ class IntegratedAgentGraph:
         else:
             logger.warning("워크플로우 완료 - 답변 없음")
         
+        if use_answer_cache and result["final_answer"] and not result.get("errors"):
+            answer_cache.store(question, result["final_answer"], {"query_type": result.get("query_type", "unknown")})
+        logger.info(f"답변 캐시: {answer_cache.format_stats()}")
+        
         # 최종 결과 반환
         return {
             "answer": result.get("final_answer", "답변을 생성할 수 없습니다."),
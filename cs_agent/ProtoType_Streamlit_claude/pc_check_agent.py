@@ -6,7 +6,6 @@ from langchain.agents import AgentExecutor, create_react_agent
 from langgraph.graph import StateGraph, END
 from typing import TypedDict, List, Dict, Any, Optional
 import json
-import duckdb
 import pandas as pd
 import re
 import os
@@ -14,6 +13,15 @@ from logging_config import get_logger
 import time
 from datetime import datetime
 from langchain_core.pydantic_v1 import BaseModel, Field
+import sys
+sys.path.append('/home/wlsdud022/AgentFactory/cs_agent')
+from model_resolver import PART_ID_COLUMNS, get_resolver, id_filter
+from entity_extractor import EXTRACTOR_MIN_CONFIDENCE, get_extractor
+from db_pool import get_pool, pooled_cursor
+from schema_cache import get_metadata, table_names, table_columns, schema_text
+from query_executor import run_parallel, fetch_records
+from result_cache import cached_fetch, format_result_cache_stats
+from sql_preflight import TABLE_SYNONYMS, preflight, format_preflight_stats
 
 # TerminalLogCapture 클래스 - 터미널 로그를 캡처하는 핵심 클래스
 class TerminalLogCapture:
@@ -62,69 +70,26 @@ class PCCompatibilityState(TypedDict):
     query_type: str  # 질문 유형
     existing_parts: Dict[str, str]  # 기존 부품 정보
 
-# 데이터베이스 샘플 가져오기
-def get_db_samples():
-    samples = {}
-        # 함수 내에서 연결 생성
-    with duckdb.connect(DB_PATH, read_only=True) as conn:
-        # CPU 샘플
-        samples['cpu'] = conn.execute("SELECT model_name FROM cpu LIMIT 5").fetchall()
-        # GPU 샘플
-        samples['gpu'] = conn.execute("SELECT model_name FROM gpu LIMIT 5").fetchall()
-        # 마더보드 샘플
-        samples['motherboard'] = conn.execute("SELECT model_name FROM motherboard LIMIT 5").fetchall()
-        
-        # 리스트로 변환
-        for key in samples:
-            samples[key] = [item[0] for item in samples[key]]
+# 테이블별 쿼리 실행 시간 제한 (초)
+TABLE_QUERY_TIMEOUT = 10
 
-# 데이터베이스 샘플 가져오기
-db_samples = get_db_samples()
+# 데이터베이스 샘플/스키마 정보 (schema_cache: 카탈로그 버전별로 한 번만 읽고, 카탈로그 갱신 후 자동으로 다시 읽음)
+def get_db_samples():
+    try:
+        return get_metadata(DB_PATH)['samples']
+    except Exception as e:
+        print(f"Error getting samples: {str(e)}")
+        return {}
 
-# 데이터베이스 스키마 정보 가져오기
 def get_db_schema():
-    schema_info = {}
-    
-    # 함수 내에서 연결 생성
-    with duckdb.connect(DB_PATH, read_only=True) as conn:
-        tables = conn.execute("SHOW TABLES").fetchall()
-        
-        for table in tables:
-            table_name = table[0]
-            columns = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-            schema_info[table_name] = [col[1] for col in columns]
-    
-    return schema_info
-
-# 스키마 정보 가져오기
-db_schema = get_db_schema()
+    return table_columns(DB_PATH)
 
-# 테이블 이름 매핑 확장
-table_mapping = {
-    "cpu_support": "cpu_mb_compatibility",
-    "motherboard_compatibility": "cpu_mb_compatibility",
-    "cpu_motherboard": "cpu_mb_compatibility",
-    "mb": "motherboard",
-    "mainboard": "motherboard",
-    "case": "case_chassis",
-    "case_product": "case_chassis",
-    "cooler": "cpu_cooler",
-    "psu": "power_supply",
-    "ram": "memory",
-    "gpu_compatibility": "gpu_case_compatibility",
-    "cpu_compatibility": "cpu_mb_compatibility",
-    "gpu_mb_compatibility": "mb_gpu_compatibility",
-    "memory_mb_compatibility": "mb_memory_compatibility",
-    "cpu_cooler_compatibility": "cpu_cooler_compatibility",
-    "psu_compatibility": "psu_case_compatibility",
-    "storage_compatibility": "mb_storage_compatibility"
-}
+# 테이블 이름 매핑 (sql_preflight.TABLE_SYNONYMS, 사전 검사와 같은 매핑)
+table_mapping = TABLE_SYNONYMS
 
-# 스키마 정보를 문자열로 변환
-schema_str = "Database Schema:\n"
-for table, columns in db_schema.items():
-    schema_str += f"Table: {table}\n"
-    schema_str += f"Columns: {', '.join(columns)}\n\n"
+# 스키마 정보 문자열 (프롬프트용, 미리 만들어 둔 블록)
+def get_schema_str():
+    return schema_text(DB_PATH)
 
 # 모듈별 로거 가져오기
 logger = get_logger("PCCheckAgent")
@@ -189,6 +154,24 @@ def analyze_question(state: PCCompatibilityState) -> PCCompatibilityState:
     start_time = time.time()
     question = state["question"]
     
+    # 부품 모델만 묻는 질문은 가제티어 추출로 끝내고 LLM 분석 생략 (게임/프로그램 요구사항 질문은 LLM이 판단)
+    extracted = extract_question_entities(question)
+    if extracted:
+        state["part_types"] = extracted["part_types"]
+        state["search_keywords"] = extracted["search_keywords"]
+        state["query_type"] = "pc_compatibility"
+        state["existing_parts"] = {
+            entity["table"]: entity["text"] for entity in extracted["entities"] if entity["kind"] == "model"
+        }
+        terminal_logger.capture(f"로그 추가: ⚡ 가제티어 추출 (확신도 {extracted['confidence']}), LLM 질문 분석 생략")
+        terminal_logger.capture(f"로그 추가: 🔎 검색 키워드: {', '.join(state['search_keywords'])}")
+        print(f"Keywords: {state['search_keywords']}")
+        print(f"Part types: {state['part_types']}")
+        print(f"Existing parts: {state['existing_parts']}")
+        print(f"Time taken: {time.time() - start_time:.2f}s")
+        print("====================== ANALYZE QUESTION END ======================")
+        return state
+    
     try:
         # LLM에 분석 요청
         result = llm.invoke(
@@ -259,6 +242,38 @@ def analyze_question(state: PCCompatibilityState) -> PCCompatibilityState:
     
     return state
 
+# LLM 판단이 필요한 질문 (게임/프로그램 사양 추천)
+LLM_ANALYSIS_WORDS = ['게임', '프로그램', '요구사항', '사양', '권장', '추천']
+
+def extract_question_entities(question):
+    """가제티어 추출 결과 (확신도가 낮거나 LLM 판단이 필요한 질문이면 None)"""
+    if any(word in question for word in LLM_ANALYSIS_WORDS):
+        return None
+    try:
+        extracted = get_extractor(DB_PATH).extract(question)
+    except Exception as e:
+        print(f"가제티어 생성 오류: {str(e)}")
+        return None
+    if extracted["confidence"] < EXTRACTOR_MIN_CONFIDENCE:
+        return None
+    return extracted
+
+# 기존 보유 부품 모델명 -> 부품 ID (모델명 해석기, 한글/영문 표기 차이 흡수)
+def resolve_existing_parts(existing_parts):
+    """{부품 테이블: 모델명} -> {부품 테이블: [부품 ID]} (해석하지 못한 부품은 제외)"""
+    resolved = {}
+    try:
+        resolver = get_resolver(DB_PATH)
+    except Exception as e:
+        print(f"모델명 색인 생성 오류: {str(e)}")
+        return resolved
+    for table, model in (existing_parts or {}).items():
+        if table in PART_ID_COLUMNS and model and model != "null":
+            ids = resolver.resolve_ids(model, table, limit=5)
+            if ids:
+                resolved[table] = ids
+    return resolved
+
 # 2. 쿼리 생성 노드
 def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     """웹 검색 결과에서 추출한 권장사양을 기반으로 SQL 쿼리 생성 - 자가 진단 및 수정 기능 포함"""
@@ -278,17 +293,12 @@ def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     try:
         # 각 테이블의 컬럼 정보 가져오기
         print("DB 스키마 확인 중...")
-        conn = duckdb.connect(DB_PATH)
         main_tables = ["cpu", "gpu", "motherboard", "memory", "power_supply", "case_chassis", "storage"]
         
-        for table in main_tables:
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table});")
-            columns = [row[1] for row in cursor.fetchall()]
-            tables_info[table] = columns
+        # 카탈로그 버전별로 캐시한 컬럼 목록 사용 (질문마다 PRAGMA table_info 를 다시 실행하지 않음)
+        tables_info = table_columns(DB_PATH, main_tables)
+        for table, columns in tables_info.items():
             print(f"테이블 {table} 컬럼: {columns}")
-        
-        conn.close()
     except Exception as e:
         error_msg = f"DB 스키마 가져오기 오류: {str(e)}"
         state["errors"].append(error_msg)
@@ -361,9 +371,16 @@ def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
         # 쿼리 생성
         queries = {}
         
+        # 기존 보유 부품은 ID로 조회 (모델명 LIKE 검색 대신)
+        resolved_ids = resolve_existing_parts(state.get("existing_parts", {}))
+        for table, ids in resolved_ids.items():
+            terminal_logger.capture(f"로그 추가: 🔗 기존 부품 해석: {table} ID {ids}")
+        
         # 각 테이블에 대한 쿼리 생성
         for table in main_tables:
-            if table in where_conditions and where_conditions[table]:
+            if table in resolved_ids:
+                queries[table] = f"SELECT * FROM {table} WHERE {id_filter(table, resolved_ids[table])} LIMIT 15"
+            elif table in where_conditions and where_conditions[table]:
                 queries[table] = f"SELECT * FROM {table} WHERE {where_conditions[table]} LIMIT 15"
             else:
                 # 테이블별 기본 쿼리
@@ -382,8 +399,8 @@ def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
                 elif table == "case_chassis":
                     queries[table] = "SELECT * FROM case_chassis LIMIT 15"
         
-        # 쿼리 저장
-        state["queries"] = queries
+        # 쿼리 저장 (LLM이 만든 조건은 EXPLAIN 사전 검사로 흔한 오류를 먼저 수정)
+        state["queries"] = preflight_queries(queries)
         
     except Exception as e:
         error_msg = f"LLM 쿼리 생성 오류: {str(e)}"
@@ -410,14 +427,34 @@ def generate_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     
     return state
 
+# 생성한 쿼리 사전 검사 (sql_preflight: EXPLAIN 으로 파싱/바인딩하고 컬럼/테이블 이름 등 흔한 오류는 규칙으로 수정)
+def preflight_queries(queries):
+    """{테이블: SQL 또는 [SQL]} -> 고친 쿼리 (고치지 못한 쿼리는 그대로 두고 실행 단계의 대안 쿼리가 처리)"""
+    checked_queries = {}
+    with pooled_cursor(DB_PATH) as cursor:
+        for table, query in queries.items():
+            query_list = query if isinstance(query, list) else [query]
+            checked = [preflight(cursor, q, DB_PATH) for q in query_list]
+            for result in checked:
+                if result['fixes']:
+                    print(f"🛠️ {table} 쿼리 자동 수정: {', '.join(result['fixes'])}")
+                elif not result['ok']:
+                    print(f"⚠️ {table} 쿼리 사전 검사 실패: {result['error']}")
+            fixed = [result['sql'] for result in checked]
+            checked_queries[table] = fixed if isinstance(query, list) else fixed[0]
+    print(f"SQL 사전 검사: {format_preflight_stats()}")
+    return checked_queries
+
 def self_diagnose_and_fix_queries(state: PCCompatibilityState, tables_info, tables_list) -> PCCompatibilityState:
     """쿼리 오류를 자가 진단하고 수정하는 함수"""
     print("====================== SELF DIAGNOSE QUERIES START ======================")
     
-    conn = None
+    # 읽기 전용 풀에서 커서를 빌려 쓰고 finally 에서 반납
+    pool = get_pool(DB_PATH)
+    checked_out = None
     try:
-        conn = duckdb.connect(DB_PATH)
-        cursor = conn.cursor()
+        checked_out = pool.checkout()
+        cursor = checked_out[0]
         
         existing_queries = state.get("queries", {})
         problematic_tables = []
@@ -511,7 +548,8 @@ def self_diagnose_and_fix_queries(state: PCCompatibilityState, tables_info, tabl
                     # 수정된 쿼리 테스트 및 적용
                     for table, query in fixed_queries.items():
                         try:
-                            # 쿼리 실행해보기
+                            # 사전 검사로 고칠 수 있는 오류는 먼저 수정한 뒤 실행해보기
+                            query = preflight(cursor, query, DB_PATH)['sql']
                             cursor.execute(query)
                             test_results = cursor.fetchall()
                             result_count = len(test_results)
@@ -564,8 +602,8 @@ def self_diagnose_and_fix_queries(state: PCCompatibilityState, tables_info, tabl
                 state["queries"][table] = f"SELECT * FROM {table} LIMIT 15"
     
     finally:
-        if conn:
-            conn.close()
+        if checked_out:
+            pool.checkin(*checked_out)
     
     print("====================== SELF DIAGNOSE QUERIES END ======================")
     return state
@@ -692,6 +730,74 @@ def optimize_search_query(state: PCCompatibilityState) -> PCCompatibilityState:
         print("====================== OPTIMIZE QUERIES ERROR ======================")
         return state
 
+# 테이블 하나의 쿼리 목록 실행 (execute_queries 에서 테이블마다 다른 스레드/커서로 동시에 호출)
+def run_table_queries(cursor, table, query):
+    """{'results': [행 dict], 'log': [출력 메시지], 'errors': [오류 메시지]}
+
+    쿼리 목록을 순서대로 실행하다 결과가 5개 이상이면 멈추고, 결과가 없으면 SELECT * ... LIMIT 15 대안 쿼리를 실행합니다.
+    같은 쿼리 결과는 result_cache 에서 꺼내 씁니다.
+    출력은 스레드끼리 섞이지 않도록 모아 두었다가 execute_queries 가 테이블 순서대로 출력합니다.
+    """
+    log = []
+    errors = []
+    
+    # 쿼리를 리스트로 변환 (최적화된 쿼리 지원)
+    query_list = query if isinstance(query, list) else [query]
+    
+    table_results = []
+    
+    # 각 쿼리 순차 실행
+    for query_index, q in enumerate(query_list, 1):
+        log.append(f"쿼리 #{query_index}: {q}")
+        
+        try:
+            # 쿼리 실행
+            q_start = time.time()
+            rows = cached_fetch(cursor, q, fetch_records, DB_PATH)
+            table_results.extend(rows)
+            
+            # 쿼리 실행 결과 기록
+            q_time = time.time() - q_start
+            log.append(f"✅ 결과 ({table}): {len(rows)}행 (실행시간: {q_time:.2f}초)")
+            
+            # 샘플 데이터 출력 (최대 3개)
+            if len(rows) > 0:
+                log.append(f"📋 샘플 데이터 ({table}, 최대 3개):")
+                for i, row_dict in enumerate(table_results[:3]):
+                    log.append(f"{i+1}. {', '.join([f'{k}: {v}' for k, v in list(row_dict.items())[:5]])}...")
+            
+            # 충분한 결과가 있으면 다음 쿼리로 넘어가기
+            if len(table_results) >= 5:
+                break
+                
+        except Exception as e:
+            error_msg = f"쿼리 실행 오류 ({table}): {str(e)}"
+            log.append(f"❌ {error_msg}")
+            errors.append(error_msg)
+    
+    # 결과가 없으면 대안 검색
+    if len(table_results) == 0:
+        log.append(f"⚠️ 테이블 {table}의 검색 결과가 없습니다. 대안 검색 시도...")
+        
+        # 대안 쿼리 생성 및 실행
+        fallback_query = f"SELECT * FROM {table} LIMIT 15"
+        try:
+            fallback_results = cached_fetch(cursor, fallback_query, fetch_records, DB_PATH)
+            
+            # 결과가 있으면 저장
+            if len(fallback_results) > 0:
+                log.append(f"✅ 대안 쿼리로 {len(fallback_results)}개 결과 찾음")
+                table_results = fallback_results
+            else:
+                log.append(f"⚠️ 대안 쿼리로도 결과를 찾을 수 없습니다.")
+        
+        except Exception as e:
+            error_msg = f"대안 쿼리 실행 오류 ({table}): {str(e)}"
+            log.append(f"❌ {error_msg}")
+            errors.append(error_msg)
+    
+    return {'results': table_results, 'log': log, 'errors': errors}
+
 # 3. SQL 쿼리 실행 노드
 def execute_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     """SQL 쿼리 실행 및 결과 처리 - 결과 없을 시 자동 대안 검색"""
@@ -704,120 +810,35 @@ def execute_queries(state: PCCompatibilityState) -> PCCompatibilityState:
     queries = state.get("queries", {})
     print(f"쿼리 목록: {list(queries.keys())}")
     
-    conn = None
+    # 쿼리 실행 결과 저장
+    results = {}
     try:
-        # DB 연결
-        print(f"DB 연결 시도: {DB_PATH}")
-        conn = duckdb.connect(DB_PATH)
-        print(f"✅ DB 연결 성공: {DB_PATH}")
-        
-        # DB 테이블 목록 확인
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [row[0] for row in cursor.fetchall()]
-        print(f"📋 DB 테이블 목록: {tables}")
-        
-        # 테이블별 스키마 확인 (디버깅용)
-        for table_name in queries.keys():
-            if table_name in tables:
-                cursor.execute(f"PRAGMA table_info({table_name});")
-                columns = [row[1] for row in cursor.fetchall()]
-                print(f"{table_name.upper()} 테이블 컬럼: {columns}")
+        # 테이블별 스키마 확인 (디버깅용, 캐시한 컬럼 목록)
+        print(f"DB: {DB_PATH}")
+        print(f"📋 DB 테이블 목록: {table_names(DB_PATH)}")
+        for table_name, columns in table_columns(DB_PATH, list(queries.keys())).items():
+            print(f"{table_name.upper()} 테이블 컬럼: {columns}")
         
-        # 쿼리 실행 결과 저장
-        results = {}
+        # 테이블별 쿼리는 서로 독립적이므로 스레드마다 풀 커서로 동시에 실행 (테이블 안의 쿼리 목록은 순서대로)
+        tasks = {
+            table: (lambda cursor, table=table, query=query: run_table_queries(cursor, table, query))
+            for table, query in queries.items()
+        }
+        outcomes = run_parallel(tasks, DB_PATH, timeout=TABLE_QUERY_TIMEOUT)
         
-        # 각 쿼리 실행
-        for table, query in queries.items():
+        # 입력 순서대로 로그 출력 및 결과 병합
+        for table, (outcome, error) in outcomes.items():
             print(f"\n===== 테이블 {table} 쿼리 실행 =====")
-            
-            # 쿼리를 리스트로 변환 (최적화된 쿼리 지원)
-            query_list = []
-            if isinstance(query, list):
-                query_list = query
-            else:
-                query_list = [query]
-            
-            table_results = []
-            query_index = 0
-            
-            # 각 쿼리 순차 실행
-            for q in query_list:
-                query_index += 1
-                print(f"쿼리 #{query_index}: {q}")
-                
-                try:
-                    # 쿼리 실행
-                    q_start = time.time()
-                    cursor.execute(q)
-                    
-                    # 결과 가져오기
-                    rows = cursor.fetchall()
-                    
-                    # 결과를 딕셔너리로 변환
-                    column_names = [column[0] for column in cursor.description]
-                    
-                    for row in rows:
-                        result_dict = {}
-                        for i, value in enumerate(row):
-                            result_dict[column_names[i]] = value
-                        table_results.append(result_dict)
-                    
-                    # 쿼리 실행 결과 기록
-                    q_time = time.time() - q_start
-                    print(f"✅ 결과 ({table}): {len(rows)}행 (실행시간: {q_time:.2f}초)")
-                    
-                    # 샘플 데이터 출력 (최대 3개)
-                    if len(rows) > 0:
-                        print(f"📋 샘플 데이터 ({table}, 최대 3개):")
-                        for i, row_dict in enumerate(table_results[:3]):
-                            print(f"{i+1}. {', '.join([f'{k}: {v}' for k, v in list(row_dict.items())[:5]])}...")
-                    
-                    # 충분한 결과가 있으면 다음 쿼리로 넘어가기
-                    if len(table_results) >= 5:
-                        break
-                        
-                except Exception as e:
-                    error_msg = f"쿼리 실행 오류 ({table}): {str(e)}"
-                    print(f"❌ {error_msg}")
-                    state["errors"].append(error_msg)
-            
-            # 결과 저장
-            results[table] = table_results
-            
-            # 결과가 없으면 대안 검색
-            if len(table_results) == 0:
-                print(f"⚠️ 테이블 {table}의 검색 결과가 없습니다. 대안 검색 시도...")
-                
-                # 대안 쿼리 생성 및 실행
-                fallback_query = f"SELECT * FROM {table} LIMIT 15"
-                try:
-                    cursor.execute(fallback_query)
-                    fallback_rows = cursor.fetchall()
-                    
-                    # 결과가 있으면 저장
-                    if len(fallback_rows) > 0:
-                        print(f"✅ 대안 쿼리로 {len(fallback_rows)}개 결과 찾음")
-                        
-                        # 결과를 딕셔너리로 변환
-                        column_names = [column[0] for column in cursor.description]
-                        fallback_results = []
-                        
-                        for row in fallback_rows:
-                            result_dict = {}
-                            for i, value in enumerate(row):
-                                result_dict[column_names[i]] = value
-                            fallback_results.append(result_dict)
-                        
-                        # 결과 저장
-                        results[table] = fallback_results
-                    else:
-                        print(f"⚠️ 대안 쿼리로도 결과를 찾을 수 없습니다.")
-                
-                except Exception as e:
-                    error_msg = f"대안 쿼리 실행 오류 ({table}): {str(e)}"
-                    print(f"❌ {error_msg}")
-                    state["errors"].append(error_msg)
+            if error is not None:
+                error_msg = f"쿼리 실행 오류 ({table}): {str(error)}"
+                print(f"❌ {error_msg}")
+                state["errors"].append(error_msg)
+                results[table] = []
+                continue
+            for message in outcome["log"]:
+                print(message)
+            state["errors"].extend(outcome["errors"])
+            results[table] = outcome["results"]
     
     except Exception as e:
         error_msg = f"DB 연결 오류: {str(e)}"
@@ -825,15 +846,11 @@ def execute_queries(state: PCCompatibilityState) -> PCCompatibilityState:
         state["errors"].append(error_msg)
         
     finally:
-        # DB 연결 종료
-        if conn:
-            conn.close()
-            print("DB 연결 종료")
-        
         # 결과 요약
         print("\n===== 쿼리 실행 결과 요약 =====")
         for table, table_results in results.items():
             print(f"테이블 {table}: {len(table_results)}개 결과")
+        print(f"결과 캐시: {format_result_cache_stats()}")
         
         # 결과 저장
         state["results"] = results
@@ -0,0 +1,299 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+from db_pool import DB_PATH, catalog_version
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+# 질문 -> 최종 답변 의미 캐시
+# "배송은 얼마나 걸리나요?" / "배송 기간이 얼마나 되나요?" 처럼 표현만 다른 같은 질문에 에이전트 그래프 전체(LLM 여러 번)를
+# 다시 돌리지 않도록, 질문을 로컬 sentence-transformer(embedding_model_test.py 에서 비교한 모델)로 임베딩해
+# 근사 최근접 이웃 색인(hnswlib HNSW, 없으면 numpy 내적 전체 탐색)에서 가장 가까운 이전 질문을 찾고,
+# 유사도가 ANSWER_CACHE_THRESHOLD 이상이고 ANSWER_CACHE_TTL 초 안에 만든 답변이면 그대로 돌려줍니다.
+#   - 숫자가 들어간 단어(5600x, 3060, 16GB, 750W 등)가 다르면 문장이 비슷해도 다른 질문으로 봅니다.
+#   - 카탈로그 버전(db_pool.catalog_version) 이나 정책 파일(policy_files) 내용이 바뀌면 캐시 전체를 비웁니다.
+#   - sentence-transformers 가 없거나 모델을 불러오지 못하면 캐시를 끄고(lookup 은 항상 None) 그대로 진행합니다.
+# 대화 기록에 기대는 후속 질문은 호출하는 쪽에서 캐시를 건너뜁니다.
+#
+# 사용법:
+#   answer_cache = AnswerCache(DB_PATH, ['scenario_agents.py'])
+#   cached = answer_cache.lookup(question)   # None 또는 {'answer', 'question', 'similarity', 'age'}
+#   if cached is None:
+#       answer = run_graph(question)
+#       answer_cache.store(question, answer)
+
+ANSWER_CACHE_MODEL = "upskyy/bge-m3-korean"
+# 같은 질문으로 볼 최소 코사인 유사도
+ANSWER_CACHE_THRESHOLD = 0.92
+# 답변 유효 시간 (초)
+ANSWER_CACHE_TTL = 6 * 60 * 60
+ANSWER_CACHE_MAX_ENTRIES = 2000
+# 색인에서 후보로 볼 이웃 수
+ANSWER_CACHE_CANDIDATES = 5
+
+# 모델 이름별 SentenceTransformer (불러오지 못하면 None)
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+def get_encoder(model_name=ANSWER_CACHE_MODEL):
+    """모델 이름의 SentenceTransformer (처음 호출할 때 불러옴, 사용할 수 없으면 None)"""
+    with _encoders_lock:
+        if model_name not in _encoders:
+            encoder = None
+            if SentenceTransformer is None:
+                logging.warning("sentence-transformers 가 없어 답변 캐시를 사용하지 않습니다.")
+            else:
+                try:
+                    started = time.time()
+                    encoder = SentenceTransformer(model_name)
+                    logging.info(f"답변 캐시 임베딩 모델 로드: {model_name}, {time.time() - started:.2f}초")
+                except Exception as e:
+                    logging.warning(f"답변 캐시 임베딩 모델 로드 실패 ({model_name}), 캐시 사용 안 함: {e}")
+            _encoders[model_name] = encoder
+        return _encoders[model_name]
+
+def normalize_question(question):
+    """공백을 하나로, 소문자로"""
+    return re.sub(r'\s+', ' ', question).strip().lower()
+
+def key_terms(question):
+    """숫자가 들어간 단어 집합 (모델명/용량/와트 등, 이 값이 다르면 다른 질문)"""
+    return frozenset(re.findall(r'[a-z]*\d+[a-z0-9]*', normalize_question(question)))
+
+# 파일 경로별 (수정 시각 ns, 내용 해시)
+_file_hashes = {}
+
+def policy_version(paths):
+    """정책 파일들 내용의 해시 (파일 수정 시각이 바뀔 때만 다시 읽음, 없는 파일은 제외)"""
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        cached = _file_hashes.get(path)
+        if not cached or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = (mtime, hashlib.sha1(f.read()).hexdigest())
+            _file_hashes[path] = cached
+        digest.update(f"{path}:{cached[1]}".encode('utf-8'))
+    return digest.hexdigest()
+
+class VectorIndex:
+    """정규화한 벡터의 내적(코사인 유사도) 최근접 이웃 색인 (hnswlib 가 있으면 HNSW, 없으면 numpy)"""
+
+    def __init__(self, dim, capacity=ANSWER_CACHE_MAX_ENTRIES):
+        self.dim = dim
+        self._labels = set()
+        self._hnsw = None
+        self._vectors = {}
+        self._matrix = None
+        if hnswlib is not None:
+            self._hnsw = hnswlib.Index(space='ip', dim=dim)
+            self._hnsw.init_index(max_elements=capacity, ef_construction=200, M=16, allow_replace_deleted=True)
+            self._hnsw.set_ef(64)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def add(self, label, vector):
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+        if self._hnsw is not None:
+            self._hnsw.add_items(vector, [label], replace_deleted=True)
+        else:
+            self._vectors[label] = vector[0]
+            self._matrix = None
+        self._labels.add(label)
+
+    def remove(self, label):
+        if label not in self._labels:
+            return
+        self._labels.discard(label)
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(label)
+        else:
+            self._vectors.pop(label)
+            self._matrix = None
+
+    def search(self, vector, k=ANSWER_CACHE_CANDIDATES):
+        """[(label, 유사도)] 유사도 높은 순"""
+        k = min(k, len(self._labels))
+        if k == 0:
+            return []
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+        if self._hnsw is not None:
+            try:
+                labels, distances = self._hnsw.knn_query(vector, k=k)
+            except RuntimeError as e:
+                logging.warning(f"답변 캐시 색인 검색 실패: {e}")
+                return []
+            # space='ip' 의 거리는 1 - 내적
+            return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+        if self._matrix is None:
+            self._matrix = (list(self._vectors), np.vstack(list(self._vectors.values())))
+        labels, matrix = self._matrix
+        scores = matrix @ vector[0]
+        top = np.argsort(-scores)[:k]
+        return [(labels[index], float(scores[index])) for index in top]
+
+class AnswerCache:
+    """질문 임베딩으로 찾는 최종 답변 캐시 (카탈로그/정책 버전별, LRU + TTL)"""
+
+    def __init__(self, db_path=DB_PATH, policy_files=(), model_name=ANSWER_CACHE_MODEL,
+                 threshold=ANSWER_CACHE_THRESHOLD, ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        self.policy_files = list(policy_files)
+        self.model_name = model_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # label -> {'question', 'answer', 'terms', 'created', 'metadata'} (오래 안 쓴 것부터)
+        self._entries = OrderedDict()
+        self._index = None
+        self._next_label = 0
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def version(self):
+        """(카탈로그 버전, 정책 파일 해시)"""
+        return (catalog_version(self.db_path), policy_version(self.policy_files))
+
+    def _encode(self, question):
+        encoder = get_encoder(self.model_name)
+        if encoder is None:
+            return None
+        return encoder.encode(normalize_question(question), normalize_embeddings=True)
+
+    def _check_version(self, version):
+        """(잠금 안에서) 버전이 바뀌었으면 전체 비움"""
+        if version == self._version:
+            return
+        if self._entries:
+            logging.info(f"카탈로그/정책 변경, 답변 캐시 {len(self._entries)}개 비움")
+            self.invalidations += 1
+        self._entries.clear()
+        self._index = None
+        self._version = version
+
+    def _remove(self, label):
+        self._entries.pop(label)
+        self._index.remove(label)
+
+    def lookup(self, question):
+        """가장 비슷한 이전 질문의 답변 {'answer', 'question', 'similarity', 'age', 'metadata'} 또는 None
+
+        캐시를 쓸 수 없거나 조회 중 오류가 나면 None (답변 생성을 막지 않음).
+        """
+        try:
+            version = self.version()
+            vector = self._encode(question)
+        except Exception as e:
+            logging.warning(f"답변 캐시 조회 실패: {e}")
+            return None
+        if vector is None:
+            return None
+        terms = key_terms(question)
+        now = time.time()
+        with self._lock:
+            self._check_version(version)
+            candidates = self._index.search(vector) if self._index is not None else []
+            for label, similarity in candidates:
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[label]
+                if now - entry['created'] > self.ttl:
+                    self._remove(label)
+                    self.expirations += 1
+                    continue
+                if entry['terms'] != terms:
+                    continue
+                self._entries.move_to_end(label)
+                self.hits += 1
+                logging.info(f"답변 캐시 적중 (유사도 {similarity:.3f}): {question} ~ {entry['question']}")
+                return {
+                    'answer': entry['answer'],
+                    'question': entry['question'],
+                    'similarity': similarity,
+                    'age': now - entry['created'],
+                    'metadata': dict(entry['metadata'])
+                }
+            self.misses += 1
+            return None
+
+    def store(self, question, answer, metadata=None):
+        """질문의 최종 답변 저장 (같은 질문으로 볼 만큼 가까운 항목은 새 답변으로 교체)"""
+        if not answer:
+            return
+        try:
+            version = self.version()
+            vector = self._encode(question)
+        except Exception as e:
+            logging.warning(f"답변 캐시 저장 실패: {e}")
+            return
+        if vector is None:
+            return
+        terms = key_terms(question)
+        with self._lock:
+            self._check_version(version)
+            if self._index is None:
+                self._index = VectorIndex(len(vector), self.max_entries)
+            for label, similarity in self._index.search(vector):
+                if similarity >= self.threshold and self._entries[label]['terms'] == terms:
+                    self._remove(label)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+            label = self._next_label
+            self._next_label += 1
+            self._index.add(label, vector)
+            self._entries[label] = {
+                'question': question,
+                'answer': answer,
+                'terms': terms,
+                'created': time.time(),
+                'metadata': dict(metadata or {})
+            }
+            self.stores += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index = None
+
+    def stats(self):
+        """{'hits', 'misses', 'hit_rate', 'entries', 'stores', 'expirations', 'invalidations'}"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'stores': self.stores,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+    def format_stats(self):
+        stats = self.stats()
+        return (
+            f"적중 {stats['hits']}회, 실패 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%}), "
+            f"{stats['entries']}개 저장"
+        )
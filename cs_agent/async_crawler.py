@@ -0,0 +1,483 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+import aiohttp
+import pandas as pd
+from crawl_parsers import parse_last_page, parse_product_links, parse_category_name, parse_product_info, normalize_html, get_parser_backend
+from crawl_journal import CrawlJournal, content_hash, product_number
+from crawl_staging import STAGING_DIR, STAMP_FORMAT, write_category_frame, export_xlsx, crawled_on, index_xlsx_files
+from page_store import PageStore, list_page_url
+
+# 비동기 크롤러 (aiohttp)
+# 01_jchyunplace_crawling.find_all_categories 의 카테고리 탐색과
+# 02_analyze_categories.check_category_products 의 상세 페이지 수집을 동시에 여러 요청으로 처리합니다.
+#   - 호스트별 초당 요청 수 제한 (토큰 버킷, 전체 작업이 공유)
+#   - 동시 요청 수 제한 (세마포어 + 커넥터 연결 수)
+#   - 하나의 ClientSession 으로 연결 재사용
+#   - 요청별 재시도 (지수 백오프 + 지터, 429/5xx 는 Retry-After 우선)
+#   - 진행 기록(crawl_journal.CrawlJournal)을 주면 끝난 목록 페이지와 신선한 상세 페이지는 건너뜀
+#   - 기간이 지난 상세 페이지는 ETag/Last-Modified 조건부 요청, 304 나 같은 정규화 HTML 해시면 파싱 생략
+#     (추가/변경/삭제 제품은 crawler.delta 에 모아 변경분 파일로 저장)
+#   - revalidate=True (--incremental) 면 신선도 기간과 무관하게 목록 페이지를 모두 다시 받고 모든 상세 페이지에
+#     조건부 요청을 보냄 (목록에 추가/삭제된 제품과 바뀐 제품을 같은 날에도 찾음)
+#   - parse_workers 를 주면 HTML 파싱을 프로세스 풀에서 실행 (이벤트 루프는 네트워크 I/O 만 처리)
+#   - page_store(page_store.PageStore)를 주면 받은 목록/상세 HTML을 압축 보관 (나중에 오프라인 재파싱)
+# 결과는 02와 같은 형태({카테고리명: DataFrame})로 Parquet 스테이징(crawl_staging)에 저장하며, base_url 을 바꾸면 로컬 대체 서버
+# (crawl_stub_server.py)를 상대로 실행할 수 있습니다.
+#
+# 사용법: python cs_agent/async_crawler.py [--base-url http://127.0.0.1:8765] [--no-journal | --incremental] [--parse-workers N] [--xlsx] [--no-page-store] [카테고리명 ...]
+#   --xlsx: Parquet 와 함께 사람이 보는 엑셀(raw_xlsx/{카테고리명}_{타임스탬프}.xlsx)도 저장
+#   --incremental: 엑셀 전체 대신 변경분 파일(crawl_delta_*.json)만 저장 (같은 날 처리한 카테고리도 다시 확인,
+#                  part_loader.py --delta 로 부품 테이블에 반영)
+
+BASE_URL = "https://www.jchyunplace.co.kr"
+LIST_PATH = "/skin/shop/basic/product_list_include_plist.php"
+
+# 기본 정책 (호스트당 초당 요청 수, 동시 요청 수, 재시도)
+REQUESTS_PER_SECOND = 2.0
+MAX_CONCURRENCY = 8
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+REQUEST_TIMEOUT = 30
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+}
+
+LIST_HEADERS = {
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "X-Requested-With": "XMLHttpRequest"
+}
+
+# 목록 요청 기본 파라미터 (카테고리 파라미터와 page 를 더해서 사용)
+LIST_PARAMS = {
+    "search_cate": "0",
+    "search": "",
+    "search1": "",
+    "sprice": "",
+    "eprice": "",
+    "list_sort_type": "",
+    "view_type": "list"
+}
+
+class RetryableStatus(Exception):
+    """재시도할 HTTP 상태 응답"""
+    def __init__(self, status, retry_after=None):
+        super().__init__(f"HTTP 오류: {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+class HostRateLimiter:
+    """호스트별 초당 요청 수 제한 (토큰 버킷)
+
+    burst 만큼은 연속으로 보낼 수 있고, 이후에는 requests_per_second 간격으로 토큰이 채워집니다.
+    """
+    def __init__(self, requests_per_second, burst=1):
+        self.rate = requests_per_second
+        self.burst = burst
+        self.buckets = {}
+        self.locks = {}
+
+    async def acquire(self, host):
+        """토큰 하나를 얻을 때까지 대기"""
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            tokens, last = self.buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                await asyncio.sleep((1 - tokens) / self.rate)
+                now = time.monotonic()
+                tokens = 1
+            self.buckets[host] = (tokens - 1, now)
+
+class AsyncCrawler:
+    """공유 세션/속도 제한/재시도를 갖춘 비동기 크롤러 (async with 로 사용)"""
+
+    def __init__(self, base_url=BASE_URL, requests_per_second=REQUESTS_PER_SECOND,
+                 concurrency=MAX_CONCURRENCY, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_SECONDS, timeout=REQUEST_TIMEOUT, journal=None, parse_workers=0,
+                 page_store=None, revalidate=False):
+        self.base_url = base_url.rstrip('/')
+        self.limiter = HostRateLimiter(requests_per_second)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.journal = journal
+        self.parse_workers = parse_workers
+        self.page_store = page_store
+        # True 면 진행 기록의 끝난 목록 페이지/신선한 상세 페이지도 다시 확인 (기록은 조건부 요청과 변경 판정에만 사용)
+        self.revalidate = revalidate
+        self.pool = None
+        self.session = None
+        self.semaphore = None
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0, 'not_modified': 0, 'parsed': 0}
+        # {카테고리: {'added': [...], 'changed': [...], 'removed': [...]}}
+        self.delta = {}
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        if self.parse_workers:
+            self.pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    async def parse(self, function, html):
+        """파싱 함수 실행 (프로세스 풀이 있으면 풀에서 실행해 이벤트 루프를 막지 않음)"""
+        if self.pool is None:
+            return function(html)
+        return await asyncio.get_running_loop().run_in_executor(self.pool, function, html, get_parser_backend())
+
+    def _url(self, path):
+        return path if path.startswith('http') else f"{self.base_url}{path}"
+
+    def _retry_wait(self, attempt, retry_after=None):
+        """재시도 대기 시간 (Retry-After 우선, 없으면 지수 백오프 + 지터)"""
+        if retry_after is not None:
+            return retry_after
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def fetch_text(self, path, method='GET', data=None, headers=None):
+        """페이지 본문을 가져옵니다. 재시도 후에도 실패하면 None"""
+        result = await self.fetch(path, method, data, headers)
+        return result[1] if result else None
+
+    async def fetch(self, path, method='GET', data=None, headers=None):
+        """(상태 코드, 본문, 응답 헤더)를 반환합니다. 304 는 본문 None. 재시도 후에도 실패하면 None"""
+        url = self._url(path)
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries):
+            await self.limiter.acquire(host)
+            try:
+                async with self.semaphore:
+                    self.stats['requests'] += 1
+                    async with self.session.request(method, url, data=data, headers=headers) as response:
+                        if response.status in RETRY_STATUSES:
+                            retry_after = response.headers.get('Retry-After')
+                            raise RetryableStatus(response.status, float(retry_after) if retry_after and retry_after.isdigit() else None)
+                        if response.status == 304:
+                            return response.status, None, response.headers
+                        if response.status != 200:
+                            logging.error(f"페이지 로드 실패 (status: {response.status}): {url}")
+                            self.stats['failures'] += 1
+                            return None
+                        return response.status, await response.text(errors='replace'), response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError, RetryableStatus) as e:
+                if attempt < self.max_retries - 1:
+                    wait = self._retry_wait(attempt, getattr(e, 'retry_after', None))
+                    self.stats['retries'] += 1
+                    logging.warning(f"요청 실패 ({attempt+1}/{self.max_retries}): {url} - {str(e) or type(e).__name__}. {wait:.1f}초 후 재시도...")
+                    await asyncio.sleep(wait)
+                else:
+                    logging.error(f"요청 최종 실패: {url} - {str(e) or type(e).__name__}")
+        self.stats['failures'] += 1
+        return None
+
+    async def fetch_list_page(self, params, page):
+        """카테고리 목록 페이지 HTML"""
+        data = {**LIST_PARAMS, **params, "page": str(page)}
+        return await self.fetch_text(LIST_PATH, method='POST', data=data, headers=LIST_HEADERS)
+
+    async def check_category(self, cate1, cate2):
+        """카테고리에 제품이 있으면 (True, 카테고리 이름), 없으면 (False, None)"""
+        params = {"depth": "2", "cate1": str(cate1), "cate2": str(cate2)}
+        html = await self.fetch_list_page(params, 1)
+        if html is None:
+            return False, None
+        category_name = parse_category_name(html)
+        if category_name is None:
+            return False, None
+        return True, category_name or f"Category {cate1}_{cate2}"
+
+    async def find_categories(self, cate1_range=range(2, 11), cate2_range=range(1, 101)):
+        """cate1/cate2 조합을 동시에 확인해 유효한 카테고리를 찾습니다 (valid_categories.json 형식)."""
+        combinations = [(cate1, cate2) for cate1 in cate1_range for cate2 in cate2_range]
+        results = await asyncio.gather(*(self.check_category(cate1, cate2) for cate1, cate2 in combinations))
+
+        valid_categories = {}
+        for (cate1, cate2), (exists, category_name) in zip(combinations, results):
+            if exists:
+                valid_categories[f"{cate1}_{cate2}"] = {
+                    'name': category_name,
+                    'params': {'depth': '2', 'cate1': str(cate1), 'cate2': str(cate2)},
+                    'products': []
+                }
+                logging.info(f"유효한 카테고리 발견: cate1={cate1}, cate2={cate2}, 이름={category_name}")
+        logging.info(f"카테고리 검색 완료: {len(combinations)}개 조합 중 {len(valid_categories)}개 유효")
+        return valid_categories
+
+    async def fetch_product_links(self, category_info):
+        """카테고리의 모든 목록 페이지에서 제품 링크 수집 (첫 페이지로 마지막 페이지 확인 후 나머지 동시 요청)"""
+        first_page = await self.fetch_list_page(category_info['params'], 1)
+        if first_page is None:
+            return []
+        last_page = await self.parse(parse_last_page, first_page)
+        logging.info(f"{category_info['name']} 총 페이지 수: {last_page}")
+
+        pages = [first_page] + await asyncio.gather(
+            *(self.fetch_list_page(category_info['params'], page) for page in range(2, last_page + 1))
+        )
+        product_links = []
+        for page, html in enumerate(pages, 1):
+            if html is None:
+                logging.error(f"{category_info['name']} {page}페이지 처리 최종 실패")
+                continue
+            product_links.extend(await self.parse(parse_product_links, html))
+        # 페이지 순서를 유지하며 중복 제거
+        return list(dict.fromkeys(product_links))
+
+    async def fetch_product_info(self, product_url, category=None, page=None, position=None):
+        """제품 상세 정보 dict (실패 시 빈 dict)
+
+        진행 기록이 있으면 신선도 기간 안에 파싱한 제품은 요청하지 않고 기록된 정보를 반환하고 (revalidate 면 생략),
+        기간이 지난 제품은 조건부 요청 후 바뀐 경우에만 파싱합니다.
+        """
+        if not self.journal:
+            html = await self.fetch_text(product_url)
+            if html is None:
+                return {}
+            if self.page_store:
+                self.page_store.put(product_url, html, 'detail', category, page)
+            return await self.parse(parse_product_info, html)
+
+        cached_info = None if self.revalidate else self.journal.fresh_product(product_url)
+        if cached_info is not None:
+            self.journal.reuse_product(category, page, position, product_url)
+            return cached_info
+
+        state = self.journal.product_state(product_url)
+        headers = {}
+        if state and state['etag']:
+            headers['If-None-Match'] = state['etag']
+        if state and state['last_modified']:
+            headers['If-Modified-Since'] = state['last_modified']
+        result = await self.fetch(product_url, headers=headers or None)
+        if result is None:
+            return {}
+        status, html, response_headers = result
+        etag, last_modified = response_headers.get('ETag'), response_headers.get('Last-Modified')
+
+        # 304 또는 정규화한 HTML 이 같으면 파싱하지 않고 기록된 정보 사용
+        html_hash = content_hash(normalize_html(html)) if html is not None else None
+        if state and (status == 304 or html_hash == state['html_hash']):
+            self.stats['not_modified'] += 1
+            self.journal.revalidate_product(category, page, position, product_url, etag, last_modified)
+            return state['info']
+        if html is None:
+            # 기록이 없는데 304 가 온 경우 (조건부 헤더를 보내지 않았으므로 정상 응답이 아님)
+            return {}
+
+        if self.page_store:
+            self.page_store.put(product_url, html, 'detail', category, page)
+        info = await self.parse(parse_product_info, html)
+        self.stats['parsed'] += 1
+        if info:
+            change = self.journal.record_product(category, page, position, product_url, info, etag, last_modified, html_hash)
+            if change != 'unchanged':
+                self.delta.setdefault(category, {'added': [], 'changed': [], 'removed': []})[change].append(
+                    {'pd_no': product_number(product_url), 'url': product_url, 'info': info}
+                )
+        return info
+
+    async def crawl_page(self, category_info, page, last_page, html=None):
+        """목록 페이지 하나의 (제품 정보 목록(페이지 내 순서), 완료 여부)
+
+        진행 기록상 끝난 페이지는 요청하지 않고 기록된 제품 정보로 채웁니다 (revalidate 면 항상 다시 요청).
+        상세 페이지가 하나라도 실패하면 완료로 기록하지 않아 다음 실행에서 다시 시도합니다.
+        """
+        name = category_info['name']
+        if self.journal and not self.revalidate and self.journal.completed_page(name, page) is not None:
+            return self.journal.page_products(name, page), True
+        if html is None:
+            html = await self.fetch_list_page(category_info['params'], page)
+            if html is None:
+                logging.error(f"{name} {page}페이지 처리 최종 실패")
+                return [], False
+        if self.page_store:
+            self.page_store.put(list_page_url(LIST_PATH, category_info['params'], page), html, 'list', name, page)
+
+        product_links = list(dict.fromkeys(await self.parse(parse_product_links, html)))
+        if self.journal:
+            self.journal.start_page(name, page)
+        product_details = await asyncio.gather(
+            *(self.fetch_product_info(url, name, page, position) for position, url in enumerate(product_links, 1))
+        )
+        complete = all(product_details)
+        if self.journal and complete:
+            self.journal.record_page(name, page, html, last_page, len(product_links))
+        return [info for info in product_details if info], complete
+
+    async def crawl_category(self, category_info):
+        """카테고리 제품 상세 정보를 DataFrame으로 반환 (제품이 없으면 None)"""
+        name = category_info['name']
+        logging.info(f"=== {name} 분석 시작 ===")
+
+        # 마지막 페이지 번호 (첫 페이지가 진행 기록에 있으면 요청하지 않음, revalidate 면 항상 요청)
+        first_page = None
+        last_page = self.journal.completed_page(name, 1) if self.journal and not self.revalidate else None
+        if last_page is None:
+            first_page = await self.fetch_list_page(category_info['params'], 1)
+            if first_page is None:
+                return None
+            last_page = await self.parse(parse_last_page, first_page)
+        logging.info(f"{name} 총 페이지 수: {last_page}")
+
+        pages = await asyncio.gather(
+            self.crawl_page(category_info, 1, last_page, first_page),
+            *(self.crawl_page(category_info, page, last_page) for page in range(2, last_page + 1))
+        )
+        product_details = [info for page_details, _ in pages for info in page_details]
+        if self.journal:
+            # 모든 목록 페이지가 끝났을 때만 목록에서 사라진 제품을 삭제로 처리
+            if all(complete for _, complete in pages):
+                removed = self.journal.remove_missing_products(name, last_page)
+                if removed:
+                    self.delta.setdefault(name, {'added': [], 'changed': [], 'removed': []})['removed'].extend(removed)
+            self.journal.summary(name)
+        if not product_details:
+            return None
+        logging.info(f"✅ {category_info['name']} 카테고리의 {len(product_details)}개 제품 정보를 수집했습니다.")
+        return pd.DataFrame(product_details)
+
+    async def crawl_categories(self, categories):
+        """여러 카테고리를 동시에 수집해 {카테고리명: DataFrame} 반환 (제품이 없는 카테고리는 제외)"""
+        categories = list(categories.values())
+        frames = await asyncio.gather(*(self.crawl_category(category) for category in categories))
+        return {category['name']: df for category, df in zip(categories, frames) if df is not None}
+
+def crawl_categories(categories, delta_dir=None, **crawler_options):
+    """동기 코드에서 호출하는 진입점: {카테고리명: DataFrame}
+
+    delta_dir 를 주면 추가/변경/삭제 제품을 변경분 파일로 저장합니다 (진행 기록이 있을 때).
+    """
+    async def run():
+        async with AsyncCrawler(**crawler_options) as crawler:
+            result = await crawler.crawl_categories(categories)
+            logging.info(f"요청 통계: {crawler.stats}")
+            if delta_dir:
+                save_delta(crawler.delta, delta_dir)
+            return result
+    return asyncio.run(run())
+
+def find_categories(**crawler_options):
+    """동기 코드에서 호출하는 카테고리 탐색 진입점 (valid_categories.json 형식)"""
+    async def run():
+        async with AsyncCrawler(**crawler_options) as crawler:
+            return await crawler.find_categories()
+    return asyncio.run(run())
+
+def save_category_frames(category_dataframes, staging_dir=STAGING_DIR, xlsx_dir=None):
+    """카테고리별 Parquet 스테이징 저장 (xlsx_dir 를 주면 02와 같은 이름의 엑셀도 저장)"""
+    crawled_at = datetime.now()
+    for category_name, df in category_dataframes.items():
+        write_category_frame(category_name, df, staging_dir, crawled_at)
+        if xlsx_dir:
+            export_xlsx(category_name, df, xlsx_dir, crawled_at.strftime(STAMP_FORMAT))
+
+def save_delta(delta, output_dir='./cs_agent/raw_xlsx'):
+    """변경분 파일 저장: crawl_delta_{타임스탬프}.json
+
+    형식: {카테고리명: {'added': [...], 'changed': [...], 'removed': [...]}}
+    각 항목은 {'pd_no', 'url', 'info'} 이며 info 는 엑셀 행과 같은 제품 정보입니다 (삭제는 마지막으로 기록된 정보).
+    변경이 없으면 파일을 만들지 않고 None 을 반환합니다.
+    """
+    if not any(changes[kind] for changes in delta.values() for kind in changes):
+        logging.info("변경된 제품이 없습니다.")
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+    delta_filename = os.path.join(output_dir, f"crawl_delta_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(delta_filename, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2)
+    for category_name, changes in delta.items():
+        logging.info(f"{category_name}: 추가 {len(changes['added'])}개, 변경 {len(changes['changed'])}개, 삭제 {len(changes['removed'])}개")
+    logging.info(f"✅ 변경분을 {delta_filename}에 저장했습니다.")
+    return delta_filename
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f"async_crawling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log", encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+    args = sys.argv[1:]
+    base_url = BASE_URL
+    journal = None
+    incremental = '--incremental' in args
+    if incremental:
+        args.remove('--incremental')
+    if '--no-journal' in args and not incremental:
+        args.remove('--no-journal')
+    else:
+        journal = CrawlJournal()
+    if '--base-url' in args:
+        index = args.index('--base-url')
+        base_url = args[index + 1]
+        del args[index:index + 2]
+    export_excel = '--xlsx' in args
+    if export_excel:
+        args.remove('--xlsx')
+    parse_workers = 0
+    if '--parse-workers' in args:
+        index = args.index('--parse-workers')
+        parse_workers = int(args[index + 1])
+        del args[index:index + 2]
+    page_store = None
+    if '--no-page-store' in args:
+        args.remove('--no-page-store')
+    else:
+        page_store = PageStore()
+
+    with open('valid_categories.json', 'r', encoding='utf-8') as f:
+        categories = json.load(f)
+    if args:
+        categories = {key: category for key, category in categories.items() if category['name'] in args}
+
+    # 오늘 날짜 스냅숏(Parquet/엑셀)이 매니페스트에 있는 카테고리는 건너뛰기 (02와 동일, 변경분 모드는 제외)
+    today_date = datetime.now().strftime("%Y%m%d")
+    if not incremental:
+        index_xlsx_files()
+    for key, category in list(categories.items()):
+        if not incremental and crawled_on(category['name'], today_date):
+            logging.info(f"✅ '{category['name']}' 카테고리는 오늘({today_date}) 이미 처리되었습니다.")
+            del categories[key]
+
+    started = time.time()
+    try:
+        category_dfs = crawl_categories(
+            categories, delta_dir='./cs_agent/raw_xlsx' if incremental else None,
+            base_url=base_url, journal=journal, parse_workers=parse_workers, page_store=page_store,
+            revalidate=incremental
+        )
+    finally:
+        if journal:
+            journal.close()
+        if page_store:
+            page_store.close()
+    if not incremental:
+        save_category_frames(category_dfs, xlsx_dir='./cs_agent/raw_xlsx' if export_excel else None)
+    logging.info(f"크롤링 완료: {len(category_dfs)}개 카테고리, {time.time() - started:.1f}초")
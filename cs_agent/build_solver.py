@@ -0,0 +1,377 @@
+import os
+import time
+import heapq
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from compatibility_engine import PAIR_TABLES, get_storage_mode
+from db_pool import DB_PATH, get_pool
+
+# 완성형 PC 견적 솔버
+# 부품 간 호환성 테이블(*_compatibility)을 인접 비트셋으로 미리 만들어 두고,
+# 제약 전파(arc consistency) + 분기 한정(branch and bound)으로 상위 K개 조합을 찾습니다.
+# 에이전트가 LLM으로 8개 테이블 조인 SQL을 생성하는 대신 이 모듈을 호출할 수 있습니다.
+# 부품/비트셋 데이터는 get_solver_data() 가 카탈로그 버전(db_pool)별로 한 번만 읽어 두므로 요청마다 탐색만 합니다.
+#
+# 사용법:
+#   from build_solver import get_solver_data, solve_builds
+#   builds = solve_builds(data=get_solver_data(DB_PATH), top_k=3, requirements={'min_vram': 16})
+
+# 부품 테이블 -> ID 컬럼 (탐색 순서: 제약이 많은 부품부터)
+SOLVER_PARTS = {
+    'cpu': 'cpu_id',
+    'motherboard': 'mb_id',
+    'memory': 'memory_id',
+    'cpu_cooler': 'cooler_id',
+    'case_chassis': 'case_id',
+    'gpu': 'gpu_id',
+    'power_supply': 'psu_id',
+    'storage': 'storage_id'
+}
+
+# 05-8에서 아직 계산하지 않는 호환성 테이블 (PAIR_TABLES 와 같이 테이블이 없거나 비어 있으면 제약 없음으로 간주)
+OPTIONAL_RELATIONS = {
+    'mb_storage_compatibility': ('motherboard', 'mb_id', 'storage', 'storage_id')
+}
+
+# 성능 점수 산정용 컬럼과 가중치 (컬럼별 최댓값으로 정규화 후 합산)
+SCORE_COLUMNS = {
+    'cpu': {'cores': 1.0, 'threads': 0.5, 'turbo_clock': 0.5},
+    'gpu': {'memory_capacity': 2.0, 'cuda_cores': 1.0, 'core_clock': 0.5},
+    'memory': {'capacity': 0.5, 'clock': 0.3},
+    'storage': {'capacity': 0.3},
+    'power_supply': {'wattage': 0.1}
+}
+
+# 가격 컬럼 후보 (현재 스키마에는 없으며, 추가되면 예산 제약에 사용)
+PRICE_COLUMNS = ['price', 'sale_price', 'lowest_price']
+
+# 점수 비교 허용 오차 (부동소수점 합산 순서 차이로 동점 가지가 남지 않도록)
+SCORE_EPSILON = 1e-9
+
+# 요구사항 키 -> (부품 테이블, 컬럼)
+REQUIREMENT_COLUMNS = {
+    'min_vram': ('gpu', 'memory_capacity'),
+    'min_cores': ('cpu', 'cores'),
+    'min_threads': ('cpu', 'threads'),
+    'min_memory_capacity': ('memory', 'capacity'),
+    'min_storage_capacity': ('storage', 'capacity'),
+    'min_psu_wattage': ('power_supply', 'wattage')
+}
+
+def _numeric(df, column):
+    """숫자 컬럼을 float 배열로 변환 (없거나 변환 불가 값은 NaN)"""
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=float)
+
+def _bitsets(matrix):
+    """bool 행렬의 행별 비트셋(int) 목록 (열 j -> 비트 j)"""
+    packed = np.packbits(np.asarray(matrix, dtype=bool), axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed]
+
+def _iter_bits(mask):
+    """비트셋에서 켜진 비트의 인덱스를 순회"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _part_scores(table, df):
+    """부품별 성능 점수 계산"""
+    scores = np.zeros(len(df))
+    for column, weight in SCORE_COLUMNS.get(table, {}).items():
+        values = _numeric(df, column)
+        top = np.nanmax(values) if np.isfinite(values).any() else 0
+        if top > 0:
+            scores += weight * np.nan_to_num(values / top)
+    return scores
+
+def _part_prices(df):
+    """가격 컬럼이 있으면 가격 배열, 없으면 None"""
+    for column in PRICE_COLUMNS:
+        if column in df.columns:
+            return _numeric(df, column)
+    return None
+
+def _relation_computed(conn, table_name):
+    """호환성 테이블/뷰가 있고 행이 하나라도 있는지 (호환 쌍이 없어도 계산한 관계는 True)"""
+    if get_storage_mode(conn, table_name) is None:
+        return False
+    return bool(conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {table_name} LIMIT 1)").fetchone()[0])
+
+def _read_pairs(conn, table_name, left_id, right_id):
+    """호환되는 쌍만 (왼쪽 ID 배열, 오른쪽 ID 배열)로 읽기 (dense 테이블과 sparse 뷰 모두 지원)"""
+    df = conn.execute(
+        f"SELECT {left_id}, {right_id} FROM {table_name} WHERE compatible"
+    ).fetch_df()
+    return df[left_id].to_numpy(dtype=np.int64), df[right_id].to_numpy(dtype=np.int64)
+
+def _positions(ids, values):
+    """정렬된 부품 ID 배열에서 values 의 위치 (없는 ID는 -1)"""
+    positions = np.searchsorted(ids, values)
+    found = positions < len(ids)
+    found[found] = ids[positions[found]] == values[found]
+    return np.where(found, positions, -1)
+
+def _adjacency(left_ids, right_ids, left_values, right_values):
+    """호환 쌍을 양방향 인접 비트셋 목록 (forward, backward)으로 변환 (부품 테이블에 없는 ID는 무시)"""
+    i = _positions(left_ids, left_values)
+    j = _positions(right_ids, right_values)
+    valid = (i >= 0) & (j >= 0)
+    matrix = np.zeros((len(left_ids), len(right_ids)), dtype=bool)
+    matrix[i[valid], j[valid]] = True
+    return _bitsets(matrix), _bitsets(matrix.T)
+
+def load_solver_data(conn):
+    """부품 목록과 호환성 인접 비트셋을 불러옵니다.
+
+    반환값은 solve_builds()에 그대로 넘길 수 있는 dict이며, 호환성 테이블이
+    갱신되기 전까지 재사용할 수 있습니다 (get_solver_data 가 카탈로그 버전별로 캐시).
+    """
+    parts = {}
+    for table, id_col in SOLVER_PARTS.items():
+        df = conn.execute(f'SELECT * FROM "{table}" ORDER BY {id_col}').fetch_df()
+        names = df['product_name'].fillna(df['model_name']) if 'product_name' in df.columns else df.get('model_name')
+        parts[table] = {
+            'df': df,
+            'ids': df[id_col].tolist(),
+            'id_array': df[id_col].to_numpy(dtype=np.int64),
+            'index': {part_id: i for i, part_id in enumerate(df[id_col].tolist())},
+            'names': names.tolist() if names is not None else [None] * len(df),
+            'scores': _part_scores(table, df),
+            'prices': _part_prices(df)
+        }
+
+    relations = {}
+    specs = {name: spec[:4] for name, spec in PAIR_TABLES.items()}
+    specs.update(OPTIONAL_RELATIONS)
+    for name, (left_table, left_id, right_table, right_id) in specs.items():
+        if not _relation_computed(conn, name):
+            # 테이블이 없거나 비어 있으면 아직 계산하지 않은 관계 (예: mb_storage) -> 모든 견적이 막히지 않도록 제외
+            if name not in OPTIONAL_RELATIONS:
+                logging.warning(f"{name} 테이블이 없거나 비어 있어 견적 제약에서 제외합니다.")
+            continue
+        # 계산했지만 호환 쌍이 없는 관계는 그대로 두어 (비트셋이 모두 0) 가능한 견적이 없다고 답함
+        left_values, right_values = _read_pairs(conn, name, left_id, right_id)
+        forward, backward = _adjacency(parts[left_table]['id_array'], parts[right_table]['id_array'],
+                                       left_values, right_values)
+        relations[name] = (left_table, right_table, forward, backward)
+
+    return {'parts': parts, 'relations': relations}
+
+# DB 파일(절대 경로)별 솔버 데이터 ('version' 키에 읽은 카탈로그 버전)
+_solver_data = {}
+_solver_data_lock = threading.Lock()
+
+def get_solver_data(db_path=DB_PATH):
+    """DB 파일의 솔버 데이터 (연결 풀이 읽는 카탈로그 버전이 바뀌었을 때만 load_solver_data 로 다시 읽음)"""
+    key = os.path.abspath(db_path)
+    pool = get_pool(key)
+    cached = _solver_data.get(key)
+    if cached and cached['version'] == pool.version():
+        return cached
+    with _solver_data_lock:
+        cursor, version = pool.checkout()
+        try:
+            cached = _solver_data.get(key)
+            if cached and cached['version'] == version:
+                return cached
+            started = time.time()
+            data = load_solver_data(cursor)
+        finally:
+            pool.checkin(cursor, version)
+        data['version'] = version
+        _solver_data[key] = data
+        logging.info(f"견적 솔버 데이터 읽기: 호환성 관계 {len(data['relations'])}개, {time.time() - started:.2f}초")
+        return data
+
+def _neighbors(relations, tables):
+    """부품 테이블별 (상대 테이블, 인접 비트셋 목록) 목록"""
+    neighbors = {table: [] for table in tables}
+    for left_table, right_table, forward, backward in relations.values():
+        if left_table not in neighbors or right_table not in neighbors:
+            continue
+        neighbors[left_table].append((right_table, forward))
+        neighbors[right_table].append((left_table, backward))
+    return neighbors
+
+def _initial_domains(parts, requirements, fixed_parts, budget):
+    """요구사항/고정 부품/예산으로 부품별 후보 비트셋 생성"""
+    domains = {}
+    for table, data in parts.items():
+        allowed = np.ones(len(data['ids']), dtype=bool)
+        for key, value in requirements.items():
+            if value is None:
+                continue
+            req_table, column = REQUIREMENT_COLUMNS[key]
+            if req_table == table:
+                allowed &= np.nan_to_num(_numeric(data['df'], column), nan=-np.inf) >= value
+        if table in fixed_parts:
+            fixed_index = data['index'].get(fixed_parts[table])
+            allowed[:] = False
+            if fixed_index is not None:
+                allowed[fixed_index] = True
+        if budget is not None:
+            allowed &= np.nan_to_num(data['prices'], nan=np.inf) <= budget
+        domains[table] = _bitsets(allowed[None, :])[0]
+    return domains
+
+def _propagate(domains, neighbors):
+    """arc consistency: 어떤 이웃 부품과도 호환되지 않는 후보를 반복 제거"""
+    changed = True
+    while changed:
+        changed = False
+        for table, links in neighbors.items():
+            domain = domains[table]
+            for index in _iter_bits(domains[table]):
+                if any(not (adjacency[index] & domains[other]) for other, adjacency in links):
+                    domain &= ~(1 << index)
+            if domain != domains[table]:
+                domains[table] = domain
+                changed = True
+            if not domain:
+                return False
+    return True
+
+def solve_builds(conn=None, data=None, top_k=5, budget=None, requirements=None, fixed_parts=None, objective='performance'):
+    """호환되는 8개 부품 조합 중 상위 top_k개를 반환합니다.
+
+    - budget: 총 가격 상한 (부품 테이블에 가격 컬럼이 있을 때만 적용)
+    - requirements: {'min_vram': 16, 'min_cores': 8, ...} (REQUIREMENT_COLUMNS 참고)
+    - fixed_parts: {'cpu': 12} 처럼 특정 부품을 고정
+    - objective: 'performance' (성능 점수 최대화) 또는 'price' (총 가격 최소화)
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k 는 1 이상이어야 합니다: {top_k}")
+    if data is None:
+        data = load_solver_data(conn)
+    parts = data['parts']
+    requirements = requirements or {}
+    fixed_parts = fixed_parts or {}
+
+    unknown = set(requirements) - set(REQUIREMENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 요구사항: {sorted(unknown)}")
+
+    has_prices = all(parts[table]['prices'] is not None for table in SOLVER_PARTS)
+    if (budget is not None or objective == 'price') and not has_prices:
+        logging.warning("부품 테이블에 가격 컬럼이 없어 예산/가격 조건을 적용하지 않습니다.")
+        budget = None
+        objective = 'performance'
+
+    # 부품이 하나도 없는 테이블(예: storage 미적재)은 조합에서 제외
+    tables = [table for table in SOLVER_PARTS if parts[table]['ids']]
+    neighbors = _neighbors(data['relations'], tables)
+    domains = _initial_domains(parts, requirements, fixed_parts, budget)
+    domains = {table: domains[table] for table in tables}
+    if not all(domains.values()) or not _propagate(domains, neighbors):
+        return []
+
+    # 목적 함수: 클수록 좋은 값 (가격 최소화는 음수 가격)
+    if objective == 'price':
+        values = {table: -np.nan_to_num(parts[table]['prices']) for table in tables}
+    else:
+        values = {table: parts[table]['scores'] for table in tables}
+    prices = {table: np.nan_to_num(parts[table]['prices']) if has_prices else np.zeros(len(parts[table]['ids']))
+              for table in tables}
+
+    # 후보를 목적 값 내림차순으로 정렬하고, 남은 부품들의 최대 기여도/최소 가격을 미리 계산
+    order = {table: sorted(_iter_bits(domains[table]), key=lambda i, t=table: -values[t][i]) for table in tables}
+    best_rest = [0.0] * (len(tables) + 1)
+    cheapest_rest = [0.0] * (len(tables) + 1)
+    for depth in range(len(tables) - 1, -1, -1):
+        candidates = order[tables[depth]]
+        best_rest[depth] = best_rest[depth + 1] + max(values[tables[depth]][i] for i in candidates)
+        cheapest_rest[depth] = cheapest_rest[depth + 1] + min(prices[tables[depth]][i] for i in candidates)
+
+    # 부품 테이블 쌍별 인접 비트셋 (나중에 선택할 부품 방향)
+    position = {table: depth for depth, table in enumerate(tables)}
+    later_links = {
+        table: [(other, adjacency) for other, adjacency in neighbors[table] if position[other] > position[table]]
+        for table in tables
+    }
+
+    def best_value(table, mask):
+        """후보 비트셋 안에서 가장 큰 목적 값 (정렬 순서상 처음 만나는 후보)"""
+        for index in order[table]:
+            if (mask >> index) & 1:
+                return values[table][index]
+        return None
+
+    heap = []  # (value, -price, counter, assignment) 최소 힙
+    counter = [0]
+    assignment = {}
+
+    def search(depth, value, price, masks):
+        if depth == len(tables):
+            counter[0] += 1
+            entry = (value, -price, counter[0], dict(assignment))
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            else:
+                heapq.heappushpop(heap, entry)
+            return
+
+        table = tables[depth]
+        for index in order[table]:
+            if not (masks[table] >> index) & 1:
+                continue
+            next_value = value + values[table][index]
+            # 남은 부품의 최대 기여도를 더해도 현재 K번째보다 나쁘면 가지치기
+            if len(heap) == top_k and next_value + best_rest[depth + 1] <= heap[0][0] + SCORE_EPSILON:
+                break  # 정렬되어 있으므로 이후 후보도 모두 가지치기 대상
+            next_price = price + prices[table][index]
+            if budget is not None and next_price + cheapest_rest[depth + 1] > budget:
+                continue
+
+            # 전방 검사: 선택한 부품과 호환되지 않는 후보를 이후 부품 후보에서 제거
+            next_masks = dict(masks)
+            feasible = True
+            for other, adjacency in later_links[table]:
+                next_masks[other] &= adjacency[index]
+                if not next_masks[other]:
+                    feasible = False
+                    break
+            if not feasible:
+                continue
+            if len(heap) == top_k:
+                bound = next_value + sum(best_value(t, next_masks[t]) for t in tables[depth + 1:])
+                if bound <= heap[0][0] + SCORE_EPSILON:
+                    continue
+
+            assignment[table] = index
+            search(depth + 1, next_value, next_price, next_masks)
+            del assignment[table]
+
+    search(0, 0.0, 0.0, dict(domains))
+
+    builds = []
+    for value, neg_price, _, chosen in sorted(heap, key=lambda entry: (-entry[0], -entry[1])):
+        build = {
+            'score': round(float(sum(parts[t]['scores'][i] for t, i in chosen.items())), 4),
+            'total_price': float(-neg_price) if has_prices else None,
+            'parts': {}
+        }
+        for table, index in chosen.items():
+            build['parts'][table] = {
+                'id': parts[table]['ids'][index],
+                'name': parts[table]['names'][index]
+            }
+        builds.append(build)
+    return builds
+
+def format_builds(builds):
+    """견적 목록을 에이전트 프롬프트/응답용 텍스트로 변환"""
+    if not builds:
+        return "조건을 만족하는 호환 조합이 없습니다."
+    lines = []
+    for rank, build in enumerate(builds, 1):
+        header = f"[추천 {rank}] 성능 점수 {build['score']}"
+        if build['total_price'] is not None:
+            header += f", 총 가격 {build['total_price']:,.0f}원"
+        lines.append(header)
+        for table, part in build['parts'].items():
+            lines.append(f"  - {table}: {part['name']} (id={part['id']})")
+    return "\n".join(lines)
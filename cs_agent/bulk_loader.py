@@ -0,0 +1,265 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+from spec_normalize import map_uniques
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# 부품 엑셀 -> DuckDB 일괄 적재
+# 05-x 로더가 행마다 INSERT 하던 방식을 대신해, 시트를 컬럼 단위(벡터화)로 변환한 뒤
+# Arrow 테이블로 등록해 INSERT ... SELECT 한 번으로 적재합니다 (pyarrow 가 없거나 변환할 수 없는 열이 있으면 DataFrame 그대로 등록).
+# 타입 변환/제약 조건에 걸린 행은 건너뛰고 rejected_rows 테이블에 사유와 원본 값을 남깁니다.
+
+REJECTED_TABLE = 'rejected_rows'
+
+# 숫자 추출 패턴 (천 단위 콤마, 소수점 포함: "1,200(W)" -> 1200, "4.2(GHz)" -> 4.2)
+NUMBER_PATTERN = r'(\d+(?:,\d{3})*(?:\.\d+)?)'
+
+TRUE_VALUES = ['true', 'yes', '1', 'y', 't', '예', '지원', 'o', '있음']
+FALSE_VALUES = ['false', 'no', '0', 'n', 'f', '아니오', '미지원', 'x', '없음', '-']
+
+def _is_text(series):
+    """문자열 값 여부 마스크"""
+    return series.map(lambda value: isinstance(value, str)).astype(bool)
+
+def clean_series(series):
+    """NaN/빈 값을 None으로 바꾼 object Series"""
+    return series.astype(object).where(series.notna(), None)
+
+def to_number_series(series, integer=False, round_values=False, pattern=NUMBER_PATTERN):
+    """문자열에서 첫 번째 숫자를 추출해 숫자 Series로 변환 (숫자 값은 그대로 사용)
+
+    integer=True 이면 소수점 이하를 버리고, round_values=True 이면 반올림합니다.
+    """
+    text_mask = _is_text(series)
+    numbers = pd.to_numeric(series.where(~text_mask), errors='coerce').astype(float)
+    if text_mask.any():
+        # 같은 문자열이 반복되므로 고유값에서만 추출
+        numbers[text_mask] = map_uniques(
+            series[text_mask],
+            lambda uniques: pd.to_numeric(uniques.str.extract(pattern, expand=False).str.replace(',', '', regex=False), errors='coerce'),
+            dtype=float
+        ).to_numpy()
+    if round_values:
+        numbers = numbers.round()
+    elif integer:
+        numbers = np.trunc(numbers)
+    if integer or round_values:
+        return numbers.astype('Int64')
+    return numbers
+
+def to_bool_series(series, true_values=TRUE_VALUES, false_values=FALSE_VALUES):
+    """불리언 Series로 변환
+
+    false_values=None 이면 true_values에 없는 문자열은 모두 False로 처리합니다.
+    """
+    result = pd.Series(pd.NA, index=series.index, dtype='boolean')
+    notna = series.notna()
+    text_mask = _is_text(series)
+    other = notna & ~text_mask
+    result[other] = series[other].astype(bool)
+    if text_mask.any():
+        text = series[text_mask].str.strip().str.lower()
+        result[text.index[text.isin(true_values)]] = True
+        if false_values is None:
+            result[text.index[~text.isin(true_values)]] = False
+        else:
+            result[text.index[text.isin(false_values)]] = False
+    return result
+
+def to_text_series(series):
+    """문자열 Series로 변환 (엑셀에서 숫자로 읽힌 값 포함)"""
+    def as_text(value):
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+    values = [None if value is None else as_text(value) for value in clean_series(series)]
+    return pd.Series(values, index=series.index, dtype=object)
+
+def map_columns(df, column_mapping):
+    """엑셀 컬럼 -> DB 컬럼 매핑으로 새 DataFrame 생성
+
+    같은 DB 컬럼에 여러 엑셀 컬럼이 매핑되면 뒤쪽 매핑을 우선하고, 값이 없으면 앞쪽 값을 사용합니다.
+    """
+    mapped = pd.DataFrame(index=df.index)
+    for excel_col, db_col in column_mapping.items():
+        if db_col is None or excel_col not in df.columns:
+            continue
+        values = clean_series(df[excel_col])
+        if db_col in mapped.columns:
+            values = values.where(values.notna(), mapped[db_col])
+        mapped[db_col] = values
+    return mapped
+
+def dedupe_names(series):
+    """중복 모델명에 일련번호 부여 (두 번째부터 "이름 (1)", "이름 (2)" ...)"""
+    counter = series.groupby(series, sort=False).cumcount()
+    return series.where(counter == 0, series.astype(str) + ' (' + counter.astype(str) + ')')
+
+def to_arrow(frame):
+    """DuckDB 에 등록할 Arrow 테이블 (pyarrow 가 없거나 한 열에 문자열/숫자가 섞여 변환할 수 없으면 DataFrame 그대로)"""
+    if pa is None:
+        return frame
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return frame
+
+def get_column_types(conn, table_name):
+    """테이블 컬럼 -> DuckDB 타입"""
+    return {col[0]: col[1] for col in conn.execute(f'DESCRIBE "{table_name}"').fetchall()}
+
+def default_converter(col_type):
+    """DB 컬럼 타입별 기본 변환 함수"""
+    col_type = col_type.upper()
+    if 'BOOL' in col_type:
+        return to_bool_series
+    if 'INT' in col_type:
+        return lambda series: to_number_series(series, integer=True)
+    if any(name in col_type for name in ('FLOAT', 'DOUBLE', 'DECIMAL', 'REAL')):
+        return to_number_series
+    if 'CHAR' in col_type or 'TEXT' in col_type:
+        return to_text_series
+    return clean_series
+
+def coerce_to_schema(frame, column_types, converters=None):
+    """DB 컬럼 타입에 맞춰 컬럼 단위로 변환
+
+    converters 에 지정한 컬럼은 해당 함수를, 나머지는 타입별 기본 변환을 사용합니다.
+    """
+    converters = converters or {}
+    result = pd.DataFrame(index=frame.index)
+    for column in frame.columns:
+        if column not in column_types:
+            continue
+        convert = converters.get(column) or default_converter(column_types[column])
+        result[column] = convert(frame[column])
+    return result
+
+def ensure_rejected_table(conn):
+    """적재 실패 행 기록 테이블 생성"""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {REJECTED_TABLE} (
+            table_name VARCHAR,
+            source_row INTEGER,
+            reason VARCHAR,
+            raw_data VARCHAR,
+            rejected_at TIMESTAMP
+        )
+    """)
+
+def _raw_json(row):
+    """원본 행을 JSON 문자열로 변환"""
+    values = {}
+    for key, value in row.items():
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            continue
+        values[str(key)] = value.item() if hasattr(value, 'item') else value
+    return json.dumps(values, ensure_ascii=False, default=str)
+
+def record_rejected_rows(conn, table_name, source, reason):
+    """적재하지 않은 원본 행을 사유와 함께 rejected_rows 에 기록"""
+    if source.empty:
+        return 0
+    ensure_rejected_table(conn)
+    rejected = pd.DataFrame({
+        'table_name': table_name,
+        'source_row': source.index.astype(int),
+        'reason': reason if isinstance(reason, str) else list(reason),
+        'raw_data': [_raw_json(row) for _, row in source.iterrows()]
+    })
+    conn.register('rejected_rows_df', rejected)
+    conn.execute(f"INSERT INTO {REJECTED_TABLE} SELECT table_name, source_row, reason, raw_data, now() FROM rejected_rows_df")
+    conn.unregister('rejected_rows_df')
+    return len(rejected)
+
+def clear_rejected_rows(conn, table_name):
+    """이전 적재에서 기록된 실패 행 삭제"""
+    ensure_rejected_table(conn)
+    conn.execute(f"DELETE FROM {REJECTED_TABLE} WHERE table_name = ?", [table_name])
+
+def get_key_constraints(conn, table_name):
+    """테이블의 NOT NULL 컬럼 목록과 PRIMARY KEY/UNIQUE 컬럼 묶음 목록"""
+    rows = conn.execute(
+        "SELECT constraint_type, constraint_column_names FROM duckdb_constraints() WHERE table_name = ?",
+        [table_name]
+    ).fetchall()
+    not_null = [columns[0] for kind, columns in rows if kind == 'NOT NULL']
+    unique = [list(columns) for kind, columns in rows if kind in ('PRIMARY KEY', 'UNIQUE')]
+    return not_null, unique
+
+def bulk_insert(conn, table_name, frame, source=None, order_by=None):
+    """변환된 DataFrame을 Arrow 테이블로 등록해 INSERT ... SELECT 한 번으로 적재합니다.
+
+    DB 타입으로 변환할 수 없는 값이 있거나, 필수 값이 비어 있거나, 기본 키/UNIQUE 값이
+    중복(시트 내 또는 기존 데이터와)된 행은 적재하지 않고 rejected_rows 에 기록합니다.
+    시트 내 중복은 먼저 나온 행을 적재합니다. frame 의 index 는 원본 시트의 행 번호여야 합니다.
+    order_by 컬럼을 주면 그 순서(결측은 마지막)로 행을 저장합니다 (정렬 배치).
+    반환값: {'inserted', 'rejected'}
+    """
+    column_types = get_column_types(conn, table_name)
+    columns = [col for col in frame.columns if col in column_types]
+    not_null, unique = get_key_constraints(conn, table_name)
+
+    staged = frame[columns].copy()
+    staged['__source_row'] = frame.index.astype(int)
+    conn.register('bulk_frame_df', to_arrow(staged))
+
+    # 컬럼별 타입 변환 실패 여부를 한 번에 계산
+    checks = [
+        f"CASE WHEN \"{col}\" IS NOT NULL AND TRY_CAST(\"{col}\" AS {column_types[col]}) IS NULL "
+        f"THEN '{col} 타입 변환 실패({column_types[col]})' END"
+        for col in columns
+    ]
+    checks += [
+        f"CASE WHEN \"{col}\" IS NULL THEN '{col} 없음' END" if col in columns else f"'{col} 없음'"
+        for col in not_null
+    ]
+    for key in unique:
+        if not all(col in columns for col in key):
+            continue
+        key_list = ', '.join(f'"{col}"' for col in key)
+        key_label = ', '.join(key)
+        key_present = ' AND '.join(f'"{col}" IS NOT NULL' for col in key)
+        key_match = ' AND '.join(f't."{col}" = b."{col}"' for col in key)
+        checks.append(
+            f"CASE WHEN ROW_NUMBER() OVER (PARTITION BY {key_list} ORDER BY __source_row) > 1 "
+            f"AND {key_present} THEN '{key_label} 중복' END"
+        )
+        checks.append(
+            f"CASE WHEN EXISTS (SELECT 1 FROM \"{table_name}\" t WHERE {key_match}) "
+            f"THEN '{key_label} 기존 데이터와 중복' END"
+        )
+    reason_expr = f"concat_ws(', ', {', '.join(checks)})" if checks else "''"
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE bulk_checked AS
+        SELECT *, {reason_expr} AS __reason FROM bulk_frame_df b
+    """)
+    conn.unregister('bulk_frame_df')
+
+    bad = conn.execute(
+        "SELECT __source_row, __reason FROM bulk_checked WHERE __reason <> '' ORDER BY __source_row"
+    ).fetchall()
+    if bad:
+        source = frame if source is None else source
+        rows, reasons = zip(*bad)
+        record_rejected_rows(conn, table_name, source.loc[list(rows)], reasons)
+        for row, reason in bad[:20]:
+            logging.warning(f"{table_name} 행 #{row} 적재 제외: {reason}")
+
+    column_list = ', '.join(f'"{col}"' for col in columns)
+    select_list = ', '.join(f'CAST("{col}" AS {column_types[col]})' for col in columns)
+    order_list = '__source_row'
+    if order_by in columns:
+        order_list = f'CAST("{order_by}" AS {column_types[order_by]}) NULLS LAST, __source_row'
+    conn.execute(f"""
+        INSERT INTO "{table_name}" ({column_list})
+        SELECT {select_list} FROM bulk_checked WHERE __reason = '' ORDER BY {order_list}
+    """)
+    inserted = conn.execute("SELECT COUNT(*) FROM bulk_checked WHERE __reason = ''").fetchone()[0]
+    conn.execute("DROP TABLE bulk_checked")
+    return {'inserted': inserted, 'rejected': len(bad)}
@@ -0,0 +1,124 @@
+import os
+import sys
+import shutil
+import logging
+import subprocess
+import duckdb
+from part_loader import DB_PATH, LOAD_ORDER, setup_logging, run_loaders
+from compatibility_engine import PAIR_TABLES
+
+# 카탈로그 갱신 (스테이징 DB 파일 교체 방식)
+# 05-x 로더처럼 운영 DB에서 바로 DELETE 후 다시 넣으면, 갱신 중에 에이전트
+# (pc_check_func.sql, 06_Text2SQL.execute_queries)가 빈 테이블이나 일부만 적재된 테이블을 보게 됩니다.
+# DuckDB는 쓰기 연결이 파일을 잠그므로, 같은 파일 안의 섀도 테이블로는 다른 프로세스의 읽기를 막게 됩니다.
+# 그래서 운영 DB를 복사한 스테이징 파일에 부품 적재 + 호환성 재계산을 모두 마친 뒤,
+# 검증을 통과하면 os.replace 로 파일을 한 번에 교체합니다.
+#   - 교체 전: 읽기 쪽은 기존 파일만 보고, 잠금 경합도 없습니다.
+#   - 교체 후: 새로 연결하는 쿼리부터 새 카탈로그를 봅니다. 이미 열린 연결은 끝날 때까지 기존 파일을 읽습니다.
+#     (같은 프로세스에 열린 연결이 남아 있으면 DuckDB가 기존 인스턴스를 재사용하므로, 에이전트가 쓰는 db_pool 은
+#      파일 버전이 바뀌면 빌려 간 커서가 모두 반납된 뒤 연결을 다시 엽니다.)
+#
+# 사용법: python cs_agent/catalog_refresh.py [--sparse] [--full] [테이블명 ...]
+
+COMPATIBILITY_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '05-8_Insert_compatibility.py')
+
+def staging_path_for(live_path):
+    """운영 DB에 대응하는 스테이징 DB 경로"""
+    return f"{live_path}.staging"
+
+def _remove_db_files(path):
+    """DB 파일과 WAL 파일 삭제"""
+    for file_path in [path, f"{path}.wal"]:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+def create_staging_copy(live_path, staging_path):
+    """운영 DB 파일을 스테이징 파일로 복사합니다.
+
+    운영 DB에 WAL 파일이 있으면 체크포인트되지 않은 쓰기가 있다는 뜻이므로 복사하지 않습니다.
+    """
+    if os.path.exists(f"{live_path}.wal"):
+        raise RuntimeError(f"{live_path}.wal 이 존재합니다. 다른 쓰기 작업이 끝난 뒤 다시 실행하세요.")
+    _remove_db_files(staging_path)
+    shutil.copyfile(live_path, staging_path)
+    logging.info(f"스테이징 DB 생성: {staging_path}")
+
+def rebuild_compatibility(staging_path, sparse=False, full=False):
+    """스테이징 DB에서 05-8 호환성 재계산 실행 (실패 시 예외)"""
+    command = [sys.executable, COMPATIBILITY_SCRIPT, '--db', staging_path]
+    if sparse:
+        command.append('--sparse')
+    if full:
+        command.append('--full')
+    logging.info(f"호환성 재계산: {' '.join(command)}")
+    subprocess.run(command, check=True)
+
+def validate_staging(staging_path, tables):
+    """교체 전 검증: 적재한 부품 테이블이 비어 있지 않은지 확인하고 행 수를 반환합니다.
+
+    양쪽 부품이 모두 있는데 비어 있는 호환성 테이블(05-8 이 계산하지 못한 테이블)이 있어도 교체하지 않습니다.
+    """
+    with duckdb.connect(staging_path, read_only=True) as conn:
+        counts = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+        empty = [table for table, count in counts.items() if count == 0]
+        if empty:
+            raise RuntimeError(f"스테이징 DB에 비어 있는 부품 테이블이 있어 교체하지 않습니다: {', '.join(empty)}")
+
+        existing = {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+        empty_pairs = []
+        for pair_table, (left_table, _, right_table, _, _) in PAIR_TABLES.items():
+            if pair_table not in existing or not {left_table, right_table} <= existing:
+                continue
+            has_parts = all(
+                conn.execute(f'SELECT COUNT(*) FROM (SELECT 1 FROM "{table}" LIMIT 1)').fetchone()[0]
+                for table in [left_table, right_table]
+            )
+            if has_parts and not conn.execute(f'SELECT COUNT(*) FROM (SELECT 1 FROM {pair_table} LIMIT 1)').fetchone()[0]:
+                empty_pairs.append(pair_table)
+    if empty_pairs:
+        raise RuntimeError(f"스테이징 DB에 비어 있는 호환성 테이블이 있어 교체하지 않습니다: {', '.join(empty_pairs)}")
+    return counts
+
+def swap_in(staging_path, live_path, keep_backup=True):
+    """스테이징 DB를 운영 DB 경로로 원자적으로 교체합니다.
+
+    keep_backup=True 이면 교체 직전 운영 DB를 {live_path}.prev 로 남깁니다 (하드 링크, 복사 없음).
+    """
+    if os.path.exists(f"{staging_path}.wal"):
+        raise RuntimeError(f"{staging_path}.wal 이 남아 있습니다. 스테이징 연결이 모두 닫혔는지 확인하세요.")
+    if os.path.exists(f"{live_path}.wal"):
+        raise RuntimeError(f"{live_path}.wal 이 존재합니다. 운영 DB에 쓰기 작업이 진행 중입니다.")
+    if keep_backup and os.path.exists(live_path):
+        backup_path = f"{live_path}.prev"
+        _remove_db_files(backup_path)
+        os.link(live_path, backup_path)
+    os.replace(staging_path, live_path)
+    logging.info(f"운영 DB 교체 완료: {staging_path} -> {live_path}")
+
+def refresh_catalog(tables=None, live_path=DB_PATH, sparse=False, full=False):
+    """스테이징 DB에서 부품 적재와 호환성 재계산을 마친 뒤 운영 DB와 교체합니다.
+
+    중간에 실패하면 스테이징 파일만 지우고 운영 DB는 그대로 둡니다. 교체 후 부품 테이블 행 수를 반환합니다.
+    """
+    tables = tables or LOAD_ORDER
+    staging_path = staging_path_for(live_path)
+    create_staging_copy(live_path, staging_path)
+    try:
+        results = run_loaders(tables, db_path=staging_path)
+        loaded = [table for table, stats in results.items() if stats is not None]
+        rebuild_compatibility(staging_path, sparse=sparse, full=full)
+        counts = validate_staging(staging_path, loaded)
+    except Exception as e:
+        logging.error(f"카탈로그 갱신 실패 (운영 DB는 변경되지 않음): {str(e)}")
+        _remove_db_files(staging_path)
+        raise
+    swap_in(staging_path, live_path)
+    for table, count in counts.items():
+        logging.info(f"{table}: {count}개")
+    return counts
+
+if __name__ == "__main__":
+    log_filename = setup_logging("catalog_refresh")
+    tables = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    refresh_catalog(tables or None, sparse='--sparse' in sys.argv, full='--full' in sys.argv)
+    print(f"로그 파일이 {log_filename}에 저장되었습니다.")
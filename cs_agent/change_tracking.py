@@ -0,0 +1,137 @@
+import pandas as pd
+
+# 부품 행 변경 추적
+# 05-x 로더가 삽입을 마친 뒤 행별 내용 해시를 part_row_hashes 에 기록하고,
+# 05-8 호환성 빌더는 마지막 계산 당시의 해시(compatibility_row_state)와 비교해
+# 추가/변경/삭제된 부품만 다시 계산합니다.
+
+HASH_TABLE = 'part_row_hashes'
+STATE_TABLE = 'compatibility_row_state'
+
+# 부품 테이블 -> 기본 키 컬럼
+PART_ID_COLUMNS = {
+    'cpu': 'cpu_id',
+    'motherboard': 'mb_id',
+    'memory': 'memory_id',
+    'gpu': 'gpu_id',
+    'power_supply': 'psu_id',
+    'case_chassis': 'case_id',
+    'cpu_cooler': 'cooler_id',
+    'storage': 'storage_id'
+}
+
+def ensure_tracking_tables(conn):
+    """변경 추적용 테이블 생성"""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {HASH_TABLE} (
+            table_name VARCHAR,
+            part_id INTEGER,
+            row_hash VARCHAR,
+            updated_at TIMESTAMP,
+            PRIMARY KEY (table_name, part_id)
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+            compatibility_table VARCHAR,
+            side VARCHAR,
+            part_id INTEGER,
+            row_hash VARCHAR,
+            PRIMARY KEY (compatibility_table, side, part_id)
+        )
+    """)
+
+def update_row_hashes(conn, table_name):
+    """부품 테이블의 행별 내용 해시(기본 키 제외)를 part_row_hashes 에 기록합니다.
+
+    내용이 바뀐 행만 updated_at 이 갱신되며, 추가/변경/삭제 건수를 반환합니다.
+    """
+    ensure_tracking_tables(conn)
+    id_col = PART_ID_COLUMNS[table_name]
+    columns = [col[1] for col in conn.execute(f"PRAGMA table_info({table_name})").fetchall() if col[1] != id_col]
+    content = ", ".join(f"COALESCE(CAST(\"{col}\" AS VARCHAR), '')" for col in columns)
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE new_row_hashes AS
+        SELECT {id_col} AS part_id, md5(concat_ws('|', {content})) AS row_hash
+        FROM "{table_name}"
+    """)
+    inserted, changed = conn.execute(f"""
+        SELECT
+            COUNT(*) FILTER (WHERE h.part_id IS NULL),
+            COUNT(*) FILTER (WHERE h.part_id IS NOT NULL AND h.row_hash <> n.row_hash)
+        FROM new_row_hashes n
+        LEFT JOIN {HASH_TABLE} h ON h.table_name = ? AND h.part_id = n.part_id
+    """, [table_name]).fetchone()
+    deleted = conn.execute(f"""
+        SELECT COUNT(*) FROM {HASH_TABLE}
+        WHERE table_name = ? AND part_id NOT IN (SELECT part_id FROM new_row_hashes)
+    """, [table_name]).fetchone()[0]
+
+    conn.execute(f"""
+        DELETE FROM {HASH_TABLE}
+        WHERE table_name = ? AND part_id NOT IN (SELECT part_id FROM new_row_hashes)
+    """, [table_name])
+    conn.execute(f"""
+        INSERT OR REPLACE INTO {HASH_TABLE}
+        SELECT ?, n.part_id, n.row_hash, now()
+        FROM new_row_hashes n
+        LEFT JOIN {HASH_TABLE} h ON h.table_name = ? AND h.part_id = n.part_id
+        WHERE h.part_id IS NULL OR h.row_hash <> n.row_hash
+    """, [table_name, table_name])
+    conn.execute("DROP TABLE new_row_hashes")
+
+    return {'inserted': inserted, 'changed': changed, 'deleted': deleted}
+
+def load_row_hashes(conn, table_name, df=None, id_col=None):
+    """부품 테이블의 현재 행 해시를 {part_id: row_hash} 로 반환합니다.
+
+    로더가 기록한 해시가 없으면 DataFrame 내용으로 직접 계산합니다.
+    """
+    ensure_tracking_tables(conn)
+    rows = conn.execute(
+        f"SELECT part_id, row_hash FROM {HASH_TABLE} WHERE table_name = ?", [table_name]
+    ).fetchall()
+    if rows:
+        return dict(rows)
+    if df is None or df.empty:
+        return {}
+    content = df.drop(columns=[id_col])
+    hashes = pd.util.hash_pandas_object(content.astype(str), index=False).astype(str)
+    return dict(zip(df[id_col].tolist(), hashes.tolist()))
+
+def load_state(conn, compatibility_table, side):
+    """호환성 테이블이 마지막으로 계산될 때의 부품 해시 {part_id: row_hash}"""
+    ensure_tracking_tables(conn)
+    rows = conn.execute(
+        f"SELECT part_id, row_hash FROM {STATE_TABLE} WHERE compatibility_table = ? AND side = ?",
+        [compatibility_table, side]
+    ).fetchall()
+    return dict(rows)
+
+def save_state(conn, compatibility_table, side, hashes):
+    """호환성 테이블 계산에 사용한 부품 해시를 저장합니다."""
+    ensure_tracking_tables(conn)
+    state = pd.DataFrame({
+        'compatibility_table': compatibility_table,
+        'side': side,
+        'part_id': list(hashes.keys()),
+        'row_hash': list(hashes.values())
+    })
+    conn.execute(
+        f"DELETE FROM {STATE_TABLE} WHERE compatibility_table = ? AND side = ?",
+        [compatibility_table, side]
+    )
+    if not state.empty:
+        conn.register('row_state_df', state)
+        conn.execute(f"INSERT INTO {STATE_TABLE} SELECT * FROM row_state_df")
+        conn.unregister('row_state_df')
+
+def diff_rows(current, previous):
+    """현재/이전 해시를 비교해 (추가, 변경, 삭제) ID 집합을 반환합니다."""
+    current_ids = set(current)
+    previous_ids = set(previous)
+    inserted = current_ids - previous_ids
+    deleted = previous_ids - current_ids
+    changed = {part_id for part_id in current_ids & previous_ids if current[part_id] != previous[part_id]}
+    return inserted, changed, deleted
@@ -0,0 +1,482 @@
+import numpy as np
+import pandas as pd
+from change_tracking import load_row_hashes, load_state, save_state, diff_rows
+from spec_normalize import normalize_socket, normalize_form_factor, to_mm, to_watts
+
+# 호환성 벡터 엔진
+# 각 부품 테이블을 한 번만 정규화한 뒤(소켓, 폼팩터, mm 치수, W 전력)
+# 고유값 단위의 작은 행렬을 만들고 NumPy 브로드캐스팅으로 N x M 호환성 행렬을 계산합니다.
+# 정규화는 spec_normalize 를 사용하며, 부품 테이블에 저장된 정규화 컬럼(socket_norm, 소켓/파워 규격 비트마스크 등)을
+# 넘기면 normalized=True 로 다시 정규화하지 않습니다.
+# 05-8_Insert_compatibility.py 의 update_*_compatibility() 가 사용하는 공용 모듈입니다.
+
+# 소켓 패밀리 호환성 (예: LGA1200과 LGA1155 등)
+SOCKET_COMPATIBILITY = {
+    "LGA1700": ["LGA1700"],
+    "LGA1200": ["LGA1200", "LGA1151", "LGA1150"],
+    "LGA1151": ["LGA1151", "LGA1150", "LGA1155"],
+    "LGA1150": ["LGA1150", "LGA1155", "LGA1156"],
+    "LGA1155": ["LGA1155", "LGA1156"],
+    "LGA2066": ["LGA2066"],
+    "AM4": ["AM4"],
+    "AM5": ["AM5"]
+}
+
+# 소켓 판정 결과 (코드 -> 이유)
+SOCKET_REASONS = {
+    0: "소켓 정보 부족",
+    1: "소켓 일치",
+    2: "소켓 패밀리 호환",
+    3: "소켓 불일치"
+}
+
+# 호환성 이유 코드 사전 (compatibility_reason_codes 테이블로 저장됨)
+# 코드 -> (설명, 호환 여부)
+REASON_CODES = {
+    0: ("소켓 정보 부족", False),
+    1: ("소켓 일치", True),
+    2: ("소켓 패밀리 호환", True),
+    3: ("소켓 불일치", False),
+    10: ("쿨러 지원 소켓 포함", True),
+    20: ("쿨러 장착 높이 이내", True),
+    30: ("케이스 보드 규격 지원", True),
+    40: ("메모리 규격 일치", True),
+    50: ("VGA 장착 길이 이내", True),
+    60: ("케이스 파워 규격 지원", True),
+    70: ("권장 파워 충족", True),
+    99: ("비호환", False)
+}
+
+# 호환성 테이블 메타데이터
+# 테이블 -> (왼쪽 부품 테이블, 왼쪽 ID, 오른쪽 부품 테이블, 오른쪽 ID, 호환 시 이유 코드)
+PAIR_TABLES = {
+    'cpu_mb_compatibility': ('cpu', 'cpu_id', 'motherboard', 'mb_id', None),
+    'cpu_cooler_compatibility': ('cpu', 'cpu_id', 'cpu_cooler', 'cooler_id', 10),
+    'cooler_case_compatibility': ('cpu_cooler', 'cooler_id', 'case_chassis', 'case_id', 20),
+    'mb_case_compatibility': ('motherboard', 'mb_id', 'case_chassis', 'case_id', 30),
+    'mb_memory_compatibility': ('motherboard', 'mb_id', 'memory', 'memory_id', 40),
+    'gpu_case_compatibility': ('gpu', 'gpu_id', 'case_chassis', 'case_id', 50),
+    'psu_case_compatibility': ('power_supply', 'psu_id', 'case_chassis', 'case_id', 60),
+    'gpu_psu_compatibility': ('gpu', 'gpu_id', 'power_supply', 'psu_id', 70)
+}
+
+# 메인보드 폼팩터 값 -> 케이스 지원 컬럼 순서 (atx, matx, itx, eatx)
+MB_FORM_FACTOR_INDEX = {
+    'ATX': 0,
+    'm-ATX': 1,
+    'ITX': 2,
+    'E-ATX': 3
+}
+
+# 정규화한 폼팩터(spec_normalize.normalize_form_factor) -> 케이스 지원 컬럼 순서
+NORMALIZED_FORM_FACTOR_INDEX = {
+    'ATX': 0,
+    'MICROATX': 1,
+    'MINIITX': 2,
+    'EXTENDEDATX': 3
+}
+
+# 메인보드/메모리 공통 메모리 타입
+MEMORY_TYPES = ['DDR4', 'DDR5']
+
+# sparse 모드에서 한 번에 평가할 왼쪽 부품 수 (N x M 전체 행렬/DataFrame을 만들지 않도록 나눠서 호환 쌍만 모음)
+SPARSE_CHUNK_ROWS = 256
+
+def _as_text(series):
+    """결측값을 None으로 유지한 채 문자열 Series로 변환"""
+    series = pd.Series(series, copy=False).reset_index(drop=True)
+    return series.astype(object).where(series.notna(), None)
+
+# 정규화 함수는 spec_normalize 의 고유값 단위 변환을 사용 (기존 이름 유지)
+normalize_socket_series = normalize_socket
+normalize_form_factor_series = normalize_form_factor
+dimension_series_to_mm = to_mm
+power_series_to_watts = to_watts
+
+def _factorize(series):
+    """결측값을 -1 코드로 두고 고유값 코드를 반환"""
+    codes, uniques = pd.factorize(_as_text(series), use_na_sentinel=True)
+    return codes, list(uniques)
+
+def _expand(unique_matrix, left_codes, right_codes, fill):
+    """고유값 행렬을 전체 N x M 행렬로 펼침 (결측 코드는 fill 값)"""
+    padded = np.full((unique_matrix.shape[0] + 1, unique_matrix.shape[1] + 1), fill, dtype=unique_matrix.dtype)
+    padded[:-1, :-1] = unique_matrix
+    return padded[left_codes[:, None], right_codes[None, :]]
+
+def socket_matrix(cpu_sockets, mb_sockets, normalized=False):
+    """CPU 소켓 x 메인보드 소켓 호환성 행렬과 이유 코드 행렬을 계산합니다."""
+    if not normalized:
+        cpu_sockets, mb_sockets = normalize_socket_series(cpu_sockets), normalize_socket_series(mb_sockets)
+    cpu_codes, cpu_uniques = _factorize(cpu_sockets)
+    mb_codes, mb_uniques = _factorize(mb_sockets)
+
+    reason = np.full((len(cpu_uniques), len(mb_uniques)), 3, dtype=np.int8)
+    for i, cpu_socket in enumerate(cpu_uniques):
+        family = SOCKET_COMPATIBILITY.get(cpu_socket, [])
+        for j, mb_socket in enumerate(mb_uniques):
+            if cpu_socket == mb_socket:
+                reason[i, j] = 1
+            elif mb_socket in family:
+                reason[i, j] = 2
+
+    reason = _expand(reason, cpu_codes, mb_codes, 0)
+    return (reason == 1) | (reason == 2), reason
+
+def mask_matrix(left_masks, right_masks):
+    """정수 비트마스크 x 비트마스크 행렬 (겹치는 비트가 있으면 True, 값이 없으면 비호환)"""
+    left = pd.to_numeric(pd.Series(left_masks, copy=False), errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    right = pd.to_numeric(pd.Series(right_masks, copy=False), errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+    return (left[:, None] & right[None, :]) != 0
+
+def socket_support_matrix(cpu_sockets, socket_supports, normalized=False):
+    """CPU 소켓 x 쿨러 지원 소켓 문자열 포함 여부 행렬을 계산합니다.
+
+    normalized=True 이면 저장된 소켓 비트마스크(cpu.cooler_socket_mask, cpu_cooler.socket_support_mask)입니다.
+    """
+    if normalized:
+        return mask_matrix(cpu_sockets, socket_supports)
+    cpu_codes, cpu_uniques = _factorize(cpu_sockets)
+    cooler_codes, cooler_uniques = _factorize(socket_supports)
+
+    unique_matrix = np.zeros((len(cpu_uniques), len(cooler_uniques)), dtype=bool)
+    for i, cpu_socket in enumerate(cpu_uniques):
+        if not isinstance(cpu_socket, str):
+            continue
+        for j, support in enumerate(cooler_uniques):
+            if isinstance(support, str) and cpu_socket in support:
+                unique_matrix[i, j] = True
+
+    return _expand(unique_matrix, cpu_codes, cooler_codes, False)
+
+def fit_matrix(part_sizes, max_sizes):
+    """부품 치수 <= 케이스 허용 치수 행렬 (값이 없으면 비호환)"""
+    part_mm = dimension_series_to_mm(part_sizes)
+    max_mm = dimension_series_to_mm(max_sizes)
+    # NaN 비교는 항상 False이므로 결측값은 자동으로 비호환 처리됩니다.
+    return part_mm[:, None] <= max_mm[None, :]
+
+def form_factor_matrix(mb_form_factors, atx_support, matx_support, itx_support, eatx_support, normalized=False):
+    """메인보드 폼팩터 x 케이스 지원 규격 행렬을 계산합니다.
+
+    normalized=True 이면 mb_form_factors 는 정규화한 값('MICROATX' 등)입니다.
+    """
+    supports = np.column_stack([
+        pd.Series(col, copy=False).reset_index(drop=True).fillna(False).astype(bool).to_numpy()
+        for col in (atx_support, matx_support, itx_support, eatx_support)
+    ])
+    # 지원 열 뒤에 항상 False인 열을 붙여 알 수 없는 폼팩터를 처리
+    supports = np.column_stack([supports, np.zeros(len(supports), dtype=bool)])
+    form_index_map = NORMALIZED_FORM_FACTOR_INDEX if normalized else MB_FORM_FACTOR_INDEX
+    form_index = _as_text(mb_form_factors).map(form_index_map).fillna(4).astype(int).to_numpy()
+    return supports[:, form_index].T
+
+def memory_type_matrix(mb_memory_support, memory_types):
+    """메인보드 지원 메모리 x 메모리 규격 일치 행렬을 계산합니다."""
+    mb_codes = _as_text(mb_memory_support).map({t: i for i, t in enumerate(MEMORY_TYPES)}).fillna(-1).astype(int).to_numpy()
+    mem_codes = _as_text(memory_types).map({t: i for i, t in enumerate(MEMORY_TYPES)}).fillna(-2).astype(int).to_numpy()
+    return mb_codes[:, None] == mem_codes[None, :]
+
+def psu_form_matrix(psu_form_factors, case_psu_supports, normalized=False):
+    """PSU 폼팩터 x 케이스 지원 파워 규격 행렬을 계산합니다. (ATX-ATX, SFX-SFX)
+
+    normalized=True 이면 저장된 규격 비트마스크(power_supply.psu_form_mask, case_chassis.psu_support_mask)입니다.
+    """
+    if normalized:
+        return mask_matrix(psu_form_factors, case_psu_supports)
+    psu_text = _as_text(psu_form_factors)
+    case_text = _as_text(case_psu_supports)
+    psu_lower = psu_text.fillna('').astype(str).str.lower()
+    case_lower = case_text.fillna('').astype(str).str.lower()
+
+    psu_atx = (psu_text.notna() & psu_lower.str.contains('atx', regex=False)).to_numpy()
+    psu_sfx = (psu_text.notna() & psu_lower.str.contains('sfx', regex=False)).to_numpy()
+    case_atx = (case_text.notna() & case_lower.str.contains('atx', regex=False)).to_numpy()
+    case_sfx = (case_text.notna() & case_lower.str.contains('sfx', regex=False)).to_numpy()
+    return (psu_atx[:, None] & case_atx[None, :]) | (psu_sfx[:, None] & case_sfx[None, :])
+
+def power_matrix(gpu_recommended_psu, psu_wattages):
+    """GPU 권장 파워 <= PSU 정격출력 행렬 (값이 없으면 비호환)"""
+    required = power_series_to_watts(gpu_recommended_psu)
+    available = power_series_to_watts(psu_wattages)
+    return required[:, None] <= available[None, :]
+
+def build_pair_frame(left_ids, right_ids, compatible, left_id_name, right_id_name, reason=None, reason_labels=None, id_offset=0):
+    """호환성 행렬을 기존 *_compatibility 테이블과 같은 형태의 DataFrame으로 변환합니다.
+
+    행 순서는 기존 중첩 루프와 동일(왼쪽 부품 우선)하며 id는 id_offset + 1부터 부여됩니다.
+    """
+    left_ids = np.asarray(left_ids)
+    right_ids = np.asarray(right_ids)
+    n, m = len(left_ids), len(right_ids)
+
+    data = {
+        'id': np.arange(id_offset + 1, id_offset + n * m + 1, dtype=np.int64),
+        left_id_name: np.repeat(left_ids, m),
+        right_id_name: np.tile(right_ids, n),
+        'compatible': compatible.reshape(-1).astype(np.int8)
+    }
+    if reason is not None:
+        labels = np.array([reason_labels[k] for k in sorted(reason_labels)], dtype=object)
+        data['reason'] = labels[reason.reshape(-1)]
+    return pd.DataFrame(data)
+
+def _object_type(conn, name):
+    """테이블/뷰 여부 확인 ('BASE TABLE', 'VIEW' 또는 None)"""
+    row = conn.execute(
+        "SELECT table_type FROM information_schema.tables WHERE table_name = ?", [name]
+    ).fetchone()
+    return row[0] if row else None
+
+def get_storage_mode(conn, table_name):
+    """호환성 테이블의 현재 저장 모드 ('dense', 'sparse' 또는 테이블이 없으면 None)"""
+    object_type = _object_type(conn, table_name)
+    if object_type is None:
+        return None
+    return 'sparse' if object_type == 'VIEW' else 'dense'
+
+def ensure_reason_codes(conn):
+    """호환성 이유 코드 사전 테이블을 생성하고 최신 코드로 채웁니다."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS compatibility_reason_codes (
+            reason_code INTEGER PRIMARY KEY,
+            description VARCHAR,
+            compatible BOOLEAN
+        )
+    """)
+    codes = pd.DataFrame(
+        [(code, desc, ok) for code, (desc, ok) in REASON_CODES.items()],
+        columns=['reason_code', 'description', 'compatible']
+    )
+    conn.register('reason_codes_df', codes)
+    conn.execute("INSERT OR REPLACE INTO compatibility_reason_codes SELECT * FROM reason_codes_df")
+    conn.unregister('reason_codes_df')
+
+def _matrix_pairs(table_name, left_ids, right_ids, compatible, reason=None):
+    """호환성 행렬에서 호환 쌍만 (왼쪽 ID, 오른쪽 ID, 이유 코드) DataFrame으로 추립니다."""
+    _, left_id, _, right_id, positive_code = PAIR_TABLES[table_name]
+    rows, cols = np.nonzero(compatible)
+    pairs = pd.DataFrame({
+        left_id: np.asarray(left_ids)[rows],
+        right_id: np.asarray(right_ids)[cols]
+    })
+    # 이유 행렬이 있는 테이블(cpu_mb)은 SOCKET_REASONS 코드가 곧 REASON_CODES 코드
+    pairs['reason_code'] = reason[rows, cols] if positive_code is None else positive_code
+    pairs['reason_code'] = pairs['reason_code'].astype('int32')
+    return pairs
+
+def _create_sparse_view(conn, table_name):
+    """호환 쌍 테이블 위에 기존 *_compatibility 와 같은 형태(id, 왼쪽 ID, 오른쪽 ID, compatible)의 뷰를 만듭니다.
+
+    호환 쌍(저장된 행)과 나머지 비호환 쌍(부품 교차 곱에서 저장된 쌍 제외)을 UNION ALL 로 합치므로,
+    WHERE compatible 조건이 붙으면 DuckDB가 비호환 쪽을 통째로 건너뛰어 호환 쌍 테이블만 읽습니다.
+    id 는 창 함수 대신 두 ID로 계산해(왼쪽 ID << 32 + 오른쪽 ID) 필터가 그대로 내려가도록 합니다.
+    """
+    left_table, left_id, right_table, right_id, positive_code = PAIR_TABLES[table_name]
+    compatible_reason = incompatible_reason = reason_join = ""
+    if positive_code is None:
+        # 저장되지 않은 쌍은 소켓 정보 유무로 이유를 복원
+        compatible_reason = ",\n            rc.description AS reason"
+        incompatible_reason = f""",
+            CASE WHEN NULLIF(TRIM(l.socket_type), '') IS NULL OR NULLIF(TRIM(r.socket_type), '') IS NULL
+                THEN '{SOCKET_REASONS[0]}' ELSE '{SOCKET_REASONS[3]}' END AS reason"""
+        reason_join = """
+        LEFT JOIN compatibility_reason_codes rc
+            ON rc.reason_code = p.reason_code"""
+    conn.execute(f"""
+        CREATE OR REPLACE VIEW {table_name} AS
+        SELECT
+            (p.{left_id}::BIGINT << 32) + p.{right_id} AS id,
+            p.{left_id},
+            p.{right_id},
+            TRUE AS compatible{compatible_reason}
+        FROM {table_name}_pairs p{reason_join}
+        UNION ALL
+        SELECT
+            (l.{left_id}::BIGINT << 32) + r.{right_id} AS id,
+            l.{left_id},
+            r.{right_id},
+            FALSE AS compatible{incompatible_reason}
+        FROM "{left_table}" l
+        CROSS JOIN "{right_table}" r
+        WHERE NOT EXISTS (
+            SELECT 1 FROM {table_name}_pairs p
+            WHERE p.{left_id} = l.{left_id} AND p.{right_id} = r.{right_id}
+        )
+    """)
+
+def store_pair_frame(conn, table_name, df, sparse=False):
+    """호환성 DataFrame을 저장합니다.
+
+    sparse=False: df 는 모든 쌍 (build_pair_frame 결과)이며 기존처럼 {table_name} 테이블에 저장합니다.
+    sparse=True: df 는 호환 쌍 (_evaluate_pairs 결과)이며 {table_name}_pairs 테이블에 저장하고,
+                 {table_name} 은 같은 컬럼을 제공하는 뷰로 바꿉니다.
+    반환값은 실제로 저장된 행 수입니다.
+    """
+    _, left_id, _, right_id, _ = PAIR_TABLES[table_name]
+    current_type = _object_type(conn, table_name)
+
+    if not sparse:
+        conn.register('dense_pairs_df', df)
+        if current_type == 'VIEW':
+            # sparse 모드에서 dense 모드로 전환: 뷰를 테이블로 되돌림
+            conn.execute(f"DROP VIEW {table_name}")
+            reason_column = ",\n                    reason TEXT" if 'reason' in df.columns else ""
+            conn.execute(f"""
+                CREATE TABLE {table_name} (
+                    id INTEGER PRIMARY KEY,
+                    {left_id} INTEGER,
+                    {right_id} INTEGER,
+                    compatible BOOLEAN{reason_column}
+                )
+            """)
+        conn.execute(f"DELETE FROM {table_name}")
+        conn.execute(f"INSERT INTO {table_name} SELECT * FROM dense_pairs_df")
+        conn.unregister('dense_pairs_df')
+        return len(df)
+
+    ensure_reason_codes(conn)
+    pairs = df
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name}_pairs (
+            {left_id} INTEGER,
+            {right_id} INTEGER,
+            reason_code INTEGER,
+            PRIMARY KEY ({left_id}, {right_id})
+        )
+    """)
+    conn.register('sparse_pairs_df', pairs)
+    conn.execute(f"DELETE FROM {table_name}_pairs")
+    conn.execute(f"INSERT INTO {table_name}_pairs SELECT * FROM sparse_pairs_df")
+    conn.unregister('sparse_pairs_df')
+
+    if current_type == 'BASE TABLE':
+        # dense 테이블을 뷰로 교체
+        conn.execute(f"DROP TABLE {table_name}")
+    _create_sparse_view(conn, table_name)
+    return len(pairs)
+
+def _evaluate(compute, left_df, right_df, left_id_col, right_id_col, table_name, id_offset=0):
+    """compute(left_df, right_df) 결과를 *_compatibility 형태의 DataFrame으로 변환"""
+    _, left_id, _, right_id, _ = PAIR_TABLES[table_name]
+    result = compute(left_df.reset_index(drop=True), right_df.reset_index(drop=True))
+    compatible, reason = result if isinstance(result, tuple) else (result, None)
+    return build_pair_frame(left_df[left_id_col], right_df[right_id_col], compatible, left_id, right_id,
+                            reason=reason, reason_labels=SOCKET_REASONS if reason is not None else None,
+                            id_offset=id_offset)
+
+def _evaluate_pairs(compute, left_df, right_df, left_id_col, right_id_col, table_name):
+    """compute(left_df, right_df) 를 왼쪽 부품 SPARSE_CHUNK_ROWS 개씩 평가해 호환 쌍만 모읍니다.
+
+    반환값: (호환 쌍 DataFrame, 평가한 쌍 수)
+    """
+    left_df = left_df.reset_index(drop=True)
+    right_df = right_df.reset_index(drop=True)
+    right_ids = right_df[right_id_col].to_numpy()
+    chunks = []
+    for start in range(0, len(left_df), SPARSE_CHUNK_ROWS):
+        chunk = left_df.iloc[start:start + SPARSE_CHUNK_ROWS].reset_index(drop=True)
+        result = compute(chunk, right_df)
+        compatible, reason = result if isinstance(result, tuple) else (result, None)
+        chunks.append(_matrix_pairs(table_name, chunk[left_id_col].to_numpy(), right_ids, compatible, reason))
+    if not chunks:
+        chunks.append(_matrix_pairs(table_name, [], right_ids, np.zeros((0, len(right_ids)), dtype=bool)))
+    return pd.concat(chunks, ignore_index=True), len(left_df) * len(right_df)
+
+def _delete_dirty_pairs(conn, table_name, dirty_left, dirty_right, sparse):
+    """변경/삭제된 부품이 포함된 쌍을 저장소에서 제거"""
+    _, left_id, _, right_id, _ = PAIR_TABLES[table_name]
+    target = f"{table_name}_pairs" if sparse else table_name
+    dirty = pd.DataFrame({
+        'side': ['left'] * len(dirty_left) + ['right'] * len(dirty_right),
+        'part_id': list(dirty_left) + list(dirty_right)
+    })
+    if dirty.empty:
+        return
+    conn.register('dirty_parts_df', dirty)
+    conn.execute(f"""
+        DELETE FROM {target}
+        WHERE {left_id} IN (SELECT part_id FROM dirty_parts_df WHERE side = 'left')
+           OR {right_id} IN (SELECT part_id FROM dirty_parts_df WHERE side = 'right')
+    """)
+    conn.unregister('dirty_parts_df')
+
+def _append_pairs(conn, table_name, df, sparse):
+    """새로 계산한 쌍(sparse 이면 호환 쌍만)을 저장소에 추가하고 저장된 행 수를 반환"""
+    if df.empty:
+        return 0
+    if sparse:
+        conn.register('sparse_pairs_df', df)
+        conn.execute(f"INSERT INTO {table_name}_pairs SELECT * FROM sparse_pairs_df")
+        conn.unregister('sparse_pairs_df')
+        return len(df)
+    conn.register('dense_pairs_df', df)
+    conn.execute(f"INSERT INTO {table_name} SELECT * FROM dense_pairs_df")
+    conn.unregister('dense_pairs_df')
+    return len(df)
+
+def refresh_pair_table(conn, table_name, left_df, left_id_col, right_df, right_id_col, compute,
+                       sparse=False, force_full=False):
+    """호환성 테이블을 필요한 만큼만 다시 계산합니다.
+
+    부품 행 해시를 마지막 계산 당시와 비교해 추가/변경/삭제된 행과 열만 다시 평가합니다.
+    (변경된 왼쪽 부품 x 전체 오른쪽 부품 + 나머지 왼쪽 부품 x 변경된 오른쪽 부품)
+    저장소가 비어 있거나 저장 모드가 바뀐 경우, 또는 force_full 이면 전체를 다시 계산합니다.
+    compute(left_df, right_df) 는 호환성 행렬 또는 (호환성 행렬, 이유 코드 행렬)을 반환해야 합니다.
+    반환값: {'mode', 'evaluated', 'saved'}
+    """
+    left_table, _, right_table, _, _ = PAIR_TABLES[table_name]
+    left_hashes = load_row_hashes(conn, left_table, left_df, left_id_col)
+    right_hashes = load_row_hashes(conn, right_table, right_df, right_id_col)
+    previous_left = load_state(conn, table_name, 'left')
+    previous_right = load_state(conn, table_name, 'right')
+
+    requested_mode = 'sparse' if sparse else 'dense'
+    storage_empty = get_storage_mode(conn, table_name) is None or \
+        conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0] == 0
+    full = (force_full or storage_empty or not previous_left or not previous_right
+            or get_storage_mode(conn, table_name) != requested_mode)
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        if full:
+            if sparse:
+                df, evaluated = _evaluate_pairs(compute, left_df, right_df, left_id_col, right_id_col, table_name)
+            else:
+                df = _evaluate(compute, left_df, right_df, left_id_col, right_id_col, table_name)
+                evaluated = len(df)
+            saved = store_pair_frame(conn, table_name, df, sparse=sparse)
+            stats = {'mode': 'full', 'evaluated': evaluated, 'saved': saved}
+        else:
+            left_inserted, left_changed, left_deleted = diff_rows(left_hashes, previous_left)
+            right_inserted, right_changed, right_deleted = diff_rows(right_hashes, previous_right)
+            _delete_dirty_pairs(conn, table_name, left_changed | left_deleted, right_changed | right_deleted, sparse)
+
+            left_new = left_df[left_df[left_id_col].isin(left_inserted | left_changed)]
+            left_old = left_df[~left_df[left_id_col].isin(left_inserted | left_changed)]
+            right_new = right_df[right_df[right_id_col].isin(right_inserted | right_changed)]
+
+            next_id = 0 if sparse else conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}").fetchone()[0]
+            evaluated = saved = 0
+            # 변경된 왼쪽 부품 x 전체 오른쪽 부품
+            for left_part, right_part in ((left_new, right_df), (left_old, right_new)):
+                # 변경된 왼쪽 부품 x 전체 오른쪽 부품, 나머지 왼쪽 부품 x 변경된 오른쪽 부품
+                if left_part.empty or right_part.empty:
+                    continue
+                if sparse:
+                    df, count = _evaluate_pairs(compute, left_part, right_part, left_id_col, right_id_col, table_name)
+                else:
+                    df = _evaluate(compute, left_part, right_part, left_id_col, right_id_col, table_name, id_offset=next_id)
+                    count = len(df)
+                    next_id += count
+                evaluated += count
+                saved += _append_pairs(conn, table_name, df, sparse)
+            stats = {'mode': 'incremental', 'evaluated': evaluated, 'saved': saved}
+
+        save_state(conn, table_name, 'left', left_hashes)
+        save_state(conn, table_name, 'right', right_hashes)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return stats
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from urllib.parse import urlparse, parse_qs
+
+# 크롤링 진행 기록 (SQLite)
+# 카테고리 목록 페이지와 제품 상세 페이지(pd_no)를 처리할 때마다 내용 해시와 함께 기록합니다.
+# 크롤링이 중간에 멈춰도 다시 실행하면
+#   - 이미 끝난 목록 페이지는 요청하지 않고 기록된 제품 정보로 채우고
+#   - 신선도 기간(FRESHNESS_HOURS) 안에 파싱한 상세 페이지는 다시 요청하지 않습니다.
+# 기간이 지난 상세 페이지는 기록된 ETag/Last-Modified 로 조건부 요청을 보내고,
+# 304 이거나 정규화한 HTML 해시가 같으면 파싱하지 않습니다 (변경 구분: 추가/변경/삭제).
+# 02_analyze_categories.py 와 async_crawler.py 가 함께 사용합니다.
+
+JOURNAL_PATH = './cs_agent/raw_xlsx/crawl_journal.db'
+FRESHNESS_HOURS = 24
+
+def content_hash(text):
+    """페이지 내용 해시 (sha256)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def product_number(product_url):
+    """제품 링크의 pd_no 값 (없으면 링크 전체)"""
+    values = parse_qs(urlparse(product_url).query).get('pd_no')
+    return values[0] if values else product_url
+
+class CrawlJournal:
+    """목록 페이지/제품 상세 페이지 진행 기록"""
+
+    def __init__(self, path=JOURNAL_PATH, freshness_hours=FRESHNESS_HOURS):
+        self.path = path
+        self.freshness_seconds = freshness_hours * 3600
+        # 처음 실행하는 트리에는 raw_xlsx 디렉터리가 없을 수 있음
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                category TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                last_page INTEGER,
+                product_count INTEGER,
+                content_hash TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (category, page)
+            );
+            CREATE TABLE IF NOT EXISTS crawl_products (
+                pd_no TEXT PRIMARY KEY,
+                category TEXT NOT NULL,
+                url TEXT NOT NULL,
+                page INTEGER,
+                position INTEGER,
+                info TEXT NOT NULL,
+                content_hash TEXT,
+                fetched_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                html_hash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_crawl_products_page ON crawl_products (category, page, position);
+        """)
+        # 이전 버전 기록 파일에 조건부 요청용 컬럼 추가
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(crawl_products)")}
+        for column in ['etag', 'last_modified', 'html_hash']:
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE crawl_products ADD COLUMN {column} TEXT")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fresh_after(self):
+        return time.time() - self.freshness_seconds
+
+    def completed_page(self, category, page):
+        """신선도 기간 안에 끝난 목록 페이지면 last_page, 아니면 None"""
+        row = self.conn.execute(
+            "SELECT last_page FROM crawl_pages WHERE category = ? AND page = ? AND fetched_at >= ?",
+            [category, page, self._fresh_after()]
+        ).fetchone()
+        return row[0] if row else None
+
+    def start_page(self, category, page):
+        """목록 페이지를 다시 처리하기 전에 이전 실행의 페이지 내 위치를 비웁니다."""
+        self.conn.execute(
+            "UPDATE crawl_products SET page = NULL, position = NULL WHERE category = ? AND page = ?",
+            [category, page]
+        )
+        self.conn.commit()
+
+    def record_page(self, category, page, html, last_page, product_count):
+        """목록 페이지 처리 완료 기록 (해당 페이지의 상세 페이지를 모두 성공한 뒤 호출)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO crawl_pages VALUES (?, ?, ?, ?, ?, ?)",
+            [category, page, last_page, product_count, content_hash(html), time.time()]
+        )
+        self.conn.commit()
+
+    def page_products(self, category, page):
+        """완료된 목록 페이지의 제품 정보 목록 (페이지 내 순서)"""
+        rows = self.conn.execute(
+            "SELECT info FROM crawl_products WHERE category = ? AND page = ? ORDER BY position",
+            [category, page]
+        ).fetchall()
+        return [json.loads(info) for (info,) in rows]
+
+    def fresh_product(self, product_url):
+        """신선도 기간 안에 파싱한 제품이면 기록된 제품 정보, 아니면 None"""
+        row = self.conn.execute(
+            "SELECT info FROM crawl_products WHERE pd_no = ? AND fetched_at >= ?",
+            [product_number(product_url), self._fresh_after()]
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def product_state(self, product_url):
+        """기록된 제품 상태 {'info', 'content_hash', 'etag', 'last_modified', 'html_hash'} (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT info, content_hash, etag, last_modified, html_hash FROM crawl_products WHERE pd_no = ?",
+            [product_number(product_url)]
+        ).fetchone()
+        if row is None:
+            return None
+        return {'info': json.loads(row[0]), 'content_hash': row[1], 'etag': row[2], 'last_modified': row[3], 'html_hash': row[4]}
+
+    def record_product(self, category, page, position, product_url, info, etag=None, last_modified=None, html_hash=None):
+        """제품 상세 페이지 파싱 결과 기록 (해시는 파싱 결과 기준이라 광고/세션 값 변화에 흔들리지 않습니다)
+
+        반환값: 'added'(처음 본 제품), 'changed'(파싱 결과가 바뀜), 'unchanged'
+        """
+        new_hash = content_hash(json.dumps(info, ensure_ascii=False, sort_keys=True))
+        row = self.conn.execute(
+            "SELECT content_hash FROM crawl_products WHERE pd_no = ?", [product_number(product_url)]
+        ).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO crawl_products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [product_number(product_url), category, product_url, page, position,
+             json.dumps(info, ensure_ascii=False), new_hash, time.time(), etag, last_modified, html_hash]
+        )
+        self.conn.commit()
+        if row is None:
+            return 'added'
+        return 'changed' if row[0] != new_hash else 'unchanged'
+
+    def revalidate_product(self, category, page, position, product_url, etag=None, last_modified=None):
+        """변경 없음이 확인된 제품 (304 또는 같은 HTML 해시): 위치와 확인 시각만 갱신"""
+        self.conn.execute(
+            """UPDATE crawl_products SET category = ?, page = ?, position = ?, fetched_at = ?,
+                   etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+               WHERE pd_no = ?""",
+            [category, page, position, time.time(), etag, last_modified, product_number(product_url)]
+        )
+        self.conn.commit()
+
+    def reuse_product(self, category, page, position, product_url):
+        """신선한 기록을 재사용할 때 현재 목록 위치로 갱신 (fetched_at 은 유지)"""
+        self.conn.execute(
+            "UPDATE crawl_products SET category = ?, page = ?, position = ? WHERE pd_no = ?",
+            [category, page, position, product_number(product_url)]
+        )
+        self.conn.commit()
+
+    def remove_missing_products(self, category, last_page):
+        """이번 목록에 없는 제품(위치가 비었거나 마지막 페이지 밖)을 기록에서 지우고 반환합니다.
+
+        카테고리의 모든 목록 페이지가 완료된 뒤에만 호출해야 합니다.
+        """
+        rows = self.conn.execute(
+            "SELECT pd_no, url, info FROM crawl_products WHERE category = ? AND (page IS NULL OR page > ?) ORDER BY pd_no",
+            [category, last_page]
+        ).fetchall()
+        self.conn.executemany("DELETE FROM crawl_products WHERE pd_no = ?", [[pd_no] for pd_no, _, _ in rows])
+        self.conn.execute("DELETE FROM crawl_pages WHERE category = ? AND page > ?", [category, last_page])
+        self.conn.commit()
+        return [{'pd_no': pd_no, 'url': url, 'info': json.loads(info)} for pd_no, url, info in rows]
+
+    def summary(self, category):
+        """카테고리의 기록된 페이지 수/제품 수"""
+        pages = self.conn.execute("SELECT COUNT(*) FROM crawl_pages WHERE category = ?", [category]).fetchone()[0]
+        products = self.conn.execute("SELECT COUNT(*) FROM crawl_products WHERE category = ?", [category]).fetchone()[0]
+        logging.info(f"{category} 진행 기록: 목록 페이지 {pages}개, 제품 {products}개")
+        return {'pages': pages, 'products': products}
@@ -0,0 +1,233 @@
+import os
+import re
+import logging
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# 쇼핑몰(jchyunplace) HTML 파싱 함수
+# 01/02 크롤링 스크립트와 async_crawler 가 같은 파싱 규칙을 쓰도록 모아 둔 모듈입니다.
+# 파서 백엔드를 고를 수 있습니다 (결과는 같아야 하며 test_crawl_parser_parity.py 로 확인합니다).
+#   - 'lxml': lxml.html + XPath (C 구현, 기본값)
+#   - 'bs4' : BeautifulSoup + html.parser (기존 방식, lxml 이 없을 때 사용)
+# 환경 변수 CRAWL_PARSER 또는 set_parser_backend() 로 바꿀 수 있고, 함수마다 backend 인자로도 지정할 수 있습니다.
+
+PARSER_BACKENDS = ['lxml', 'bs4']
+_parser_backend = os.getenv('CRAWL_PARSER') or ('lxml' if lxml is not None else 'bs4')
+
+PAGE_MOVE_PATTERN = re.compile(r'pageMove\((\d+)\)')
+
+def set_parser_backend(backend):
+    """기본 파서 백엔드 변경 ('lxml' 또는 'bs4')"""
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"지원하지 않는 파서 백엔드: {backend}")
+    if backend == 'lxml' and lxml is None:
+        raise ImportError("lxml 이 설치되어 있지 않습니다.")
+    _parser_backend = backend
+
+def get_parser_backend():
+    return _parser_backend
+
+def _parsers(backend):
+    return _BACKENDS[backend or _parser_backend]
+
+def parse_last_page(html, backend=None):
+    """목록 페이지의 마지막 페이지 번호"""
+    return _parsers(backend)['last_page'](html)
+
+def parse_product_links(html, backend=None):
+    """목록 페이지의 제품 상세 링크 (pd_no 가 있는 링크만)"""
+    return _parsers(backend)['product_links'](html)
+
+def parse_category_name(html, backend=None):
+    """목록 페이지에 제품이 있으면 첫 번째 제품명, 없으면 None"""
+    return _parsers(backend)['category_name'](html)
+
+def parse_product_info(html, backend=None):
+    """제품 상세 페이지에서 제품명과 상세 정보 테이블(키-값)을 추출합니다.
+
+    상세 정보 테이블이 없어도 오류로 처리하지 않고 제품명만 담아 반환합니다.
+    """
+    info_dict, table_found = _parsers(backend)['product_info'](html)
+    if not table_found:
+        logging.warning("제품 상세 테이블을 찾을 수 없습니다.")
+    return info_dict
+
+def _max_page_move(hrefs):
+    """pageMove(N) 링크들 중 가장 큰 N (없으면 1)"""
+    max_page = 1
+    for href in hrefs:
+        if 'pageMove' in href:
+            if match := PAGE_MOVE_PATTERN.search(href):
+                max_page = max(max_page, int(match.group(1)))
+    return max_page
+
+def _table_pairs(rows):
+    """상세 정보 테이블 행들([셀 텍스트, ...], th 가 있는 제목 행은 제외)에서 키-값 추출"""
+    info_dict = {}
+    for cells in rows:
+        for i in range(0, len(cells) - 1, 2):
+            key, value = cells[i], cells[i + 1]
+            if key and value:
+                info_dict[key] = value
+    return info_dict
+
+# --- bs4 (html.parser) ---
+
+def _bs4_last_page(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    last_page_link = soup.find('a', class_='next', string='마지막')
+
+    if last_page_link and 'href' in last_page_link.attrs:
+        # 예: javascript:pageMove(30); 에서 30 추출
+        if match := PAGE_MOVE_PATTERN.search(last_page_link['href']):
+            return int(match.group(1))
+
+    # 마지막 페이지 링크를 찾지 못한 경우 페이지네이션에서 가장 큰 숫자 찾기
+    return _max_page_move(link['href'] for link in soup.select('div.paginate a') if 'href' in link.attrs)
+
+def _bs4_product_links(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    product_links = []
+    for product in soup.select('.prd_view_type li.list'):
+        link_element = product.select_one('a.name')
+        if link_element and 'href' in link_element.attrs and 'pd_no=' in link_element['href']:
+            product_links.append(link_element['href'])
+    return product_links
+
+def _bs4_category_name(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    if not soup.select('.prd_view_type li.list'):
+        return None
+    first_product = soup.select_one('.prd_view_type li.list a.name')
+    return first_product.get_text(strip=True) if first_product else ''
+
+def _bs4_product_info(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    info_dict = {}
+
+    # 제품명 추출 (span.name에서 가져오기)
+    product_name_elem = soup.select_one('span.name')
+    if product_name_elem:
+        info_dict['제품명(전체)'] = product_name_elem.get_text(strip=True)
+
+    # 상세 정보 테이블 (th 가 있는 행은 제목 행)
+    table = soup.select_one('.more_info.info table')
+    if not table:
+        return info_dict, False
+    rows = [
+        [cell.get_text(strip=True) for cell in row.find_all('td')]
+        for row in table.find_all('tr') if not row.find('th')
+    ]
+    info_dict.update(_table_pairs(rows))
+    return info_dict, True
+
+# --- lxml ---
+
+def _class_test(name):
+    """XPath 클래스 조건 (CSS .name 과 같은 의미)"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_XPATH_PRODUCT_ITEMS = f"//*[{_class_test('prd_view_type')}]//li[{_class_test('list')}]"
+_XPATH_NAME_LINK = f".//a[{_class_test('name')}]"
+_XPATH_SPEC_TABLE = f"//*[{_class_test('more_info')} and {_class_test('info')}]//table"
+
+def _lxml_document(html):
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except lxml.etree.ParserError:
+        return None
+
+def _lxml_text(element):
+    """BeautifulSoup get_text(strip=True) 와 같은 결과 (script/style/주석 제외, 조각별 strip 후 연결)"""
+    return ''.join(text.strip() for text in element.xpath('.//text()[not(parent::script) and not(parent::style)]'))
+
+def _lxml_product_items(doc):
+    # 중첩된 목록에서 같은 li 가 두 번 나오지 않도록 문서 순서로 중복 제거
+    return list(dict.fromkeys(doc.xpath(_XPATH_PRODUCT_ITEMS)))
+
+def _lxml_last_page(html):
+    doc = _lxml_document(html)
+    if doc is None:
+        return 1
+    for link in doc.xpath(f"//a[{_class_test('next')}]"):
+        # BeautifulSoup string='마지막' 과 같이 자식 문자열 하나가 정확히 '마지막' 인 첫 링크
+        if len(link) == 0 and link.text == '마지막':
+            href = link.get('href')
+            if href is not None and (match := PAGE_MOVE_PATTERN.search(href)):
+                return int(match.group(1))
+            break
+    return _max_page_move(link.get('href') for link in doc.xpath(f"//div[{_class_test('paginate')}]//a[@href]"))
+
+def _lxml_product_links(html):
+    doc = _lxml_document(html)
+    if doc is None:
+        return []
+    product_links = []
+    for product in _lxml_product_items(doc):
+        links = product.xpath(_XPATH_NAME_LINK)
+        if links and 'pd_no=' in links[0].get('href', ''):
+            product_links.append(links[0].get('href'))
+    return product_links
+
+def _lxml_category_name(html):
+    doc = _lxml_document(html)
+    if doc is None:
+        return None
+    products = _lxml_product_items(doc)
+    if not products:
+        return None
+    for product in products:
+        links = product.xpath(_XPATH_NAME_LINK)
+        if links:
+            return _lxml_text(links[0])
+    return ''
+
+def _lxml_product_info(html):
+    doc = _lxml_document(html)
+    info_dict = {}
+    if doc is None:
+        return info_dict, False
+
+    names = doc.xpath(f"//span[{_class_test('name')}]")
+    if names:
+        info_dict['제품명(전체)'] = _lxml_text(names[0])
+
+    tables = doc.xpath(_XPATH_SPEC_TABLE)
+    if not tables:
+        return info_dict, False
+    rows = [
+        [_lxml_text(cell) for cell in row.iter('td')]
+        for row in tables[0].iter('tr') if not row.xpath('.//th')
+    ]
+    info_dict.update(_table_pairs(rows))
+    return info_dict, True
+
+_BACKENDS = {
+    'bs4': {
+        'last_page': _bs4_last_page,
+        'product_links': _bs4_product_links,
+        'category_name': _bs4_category_name,
+        'product_info': _bs4_product_info
+    },
+    'lxml': {
+        'last_page': _lxml_last_page,
+        'product_links': _lxml_product_links,
+        'category_name': _lxml_category_name,
+        'product_info': _lxml_product_info
+    }
+}
+
+def normalize_html(html):
+    """변경 비교용으로 정규화한 HTML (스크립트/스타일/주석 제거, 공백 정리)
+
+    페이지마다 바뀌는 세션 스크립트나 광고 마크업 때문에 같은 제품이 변경된 것으로 보이지 않게 합니다.
+    """
+    html = re.sub(r'<script\b.*?</script>|<style\b.*?</style>|<!--.*?-->', '', html, flags=re.S | re.I)
+    return re.sub(r'\s+', ' ', html).strip()
@@ -0,0 +1,346 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+from datetime import datetime
+import duckdb
+import pandas as pd
+import pyarrow.parquet as pq
+
+# 크롤링 결과 Parquet 스테이징
+# 크롤러(02, async_crawler)가 카테고리별 결과를 엑셀 대신 Parquet 로 저장하고,
+# 03/05-x 로더는 DuckDB read_parquet 로 바로 읽습니다 (엑셀 파싱 없음, 숫자 컬럼 타입 유지).
+#   raw_parquet/category={카테고리}/crawl_date={YYYYMMDD}/part-{HHMMSS}.parquet
+#   raw_parquet/manifest.json  : 저장한 파일 목록 (카테고리, 크롤링 시각, 행 수, 컬럼, 해시)
+# 사람이 보는 엑셀은 export_xlsx 로 필요할 때만 만듭니다.
+#
+# 매니페스트는 스냅숏 색인 역할도 합니다. 로더는 디렉터리를 훑지 않고 매니페스트에서 바로 찾습니다.
+#   entries : 스냅숏 목록 (format: parquet/xlsx, status: good/bad). 엑셀도 raw_parquet 기준 상대 경로로 등록
+#   latest  : {카테고리: 가장 최신 good 스냅숏} (쓰기/롤백 때마다 갱신)
+#   pins    : {카테고리: 고정한 스냅숏 stamp} (있으면 latest 대신 사용)
+# 매니페스트 등록 전에 만든 엑셀은 index_xlsx_files() 로 한 번 등록합니다.
+#
+# 사용법: python cs_agent/crawl_staging.py list [카테고리명]
+#         python cs_agent/crawl_staging.py pin 카테고리명 YYYYMMDD_HHMMSS
+#         python cs_agent/crawl_staging.py unpin 카테고리명
+#         python cs_agent/crawl_staging.py rollback 카테고리명   (현재 스냅숏을 bad 로 표시하고 이전 스냅숏 사용)
+#         python cs_agent/crawl_staging.py verify                (파일 해시를 확인해 깨진 스냅숏을 bad 로 표시)
+#         python cs_agent/crawl_staging.py index                 (raw_xlsx 의 미등록 엑셀 등록)
+
+STAGING_DIR = './cs_agent/raw_parquet'
+RAW_XLSX_DIR = './cs_agent/raw_xlsx/'
+MANIFEST_NAME = 'manifest.json'
+STAMP_FORMAT = '%Y%m%d_%H%M%S'
+XLSX_NAME_PATTERN = re.compile(r'^(.+)_(\d{8}_\d{6})\.xlsx$')
+
+# 읽기 전용 매니페스트 캐시 {경로: (mtime_ns, 매니페스트)}
+_manifest_cache = {}
+
+def manifest_path(staging_dir=STAGING_DIR):
+    return os.path.join(staging_dir, MANIFEST_NAME)
+
+def load_manifest(staging_dir=STAGING_DIR):
+    """매니페스트 {'entries': [...], 'latest': {...}, 'pins': {...}} (없으면 빈 매니페스트)"""
+    path = manifest_path(staging_dir)
+    if not os.path.exists(path):
+        return {'entries': [], 'latest': {}, 'pins': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if 'latest' not in manifest:
+        # 색인 이전 매니페스트: 항목에 기본값을 채우고 latest 를 만듦
+        for entry in manifest['entries']:
+            entry.setdefault('format', 'parquet')
+            entry.setdefault('status', 'good')
+        manifest['latest'] = {}
+        for category in {entry['category'] for entry in manifest['entries']}:
+            _refresh_latest(manifest, category)
+    manifest.setdefault('pins', {})
+    return manifest
+
+def _cached_manifest(staging_dir=STAGING_DIR):
+    """조회용 매니페스트 (파일이 바뀌지 않았으면 다시 읽지 않음, 수정하지 말 것)"""
+    path = manifest_path(staging_dir)
+    mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_manifest(staging_dir))
+        _manifest_cache[path] = cached
+    return cached[1]
+
+def save_manifest(manifest, staging_dir=STAGING_DIR):
+    """매니페스트 저장 (임시 파일에 쓴 뒤 교체해 읽는 쪽이 쓰다 만 파일을 보지 않게 함)"""
+    path = manifest_path(staging_dir)
+    os.makedirs(staging_dir, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+    _manifest_cache.pop(path, None)
+
+def _snapshot_key(entry):
+    # 같은 시각의 Parquet 와 엑셀이 있으면 Parquet 우선
+    return entry['stamp'], entry.get('format', 'parquet') == 'parquet'
+
+def _refresh_latest(manifest, category):
+    """카테고리의 latest 를 가장 최신 good 스냅숏으로 다시 계산"""
+    entries = [
+        entry for entry in manifest['entries']
+        if entry['category'] == category and entry.get('status', 'good') == 'good'
+    ]
+    if entries:
+        manifest['latest'][category] = max(entries, key=_snapshot_key)
+    else:
+        manifest['latest'].pop(category, None)
+
+def _add_entry(entry, staging_dir=STAGING_DIR):
+    manifest = load_manifest(staging_dir)
+    manifest['entries'].append(entry)
+    _refresh_latest(manifest, entry['category'])
+    save_manifest(manifest, staging_dir)
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _arrow_safe(df):
+    """문자열/숫자가 섞인 object 컬럼은 문자열로 통일 (결측값은 그대로)"""
+    frame = df.copy()
+    for column in frame.columns:
+        if frame[column].dtype == object:
+            frame[column] = frame[column].map(lambda value: value if value is None or isinstance(value, str) or pd.isna(value) else str(value))
+    frame.columns = [str(column) for column in frame.columns]
+    return frame
+
+def write_category_frame(category_name, df, staging_dir=STAGING_DIR, crawled_at=None):
+    """카테고리 DataFrame을 Parquet 파티션으로 저장하고 매니페스트에 추가합니다. 매니페스트 항목 반환"""
+    crawled_at = crawled_at or datetime.now()
+    relative_path = os.path.join(
+        f"category={category_name}", f"crawl_date={crawled_at:%Y%m%d}", f"part-{crawled_at:%H%M%S}.parquet"
+    )
+    path = os.path.join(staging_dir, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    frame = _arrow_safe(df)
+    temp_path = f"{path}.tmp"
+    frame.to_parquet(temp_path, index=False)
+    os.replace(temp_path, path)
+
+    entry = {
+        'category': category_name,
+        'crawl_date': crawled_at.strftime('%Y%m%d'),
+        'stamp': crawled_at.strftime(STAMP_FORMAT),
+        'path': relative_path,
+        'rows': len(frame),
+        'columns': list(frame.columns),
+        'sha256': _file_hash(path),
+        'format': 'parquet',
+        'status': 'good' if len(frame) else 'bad'
+    }
+    _add_entry(entry, staging_dir)
+    logging.info(f"✅ '{category_name}' 데이터를 {path}에 저장했습니다. ({len(frame)}행)")
+    return entry
+
+def register_xlsx(category_name, path, stamp, staging_dir=STAGING_DIR, rows=None):
+    """엑셀 파일을 스냅숏으로 등록 (경로는 staging_dir 기준 상대 경로로 저장). 매니페스트 항목 반환"""
+    entry = {
+        'category': category_name,
+        'crawl_date': stamp[:8],
+        'stamp': stamp,
+        'path': os.path.relpath(path, staging_dir),
+        'rows': rows,
+        'columns': None,
+        'sha256': _file_hash(path),
+        'format': 'xlsx',
+        'status': 'good' if rows != 0 else 'bad'
+    }
+    _add_entry(entry, staging_dir)
+    return entry
+
+def index_xlsx_files(raw_xlsx_dir=RAW_XLSX_DIR, staging_dir=STAGING_DIR):
+    """raw_xlsx 에서 매니페스트에 없는 {카테고리}_{타임스탬프}.xlsx 를 등록. 등록한 수 반환"""
+    if not os.path.isdir(raw_xlsx_dir):
+        return 0
+    manifest = load_manifest(staging_dir)
+    known = {os.path.normpath(os.path.join(staging_dir, entry['path'])) for entry in manifest['entries']}
+    added = 0
+    for file_name in sorted(os.listdir(raw_xlsx_dir)):
+        match = XLSX_NAME_PATTERN.match(file_name)
+        path = os.path.join(raw_xlsx_dir, file_name)
+        if not match or os.path.normpath(path) in known:
+            continue
+        category, stamp = match.groups()
+        manifest['entries'].append({
+            'category': category, 'crawl_date': stamp[:8], 'stamp': stamp,
+            'path': os.path.relpath(path, staging_dir), 'rows': None, 'columns': None,
+            'sha256': _file_hash(path), 'format': 'xlsx', 'status': 'good'
+        })
+        _refresh_latest(manifest, category)
+        added += 1
+    if added:
+        save_manifest(manifest, staging_dir)
+        logging.info(f"엑셀 {added}개를 매니페스트에 등록했습니다.")
+    return added
+
+def current_snapshot(category_name, staging_dir=STAGING_DIR, use_pin=True):
+    """로더가 읽을 스냅숏 항목: 고정(pin)한 스냅숏, 없으면 가장 최신 good 스냅숏 (없으면 None)"""
+    manifest = _cached_manifest(staging_dir)
+    pinned_stamp = manifest['pins'].get(category_name) if use_pin else None
+    if pinned_stamp:
+        entries = [
+            entry for entry in manifest['entries']
+            if entry['category'] == category_name and entry['stamp'] == pinned_stamp
+        ]
+        if entries:
+            return max(entries, key=_snapshot_key)
+        logging.warning(f"{category_name}: 고정한 스냅숏 {pinned_stamp} 이 매니페스트에 없어 최신 스냅숏을 사용합니다.")
+    return manifest['latest'].get(category_name)
+
+def latest_entry(prefix, staging_dir=STAGING_DIR):
+    """엑셀 파일명 규칙({카테고리}_{타임스탬프})이 prefix 로 시작하는 현재 스냅숏 항목 (없으면 None)
+
+    로더의 prefix('CPU_')는 카테고리 이름으로 바로 찾고, 그 밖의 prefix 만 항목을 훑습니다.
+    """
+    if prefix.endswith('_'):
+        return current_snapshot(prefix[:-1], staging_dir)
+    entries = [
+        entry for entry in _cached_manifest(staging_dir)['latest'].values()
+        if f"{entry['category']}_{entry['stamp']}".startswith(prefix)
+    ]
+    return max(entries, key=_snapshot_key) if entries else None
+
+def pin_snapshot(category_name, stamp, staging_dir=STAGING_DIR):
+    """로더가 항상 지정한 스냅숏을 읽도록 고정"""
+    manifest = load_manifest(staging_dir)
+    if not any(entry['category'] == category_name and entry['stamp'] == stamp for entry in manifest['entries']):
+        raise ValueError(f"{category_name} 스냅숏 {stamp} 이 매니페스트에 없습니다.")
+    manifest['pins'][category_name] = stamp
+    save_manifest(manifest, staging_dir)
+
+def unpin_snapshot(category_name, staging_dir=STAGING_DIR):
+    manifest = load_manifest(staging_dir)
+    manifest['pins'].pop(category_name, None)
+    save_manifest(manifest, staging_dir)
+
+def rollback_snapshot(category_name, staging_dir=STAGING_DIR):
+    """현재 최신 스냅숏(같은 stamp 의 Parquet/엑셀)을 bad 로 표시하고 새 latest 항목 반환 (없으면 None)"""
+    manifest = load_manifest(staging_dir)
+    current = manifest['latest'].get(category_name)
+    if current is None:
+        return None
+    for entry in manifest['entries']:
+        if entry['category'] == category_name and entry['stamp'] == current['stamp']:
+            entry['status'] = 'bad'
+    _refresh_latest(manifest, category_name)
+    if manifest['pins'].get(category_name) == current['stamp']:
+        del manifest['pins'][category_name]
+    save_manifest(manifest, staging_dir)
+    return manifest['latest'].get(category_name)
+
+def verify_snapshots(staging_dir=STAGING_DIR):
+    """good 스냅숏 파일이 없거나 해시가 다르면 bad 로 표시. bad 로 바꾼 항목 목록 반환"""
+    manifest = load_manifest(staging_dir)
+    broken = []
+    for entry in manifest['entries']:
+        if entry.get('status') != 'good':
+            continue
+        path = os.path.join(staging_dir, entry['path'])
+        if not os.path.exists(path) or _file_hash(path) != entry['sha256']:
+            entry['status'] = 'bad'
+            broken.append(entry)
+    for category in {entry['category'] for entry in broken}:
+        _refresh_latest(manifest, category)
+    if broken:
+        save_manifest(manifest, staging_dir)
+    return broken
+
+def crawled_on(category_name, date_string, staging_dir=STAGING_DIR):
+    """해당 날짜(YYYYMMDD)에 저장한 카테고리의 good 스냅숏이 있는지"""
+    return any(
+        entry['category'] == category_name and entry['crawl_date'] == date_string and entry.get('status', 'good') == 'good'
+        for entry in _cached_manifest(staging_dir)['entries']
+    )
+
+def find_latest_sheet(prefix, raw_xlsx_dir=RAW_XLSX_DIR, staging_dir=STAGING_DIR):
+    """prefix 로 시작하는 현재 원본 시트 경로 (없으면 None)
+
+    매니페스트의 고정/최신 good 스냅숏을 쓰고 (같은 시각이면 Parquet 우선), 매니페스트에 없을 때만
+    raw_xlsx 의 미등록 엑셀을 한 번 등록한 뒤 다시 찾습니다.
+    """
+    entry = latest_entry(prefix, staging_dir)
+    if entry is None and index_xlsx_files(raw_xlsx_dir, staging_dir):
+        entry = latest_entry(prefix, staging_dir)
+    if entry is None:
+        return None
+    path = os.path.normpath(os.path.join(staging_dir, entry['path']))
+    if not os.path.exists(path):
+        logging.warning(f"{path} 파일이 없습니다. 'crawl_staging.py verify' 로 매니페스트를 정리하세요.")
+        return None
+    return path
+
+def read_sheet(path, conn=None):
+    """원본 시트 읽기: Parquet 는 DuckDB read_parquet, 엑셀은 pd.read_excel
+
+    파티션 디렉터리(category=..., crawl_date=...)가 컬럼으로 붙지 않게 hive_partitioning 을 끄고,
+    DuckDB가 대소문자만 다른 컬럼명('MYSTIC LIGHT', 'Mystic Light')을 중복으로 보고 바꾼 이름은
+    Parquet 스키마의 원래 컬럼명으로 되돌립니다.
+    """
+    if not path.endswith('.parquet'):
+        return pd.read_excel(path)
+    if conn is None:
+        with duckdb.connect() as memory_conn:
+            df = memory_conn.execute("SELECT * FROM read_parquet(?, hive_partitioning = false)", [path]).df()
+    else:
+        df = conn.execute("SELECT * FROM read_parquet(?, hive_partitioning = false)", [path]).df()
+    df.columns = pq.read_schema(path).names
+    return df
+
+def export_xlsx(category_name, df, output_dir='./cs_agent/raw_xlsx', stamp=None, staging_dir=STAGING_DIR):
+    """사람이 보는 엑셀 내보내기 ({카테고리명}_{타임스탬프}.xlsx, 매니페스트에도 등록)"""
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = stamp or datetime.now().strftime(STAMP_FORMAT)
+    excel_filename = os.path.join(output_dir, f"{category_name}_{stamp}.xlsx")
+    df.to_excel(excel_filename, index=False)
+    register_xlsx(category_name, excel_filename, stamp, staging_dir, rows=len(df))
+    logging.info(f"✅ '{category_name}' 데이터를 {excel_filename}에 저장했습니다.")
+    return excel_filename
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+    command = args.pop(0) if args else 'list'
+    if command == 'list':
+        manifest = load_manifest()
+        for entry in sorted(manifest['entries'], key=lambda entry: (entry['category'], entry['stamp'])):
+            if args and entry['category'] not in args:
+                continue
+            marks = []
+            if manifest['latest'].get(entry['category']) == entry:
+                marks.append('latest')
+            if manifest['pins'].get(entry['category']) == entry['stamp']:
+                marks.append('pinned')
+            print(f"{entry['category']:<15} {entry['stamp']} {entry.get('format', 'parquet'):<7} "
+                  f"{entry.get('status', 'good'):<4} rows={entry['rows']} {','.join(marks)}")
+    elif command == 'pin' and len(args) == 2:
+        pin_snapshot(args[0], args[1])
+        print(f"{args[0]}: {args[1]} 스냅숏으로 고정했습니다.")
+    elif command == 'unpin' and len(args) == 1:
+        unpin_snapshot(args[0])
+        print(f"{args[0]}: 고정을 해제했습니다.")
+    elif command == 'rollback' and len(args) == 1:
+        entry = rollback_snapshot(args[0])
+        print(f"{args[0]}: " + (f"{entry['stamp']} 스냅숏으로 되돌렸습니다." if entry else "남은 good 스냅숏이 없습니다."))
+    elif command == 'verify':
+        broken = verify_snapshots()
+        for entry in broken:
+            print(f"❌ {entry['category']} {entry['stamp']} {entry['path']}")
+        print(f"깨진 스냅숏 {len(broken)}개")
+    elif command == 'index':
+        print(f"엑셀 {index_xlsx_files()}개를 등록했습니다.")
+    else:
+        print(f"알 수 없는 명령: {command}")
+        sys.exit(1)
@@ -0,0 +1,114 @@
+import sys
+import time
+import random
+import hashlib
+from aiohttp import web
+
+# 크롤러 테스트용 로컬 대체 서버 (aiohttp.web)
+# 쇼핑몰의 목록 API(POST)와 제품 상세 페이지(GET)를 같은 마크업으로 흉내 냅니다.
+# async_crawler.AsyncCrawler(base_url=...) 를 이 서버로 돌려 속도 제한, 재시도, 결과 형태를 확인합니다.
+#   - 카테고리: cate1/cate2 조합별 제품 수 (CATEGORIES)
+#   - failure_rate: 요청 중 일부를 503 으로 응답 (재시도 확인용)
+#   - 서버가 받은 요청 시각은 app['request_log'] 에 기록됩니다.
+#   - 상세 페이지는 ETag/Last-Modified 를 주고 조건부 요청에 304 로 응답합니다 (validators=False 면 생략).
+#     페이지마다 바뀌는 스크립트가 들어 있어 HTML 원문 해시는 매번 달라집니다.
+#   - app['catalog'] (카테고리별 제품 수), app['revisions'] ({pd_no: 개정 번호}) 를 바꿔 제품 추가/삭제/변경을 흉내 냅니다.
+#
+# 사용법: python cs_agent/crawl_stub_server.py [포트] [failure_rate]
+
+LIST_PATH = "/skin/shop/basic/product_list_include_plist.php"
+DETAIL_PATH = "/shop/view.php"
+PAGE_SIZE = 20
+
+# {(cate1, cate2): (카테고리 이름, 제품 수)}
+CATEGORIES = {
+    ('2', '1'): ('CPU', 45),
+    ('2', '2'): ('Memory', 30),
+    ('3', '1'): ('VGA', 12)
+}
+
+def product_number(cate1, cate2, index):
+    """카테고리 안 index 번째 제품의 pd_no"""
+    return int(cate1) * 100000 + int(cate2) * 1000 + index
+
+def render_list_page(cate1, cate2, page, catalog=CATEGORIES):
+    """목록 페이지 HTML (제품 목록 + 페이지네이션)"""
+    if (cate1, cate2) not in catalog:
+        return '<div class="prd_view_type"><ul></ul></div>'
+    name, count = catalog[(cate1, cate2)]
+    last_page = max(1, (count + PAGE_SIZE - 1) // PAGE_SIZE)
+    start = (page - 1) * PAGE_SIZE
+    items = "".join(
+        f'<li class="list"><a class="name" href="{DETAIL_PATH}?pd_no={product_number(cate1, cate2, index)}">'
+        f'{name} 제품 {index}</a></li>'
+        for index in range(start + 1, min(start + PAGE_SIZE, count) + 1)
+    )
+    pages = "".join(f'<a href="javascript:pageMove({number});">{number}</a>' for number in range(1, last_page + 1))
+    return (
+        f'<div class="prd_view_type"><ul>{items}</ul></div>'
+        f'<div class="paginate">{pages}<a class="next" href="javascript:pageMove({last_page});">마지막</a></div>'
+    )
+
+def render_detail_page(pd_no, revision=0):
+    """제품 상세 페이지 HTML (제품명 + 상세 정보 테이블, 개정 번호가 바뀌면 가격이 바뀜)"""
+    return (
+        f'<html><head><script>var session_time = {time.time()};</script></head>'
+        f'<body><span class="name">테스트 제품 {pd_no}</span>'
+        '<div class="more_info info"><table>'
+        '<tr><th>항목</th><th>내용</th><th>항목</th><th>내용</th></tr>'
+        f'<tr><td>제조회사</td><td>제조사{pd_no % 3}</td><td>모델번호</td><td>M-{pd_no}</td></tr>'
+        f'<tr><td>가격</td><td>{pd_no % 1000 * 100 + revision * 10}원</td><td></td><td></td></tr>'
+        '</table></div></body></html>'
+    )
+
+def create_app(failure_rate=0.0, seed=None, validators=True):
+    """대체 서버 애플리케이션 (failure_rate 비율의 요청에 503 응답)"""
+    rng = random.Random(seed)
+    app = web.Application()
+    app['request_log'] = []
+    app['catalog'] = dict(CATEGORIES)
+    app['revisions'] = {}
+
+    def should_fail():
+        return failure_rate and rng.random() < failure_rate
+
+    async def list_handler(request):
+        app['request_log'].append((request.loop.time(), 'list'))
+        if should_fail():
+            return web.Response(status=503, headers={'Retry-After': '0'})
+        form = await request.post()
+        html = render_list_page(form.get('cate1', ''), form.get('cate2', ''), int(form.get('page', '1')), app['catalog'])
+        return web.Response(text=html, content_type='text/html')
+
+    async def detail_handler(request):
+        app['request_log'].append((request.loop.time(), 'detail'))
+        if should_fail():
+            return web.Response(status=503)
+        pd_no = int(request.query['pd_no'])
+        revision = app['revisions'].get(pd_no, 0)
+        headers = {}
+        if validators:
+            etag = '"' + hashlib.md5(f"{pd_no}:{revision}".encode()).hexdigest() + '"'
+            headers = {'ETag': etag, 'Last-Modified': f"Mon, 0{1 + revision % 9} Jan 2024 00:00:00 GMT"}
+            if request.headers.get('If-None-Match') == etag:
+                return web.Response(status=304, headers=headers)
+        return web.Response(text=render_detail_page(pd_no, revision), content_type='text/html', headers=headers)
+
+    app.router.add_post(LIST_PATH, list_handler)
+    app.router.add_get(DETAIL_PATH, detail_handler)
+    return app
+
+async def start_stub_server(port=0, failure_rate=0.0, seed=None, validators=True):
+    """서버를 백그라운드로 시작하고 (runner, base_url) 반환. 종료는 await runner.cleanup()"""
+    app = create_app(failure_rate, seed, validators)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{bound_port}"
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    failure_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    web.run_app(create_app(failure_rate), host='127.0.0.1', port=port)
@@ -0,0 +1,146 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 카테고리 병렬 크롤링 (스레드 작업자 풀)
+# valid_categories.json 의 카테고리는 서로 독립이므로 02_analyze_categories 의 --workers N 모드에서
+# N 개 카테고리를 동시에 수집합니다.
+#   - 모든 작업자가 TokenBucket 하나를 공유해 전체 초당 요청 수를 제한 (사이트 부담은 작업자 수와 무관)
+#   - CrawlProgress 가 카테고리별 처리 페이지/제품 수를 모아 주기적으로 처리량(pages/s, products/s)과 ETA 를 로그로 출력
+# requests.Session 과 SQLite 연결은 스레드 간에 공유하지 않으므로 작업자마다 따로 만듭니다 (crawl_function 에서).
+
+REQUESTS_PER_SECOND = 2.0
+REPORT_SECONDS = 10
+
+class TokenBucket:
+    """스레드 간 공유하는 초당 요청 수 제한 (토큰 버킷, async_crawler.HostRateLimiter 의 스레드 버전)"""
+
+    def __init__(self, requests_per_second=REQUESTS_PER_SECOND, burst=1):
+        self.rate = requests_per_second
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 (대기 중에는 다른 작업자도 순서를 기다림)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                now = time.monotonic()
+                self.tokens = 1
+            self.tokens -= 1
+            self.last = now
+
+class CrawlProgress:
+    """카테고리별 진행 상황 (페이지/제품 처리 수, 처리량, ETA)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.categories = {}
+
+    def start(self, category):
+        with self.lock:
+            self.categories[category] = {
+                'started': time.monotonic(), 'finished': None,
+                'total_pages': None, 'pages': 0, 'products': 0
+            }
+
+    def set_total_pages(self, category, total_pages):
+        with self.lock:
+            self.categories[category]['total_pages'] = total_pages
+
+    def page_done(self, category):
+        with self.lock:
+            self.categories[category]['pages'] += 1
+
+    def product_done(self, category, count=1):
+        with self.lock:
+            self.categories[category]['products'] += count
+
+    def finish(self, category):
+        with self.lock:
+            self.categories[category]['finished'] = time.monotonic()
+
+    def snapshot(self, category):
+        """{'pages', 'total_pages', 'products', 'pages_per_second', 'products_per_second', 'eta_seconds', 'finished'}
+
+        ETA 는 지금까지의 페이지 처리 속도로 남은 페이지를 처리하는 데 걸릴 시간 (계산할 수 없으면 None)
+        """
+        with self.lock:
+            state = dict(self.categories[category])
+        elapsed = max((state['finished'] or time.monotonic()) - state['started'], 1e-9)
+        pages_per_second = state['pages'] / elapsed
+        eta_seconds = None
+        if state['finished']:
+            eta_seconds = 0
+        elif state['total_pages'] is not None and pages_per_second > 0:
+            eta_seconds = max(state['total_pages'] - state['pages'], 0) / pages_per_second
+        return {
+            'pages': state['pages'],
+            'total_pages': state['total_pages'],
+            'products': state['products'],
+            'pages_per_second': pages_per_second,
+            'products_per_second': state['products'] / elapsed,
+            'eta_seconds': eta_seconds,
+            'finished': state['finished'] is not None
+        }
+
+    def report(self):
+        """카테고리별 진행 상황 한 줄씩 (시작한 순서)"""
+        with self.lock:
+            categories = list(self.categories)
+        lines = []
+        for category in categories:
+            state = self.snapshot(category)
+            total = state['total_pages'] if state['total_pages'] is not None else '?'
+            if state['finished']:
+                eta = '완료'
+            elif state['eta_seconds'] is None:
+                eta = 'ETA ?'
+            else:
+                eta = f"ETA {state['eta_seconds']:.0f}초"
+            lines.append(
+                f"{category}: 페이지 {state['pages']}/{total} ({state['pages_per_second']:.2f} pages/s), "
+                f"제품 {state['products']}개 ({state['products_per_second']:.2f} products/s), {eta}"
+            )
+        return lines
+
+    @contextmanager
+    def reporting(self, interval=REPORT_SECONDS):
+        """with 블록 동안 interval 초마다 진행 상황을 로그로 출력 (끝날 때 한 번 더 출력)"""
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                for line in self.report():
+                    logging.info(f"[진행] {line}")
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+            thread.join()
+            for line in self.report():
+                logging.info(f"[진행] {line}")
+
+def run_category_workers(categories, crawl_function, workers, requests_per_second=REQUESTS_PER_SECOND,
+                         report_seconds=REPORT_SECONDS):
+    """카테고리들을 작업자 workers 개로 동시에 수집하고, 끝나는 순서대로 (카테고리, 결과, 예외) 를 내보냅니다.
+
+    crawl_function(category, limiter, progress) 는 작업자 스레드에서 실행되며
+    요청마다 limiter.acquire() 를 호출하고 progress 에 진행 상황을 기록해야 합니다.
+    """
+    limiter = TokenBucket(requests_per_second)
+    progress = CrawlProgress()
+    with progress.reporting(report_seconds), ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(crawl_function, category, limiter, progress): category for category in categories}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], (None if error else future.result()), error
@@ -0,0 +1,136 @@
+import os
+import threading
+import logging
+from contextlib import contextmanager
+import duckdb
+
+# 에이전트용 읽기 전용 DuckDB 연결 풀
+# 요청마다 duckdb.connect(DB_PATH) 로 파일을 열고 닫는 대신, 프로세스에서 DB 파일마다 읽기 전용 연결 하나를
+# 처음 쓸 때 열어 두고 스레드별 커서(conn.cursor())를 빌려줍니다. DuckDB 연결 객체는 스레드 간에 공유하면 안 되므로
+# 커서 하나는 한 번에 한 스레드만 쓰고(pooled_cursor 블록 안), 반납된 커서는 다음 요청이 다시 씁니다.
+# FastAPI run_in_executor 스레드처럼 동시에 들어오는 요청은 POOL_SIZE 개까지 커서를 나눠 쓰고, 그 이상은 반납을 기다립니다.
+#
+# 카탈로그 갱신(catalog_refresh.swap_in)은 DB 파일을 os.replace 로 교체합니다. 같은 프로세스에 기존 연결이 남아 있으면
+# DuckDB가 기존 인스턴스(교체 전 파일)를 계속 쓰므로, 빌려줄 때마다 catalog_version(파일 inode/수정 시각)을 확인하고
+# 바뀌었으면 빌려 간 커서가 모두 반납된 시점에 연결을 닫고 새 파일로 다시 엽니다 (그 전까지는 기존 파일을 읽습니다).
+#
+# 사용법:
+#   from db_pool import pooled_cursor
+#   with pooled_cursor(DB_PATH) as conn:
+#       rows = conn.execute("SELECT ...").fetchall()
+
+DB_PATH = './cs_agent/db/pc_parts.db'
+
+# 동시에 빌려줄 수 있는 커서 수 (DB 파일마다)
+POOL_SIZE = 8
+
+def catalog_version(db_path):
+    """DB 파일 버전 (inode, 수정 시각 ns, 크기). 카탈로그 교체/재적재 후에는 값이 바뀝니다."""
+    stat = os.stat(db_path)
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+class ConnectionPool:
+    """DB 파일 하나의 읽기 전용 연결 + 커서 풀"""
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._conn = None
+        self._version = None
+        self._idle = []
+        self._in_use = 0
+        self.reconnects = 0
+
+    def _refresh_connection(self):
+        """(잠금 안에서) 처음 쓰거나 파일이 바뀌었고 빌려 간 커서가 없으면 연결을 다시 엽니다."""
+        version = catalog_version(self.db_path)
+        if self._conn is not None and (version == self._version or self._in_use):
+            return
+        if self._conn is not None:
+            logging.info(f"DB 파일 변경 감지, 연결 다시 열기: {self.db_path}")
+            self._close_connection()
+            self.reconnects += 1
+        self._conn = duckdb.connect(self.db_path, read_only=True)
+        self._version = version
+
+    def _close_connection(self):
+        for cursor in self._idle:
+            cursor.close()
+        self._idle = []
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = None
+        self._version = None
+
+    def checkout(self):
+        """(커서, 버전) 빌리기 (POOL_SIZE 개를 모두 빌려 갔으면 반납까지 대기)"""
+        self._slots.acquire()
+        try:
+            with self._lock:
+                self._refresh_connection()
+                cursor = self._idle.pop() if self._idle else self._conn.cursor()
+                self._in_use += 1
+                return cursor, self._version
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, cursor, version):
+        """커서 반납 (그 사이 연결을 다시 열었으면 닫음)"""
+        with self._lock:
+            self._in_use -= 1
+            if version == self._version and self._conn is not None:
+                self._idle.append(cursor)
+            else:
+                cursor.close()
+        self._slots.release()
+
+    @contextmanager
+    def cursor(self):
+        cursor, version = self.checkout()
+        try:
+            yield cursor
+        finally:
+            self.checkin(cursor, version)
+
+    def version(self):
+        """풀 커서가 읽는 DB 파일 버전
+
+        빌려 간 커서가 있으면 그 커서들이 읽는 버전(교체 전 파일일 수 있음), 없으면 다음에 빌려줄 커서가 읽을 파일 버전.
+        """
+        with self._lock:
+            if self._conn is not None and self._in_use:
+                return self._version
+            return catalog_version(self.db_path)
+
+    def close(self):
+        """빌려 간 커서가 없을 때 연결을 닫습니다 (다음 checkout 에서 다시 엶)."""
+        with self._lock:
+            if self._in_use:
+                return False
+            self._close_connection()
+            return True
+
+# DB 파일 경로(절대 경로)별 풀
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_path=DB_PATH):
+    """DB 파일의 ConnectionPool (처음 호출할 때 생성)"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(key)
+        return _pools[key]
+
+def pooled_cursor(db_path=DB_PATH):
+    """읽기 전용 커서를 빌려주는 컨텍스트 매니저 (블록이 끝나면 반납)"""
+    return get_pool(db_path).cursor()
+
+def close_pools():
+    """모든 풀의 연결 닫기 (프로세스 종료/테스트용)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
@@ -0,0 +1,290 @@
+import re
+import sys
+import time
+import logging
+from collections import Counter, deque
+from model_resolver import DB_PATH, normalize_model_text, get_resolver
+
+# 질문에서 부품 모델/부품 유형 추출 (가제티어 + Aho-Corasick)
+# DB의 실제 모델명에서 뽑은 모델 키(5600X, RTX4070, RX7900XT ...)와 부품 유형 단어(그래픽카드, 메인보드 ...)로
+# Aho-Corasick 오토마톤을 만들어 질문을 한 번 훑어 찾습니다. 한글 표기(라이젠, 지포스 ...)는 model_resolver 와 같은
+# 정규화로 영문으로 바꾼 뒤 공백을 없앤 문자열에서 찾으므로 "RTX 4070", "RTX4070" 이 같은 키에 걸립니다.
+# 확신도(confidence)가 EXTRACTOR_MIN_CONFIDENCE 이상이면 에이전트는 LLM 질문 분석을 건너뜁니다
+# (06_Text2SQL.analyze_question, 프로토타입 pc_check_agent.analyze_question).
+#
+# 사용법: python cs_agent/entity_extractor.py "라이젠 5600X랑 B650 보드 호환돼?"
+
+EXTRACTOR_MIN_CONFIDENCE = 0.8
+
+# 부품 유형 단어 (model_resolver.normalize_model_text 로 정규화해 사용)
+PART_TYPE_KEYWORDS = {
+    'gpu': ['그래픽카드', '그래픽 카드', '그래픽', '글카', '비디오카드', 'VGA', 'GPU'],
+    'cpu': ['CPU', '프로세서', '씨피유'],
+    'motherboard': ['메인보드', '마더보드', '보드', 'MOTHERBOARD', 'MAINBOARD'],
+    'memory': ['메모리', '램', 'RAM', 'MEMORY'],
+    'case_chassis': ['케이스', '본체', 'CASE'],
+    'power_supply': ['파워서플라이', '파워', 'PSU'],
+    'cpu_cooler': ['CPU쿨러', '쿨러', '수냉', '공랭', 'COOLER'],
+    'storage': ['저장장치', 'SSD', 'HDD', 'NVME', 'STORAGE']
+}
+
+# 모델 번호 뒤에 붙는 등급 표기 (RTX 4070 TI, RX 7900 XT 를 한 키로)
+MODEL_SUFFIXES = {'TI', 'SUPER', 'XT', 'XTX', 'GRE', 'X3D', 'KS', 'KF'}
+
+# 모델 키에서 제외하는 사양 토큰 (용량, 클럭, 규격 등)
+SPEC_TOKEN_PATTERN = r'^(\d+(?:GB|TB|MB|MHZ|GHZ|W|MM|CM|V|A|RPM|MM2|T|P)|DDR\d|GDDR\d+X?|PCIE\d|USB\d*|M2|\d+)$'
+
+def _is_model_token(token):
+    return (
+        len(token) >= 3 and any(ch.isdigit() for ch in token) and token.isascii()
+        and not re.match(SPEC_TOKEN_PATTERN, token)
+    )
+
+def _family(tokens, index):
+    """모델 번호 앞의 영문 계열 토큰 (RTX, RX, GX ...), 없으면 None"""
+    previous = tokens[index - 1] if index > 0 else None
+    if previous and previous.isascii() and previous.isalpha() and len(previous) <= 8:
+        return previous
+    return None
+
+def _model_tokens(tokens):
+    """[(위치, 모델 번호 키)]: 숫자가 들어간 토큰
+
+    숫자만인 토큰은 앞 계열 토큰과 합친 키(RTX 4070 -> RTX4070)와 4~5자리면 숫자 자체(4070, 13400).
+    사양 토큰 뒤의 숫자(DDR5-5600 의 5600)는 제외합니다.
+    """
+    for index, token in enumerate(tokens):
+        if token.isdigit():
+            if index > 0 and re.match(SPEC_TOKEN_PATTERN, tokens[index - 1]):
+                continue
+            family = _family(tokens, index)
+            if len(token) >= 3 and family:
+                yield index, family + token
+            if 4 <= len(token) <= 5:
+                yield index, token
+        elif _is_model_token(token):
+            yield index, token
+
+def model_keys(name):
+    """모델명 하나에서 만드는 모델 키 (공백 없는 정규화 문자열)
+
+    모델 번호 키(5600X, RTX4070), 앞 계열 토큰과 합친 키(MAGB650M), 등급 표기까지 합친 키(RTX4070TI),
+    마지막 영문 한 글자를 뗀 키(B650M -> B650, 13400F -> 13400)
+    """
+    tokens = normalize_model_text(name).split()
+    keys = set()
+    for index, key in _model_tokens(tokens):
+        variants = [key]
+        stem = re.match(r'^([A-Z]*\d{3,})[A-Z]$', key)
+        if stem:
+            variants.append(stem.group(1))
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+        if following in MODEL_SUFFIXES:
+            variants.append(key + following)
+        keys.update(variants)
+        family = _family(tokens, index)
+        if family and not key.startswith(family):
+            keys.update(family + variant for variant in variants)
+    return keys
+
+class AhoCorasick:
+    """문자열 키 집합의 Aho-Corasick 오토마톤 (키 -> 값)"""
+
+    def __init__(self, items):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for key, value in items:
+            node = 0
+            for ch in key:
+                if ch not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.outputs[node].append((len(key), value))
+
+        # 너비 우선으로 실패 링크 연결
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(ch, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def find_all(self, text):
+        """[(시작, 끝, 값)] (겹치는 일치 포함)"""
+        matches = []
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for length, value in self.outputs[node]:
+                matches.append((end - length, end, value))
+        return matches
+
+def _compact_with_boundaries(text):
+    """정규화 문자열 -> (공백 없는 문자열, 토큰 경계 위치 집합, 공백 없는 위치 -> 원래 위치 목록)
+
+    공백과 영숫자/한글이 바뀌는 위치를 토큰 경계로 봅니다 (예: '5600X랑' 은 '5600X' 뒤가 경계).
+    """
+    compact = []
+    positions = []
+    boundaries = {0}
+    previous_kind = None
+    for position, ch in enumerate(text):
+        if ch == ' ':
+            boundaries.add(len(compact))
+            previous_kind = None
+            continue
+        kind = ch.isascii()
+        if previous_kind is not None and kind != previous_kind:
+            boundaries.add(len(compact))
+        previous_kind = kind
+        compact.append(ch)
+        positions.append(position)
+    boundaries.add(len(compact))
+    return ''.join(compact), boundaries, positions
+
+class EntityExtractor:
+    """모델 키 + 부품 유형 단어 가제티어"""
+
+    def __init__(self, parts):
+        # parts: [(테이블, 모델명)]
+        key_tables = {}
+        for table, name in parts:
+            for key in model_keys(name):
+                key_tables.setdefault(key, Counter())[table] += 1
+        type_keys = {}
+        for table, words in PART_TYPE_KEYWORDS.items():
+            for word in words:
+                type_keys[normalize_model_text(word).replace(' ', '')] = table
+
+        items = [(key, ('model', dict(tables))) for key, tables in key_tables.items() if key not in type_keys]
+        items += [(key, ('part_type', table)) for key, table in type_keys.items()]
+        self.automaton = AhoCorasick(items)
+        self.model_key_count = len(key_tables)
+
+    @classmethod
+    def from_resolver(cls, resolver):
+        """model_resolver.ModelResolver 가 읽어 둔 모델명으로 생성"""
+        return cls([
+            (resolver.tables[table_code], name)
+            for table_code, name in zip(resolver.doc_tables.tolist(), resolver.doc_names)
+        ])
+
+    def extract(self, question):
+        """{'search_keywords', 'part_types', 'entities', 'confidence'}
+
+        search_keywords: 찾은 모델 키를 질문 표기대로 (긴 것부터), part_types: 나온 순서대로 (부품 테이블명)
+        confidence: 모델을 하나 이상 찾았고 모르는 모델 번호가 없으면 높음
+                    (여러 테이블에 걸친 모델 키는 같은 질문의 부품 유형 단어로 정해질 때만 높음)
+        """
+        normalized = normalize_model_text(question)
+        compact, boundaries, positions = _compact_with_boundaries(normalized)
+
+        # 토큰 경계에서 시작하고 (영문 키는) 경계에서 끝나는 일치만, 왼쪽부터 가장 긴 것 우선으로 겹치지 않게
+        candidates = []
+        for start, end, value in self.automaton.find_all(compact):
+            if start not in boundaries:
+                continue
+            if compact[end - 1].isascii() and end not in boundaries:
+                continue
+            # 사양 토큰 뒤의 숫자는 모델 번호가 아님 (DDR5 5600)
+            if compact[start:end].isdigit():
+                previous = normalized[:positions[start]].split()[-1:]
+                if previous and re.match(SPEC_TOKEN_PATTERN, previous[0]):
+                    continue
+            candidates.append((start, -(end - start), end, value))
+        candidates.sort(key=lambda item: (item[0], item[1]))
+        entities = []
+        covered_until = 0
+        for start, _, end, (kind, value) in candidates:
+            if start < covered_until:
+                continue
+            covered_until = end
+            text = normalized[positions[start]:positions[end - 1] + 1]
+            entities.append({'kind': kind, 'text': text, 'start': start, 'end': end, 'value': value})
+
+        # 부품 유형은 질문에 나온 순서 (모델은 그 모델의 테이블)
+        models = [entity for entity in entities if entity['kind'] == 'model']
+        type_words = {entity['value'] for entity in entities if entity['kind'] == 'part_type'}
+        ambiguous = False
+        for entity in models:
+            # 한 테이블에 80% 이상 몰린 키는 그 테이블, 아니면 질문의 부품 유형 단어로 정함
+            tables = entity['value']
+            table, count = max(tables.items(), key=lambda item: item[1])
+            if count < 0.8 * sum(tables.values()):
+                mentioned = [table for table in tables if table in type_words]
+                if mentioned:
+                    table = mentioned[0]
+                else:
+                    ambiguous = True
+            entity['table'] = table
+        part_types = list(dict.fromkeys(
+            entity['table'] if entity['kind'] == 'model' else entity['value'] for entity in entities
+        ))
+
+        # 모델 키로 찾지 못한 모델 번호 같은 토큰 (DB에 없는 모델)
+        found = [entity['text'].replace(' ', '') for entity in models]
+        tokens = re.findall(r'[0-9A-Z]+|[가-힣]+', normalized)
+        unknown = [
+            key for _, key in _model_tokens(tokens)
+            if not any(key in found_key or found_key in key for found_key in found)
+        ]
+
+        if not models:
+            confidence = 0.3 if part_types else 0.0
+        elif unknown:
+            confidence = 0.5
+        elif ambiguous:
+            confidence = 0.6
+        else:
+            confidence = 1.0
+
+        search_keywords = [entity['text'] for entity in sorted(models, key=lambda entity: -(entity['end'] - entity['start']))]
+        return {
+            'search_keywords': list(dict.fromkeys(search_keywords)),
+            'part_types': part_types,
+            'entities': entities,
+            'unknown_tokens': unknown,
+            'confidence': confidence
+        }
+
+# 색인(ModelResolver)별 추출기
+_extractors = {}
+
+def get_extractor(db_path=DB_PATH):
+    """DB 경로의 EntityExtractor (model_resolver.get_resolver 와 같은 모델명, DB가 바뀌면 다시 생성)"""
+    resolver = get_resolver(db_path)
+    cached = _extractors.get(db_path)
+    if cached and cached[0] is resolver:
+        return cached[1]
+    started = time.time()
+    extractor = EntityExtractor.from_resolver(resolver)
+    logging.info(f"가제티어 생성: 모델 키 {extractor.model_key_count}개, {time.time() - started:.2f}초")
+    _extractors[db_path] = (resolver, extractor)
+    return extractor
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if len(sys.argv) < 2:
+        print("사용법: python cs_agent/entity_extractor.py 질문")
+        sys.exit(1)
+    extractor = get_extractor()
+    started = time.perf_counter()
+    result = extractor.extract(sys.argv[1])
+    elapsed = time.perf_counter() - started
+    print(f"키워드: {result['search_keywords']}")
+    print(f"부품 유형: {result['part_types']}")
+    print(f"확신도: {result['confidence']} (모르는 모델 번호: {result['unknown_tokens']})")
+    print(f"({elapsed * 1000:.2f}ms)")
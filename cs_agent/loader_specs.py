@@ -0,0 +1,637 @@
+import pandas as pd
+from bulk_loader import clean_series, to_bool_series
+from spec_normalize import COOLER_SOCKETS
+
+# 부품 엑셀 적재 명세
+# 05-1 ~ 05-7 로더가 각자 갖고 있던 엑셀 -> DB 컬럼 매핑과 변환 규칙을 테이블별 명세로 모았습니다.
+# part_loader.py 가 이 명세를 읽어 모든 부품 테이블을 한 프로세스, 한 연결에서 적재합니다.
+#
+# 명세 항목
+#   label        로그 표시 이름
+#   file_prefix  원본 시트 파일명 접두사 (raw_parquet 매니페스트 / raw_xlsx 엑셀 중 가장 최신 사용)
+#   id_column    기본 키 컬럼
+#   row_ids      True 이면 시트 행 번호 + 1 을 임시 ID로 넣어 derive 의 대체 모델명에 사용
+#                (저장되는 ID는 항상 모델명 기준, part_loader.assign_part_ids)
+#   columns      엑셀 컬럼 -> DB 컬럼 (같은 DB 컬럼이 여러 번 나오면 뒤쪽 우선, 값이 없으면 앞쪽 값)
+#   converters   DB 컬럼 -> 변환기 이름 (part_loader.CONVERTERS) 또는 함수, 없으면 DB 타입에 따라 변환
+#                ('dimension' 은 mm, 'power' 는 W 로 단위 변환 후 반올림)
+#   true_values  'flag' 변환기에서 참으로 볼 값 (그 외 문자열은 False)
+#   defaults     DB 컬럼 -> 값이 없을 때 채울 기본값
+#   derive       (data, df) -> data, 매핑 후 model_name 등 파생 컬럼 생성
+#   dedupe_names True 이면 중복 모델명에 일련번호 부여 (False 이면 중복 행은 rejected_rows 로)
+
+CPU_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '세대명': 'generation',
+    '(인텔) 모델명': 'intel_model',
+    '(AMD) 모델명': 'amd_model',
+    '코어 갯수': 'cores',
+    '쓰레드': 'threads',
+    '소켓 형태': 'socket_type',
+    '동작 클럭': 'base_clock',
+    '터보 클럭': 'turbo_clock',
+    'L3 캐시메모리': 'l3_cache',
+    '내장그래픽': 'integrated_graphics',
+    '그래픽 코어 모델': 'graphics_model',
+    '그래픽 코어 클럭': 'graphics_clock',
+    'PBP/MTP': 'pbp_mtp',
+    '열 설계 전력(TDP)': 'tdp',
+    '제조공정': 'process',
+    '옵테인': 'optane',
+    '하이퍼스레드': 'hyperthreading',
+    'SENSEMI': 'sensemi',
+    'StoreMI': 'storemi',
+    'VR Ready 프리미엄': 'vr_ready',
+    'Ryzen Master': 'ryzen_master',
+    '3D V캐시': 'v_cache',
+    '지원 메모리 규격': 'memory_support',
+    '메모리 버스': 'memory_bus',
+    '메모리 채널': 'memory_channels',
+    '패키지': 'package',
+    'KC 인증정보': 'kc_certification',
+    '정격전압': 'rated_voltage',
+    '소비전력': 'power_consumption',
+    '에너지소비효율등급': 'energy_efficiency',
+    '동일모델의 출시년월': 'release_date',
+    '제조자,수입품의 경우 수입자를 함께 표기': 'manufacturer_importer',
+    '제조국': 'country_of_origin',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요사항': 'key_features',
+    '품질보증기준': 'warranty',
+    'A/S 책임자와 전화번호': 'as_contact',
+    '법에 의한 인증, 허가 등을 받았음을 확인할 수 있는 경우 그에 대한 사항': 'certification',
+    '제조국 또는 원산지': 'origin',
+    '제조사/수입품의 경우 수입자를 함께 표기': 'manufacturer_info',
+    'A/S 책임자': 'as_manager',
+    '소비자상담 관련 전화번호': 'customer_service',
+    'AMD Ryzen AI': 'ryzen_ai',
+    'PPT': 'ppt',
+    '인텔 XTU': 'intel_xtu',
+    '인텔 딥러닝부스트': 'intel_dlboost'
+}
+
+MOTHERBOARD_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '사용 CPU': 'cpu_support',
+    '소켓': 'socket_type',
+    '칩셋': 'chipset',
+    '보드 규격': 'form_factor',
+    'CPU 장착 개수': 'cpu_count',
+    '지원 메모리': 'memory_support',
+    '속도': 'memory_speed',
+    '슬롯': 'memory_slots',
+    '지원 용량': 'max_memory',
+    '지원 채널': 'memory_channel',
+    'M.2': 'm2_slots',
+    'SATA3': 'sata3',
+    'D-SUB': 'vga',
+    'HDMI': 'hdmi',
+    'DP': 'display_port',
+    'PCI-Ex. x16': 'pcie_x16',
+    'PCI-Ex. x1': 'pcie_x1',
+    'USB 3.1': 'usb_31_gen1',
+    '무선랜': 'wifi_support',
+    '블루투스': 'bluetooth_support',
+    '유선랜 속도': 'lan_speed',
+    '오디오 칩셋': 'audio_chipset',
+    'RGB 헤더': 'rgb_header',
+    'ARGB 헤더': 'argb_header',
+    '시스템팬 헤더': 'fan_headers',
+    'CPU팬 헤더': 'cpu_fan_headers',
+    '수냉 펌프': 'pump_headers',
+    '디버그 LED': 'debug_led',
+    'POST 디스플레이': 'post_display',
+    'CMOS 클리어': 'clear_cmos',
+    'BIOS 플래시백': 'bios_flashback',
+    '듀얼 BIOS': 'dual_bios',
+    'EZ 모드': 'ez_mode',
+    '제품명': 'product_name',
+    'KC 인증': 'kc_certification',
+    '정격전압': 'rated_voltage',
+    '소비전력': 'power_consumption',
+    '에너지효율': 'energy_efficiency',
+    '인증': 'certification',
+    '출시일': 'release_date',
+    '제조자/수입자': 'manufacturer_importer',
+    '원산지': 'origin',
+    '제조사 정보': 'manufacturer_info',
+    '제조국': 'country_of_origin',
+    'A/S 책임자': 'as_manager',
+    '소비자상담 관련 전화번호': 'customer_service',
+    'A/S 안내': 'as_contact',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요 특징': 'key_features',
+    '품질보증기준': 'warranty'
+}
+
+MEMORY_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '용도': 'purpose',
+    '분류': 'classification',
+    '제품 분류': 'product_classification',
+    '사용 장치': 'device_usage',
+    '규격': 'memory_standard',
+    '메모리 규격': 'memory_type',
+    '용량': 'capacity',
+    '메모리 용량': 'memory_capacity',
+    '클럭': 'clock',
+    '동작 클럭': 'operating_clock',
+    '타이밍': 'timing',
+    '메모리 타이밍': 'memory_timing',
+    '전압': 'voltage',
+    '정격전압': 'rated_voltage',
+    '패키지': 'package',
+    '패키지 구성': 'package_composition',
+    'ECC': 'ecc',
+    '온다이ECC': 'on_die_ecc',
+    'REG': 'reg',
+    'XMP': 'xmp',
+    'EXPO': 'expo',
+    '클럭드라이버': 'clock_driver',
+    '방열판': 'heatsink',
+    'LED': 'led',
+    'LED색': 'led_color',
+    'RGB제어': 'rgb_control',
+    'AURA SYNC': 'aura_sync',
+    'MYSTIC LIGHT': 'mystic_light',
+    'POLYCHROME-SYNC': 'polychrome_sync',
+    'RGB FUSION': 'rgb_fusion',
+    'T-FORCE BLITZ': 'tt_rgb_plus',
+    'XPG RGB': 'razer_chroma',
+    '품명': 'product_name',
+    '모델명': 'model_name',
+    'KC 인증정보': 'kc_certification',
+    '소비전력': 'power_consumption',
+    '에너지소비효율등급': 'energy_efficiency',
+    '법에 의한 인증, 허가 등을 받았음을 확인할 수 있는 경우 그에 대한 사항': 'certification',
+    '동일모델의 출시년월': 'release_date',
+    '제조자,수입품의 경우 수입자를 함께 표기': 'manufacturer_importer',
+    '제조국 또는 원산지': 'origin',
+    '제조사/수입품의 경우 수입자를 함께 표기': 'manufacturer_info',
+    '제조국': 'country_of_origin',
+    '제조회사': 'manufacturer',
+    'A/S 책임자': 'as_manager',
+    '소비자상담 관련 전화번호': 'customer_service',
+    'A/S 책임자와 전화번호': 'as_contact',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요사항': 'key_features',
+    '품질보증기준': 'warranty',
+    '-': None
+}
+
+CASE_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '제품 분류': 'case_type',
+    '케이스 타입': 'case_type',
+    '지원 파워': 'power_supply_type',
+    'ATX': 'atx_support',
+    'mATX': 'matx_support',
+    'MiniITX': 'itx_support',
+    'CPU쿨러장착높이': 'cpu_cooler_height',
+    'VGA장착길이': 'vga_length',
+    '2.5베이': 'ssd_bays',
+    '3.5베이': 'hdd_bays',
+    'PCI슬롯': 'expansion_slots',
+    'USB': 'usb_ports',
+    'USB 3.0': 'usb_31_gen1',
+    '너비': 'width',
+    '높이': 'height',
+    '깊이': 'depth',
+    '장착 팬 개수': 'fans_included',
+    '측면': 'side_panel',
+    '품명': 'product_name',
+    '제품명(전체)': 'product_name',
+    '파워 포함 여부': 'power_included',
+    '브랜드별 지원파워규격': 'supported_mb_types',
+    'EATX': 'eatx_support',
+    '수랭쿨러 지원': 'radiator_support',
+    '전면 팬': 'front_fan',
+    '상단 팬': 'top_fan',
+    '후면 팬': 'rear_fan',
+    '하단 팬': 'bottom_fan',
+    '측면 팬': 'side_fan',
+    '전면 라디에이터': 'front_radiator',
+    '상단 라디에이터': 'top_radiator',
+    '후면 라디에이터': 'rear_radiator',
+    '측면 라디에이터': 'side_radiator',
+    'USB 3.1 Gen1': 'usb_31_gen1',
+    'USB 3.1 Gen2': 'usb_31_gen2',
+    'USB 3.1 Type-C': 'usb_31_type_c',
+    'USB 2.0': 'usb_20',
+    '오디오 포트': 'audio_ports',
+    'RGB 지원': 'rgb_support',
+    'RGB 컨트롤러': 'rgb_controller',
+    'AURA SYNC': 'aura_sync',
+    'Mystic Light': 'mystic_light',
+    'RGB Fusion': 'rgb_fusion',
+    'Polychrome Sync': 'polychrome_sync',
+    'TT RGB Plus': 'tt_rgb_plus',
+    'Razer Chroma': 'razer_chroma',
+    '무게': 'weight',
+    '재질': 'material',
+    '먼지 필터': 'dust_filter',
+    'PSU 슈라우드': 'psu_shroud',
+    'KC인증': 'kc_certification',
+    '정격전압': 'rated_voltage',
+    '소비전력': 'power_consumption',
+    '에너지효율': 'energy_efficiency',
+    '인증': 'certification',
+    '출시일': 'release_date',
+    '제조/수입자': 'manufacturer_importer',
+    '원산지': 'origin',
+    '제조자정보': 'manufacturer_info',
+    '제조국': 'country_of_origin',
+    'A/S책임자': 'as_manager',
+    '고객상담': 'customer_service',
+    'A/S연락처': 'as_contact',
+    '크기': 'size',
+    '주요특징': 'key_features',
+    '보증기간': 'warranty'
+}
+
+GPU_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '칩셋': 'chipset_manufacturer',
+    '분류': 'gpu_type',
+    '칩셋모델': 'chipset',
+    '기본 클럭': 'core_clock',
+    '부스트 클럭': 'memory_clock',
+    '메모리용량': 'memory_capacity',
+    '종류': 'memory_type',
+    '버스': 'memory_bus',
+    '쿠다프로세서': 'cuda_cores',
+    '스트림프로세서(AMD)': 'stream_processors',
+    'RT 코어': 'rt_cores',
+    '텐서 코어': 'tensor_cores',
+    '장착 인터페이스': 'interface',
+    'HDMI': 'hdmi',
+    'DP': 'display_port',
+    'DVI': 'dvi',
+    'D-SUB': 'vga',
+    '전원 커넥터': 'power_pin',
+    '소비전력': 'power_consumption',
+    '권장 파워': 'recommended_psu',
+    '냉각 방식': 'cooling_type',
+    '팬 개수': 'cooling_fan',
+    '길이': 'length',
+    '너비': 'width',
+    '높이': 'height',
+    '백플레이트': 'backplate',
+    'LED': 'led',
+    'RGB': 'rgb',
+    'AURA SYNC': 'aura_sync',
+    'MYSTIC LIGHT': 'mystic_light',
+    'RGB FUSION': 'rgb_fusion',
+    'POLYCHROME SYNC': 'polychrome_sync',
+    'TT RGB PLUS': 'tt_rgb_plus',
+    'RAZER CHROMA': 'razer_chroma',
+    'DirectX': 'directx',
+    'OpenGL': 'opengl',
+    'OpenCL': 'opencl',
+    'Vulkan': 'vulkan',
+    'CUDA': 'cuda',
+    'PhysX': 'physx',
+    'SLI/CrossFire': 'sli_crossfire',
+    'VR Ready': 'vr_ready',
+    'DLSS': 'dlss',
+    'Ray Tracing': 'ray_tracing',
+    'HDCP': 'hdcp',
+    '멀티 모니터': 'multi_monitor',
+    '품명': 'product_name',
+    '제품명(전체)': 'product_name',
+    'KC 인증정보': 'kc_certification',
+    '정격전압': 'rated_voltage',
+    '에너지소비효율등급': 'energy_efficiency',
+    '인증': 'certification',
+    '동일모델의 출시년월': 'release_date',
+    '제조자,수입품의 경우 수입자를 함께 표기': 'manufacturer_importer',
+    '원산지': 'origin',
+    '제조자': 'manufacturer_info',
+    '제조국': 'country_of_origin',
+    'A/S 책임자': 'as_manager',
+    '고객상담': 'customer_service',
+    'A/S 책임자와 전화번호': 'as_contact',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요사항': 'key_features',
+    '품질보증기준': 'warranty'
+}
+
+POWER_SUPPLY_COLUMNS = {
+    '수입/제조사': 'manufacturer',
+    '제품분류': 'product_category',
+    '정격출력': 'wattage',
+    'PFC 방식': 'pfc_type',
+    '+12V': 'plus12v',
+    '+5V': 'plus5v',
+    '+3.3V': 'plus3v3',
+    '80PLUS': 'efficiency',
+    '보증기간': 'warranty',
+    '제품명(전체)': 'product_name',
+    '모델명': 'model_name',
+    '법에 의한 인증, 허가 등을 받았음을 확인할 수 있는 경우 그에 대한 사항': 'kc_certification',
+    '제조국 또는 원산지': 'country_of_origin',
+    '제조사/수입품의 경우 수입자를 함께 표기': 'manufacturer_importer',
+    'A/S 책임자': 'as_manager',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요사항': 'key_features',
+    '품질보증기준': 'certification',
+    'A/S 책임자와 전화번호': 'as_contact',
+    '모듈러 타입': 'modular_type',
+    '6핀 PCI-E': 'pcie_6pin',
+    '리폼 케이블': 'reform_cable',
+    'LED라이트': 'led_light',
+    'AURA SYNC': 'aura_sync',
+    'MYSTIC LIGHT': 'mystic_light',
+    'RGB FUSION': 'rgb_fusion',
+    'POLYCHROME': 'polychrome',
+    'RAZER CHROMA': 'razer_chroma',
+    'TT RGB PLUS': 'tt_rgb_plus'
+}
+
+CPU_COOLER_COLUMNS = {
+    '제품명(전체)': 'model_name',
+    '수입/제조사': 'manufacturer',
+    '쿨러 종류': 'cooler_type',
+    '냉각방식': 'cooler_type',
+    '히트파이프': 'key_features',
+    '전원단자': 'fan_connector',
+    '높이': 'height',
+    '팬 크기': 'fan_size',
+    '팬 개수': 'fan_count',
+    '최대 팬속도': 'fan_speed',
+    '최대 풍량': 'key_features',
+    '팬 두께': 'key_features',
+    'TDP': 'tdp_support',
+    'KC 인증정보': 'kc_certification',
+    '정격전압': 'rated_voltage',
+    '소비전력': 'power_consumption',
+    '에너지소비효율등급': 'energy_efficiency',
+    '법에 의한 인증, 허가 등을 받았음을 확인할 수 있는 경우 그에 대한 사항': 'certification',
+    '동일모델의 출시년월': 'release_date',
+    '제조자,수입품의 경우 수입자를 함께 표기': 'manufacturer_importer',
+    '제조국 또는 원산지': 'origin',
+    '제조사/수입품의 경우 수입자를 함께 표기': 'manufacturer_info',
+    '제조국': 'country_of_origin',
+    'A/S 책임자': 'as_manager',
+    '소비자상담 관련 전화번호': 'customer_service',
+    'A/S 책임자와 전화번호': 'as_contact',
+    '크기': 'size',
+    '무게': 'weight',
+    '주요사항': 'key_features',
+    '품질보증기준': 'warranty',
+    'A/S기간': 'warranty',
+    'LED 라이트': 'rgb',
+    'LED라이트': 'rgb',
+    'RGB LED': 'rgb',
+    'LED시스템': 'rgb',
+    'AURA SYNC': 'aura_sync',
+    'MYSTIC LIGHT': 'mystic_light',
+    'RGB FUSION': 'rgb_fusion',
+    'POLYCHROME': 'polychrome_sync',
+    'CHROMA': 'razer_chroma',
+    'TT RGB PLUS': 'tt_rgb_plus',
+    '베어링 타입': 'bearing_type',
+    'PWM': 'fan_pwm',
+    '컨넥터': 'fan_connector',
+    '수랭팬개수': 'fan_count',
+    '워터블록 재질': 'water_block_material',
+    '라디에이터 크기': 'radiator_size',
+    '튜브 길이': 'tube_length'
+}
+
+# 쿨러 시트의 소켓별 지원 여부 컬럼 (지원하는 소켓명을 socket_support 로 합침, 비트마스크와 같은 순서)
+SOCKET_COLUMNS = COOLER_SOCKETS
+
+def _empty(data):
+    """값이 모두 비어 있는 Series"""
+    return pd.Series(None, index=data.index, dtype=object)
+
+def _derive_cpu(data, df):
+    """모델명 생성: 제품명(전체) > 인텔 모델명 > AMD 모델명 > 제조사_CPU_ID"""
+    manufacturer = data['manufacturer'].fillna("Unknown") if 'manufacturer' in data else pd.Series("Unknown", index=data.index)
+    model_name = manufacturer.astype(str) + "_CPU_" + data['cpu_id'].astype(str)
+    intel_model = data['intel_model'].where(data['intel_model'] != '-') if 'intel_model' in data else None
+    amd_model = data['amd_model'].where(data['amd_model'] != '-') if 'amd_model' in data else None
+    for candidate in [amd_model, intel_model, df.get('제품명(전체)')]:
+        if candidate is not None:
+            model_name = clean_series(candidate).where(candidate.notna(), model_name)
+    data['model_name'] = model_name
+    data['product_name'] = model_name
+    return data
+
+def _derive_motherboard(data, df):
+    """제품명(전체)를 모델명으로 사용, 없으면 제조사/칩셋/소켓으로 생성"""
+    blank = pd.Series('', index=df.index)
+    fallback_name = (
+        df.get('수입/제조사', blank).fillna('').astype(str) + " " +
+        df.get('칩셋', blank).fillna('').astype(str) + " " +
+        df.get('소켓', blank).fillna('').astype(str) + " #" +
+        data['mb_id'].astype(str)
+    )
+    full_name = df.get('제품명(전체)', _empty(df))
+    data['model_name'] = clean_series(full_name).where(full_name.notna() & (full_name != ''), fallback_name)
+    return data
+
+def _derive_memory(data, df):
+    """제품명(전체)를 product_name과 model_name 모두에 사용"""
+    if '제품명(전체)' in df.columns:
+        full_name = clean_series(df['제품명(전체)'])
+        for column in ['product_name', 'model_name']:
+            data[column] = full_name.where(full_name.notna(), data[column]) if column in data else full_name
+    return data
+
+def _derive_case(data, df):
+    """품명을 모델명으로 사용"""
+    if 'product_name' in data and 'model_name' not in data:
+        data['model_name'] = data['product_name']
+    return data
+
+def _derive_gpu(data, df):
+    """품명을 모델명으로 사용, 없으면 칩셋 정보로 모델명 생성"""
+    chipset = data.get('chipset', _empty(data))
+    manufacturer = data.get('manufacturer', _empty(data))
+    chipset_name = chipset.where(manufacturer.isna(), manufacturer.astype(str) + " " + chipset.astype(str))
+    chipset_name = chipset_name.where(chipset.notna(), None)
+    product_name = data.get('product_name', _empty(data))
+    data['model_name'] = product_name.where(product_name.notna(), chipset_name)
+    return data
+
+def _derive_power_supply(data, df):
+    """모델명이 없거나 '상세정보참조'이면 품명을 모델명으로 사용, 제품분류로 폼팩터 채우기"""
+    if 'product_name' in data:
+        model_name = data.get('model_name', _empty(data))
+        use_product = data['product_name'].notna() & (model_name.isna() | (model_name == '상세정보참조'))
+        data['model_name'] = data['product_name'].where(use_product, model_name)
+
+    # 시트에 폼팩터 컬럼이 없어 제품분류(예: "ATX 파워", "M-ATX(SFX) 파워")를 폼팩터로 사용 (PSU-케이스 호환성용)
+    if 'product_category' in data:
+        category = data['product_category']
+        is_form = category.astype(str).str.contains('ATX|SFX|TFX|FLEX', case=False, na=False)
+        form_factor = data.get('form_factor', _empty(data))
+        data['form_factor'] = form_factor.where(form_factor.notna(), category.where(is_form))
+    return data
+
+def _derive_cpu_cooler(data, df):
+    """소켓 지원 정보(지원 소켓명을 ", "로 연결)와 모델명 생성"""
+    # 제품명(전체)는 product_name과 model_name 모두에 사용
+    if '제품명(전체)' in df.columns:
+        data['product_name'] = clean_series(df['제품명(전체)'])
+
+    present = [socket for socket in SOCKET_COLUMNS if socket in df.columns]
+    if present:
+        flags = pd.DataFrame({socket: to_bool_series(df[socket]).fillna(False).astype(bool) for socket in present})
+        socket_support = flags.dot(pd.Series([f"{socket}, " for socket in present], index=present)).str.rstrip(', ')
+        data['socket_support'] = socket_support.where(socket_support != '', data.get('socket_support'))
+
+    # 품명을 모델명으로 사용
+    if 'product_name' in data:
+        model_name = data.get('model_name', _empty(data))
+        data['model_name'] = model_name.where(model_name.notna(), data['product_name'])
+    return data
+
+PART_SPECS = {
+    'cpu': {
+        'label': 'CPU',
+        'file_prefix': 'CPU_',
+        'id_column': 'cpu_id',
+        'row_ids': True,
+        'columns': CPU_COLUMNS,
+        # 숫자 추출 (예: "4.2(GHz)" -> 4.2)
+        'converters': {
+            **{column: 'number' for column in [
+                'cores', 'threads', 'base_clock', 'turbo_clock', 'graphics_clock', 'tdp',
+                'memory_channels'
+            ]},
+            **{column: 'flag' for column in [
+                'integrated_graphics', 'optane', 'hyperthreading', 'sensemi', 'storemi',
+                'vr_ready', 'ryzen_master', 'v_cache', 'ryzen_ai', 'intel_xtu', 'intel_dlboost'
+            ]}
+        },
+        'true_values': ['있음', '예', 'yes', 'true', '1', 'o'],
+        'derive': _derive_cpu,
+        'dedupe_names': False
+    },
+    'motherboard': {
+        'label': '마더보드',
+        'file_prefix': 'Mainboard_',
+        'id_column': 'mb_id',
+        'row_ids': True,
+        'columns': MOTHERBOARD_COLUMNS,
+        # 숫자 추출 (예: "4(EA)" -> 4, "최대 128(GB)" -> 128)
+        'converters': {
+            **{column: 'number' for column in [
+                'memory_slots', 'max_memory', 'pcie_x16', 'pcie_x8', 'pcie_x4', 'pcie_x1',
+                'm2_slots', 'sata3', 'lan_ports', 'usb_31_gen2', 'usb_31_gen1', 'usb_20',
+                'usb_type_c', 'rgb_header', 'argb_header', 'fan_headers', 'cpu_fan_headers',
+                'pump_headers', 'temperature_sensors', 'memory_channel', 'cpu_count'
+            ]},
+            **{column: 'flag' for column in [
+                'thunderbolt_support', 'wifi_support', 'bluetooth_support', 'display_port', 'hdmi',
+                'dvi', 'vga', 'corsair_header', 'aura_sync', 'mystic_light', 'rgb_fusion',
+                'polychrome_sync', 'razer_chroma', 'tt_rgb_plus', 'debug_led', 'post_display',
+                'clear_cmos', 'bios_flashback', 'dual_bios', 'ez_mode', 'sata_raid', 'nvme_raid'
+            ]}
+        },
+        'true_values': ['있음', '예', 'yes', 'true', '1', 'o', '지원'],
+        'derive': _derive_motherboard,
+        'dedupe_names': False
+    },
+    'memory': {
+        'label': '메모리',
+        'file_prefix': 'Mainboard_',
+        'id_column': 'memory_id',
+        'row_ids': False,
+        'columns': MEMORY_COLUMNS,
+        # 용량/클럭은 정수, 전압은 실수로 추출 (DB 컬럼 타입과 무관하게 숫자만 저장)
+        'converters': {
+            'capacity': 'integer',
+            'memory_capacity': 'integer',
+            'clock': 'integer',
+            'operating_clock': 'integer',
+            'voltage': 'number',
+            'rated_voltage': 'number'
+        },
+        'derive': _derive_memory,
+        'dedupe_names': True
+    },
+    'case_chassis': {
+        'label': '케이스',
+        'file_prefix': 'Case_',
+        'id_column': 'case_id',
+        'row_ids': False,
+        'columns': CASE_COLUMNS,
+        'converters': {
+            'width': 'number',
+            'height': 'number',
+            'depth': 'number',
+            # 장착 가능 치수 (예: "16.5cm" -> 165, 호환성 계산에 mm 로 사용)
+            'cpu_cooler_height': 'dimension',
+            'vga_length': 'dimension'
+        },
+        'derive': _derive_case,
+        'dedupe_names': True
+    },
+    'gpu': {
+        'label': 'GPU',
+        'file_prefix': 'VGA_',
+        'id_column': 'gpu_id',
+        'row_ids': False,
+        'columns': GPU_COLUMNS,
+        'converters': {
+            'core_clock': 'number',
+            'memory_clock': 'number',
+            # 예: "8(GB)" -> 8, "128(bit)" -> 128
+            'memory_capacity': 'integer',
+            'memory_bus': 'integer',
+            # 치수 정보 (예: "249.9(mm)" -> 250, "30.5cm" -> 305)
+            'length': 'dimension',
+            'width': 'dimension',
+            'height': 'dimension',
+            # 권장 파워 (예: "650W 이상" -> 650)
+            'recommended_psu': 'power'
+        },
+        'derive': _derive_gpu,
+        'dedupe_names': True
+    },
+    'power_supply': {
+        'label': '파워서플라이',
+        'file_prefix': 'Power_',
+        'id_column': 'psu_id',
+        'row_ids': False,
+        'columns': POWER_SUPPLY_COLUMNS,
+        'converters': {
+            # 와트 정보 (예: "750(W)" -> 750, "1.2kW" -> 1200)
+            'wattage': 'power',
+            # 전류 정보 (예: "62.5(A)" -> 62.5)
+            'plus12v': 'number',
+            'plus5v': 'number',
+            'plus3v3': 'number',
+            'size': 'dimension',
+            'weight': 'dimension'
+        },
+        'derive': _derive_power_supply,
+        'dedupe_names': True
+    },
+    'cpu_cooler': {
+        'label': 'CPU 쿨러',
+        'file_prefix': 'CpuCooler_',
+        'id_column': 'cooler_id',
+        'row_ids': False,
+        'columns': CPU_COOLER_COLUMNS,
+        'converters': {
+            'height': 'dimension',
+            'width': 'dimension',
+            'depth': 'dimension',
+            'fan_size': 'dimension',
+            # TDP 값 (예: "150W" -> 150)
+            'tdp_support': 'integer'
+        },
+        'derive': _derive_cpu_cooler,
+        'dedupe_names': True
+    }
+}
@@ -0,0 +1,254 @@
+import os
+import re
+import sys
+import time
+import logging
+import threading
+from functools import lru_cache
+import numpy as np
+from db_pool import get_pool
+
+# 부품 모델명 해석기 (트라이그램 색인)
+# 질의마다 model_name LIKE '%RTX%4070%' 로 전체 테이블을 훑는 대신, 부품 테이블의 모델명을 한 번 읽어
+# 메모리 트라이그램 색인(트라이그램 -> 문서 번호 배열)을 만들고 검색어와 겹치는 트라이그램 수로 순위를 매깁니다.
+# 모델명과 검색어 모두 한글 표기(라데온, 라이젠, 지포스 ...)를 영문으로 바꾸고 공백/기호를 없앤 뒤 비교하므로
+# "라데온 RX7900", "Radeon RX 7900" 이 같은 문자열이 됩니다.
+# 에이전트는 먼저 부품 ID를 해석하고 ID로 조회합니다 (06_Text2SQL.generate_queries, 프로토타입 에이전트).
+#
+# 사용법: python cs_agent/model_resolver.py "라이젠 7800X3D" [테이블명 ...]
+
+DB_PATH = './cs_agent/db/pc_parts.db'
+
+# 부품 테이블 -> 기본 키 컬럼
+PART_ID_COLUMNS = {
+    'cpu': 'cpu_id',
+    'motherboard': 'mb_id',
+    'memory': 'memory_id',
+    'gpu': 'gpu_id',
+    'power_supply': 'psu_id',
+    'case_chassis': 'case_id',
+    'storage': 'storage_id',
+    'cpu_cooler': 'cooler_id'
+}
+
+# 한글 표기 -> 영문 표기 (대문자로 바꾼 뒤 긴 표기부터 치환)
+MODEL_ALIASES = {
+    '지포스': 'GEFORCE',
+    '엔비디아': 'NVIDIA',
+    '라데온': 'RADEON',
+    '라이젠': 'RYZEN',
+    '스레드리퍼': 'THREADRIPPER',
+    '인텔': 'INTEL',
+    '코어': 'CORE',
+    '울트라': 'ULTRA',
+    '펜티엄': 'PENTIUM',
+    '셀러론': 'CELERON',
+    '슈퍼': 'SUPER',
+    '티아이': 'TI',
+    '삼성전자': 'SAMSUNG',
+    '삼성': 'SAMSUNG',
+    '에이수스': 'ASUS',
+    '기가바이트': 'GIGABYTE',
+    '애즈락': 'ASROCK',
+    '커세어': 'CORSAIR',
+    '마이크론': 'MICRON',
+    '시소닉': 'SEASONIC',
+    '쿨러마스터': 'COOLERMASTER',
+    '녹투아': 'NOCTUA',
+    '리안리': 'LIANLI',
+    '잘만': 'ZALMAN'
+}
+
+# 검색어 트라이그램 중 이 비율 이상이 겹쳐야 후보
+MIN_COVERAGE = 0.6
+RESOLVE_LIMIT = 10
+RESOLVE_CACHE_SIZE = 4096
+# 문장에서 찾은 구간은 오인식이 많으므로 더 높은 점수만 인정
+MENTION_MIN_SCORE = 0.7
+
+_ALIAS_PATTERN = re.compile('|'.join(sorted(map(re.escape, MODEL_ALIASES), key=len, reverse=True)))
+_NUMBER_TOKEN = re.compile(r'[0-9A-Z]*\d[0-9A-Z]*')
+
+def normalize_model_text(text):
+    """대문자 + 한글 표기를 영문으로 + 영숫자/한글 외 문자를 공백 하나로 (예: '라데온 RX-7900 XT' -> 'RADEON RX 7900 XT')"""
+    text = _ALIAS_PATTERN.sub(lambda match: f" {MODEL_ALIASES[match.group(0)]} ", str(text).upper())
+    return ' '.join(re.sub(r'[^0-9A-Z가-힣]+', ' ', text).split())
+
+def trigrams(compact):
+    """공백 없는 문자열의 트라이그램 집합 (3자 미만이면 문자열 자체)"""
+    if len(compact) < 3:
+        return {compact} if compact else set()
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+class ModelResolver:
+    """부품 모델명 트라이그램 색인"""
+
+    def __init__(self, parts):
+        # parts: [(테이블, ID, 모델명)]
+        self.tables = sorted({table for table, _, _ in parts})
+        self.table_codes = {table: code for code, table in enumerate(self.tables)}
+        self.doc_tables = np.array([self.table_codes[table] for table, _, _ in parts], dtype=np.int16)
+        self.doc_ids = [part_id for _, part_id, _ in parts]
+        self.doc_names = [name for _, _, name in parts]
+        self.doc_compacts = [normalize_model_text(name).replace(' ', '') for name in self.doc_names]
+
+        # 테이블별 트라이그램 -> 문서 번호 배열 (테이블을 지정한 검색은 그 테이블 목록만 합침)
+        postings = {table: {} for table in self.tables}
+        gram_counts = np.zeros(len(parts), dtype=np.int32)
+        for doc, compact in enumerate(self.doc_compacts):
+            grams = trigrams(compact)
+            gram_counts[doc] = len(grams)
+            table_postings = postings[parts[doc][0]]
+            for gram in grams:
+                table_postings.setdefault(gram, []).append(doc)
+        self.postings = {
+            table: {gram: np.array(docs, dtype=np.int32) for gram, docs in table_postings.items()}
+            for table, table_postings in postings.items()
+        }
+        self.gram_counts = gram_counts
+        self._resolve_cached = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self._resolve)
+
+    @classmethod
+    def from_connection(cls, conn, tables=None):
+        """DB의 부품 테이블(tables, 생략하면 PART_ID_COLUMNS 전체)에서 색인 생성"""
+        existing = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+        parts = []
+        for table in tables or PART_ID_COLUMNS:
+            if table not in existing:
+                continue
+            rows = conn.execute(
+                f'SELECT {PART_ID_COLUMNS[table]}, model_name FROM "{table}" WHERE model_name IS NOT NULL'
+            ).fetchall()
+            parts.extend((table, part_id, name) for part_id, name in rows)
+        return cls(parts)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def resolve(self, text, tables=None, limit=RESOLVE_LIMIT, min_coverage=MIN_COVERAGE):
+        """검색어와 가장 비슷한 부품 [{'table', 'id', 'model_name', 'score'}] (점수 높은 순)
+
+        점수 = 검색어 트라이그램 중 겹친 비율(0.7) + 자카드 유사도(0.3).
+        검색어의 숫자 포함 토큰(4070, 7800X3D 등)이 모델명에 없으면 점수를 절반으로 낮춥니다.
+        같은 검색어는 캐시한 결과를 씁니다 (색인은 읽기 전용).
+        """
+        tables = tuple(tables) if tables else tuple(self.tables)
+        return [dict(hit) for hit in self._resolve_cached(str(text), tables, limit, min_coverage)]
+
+    def _resolve(self, text, tables, limit, min_coverage):
+        normalized = normalize_model_text(text)
+        grams = trigrams(normalized.replace(' ', ''))
+        postings = [
+            self.postings[table][gram]
+            for table in tables if table in self.postings
+            for gram in grams if gram in self.postings[table]
+        ]
+        if not postings:
+            return ()
+        counts = np.bincount(np.concatenate(postings), minlength=len(self.doc_ids))
+        candidates = np.flatnonzero(counts >= max(1, min_coverage * len(grams)))
+        if len(candidates) == 0:
+            return ()
+
+        shared = counts[candidates].astype(float)
+        scores = 0.7 * shared / len(grams) + 0.3 * shared / (len(grams) + self.gram_counts[candidates] - shared)
+        # 숫자 토큰 확인은 상위 후보에만
+        if len(candidates) > limit * 5:
+            top = np.argpartition(-scores, limit * 5)[:limit * 5]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        number_tokens = _NUMBER_TOKEN.findall(normalized)
+        results = []
+        for index in top.tolist():
+            doc = int(candidates[index])
+            score = float(scores[index])
+            if any(token not in self.doc_compacts[doc] for token in number_tokens):
+                score *= 0.5
+            results.append({
+                'table': self.tables[self.doc_tables[doc]],
+                'id': self.doc_ids[doc],
+                'model_name': self.doc_names[doc],
+                'score': round(score, 4)
+            })
+        results.sort(key=lambda hit: -hit['score'])
+        return tuple(results[:limit])
+
+    def resolve_ids(self, text, table, limit=RESOLVE_LIMIT, min_score=MIN_COVERAGE):
+        """테이블 하나에서 점수 min_score 이상인 부품 ID 목록 (순위 순)"""
+        return [hit['id'] for hit in self.resolve(text, [table], limit) if hit['score'] >= min_score]
+
+    def resolve_mentions(self, text, tables=None, limit=5, min_score=MENTION_MIN_SCORE):
+        """자유 문장에서 모델명으로 보이는 구간을 해석해 {테이블: [hit + 'mention']} (점수 높은 순)
+
+        숫자가 들어간 영문 토큰(5600X, 4070 등)과 앞 2개/뒤 1개 영문 토큰으로 만든 구간을 각각 해석하고,
+        부품마다 가장 높은 점수의 구간을 남깁니다. 조사 등 한글 토큰은 구간에 넣지 않습니다.
+        """
+        tokens = re.findall(r'[0-9A-Z]+', normalize_model_text(text))
+        spans = set()
+        for index, token in enumerate(tokens):
+            if not any(ch.isdigit() for ch in token):
+                continue
+            for start in range(max(0, index - 2), index + 1):
+                for end in range(index + 1, min(len(tokens), index + 2) + 1):
+                    spans.add(' '.join(tokens[start:end]))
+
+        best = {}
+        for span in sorted(spans):
+            for hit in self.resolve(span, tables, limit):
+                key = (hit['table'], hit['id'])
+                if hit['score'] >= min_score and (key not in best or best[key]['score'] < hit['score']):
+                    best[key] = dict(hit, mention=span)
+        resolved = {}
+        for hit in sorted(best.values(), key=lambda hit: -hit['score']):
+            hits = resolved.setdefault(hit['table'], [])
+            if len(hits) < limit:
+                hits.append(hit)
+        return resolved
+
+# DB 파일(절대 경로)별 (카탈로그 버전, 색인)
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+def get_resolver(db_path=DB_PATH):
+    """DB 파일의 ModelResolver (연결 풀이 읽는 카탈로그 버전이 바뀌었을 때만 다시 생성)
+
+    schema_cache 와 같이 db_pool 커서로 읽으므로, 카탈로그 교체 후 이전 파일의 DuckDB 인스턴스를 읽어
+    새 버전으로 저장하는 일이 없습니다.
+    """
+    key = os.path.abspath(db_path)
+    pool = get_pool(key)
+    cached = _resolvers.get(key)
+    if cached and cached[0] == pool.version():
+        return cached[1]
+    with _resolvers_lock:
+        cursor, version = pool.checkout()
+        try:
+            cached = _resolvers.get(key)
+            if cached and cached[0] == version:
+                return cached[1]
+            started = time.time()
+            resolver = ModelResolver.from_connection(cursor)
+        finally:
+            pool.checkin(cursor, version)
+        logging.info(f"모델명 색인 생성: {len(resolver)}개 부품, {time.time() - started:.2f}초")
+        _resolvers[key] = (version, resolver)
+        return resolver
+
+def id_filter(table, ids, alias=None):
+    """ID 목록 조건 SQL (예: 'g.gpu_id IN (3, 17)')"""
+    column = f"{alias}.{PART_ID_COLUMNS[table]}" if alias else PART_ID_COLUMNS[table]
+    return f"{column} IN ({', '.join(str(int(part_id)) for part_id in ids)})"
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if len(sys.argv) < 2:
+        print("사용법: python cs_agent/model_resolver.py 검색어 [테이블명 ...]")
+        sys.exit(1)
+    resolver = get_resolver()
+    started = time.perf_counter()
+    hits = resolver.resolve(sys.argv[1], sys.argv[2:] or None)
+    elapsed = time.perf_counter() - started
+    for hit in hits:
+        print(f"{hit['score']:.3f}  {hit['table']}#{hit['id']}  {hit['model_name']}")
+    print(f"({elapsed * 1000:.2f}ms)")
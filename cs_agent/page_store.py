@@ -0,0 +1,188 @@
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import logging
+from urllib.parse import urlencode
+import pandas as pd
+import zstandard
+from crawl_parsers import parse_product_links, parse_product_info
+from crawl_staging import write_category_frame
+
+# 원본 HTML 보관소 (내용 주소 방식)
+# 크롤링한 목록/상세 페이지 HTML을 sha256 해시 이름의 zstd 압축 파일로 한 번만 저장하고,
+# SQLite 색인에 URL, 가져온 시각, 해시를 기록합니다. 같은 내용의 페이지는 실행이 달라도 한 번만 저장됩니다.
+#   raw_html/blobs/{해시 앞 2자리}/{해시}.zst
+#   raw_html/index.db  (pages: url, kind, category, page, fetched_at, hash)
+# 파서를 고친 뒤에는 reparse 로 네트워크 없이 저장된 페이지만으로 카테고리 결과를 다시 만듭니다.
+#
+# 사용법: python cs_agent/page_store.py stats
+#         python cs_agent/page_store.py reparse [--backend lxml|bs4] [카테고리명 ...]
+#         python cs_agent/page_store.py export 출력디렉터리 [카테고리명 ...]   (최신 페이지를 .html 로 꺼냄)
+
+STORE_DIR = './cs_agent/raw_html'
+COMPRESSION_LEVEL = 10
+
+def list_page_url(list_path, params, page):
+    """POST 목록 요청을 식별하는 URL (색인 키)"""
+    return f"{list_path}?{urlencode(sorted({**params, 'page': str(page)}.items()))}"
+
+class PageStore:
+    """zstd 압축 blob + SQLite 색인"""
+
+    def __init__(self, store_dir=STORE_DIR, level=COMPRESSION_LEVEL):
+        self.store_dir = store_dir
+        os.makedirs(os.path.join(store_dir, 'blobs'), exist_ok=True)
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+        self.conn = sqlite3.connect(os.path.join(store_dir, 'index.db'))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT NOT NULL,
+                kind TEXT,
+                category TEXT,
+                page INTEGER,
+                fetched_at REAL NOT NULL,
+                hash TEXT NOT NULL,
+                size INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (url, fetched_at);
+            CREATE INDEX IF NOT EXISTS idx_pages_category ON pages (category, kind);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def blob_path(self, content_hash):
+        return os.path.join(self.store_dir, 'blobs', content_hash[:2], f"{content_hash}.zst")
+
+    def put(self, url, html, kind=None, category=None, page=None):
+        """페이지 저장 (같은 내용의 blob 이 있으면 색인만 추가). 해시 반환"""
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(self.compressor.compress(data))
+            os.replace(temp_path, path)
+        self.conn.execute(
+            "INSERT INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [url, kind, category, page, time.time(), content_hash, len(data)]
+        )
+        self.conn.commit()
+        return content_hash
+
+    def get(self, content_hash):
+        """해시로 HTML 읽기"""
+        with open(self.blob_path(content_hash), 'rb') as f:
+            return self.decompressor.decompress(f.read()).decode('utf-8')
+
+    def latest(self, url):
+        """URL의 가장 최근 HTML (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT hash FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", [url]
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def latest_pages(self, category, kind):
+        """카테고리의 URL별 가장 최근 페이지 [(url, page, hash)] (page, url 순)"""
+        return self.conn.execute("""
+            SELECT url, page, hash FROM (
+                SELECT url, page, hash,
+                       ROW_NUMBER() OVER (PARTITION BY url ORDER BY fetched_at DESC) AS rn
+                FROM pages WHERE category = ? AND kind = ?
+            ) WHERE rn = 1 ORDER BY page, url
+        """, [category, kind]).fetchall()
+
+    def categories(self):
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT category FROM pages WHERE category IS NOT NULL ORDER BY 1"
+        )]
+
+    def stats(self):
+        """색인 행 수, 고유 blob 수, 원본 크기 합, 압축 저장 크기 합"""
+        entries, unique_blobs = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT hash) FROM pages").fetchone()
+        raw_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT hash, size FROM pages)"
+        ).fetchone()[0]
+        stored_bytes = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(os.path.join(self.store_dir, 'blobs')) for name in names
+        )
+        return {'entries': entries, 'unique_blobs': unique_blobs, 'raw_bytes': raw_bytes, 'stored_bytes': stored_bytes}
+
+def reparse_category(store, category, backend=None):
+    """저장된 목록/상세 페이지만으로 카테고리 결과 DataFrame을 다시 만듭니다 (네트워크 없음).
+
+    목록 페이지(페이지 순서)에서 제품 링크 순서를 복원하고, 링크마다 가장 최근 상세 페이지를 파싱합니다.
+    """
+    product_links = []
+    for _, _, content_hash in store.latest_pages(category, 'list'):
+        product_links.extend(parse_product_links(store.get(content_hash), backend=backend))
+    detail_hashes = {url: content_hash for url, _, content_hash in store.latest_pages(category, 'detail')}
+
+    product_details = []
+    missing = 0
+    for url in dict.fromkeys(product_links):
+        if url not in detail_hashes:
+            missing += 1
+            continue
+        info = parse_product_info(store.get(detail_hashes[url]), backend=backend)
+        if info:
+            product_details.append(info)
+    if missing:
+        logging.warning(f"{category}: 저장된 상세 페이지가 없는 링크 {missing}개")
+    return pd.DataFrame(product_details) if product_details else None
+
+def export_pages(store, output_dir, categories=None):
+    """카테고리별 최신 목록/상세 페이지를 {카테고리}_{종류}_{페이지}_{해시 앞 8자리}.html 로 저장. 파일 수 반환"""
+    os.makedirs(output_dir, exist_ok=True)
+    count = 0
+    for category in categories or store.categories():
+        for kind in ('list', 'detail'):
+            for _, page, content_hash in store.latest_pages(category, kind):
+                file_name = f"{category.replace('/', '_')}_{kind}_{page}_{content_hash[:8]}.html"
+                with open(os.path.join(output_dir, file_name), 'w', encoding='utf-8') as f:
+                    f.write(store.get(content_hash))
+                count += 1
+    return count
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+    command = args.pop(0) if args else 'stats'
+    backend = None
+    if '--backend' in args:
+        index = args.index('--backend')
+        backend = args[index + 1]
+        del args[index:index + 2]
+
+    with PageStore() as store:
+        if command == 'stats':
+            stats = store.stats()
+            print(f"색인 {stats['entries']}건, 고유 페이지 {stats['unique_blobs']}개, "
+                  f"원본 {stats['raw_bytes'] / 1e6:.1f}MB -> 압축 저장 {stats['stored_bytes'] / 1e6:.1f}MB")
+        elif command == 'reparse':
+            started = time.time()
+            for category in args or store.categories():
+                df = reparse_category(store, category, backend)
+                if df is None:
+                    logging.warning(f"{category}: 다시 파싱할 페이지가 없습니다.")
+                    continue
+                write_category_frame(category, df)
+            logging.info(f"다시 파싱 완료: {time.time() - started:.1f}초")
+        elif command == 'export' and args:
+            count = export_pages(store, args[0], args[1:])
+            print(f"{count}개 페이지를 {args[0]}에 저장했습니다.")
+        else:
+            print(f"알 수 없는 명령: {command}")
+            sys.exit(1)
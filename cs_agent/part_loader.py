@@ -0,0 +1,344 @@
+import sys
+import json
+import logging
+import datetime
+import duckdb
+import pandas as pd
+from change_tracking import update_row_hashes
+from bulk_loader import (
+    REJECTED_TABLE, map_columns, dedupe_names, to_number_series, to_bool_series, to_text_series,
+    default_converter, get_column_types, clear_rejected_rows, record_rejected_rows, bulk_insert
+)
+from loader_specs import PART_SPECS
+from spec_normalize import to_mm, to_watts, SORT_COLUMNS, ensure_normalized_columns, add_normalized_columns
+from crawl_staging import STAGING_DIR, find_latest_sheet, read_sheet
+
+# 부품 엑셀 적재 엔진
+# loader_specs.PART_SPECS 의 테이블별 명세(엑셀 컬럼 -> DB 컬럼, 변환기, 기본값)를 읽어
+# 모든 부품 테이블을 한 프로세스, 한 DuckDB 연결에서 적재합니다.
+# 변환기는 테이블마다 한 번만 만들고(compile_converters) 컬럼 단위로 적용합니다.
+# 원본 시트는 Parquet 스테이징(crawl_staging)을 DuckDB read_parquet 로 읽고, 더 최신 엑셀 파일이 있을 때만 엑셀을 읽습니다.
+# 치수/전력은 단위를 반영해 mm/W 로 저장하고, 소켓/폼팩터/메모리 규격과 쿨러 지원 소켓/파워 규격(비트마스크)은
+# 정규화 컬럼(spec_normalize.NORMALIZED_COLUMNS)으로 함께 저장해 호환성 계산과 질의에서 문자열을 다시 파싱하지 않게 합니다.
+# 치수/전력/소켓 정수 컬럼(length_mm, wattage_w, socket_code 등)은 보조 인덱스를 만들고,
+# 행은 SORT_COLUMNS 순서로 저장합니다 (범위 조건/범위 조인용 정렬 배치).
+# async_crawler --incremental 의 변경분 파일(crawl_delta_*.json)은 --delta 로 추가/변경/삭제 제품 행만 반영합니다.
+#
+# 사용법:
+#   python cs_agent/part_loader.py [테이블명 ...]  (생략하면 전체 부품 테이블)
+#   python cs_agent/part_loader.py --delta cs_agent/raw_xlsx/crawl_delta_20250101_120000.json [...]
+
+RAW_XLSX_DIR = "./cs_agent/raw_xlsx/"
+DB_PATH = './cs_agent/db/pc_parts.db'
+
+# 적재 순서 (05-1 ~ 05-7 순서)
+LOAD_ORDER = ['cpu', 'motherboard', 'memory', 'case_chassis', 'gpu', 'power_supply', 'cpu_cooler']
+
+# 명세에서 이름으로 지정하는 변환기
+CONVERTERS = {
+    'number': to_number_series,
+    'integer': lambda series: to_number_series(series, integer=True),
+    'dimension': lambda series: _rounded(to_mm(series), series.index),
+    'power': lambda series: _rounded(to_watts(series), series.index),
+    'bool': to_bool_series,
+    'text': to_text_series
+}
+
+def _rounded(values, index):
+    """float 배열을 반올림한 Int64 Series로"""
+    return pd.Series(values, index=index).round().astype('Int64')
+
+def setup_logging(name):
+    """로그 파일 + 콘솔 출력 설정, 로그 파일명을 반환합니다."""
+    log_filename = f"{name}_insert_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    logging.basicConfig(
+        filename=log_filename,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    # 콘솔에도 로그 출력
+    console = logging.StreamHandler()
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logging.getLogger('').addHandler(console)
+    return log_filename
+
+def compile_converters(spec, column_types):
+    """테이블의 모든 DB 컬럼에 대한 변환 함수 {컬럼: 함수}"""
+    true_values = spec.get('true_values')
+    named = dict(CONVERTERS)
+    named['flag'] = lambda series: to_bool_series(series, true_values, None)
+
+    converters = {}
+    for column, col_type in column_types.items():
+        converter = spec.get('converters', {}).get(column)
+        if converter is None:
+            converters[column] = default_converter(col_type)
+        elif callable(converter):
+            converters[column] = converter
+        else:
+            converters[column] = named[converter]
+    return converters
+
+def read_part_sheet(table_name, raw_xlsx_dir=RAW_XLSX_DIR, conn=None, staging_dir=STAGING_DIR):
+    """명세의 파일 접두사로 최신 원본 시트를 읽습니다 (Parquet 스테이징 우선). 없으면 None"""
+    spec = PART_SPECS[table_name]
+    path = find_latest_sheet(spec['file_prefix'], raw_xlsx_dir, staging_dir)
+    if path is None:
+        logging.warning(f"{spec['label']} 원본 파일 없음: {staging_dir}, {raw_xlsx_dir}{spec['file_prefix']}*.xlsx")
+        return None
+    logging.info(f"{spec['label']} 원본 파일 로드 중: {path}")
+    df = read_sheet(path, conn)
+    logging.info(f"{spec['label']} 원본 파일 로드 완료 - {len(df)} 행 발견")
+    return df
+
+def transform_sheet(spec, df):
+    """엑셀 시트를 명세에 따라 DB 컬럼 DataFrame으로 변환합니다 (타입 변환 전)."""
+    data = map_columns(df, spec['columns'])
+    for column, default in spec.get('defaults', {}).items():
+        data[column] = data[column].where(data[column].notna(), default) if column in data else default
+    if spec.get('row_ids'):
+        data[spec['id_column']] = df.index + 1
+    if spec.get('derive'):
+        data = spec['derive'](data, df)
+    if 'model_name' not in data:
+        data['model_name'] = None
+    return data
+
+def drop_dependent_foreign_keys(conn, table_name):
+    """이 테이블을 외래 키로 참조하는 테이블(호환성 테이블 등)을 외래 키 없이 다시 만듭니다 (행은 유지).
+
+    DuckDB는 참조되는 부품 행을 지우고 다시 넣을 수 없고 ALTER TABLE 로 외래 키만 지울 수도 없어,
+    예전 스키마(03_Create_DB, 03-1)로 만든 DB 를 한 번 옮겨 둡니다. 이미 옮긴 DB 에서는 아무 일도 하지 않습니다.
+    반환값: 다시 만든 테이블 목록
+    """
+    dependents = [row[0] for row in conn.execute("""
+        SELECT DISTINCT table_name FROM duckdb_constraints()
+        WHERE constraint_type = 'FOREIGN KEY' AND referenced_table = ? AND table_name <> ?
+        ORDER BY table_name
+    """, [table_name, table_name]).fetchall()]
+    if not dependents:
+        return []
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        for dependent in dependents:
+            columns = conn.execute("""
+                SELECT column_name, data_type, is_nullable FROM duckdb_columns()
+                WHERE table_name = ? ORDER BY column_index
+            """, [dependent]).fetchall()
+            primary_key = conn.execute("""
+                SELECT constraint_column_names FROM duckdb_constraints()
+                WHERE table_name = ? AND constraint_type = 'PRIMARY KEY'
+            """, [dependent]).fetchone()
+            definitions = [
+                f'"{name}" {data_type}' + ('' if nullable else ' NOT NULL')
+                for name, data_type, nullable in columns
+            ]
+            if primary_key:
+                definitions.append("PRIMARY KEY (" + ", ".join(f'"{name}"' for name in primary_key[0]) + ")")
+            conn.execute(f'CREATE TABLE "{dependent}__nofk" ({", ".join(definitions)})')
+            conn.execute(f'INSERT INTO "{dependent}__nofk" SELECT * FROM "{dependent}"')
+            conn.execute(f'DROP TABLE "{dependent}"')
+            conn.execute(f'ALTER TABLE "{dependent}__nofk" RENAME TO "{dependent}"')
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return dependents
+
+def assign_part_ids(conn, table_name, id_col, model_names):
+    """모델명 기준 ID: 이미 적재된 모델명은 기존 ID를 그대로 쓰고, 새 모델명은 기존 최댓값 다음부터 부여합니다.
+
+    시트에 행이 추가/삭제되어도 다른 부품의 ID와 행 해시가 바뀌지 않아 05-8 이 바뀐 부품의 쌍만 다시 계산합니다.
+    """
+    existing = dict(conn.execute(
+        f'SELECT model_name, {id_col} FROM "{table_name}" WHERE model_name IS NOT NULL'
+    ).fetchall())
+    ids = model_names.map(existing)
+    new_names = pd.unique(model_names[ids.isna()])
+    next_id = max(existing.values(), default=0) + 1
+    new_ids = dict(zip(new_names, range(next_id, next_id + len(new_names))))
+    return ids.fillna(model_names.map(new_ids)).astype('int64')
+
+def convert_rows(conn, table_name, df, converters):
+    """원본 시트 행을 DB 컬럼으로 변환하고 모델명 기준 ID를 부여합니다 (모델명이 없는 행은 rejected_rows 에 기록).
+
+    반환값: (변환한 DataFrame, 모델명이 없어 제외한 행 수)
+    """
+    spec = PART_SPECS[table_name]
+    data = add_normalized_columns(table_name, transform_sheet(spec, df))
+
+    # 필수 컬럼인 model_name이 없는 행은 건너뛰기
+    missing = data['model_name'].isna()
+    rejected = record_rejected_rows(conn, table_name, df[missing], "모델명 없음")
+    data = data[~missing].copy()
+
+    # 모델명 중복 처리 (일련번호 추가)
+    if spec.get('dedupe_names'):
+        data['model_name'] = dedupe_names(data['model_name'])
+
+    data = pd.DataFrame(
+        {column: converters[column](data[column]) for column in data.columns if column in converters},
+        index=data.index
+    )
+
+    # 변환한 모델명 기준으로 ID 부여 (시트 행 순서와 무관)
+    data[spec['id_column']] = assign_part_ids(conn, table_name, spec['id_column'], data['model_name'])
+    return data, rejected
+
+def load_part(conn, table_name, df=None, raw_xlsx_dir=RAW_XLSX_DIR, staging_dir=STAGING_DIR):
+    """부품 테이블 하나를 명세대로 다시 적재합니다.
+
+    반환값: {'read', 'inserted', 'rejected'} (원본 시트가 없으면 None)
+    """
+    spec = PART_SPECS[table_name]
+    if df is None:
+        df = read_part_sheet(table_name, raw_xlsx_dir, conn, staging_dir)
+        if df is None:
+            return None
+
+    ensure_normalized_columns(conn, table_name)
+    converters = compile_converters(spec, get_column_types(conn, table_name))
+
+    # 참조하는 테이블의 외래 키 제거 (호환성 행은 그대로 두고 05-8 이 바뀐 부품의 쌍만 다시 계산)
+    for dependent in drop_dependent_foreign_keys(conn, table_name):
+        logging.info(f"{dependent} 테이블의 외래 키 제거 (행 유지)")
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        clear_rejected_rows(conn, table_name)
+        logging.info(f"{spec['label']} 데이터 변환 중...")
+        data, rejected = convert_rows(conn, table_name, df, converters)
+
+        # 기존 데이터 삭제
+        conn.execute(f'DELETE FROM "{table_name}"')
+        result = bulk_insert(conn, table_name, data, source=df, order_by=SORT_COLUMNS.get(table_name))
+
+        # 행별 내용 해시 기록 (호환성 테이블 증분 갱신용, 부품 행과 같은 트랜잭션)
+        hash_stats = update_row_hashes(conn, table_name)
+        conn.execute("COMMIT")
+    except Exception as e:
+        conn.execute("ROLLBACK")
+        logging.error(f"{spec['label']} 데이터 삽입 중 오류 발생: {str(e)}")
+        raise
+
+    stats = {'read': len(df), 'inserted': result['inserted'], 'rejected': rejected + result['rejected']}
+    logging.info(
+        f"{spec['label']} 데이터 삽입 완료: 총 {stats['read']}개 중 {stats['inserted']}개 성공, "
+        f"{stats['rejected']}개 실패 (사유: {REJECTED_TABLE} 테이블)"
+    )
+    logging.info(f"{spec['label']} 행 해시 갱신: 추가 {hash_stats['inserted']}개, 변경 {hash_stats['changed']}개, 삭제 {hash_stats['deleted']}개")
+    return stats
+
+def tables_for_category(category):
+    """크롤링 카테고리(변경분 파일의 키)를 원본 시트로 쓰는 부품 테이블 목록"""
+    return [table for table in LOAD_ORDER if PART_SPECS[table]['file_prefix'] == f"{category}_"]
+
+def _delete_models(conn, table_name, model_names):
+    """모델명이 같은 행 삭제, 삭제한 행 수 반환"""
+    if len(model_names) == 0:
+        return 0
+    conn.register('delta_models_df', pd.DataFrame({'model_name': list(model_names)}, dtype=object))
+    deleted = conn.execute(
+        f'DELETE FROM "{table_name}" WHERE model_name IN (SELECT model_name FROM delta_models_df)'
+    ).fetchone()[0]
+    conn.unregister('delta_models_df')
+    return deleted
+
+def apply_delta(conn, table_name, changes):
+    """변경분 파일의 카테고리 항목({'added', 'changed', 'removed'})을 부품 테이블에 반영합니다.
+
+    추가/변경 제품은 모델명이 같은 행을 새 행으로 바꾸고(기존 ID 유지), 삭제 제품은 지웁니다. 나머지 행은 그대로 둡니다.
+    모델명 중복 번호(dedupe_names)는 변경분 안에서만 매깁니다.
+    반환값: {'inserted', 'removed', 'rejected'}
+    """
+    spec = PART_SPECS[table_name]
+    upserts = pd.DataFrame([item['info'] for item in changes.get('added', []) + changes.get('changed', [])])
+    removed = pd.DataFrame([item['info'] for item in changes.get('removed', [])])
+
+    ensure_normalized_columns(conn, table_name)
+    converters = compile_converters(spec, get_column_types(conn, table_name))
+    for dependent in drop_dependent_foreign_keys(conn, table_name):
+        logging.info(f"{dependent} 테이블의 외래 키 제거 (행 유지)")
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        removed_count = 0
+        if not removed.empty:
+            names = converters['model_name'](transform_sheet(spec, removed)['model_name']).dropna()
+            removed_count = _delete_models(conn, table_name, names)
+        stats = {'inserted': 0, 'rejected': 0}
+        if not upserts.empty:
+            data, rejected = convert_rows(conn, table_name, upserts, converters)
+            _delete_models(conn, table_name, data['model_name'])
+            result = bulk_insert(conn, table_name, data, source=upserts, order_by=SORT_COLUMNS.get(table_name))
+            stats = {'inserted': result['inserted'], 'rejected': rejected + result['rejected']}
+        hash_stats = update_row_hashes(conn, table_name)
+        conn.execute("COMMIT")
+    except Exception as e:
+        conn.execute("ROLLBACK")
+        logging.error(f"{spec['label']} 변경분 반영 중 오류 발생: {str(e)}")
+        raise
+
+    stats['removed'] = removed_count
+    logging.info(
+        f"{spec['label']} 변경분 반영 완료: 추가/변경 {len(upserts)}개 중 {stats['inserted']}개 적재, "
+        f"{stats['rejected']}개 실패, 삭제 {stats['removed']}개"
+    )
+    logging.info(f"{spec['label']} 행 해시 갱신: 추가 {hash_stats['inserted']}개, 변경 {hash_stats['changed']}개, 삭제 {hash_stats['deleted']}개")
+    return stats
+
+def apply_delta_files(delta_paths, db_path=DB_PATH):
+    """변경분 파일들을 순서대로 부품 테이블에 반영합니다. [(파일, 테이블, 결과)] 반환 (부품 테이블이 아닌 카테고리는 건너뜀)"""
+    conn = duckdb.connect(db_path)
+    results = []
+    try:
+        for delta_path in delta_paths:
+            with open(delta_path, 'r', encoding='utf-8') as f:
+                delta = json.load(f)
+            logging.info(f"변경분 파일 반영: {delta_path}")
+            for category, changes in delta.items():
+                tables = tables_for_category(category)
+                if not tables:
+                    logging.info(f"{category}: 부품 테이블 원본이 아니어서 건너뜀")
+                for table_name in tables:
+                    results.append((delta_path, table_name, apply_delta(conn, table_name, changes)))
+    finally:
+        conn.close()
+    return results
+
+def run_loaders(tables=None, db_path=DB_PATH, raw_xlsx_dir=RAW_XLSX_DIR, staging_dir=STAGING_DIR):
+    """부품 테이블들을 하나의 연결로 순서대로 적재합니다. {테이블: 결과} 반환"""
+    tables = tables or LOAD_ORDER
+    logging.info("데이터베이스 연결 중...")
+    conn = duckdb.connect(db_path)
+    logging.info("데이터베이스 연결 성공")
+
+    results = {}
+    try:
+        for table_name in tables:
+            logging.info("=" * 50)
+            results[table_name] = load_part(conn, table_name, raw_xlsx_dir=raw_xlsx_dir, staging_dir=staging_dir)
+    finally:
+        conn.close()
+        logging.info("데이터베이스 연결 종료")
+
+    logging.info("=" * 50)
+    for table_name, stats in results.items():
+        if stats is None:
+            logging.info(f"{table_name}: 원본 파일 없음 (건너뜀)")
+        else:
+            logging.info(f"{table_name}: {stats['inserted']}개 적재, {stats['rejected']}개 실패")
+    return results
+
+if __name__ == "__main__":
+    log_filename = setup_logging("parts")
+    if '--delta' in sys.argv:
+        # 파일 이름의 타임스탬프 순서대로 반영
+        apply_delta_files(sorted(arg for arg in sys.argv[1:] if arg != '--delta'))
+    else:
+        run_loaders(sys.argv[1:] or None)
+    print(f"로그 파일이 {log_filename}에 저장되었습니다.")
@@ -22,6 +22,7 @@ from datetime import datetime
 # 직접적인 import 경로로 변경
 # from ProtoType_JYK.orchestrator_graph_jyk import orchestrator_graph
 from ProtoType_JYK.ai_pc_agents import run_chatbot
+from answer_cache import AnswerCache
 
 # 로깅 설정
 logging.basicConfig(
@@ -31,6 +32,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger("api_server")
 
+# 질문 -> 최종 답변 캐시 (카탈로그 DB 나 상담 프롬프트 파일이 바뀌면 비움)
+answer_cache = AnswerCache(
+    os.path.join(parent_dir, 'db', 'pc_parts.db'),
+    [os.path.join(parent_dir, 'ProtoType_JYK', name) for name in ('ai_pc_agents.py', 'scenario_agents.py')]
+)
+
+def answer_query(query: str) -> str:
+    """답변 캐시에 같은 질문이 있으면 캐시 답변, 없으면 run_chatbot 실행 후 저장 (run_chatbot 은 대화 기록을 쓰지 않음)"""
+    cached = answer_cache.lookup(query)
+    if cached is not None:
+        logger.info(f"답변 캐시 적중 (유사도 {cached['similarity']:.3f}): {query} ~ {cached['question']}")
+        return cached['answer']
+    answer = run_chatbot(query)
+    if isinstance(answer, str):
+        answer_cache.store(query, answer)
+    logger.info(f"답변 캐시: {answer_cache.format_stats()}")
+    return answer
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title="제플몰 AI 상담 API",
@@ -100,7 +119,7 @@ async def process_query(request_info: RequestInfo, timeout: int):
             #     request_info.query, 
             #     chat_history=request_info.chat_history
             # )
-            lambda: run_chatbot(
+            lambda: answer_query(
                 request_info.query
             )
         )
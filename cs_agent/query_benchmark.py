@@ -0,0 +1,192 @@
+import sys
+import time
+import logging
+import duckdb
+from sql_templates import render_query
+from spec_normalize import NORMALIZED_COLUMNS, backfill_normalized_columns
+
+# 호환성 질의 템플릿 성능 비교 (기존 템플릿 vs sql_templates)
+# 기존 템플릿(문자열/원본 컬럼 비교, 교차 조인 + ROW_NUMBER)과 현재 템플릿(정규화 정수 컬럼, ASOF/범위 조인)을
+# 같은 DB에서 반복 실행해 평균 시간과 배속을 출력합니다.
+# 결과 행 수는 LIMIT 을 뺀 전체 결과로 비교합니다 (소켓/폼팩터는 정규화로 표기 차이가 사라져 늘어날 수 있음).
+# 정규화 컬럼이 없는 기존 DB는 --backfill 로 먼저 채웁니다 (정렬 배치는 part_loader 로 다시 적재해야 적용).
+#
+# 사용법: python cs_agent/query_benchmark.py [DB 경로] [--repeat N] [--backfill]
+
+DB_PATH = './cs_agent/db/pc_parts.db'
+
+# 관계별 검색 패턴 (generate_queries 가 만드는 '%키워드%' 형태)
+BENCHMARK_PATTERNS = {
+    "gpu_case": "%RTX%",
+    "gpu_psu": "%RTX%",
+    "cpu_motherboard": "%라이젠%",
+    "motherboard_case": "%B650%"
+}
+
+# 정규화 컬럼 도입 전 06_Text2SQL 템플릿
+LEGACY_TEMPLATES = {
+    "gpu_case": """
+        WITH RankedCases AS (
+            SELECT
+                g.model_name AS gpu_model,
+                g.length AS gpu_length,
+                c.model_name AS case_model,
+                c.vga_length AS available_gpu_length,
+                g.manufacturer AS gpu_manufacturer,
+                c.manufacturer AS case_manufacturer,
+                (c.vga_length - g.length) AS space_difference,
+                ROW_NUMBER() OVER (PARTITION BY g.model_name ORDER BY (c.vga_length - g.length)) AS rank
+            FROM
+                gpu g, case_chassis c
+            WHERE
+                g.model_name LIKE '%{pattern}%'
+                AND g.length <= c.vga_length
+        )
+        SELECT
+            gpu_model,
+            gpu_length,
+            case_model,
+            available_gpu_length,
+            gpu_manufacturer,
+            case_manufacturer,
+            space_difference
+        FROM
+            RankedCases
+        WHERE
+            rank = 1
+        ORDER BY
+            CASE WHEN gpu_model LIKE '%Ti%' THEN 1 ELSE 0 END,
+            gpu_model
+        LIMIT 10
+    """,
+    "gpu_psu": """
+        SELECT
+            g.model_name AS gpu_model,
+            g.power_consumption AS gpu_power,
+            p.model_name AS psu_model,
+            p.wattage AS psu_wattage,
+            g.manufacturer AS gpu_manufacturer,
+            p.manufacturer AS psu_manufacturer
+        FROM
+            gpu g, power_supply p
+        WHERE
+            g.model_name LIKE '{pattern}'
+            AND g.power_consumption <= (p.wattage * 0.7)
+        LIMIT 10
+    """,
+    "cpu_motherboard": """
+        SELECT
+            c.model_name AS cpu_model,
+            c.socket_type AS cpu_socket,
+            m.model_name AS motherboard_model,
+            m.socket_type AS mb_socket,
+            c.manufacturer AS cpu_manufacturer,
+            m.manufacturer AS mb_manufacturer
+        FROM
+            cpu c, motherboard m
+        WHERE
+            (c.model_name LIKE '{pattern}' OR c.socket_type = '{pattern}')
+            AND c.socket_type = m.socket_type
+        LIMIT 10
+    """,
+    "motherboard_case": """
+        SELECT
+            m.model_name AS motherboard_model,
+            m.form_factor AS mb_form_factor,
+            c.model_name AS case_model,
+            c.supported_mb_types AS case_supported_mb_types,
+            m.manufacturer AS mb_manufacturer,
+            c.manufacturer AS case_manufacturer
+        FROM
+            motherboard m, case_chassis c
+        WHERE
+            m.model_name LIKE '{pattern}'
+            AND (
+                (m.form_factor = 'ATX' AND c.supported_mb_types LIKE '%ATX%') OR
+                (m.form_factor = 'mATX' AND c.supported_mb_types LIKE '%mATX%') OR
+                (m.form_factor = 'ITX' AND c.supported_mb_types LIKE '%ITX%')
+            )
+        LIMIT 10
+    """
+}
+
+def missing_normalized_columns(conn):
+    """{테이블: [없는 정규화 컬럼]} (DB에 있는 부품 테이블만)"""
+    tables = {row[0] for row in conn.execute("SHOW TABLES").fetchall()}
+    missing = {}
+    for table_name, columns in NORMALIZED_COLUMNS.items():
+        if table_name not in tables:
+            continue
+        existing = {col[1] for col in conn.execute(f"PRAGMA table_info({table_name})").fetchall()}
+        absent = [column for column in columns if column not in existing]
+        if absent:
+            missing[table_name] = absent
+    return missing
+
+def time_query(conn, sql, repeat):
+    """평균 실행 시간(초)과 마지막 결과"""
+    rows = None
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = conn.execute(sql).fetchall()
+    return (time.perf_counter() - started) / repeat, rows
+
+def count_rows(conn, sql):
+    """LIMIT 을 뺀 전체 결과 행 수"""
+    body = sql.strip()
+    body = body[:body.upper().rindex('LIMIT')]
+    return conn.execute(f"SELECT COUNT(*) FROM ({body})").fetchone()[0]
+
+def run_benchmark(conn, repeat=20, patterns=BENCHMARK_PATTERNS):
+    """관계별 {'legacy_seconds', 'current_seconds', 'speedup', 'legacy_rows', 'current_rows'}"""
+    results = {}
+    for relation, pattern in patterns.items():
+        legacy_sql = LEGACY_TEMPLATES[relation].format(pattern=pattern)
+        current_sql = render_query(relation, pattern=pattern)
+        # 첫 실행(계획/캐시 준비)은 측정에서 제외
+        conn.execute(legacy_sql).fetchall()
+        conn.execute(current_sql).fetchall()
+        legacy_seconds, _ = time_query(conn, legacy_sql, repeat)
+        current_seconds, _ = time_query(conn, current_sql, repeat)
+        results[relation] = {
+            'legacy_seconds': legacy_seconds,
+            'current_seconds': current_seconds,
+            'speedup': legacy_seconds / max(current_seconds, 1e-9),
+            'legacy_rows': count_rows(conn, legacy_sql),
+            'current_rows': count_rows(conn, current_sql)
+        }
+    return results
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+    repeat = 20
+    if '--repeat' in args:
+        index = args.index('--repeat')
+        repeat = int(args[index + 1])
+        del args[index:index + 2]
+    backfill = '--backfill' in args
+    if backfill:
+        args.remove('--backfill')
+    db_path = args[0] if args else DB_PATH
+
+    with duckdb.connect(db_path, read_only=not backfill) as conn:
+        missing = missing_normalized_columns(conn)
+        if missing and backfill:
+            for table_name in missing:
+                count = backfill_normalized_columns(conn, table_name)
+                logging.info(f"{table_name}: 정규화 컬럼 {count}행 채움")
+        elif missing:
+            for table_name, columns in missing.items():
+                logging.error(f"{table_name}: 정규화 컬럼 없음 ({', '.join(columns)})")
+            print("part_loader.py 로 다시 적재하거나 --backfill 로 정규화 컬럼을 채운 뒤 실행하세요.")
+            sys.exit(1)
+
+        results = run_benchmark(conn, repeat)
+
+    print(f"{'관계':<18}{'기존(ms)':>10}{'현재(ms)':>10}{'배속':>8}{'기존 행':>10}{'현재 행':>10}")
+    for relation, result in results.items():
+        print(
+            f"{relation:<18}{result['legacy_seconds'] * 1000:>10.2f}{result['current_seconds'] * 1000:>10.2f}"
+            f"{result['speedup']:>7.1f}x{result['legacy_rows']:>10}{result['current_rows']:>10}"
+        )
@@ -0,0 +1,92 @@
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from db_pool import DB_PATH, POOL_SIZE, get_pool
+from result_cache import cached_fetch
+
+# 서로 독립적인 SQL 동시 실행 (부품 테이블별 쿼리 등)
+# 작업마다 스레드에서 db_pool 커서를 하나씩 빌려 실행하므로 전체 시간은 쿼리 시간의 합이 아니라 가장 긴 쿼리 시간이 됩니다.
+# 작업이 timeout 초를 넘기면 그 커서에 interrupt() 를 보내 쿼리를 중단하고 결과 대신 QueryTimeout 을 돌려줍니다.
+# 결과는 작업을 넘긴 순서대로 돌려줍니다 (pc_check_agent.execute_queries, pc_check_func.multiple_sql, 06_Text2SQL.execute_queries).
+# cache=True 이면 같은 SQL 결과를 result_cache 에서 꺼내 씁니다.
+#
+# 사용법:
+#   outcomes = execute_parallel({'cpu': "SELECT ...", 'gpu': "SELECT ..."})
+#   for name, (rows, error) in outcomes.items(): ...
+
+QUERY_TIMEOUT = 10
+MAX_WORKERS = 4
+# 시간 초과 확인 간격 (초)
+WATCH_INTERVAL = 0.05
+
+class QueryTimeout(Exception):
+    """쿼리 시간 초과"""
+
+def run_parallel(tasks, db_path=DB_PATH, timeout=QUERY_TIMEOUT, max_workers=MAX_WORKERS):
+    """{이름: 함수(cursor)} 를 동시에 실행해 {이름: (결과, 오류)} (tasks 순서, 성공하면 오류는 None)
+
+    함수는 빌린 커서 하나로 쿼리를 실행합니다 (다른 스레드와 커서를 공유하지 않음).
+    시간 초과된 작업은 끝날 때까지 커서에 interrupt() 를 계속 보내고, 결과는 (None, QueryTimeout) 입니다.
+    """
+    if not tasks:
+        return {}
+    pool = get_pool(db_path)
+    lock = threading.Lock()
+    running = {}
+    timed_out = set()
+
+    def run(name, function):
+        with pool.cursor() as cursor:
+            with lock:
+                running[name] = (cursor, time.monotonic())
+            try:
+                return function(cursor)
+            finally:
+                with lock:
+                    running.pop(name)
+
+    workers = max(1, min(max_workers, POOL_SIZE, len(tasks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, name, function): name for name, function in tasks.items()}
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=WATCH_INTERVAL, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+            with lock:
+                for name, (cursor, started) in running.items():
+                    if name in timed_out or now - started > timeout:
+                        if name not in timed_out:
+                            logging.warning(f"쿼리 시간 초과 ({timeout}초), 중단: {name}")
+                            timed_out.add(name)
+                        cursor.interrupt()
+
+    outcomes = {}
+    for future, name in futures.items():
+        if name in timed_out:
+            outcomes[name] = (None, QueryTimeout(f"쿼리 시간 초과 ({timeout}초): {name}"))
+        elif future.exception() is not None:
+            outcomes[name] = (None, future.exception())
+        else:
+            outcomes[name] = (future.result(), None)
+    return {name: outcomes[name] for name in tasks}
+
+def fetch_rows(cursor, sql):
+    return cursor.execute(sql).fetchall()
+
+def fetch_df(cursor, sql):
+    return cursor.execute(sql).fetchdf()
+
+def fetch_records(cursor, sql):
+    """[{컬럼: 값}] (cursor.description 의 컬럼명)"""
+    rows = cursor.execute(sql).fetchall()
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+def execute_parallel(queries, db_path=DB_PATH, timeout=QUERY_TIMEOUT, max_workers=MAX_WORKERS, fetch=fetch_rows, cache=False):
+    """{이름: SQL} 을 동시에 실행해 {이름: (fetch 결과, 오류)} (queries 순서, cache=True 면 result_cache 사용)"""
+    if cache:
+        tasks = {name: (lambda cursor, sql=sql: cached_fetch(cursor, sql, fetch, db_path)) for name, sql in queries.items()}
+    else:
+        tasks = {name: (lambda cursor, sql=sql: fetch(cursor, sql)) for name, sql in queries.items()}
+    return run_parallel(tasks, db_path, timeout, max_workers)
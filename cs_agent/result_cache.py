@@ -0,0 +1,146 @@
+import re
+import sys
+import time
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+from db_pool import DB_PATH, get_pool
+
+# 쿼리 결과 캐시 (프로세스 안 LRU, 메모리 상한 + TTL)
+# 에이전트가 요청마다 같은 기본 쿼리(SELECT * FROM gpu WHERE memory_capacity >= 4 ... LIMIT 15 등)를 다시 실행하지 않도록
+# (카탈로그 버전, 정규화한 SQL, 결과 형식) 을 키로 결과를 보관합니다. 카탈로그 버전은 커서를 빌린 동안의
+# db_pool 연결 버전이므로, 카탈로그 갱신(또는 .prev 로 되돌리기)으로 DB 파일이 바뀌면 다른 버전 결과를 처음 넣을 때 캐시 전체를 비웁니다.
+# 캐시한 결과는 호출한 쪽이 고쳐도 캐시에 영향이 없도록 복사해서 돌려줍니다.
+# pc_check_func.sql/multiple_sql, 06_Text2SQL.execute_queries, pc_check_agent.execute_queries 가 함께 씁니다.
+
+RESULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESULT_CACHE_TTL = 600
+
+def normalize_sql(sql):
+    """따옴표 밖의 공백을 하나로, 대소문자를 소문자로, 끝의 ; 제거 (문자열/따옴표 식별자는 그대로)"""
+    parts = re.split(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""", sql.strip().rstrip(';').strip())
+    return ''.join(
+        part if index % 2 else re.sub(r'\s+', ' ', part).lower()
+        for index, part in enumerate(parts)
+    )
+
+def _estimate_size(value):
+    """결과의 대략적인 메모리 크기 (바이트)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    size = sys.getsizeof(value)
+    for item in value:
+        size += sys.getsizeof(item)
+        values = item.values() if isinstance(item, dict) else item
+        size += sum(sys.getsizeof(field) for field in values)
+    return size
+
+def _copy_result(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return [dict(item) if isinstance(item, dict) else item for item in value]
+
+class ResultCache:
+    """LRU + TTL 결과 캐시 (전체 크기가 max_bytes 를 넘으면 오래 안 쓴 것부터 제거)"""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """(True, 결과) 또는 (False, None)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[2] > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value):
+        """key[0] 은 카탈로그 버전 (inode, 수정 시각 ns, 크기). 버전이 바뀌면 (.prev 로 되돌린 경우 포함) 전체 비움"""
+        version = key[0]
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logging.info(f"카탈로그 버전 변경, 결과 캐시 {len(self._entries)}개 비움")
+                    self.invalidations += 1
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """{'hits', 'misses', 'hit_rate', 'entries', 'bytes', 'evictions', 'expirations', 'invalidations'}"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+# 프로세스 공용 캐시
+result_cache = ResultCache()
+
+def cached_fetch(cursor, sql, fetch, db_path=DB_PATH):
+    """db_pool 에서 빌린 cursor 로 fetch(cursor, sql) 실행 (캐시에 있으면 캐시 결과). 오류는 캐시하지 않음.
+
+    커서를 빌린 동안에는 풀이 연결을 다시 열지 않으므로, 풀의 현재 버전이 이 커서가 읽는 카탈로그 버전입니다.
+    """
+    key = (get_pool(db_path).version(), normalize_sql(sql), fetch.__name__)
+    hit, value = result_cache.get(key)
+    if not hit:
+        value = fetch(cursor, sql)
+        result_cache.put(key, value)
+    return _copy_result(value)
+
+def result_cache_stats():
+    return result_cache.stats()
+
+def format_result_cache_stats():
+    stats = result_cache_stats()
+    return (
+        f"적중 {stats['hits']}회, 실패 {stats['misses']}회 (적중률 {stats['hit_rate']:.0%}), "
+        f"{stats['entries']}개 {stats['bytes'] / 1024:.0f}KB"
+    )
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import logging
+import threading
+from db_pool import DB_PATH, get_pool
+
+# 프롬프트용 DB 메타데이터 캐시 (테이블 목록, 컬럼, 모델명 샘플, 스키마 문자열)
+# 에이전트가 질문마다 SHOW TABLES / PRAGMA table_info / 샘플 조회를 다시 하지 않도록, DB 파일의 카탈로그 버전
+# (db_pool.catalog_version) 별로 한 번만 읽어 두고 프롬프트에 넣는 스키마 문자열 블록도 미리 만들어 둡니다.
+# 카탈로그 갱신(catalog_refresh)으로 파일이 바뀌면 다음 조회에서 버전이 달라져 자동으로 다시 읽습니다.
+# db_desc.json 같은 설명 파일은 cached_json 으로 파일 수정 시각이 바뀔 때만 다시 읽습니다.
+#
+# 사용법:
+#   from schema_cache import get_metadata, schema_text, table_columns
+#   schema_text(DB_PATH, ['cpu', 'gpu'])
+
+# 모델명 샘플을 읽는 테이블과 개수
+SAMPLE_TABLES = ['cpu', 'gpu', 'motherboard']
+SAMPLE_LIMIT = 5
+
+def _schema_block(table, columns):
+    return f"Table: {table}\nColumns: {', '.join(columns)}\n\n"
+
+def load_metadata(conn, version=None):
+    """연결에서 메타데이터 읽기
+
+    {'version', 'tables', 'columns': {테이블: [컬럼]}, 'samples': {테이블: [모델명]},
+     'schema_blocks': {테이블: 스키마 문자열}, 'schema_text': 전체 스키마 문자열}
+    """
+    tables = [row[0] for row in conn.execute("SHOW TABLES").fetchall()]
+    columns = {}
+    for table in tables:
+        columns[table] = [col[1] for col in conn.execute(f'PRAGMA table_info("{table}")').fetchall()]
+    samples = {}
+    for table in SAMPLE_TABLES:
+        if table in columns and 'model_name' in columns[table]:
+            rows = conn.execute(f'SELECT model_name FROM "{table}" LIMIT {SAMPLE_LIMIT}').fetchall()
+            samples[table] = [row[0] for row in rows]
+    schema_blocks = {table: _schema_block(table, table_columns) for table, table_columns in columns.items()}
+    return {
+        'version': version,
+        'tables': tables,
+        'columns': columns,
+        'samples': samples,
+        'schema_blocks': schema_blocks,
+        'schema_text': "Database Schema:\n" + ''.join(schema_blocks.values())
+    }
+
+# DB 파일(절대 경로)별 메타데이터
+_metadata = {}
+_metadata_lock = threading.Lock()
+
+def get_metadata(db_path=DB_PATH, conn=None):
+    """DB 파일의 메타데이터 (연결 풀이 읽는 카탈로그 버전이 바뀌었을 때만 다시 읽음)
+
+    카탈로그 교체 후에도 빌려 간 커서가 남아 있는 동안은 풀이 이전 파일을 읽으므로 캐시도 그대로 씁니다.
+    이미 풀 커서를 빌린 쪽은 conn 으로 그 커서를 넘기면 커서를 하나 더 빌리지 않고 그 커서로 읽습니다.
+    """
+    key = os.path.abspath(db_path)
+    pool = get_pool(key)
+    cached = _metadata.get(key)
+    if cached and cached['version'] == pool.version():
+        return cached
+    with _metadata_lock:
+        if conn is not None:
+            # 빌린 커서가 있는 동안 풀은 연결을 다시 열지 않으므로 풀 버전이 곧 그 커서가 읽는 버전
+            version = pool.version()
+            cached = _metadata.get(key)
+            if cached and cached['version'] == version:
+                return cached
+            started = time.time()
+            metadata = load_metadata(conn, version)
+        else:
+            cursor, version = pool.checkout()
+            try:
+                cached = _metadata.get(key)
+                if cached and cached['version'] == version:
+                    return cached
+                started = time.time()
+                metadata = load_metadata(cursor, version)
+            finally:
+                pool.checkin(cursor, version)
+        _metadata[key] = metadata
+        logging.info(f"DB 메타데이터 읽기: 테이블 {len(metadata['tables'])}개, {time.time() - started:.2f}초")
+        return metadata
+
+def table_names(db_path=DB_PATH):
+    return get_metadata(db_path)['tables']
+
+def table_columns(db_path=DB_PATH, tables=None):
+    """{테이블: [컬럼]} (tables 를 주면 DB에 있는 것만, 순서 유지)"""
+    columns = get_metadata(db_path)['columns']
+    if tables is None:
+        return dict(columns)
+    return {table: columns[table] for table in tables if table in columns}
+
+def schema_text(db_path=DB_PATH, tables=None):
+    """프롬프트용 스키마 문자열 (tables 를 주면 해당 테이블 블록만)"""
+    metadata = get_metadata(db_path)
+    if tables is None:
+        return metadata['schema_text']
+    return "Database Schema:\n" + ''.join(
+        metadata['schema_blocks'][table] for table in tables if table in metadata['schema_blocks']
+    )
+
+# 파일 경로별 (수정 시각, 내용)
+_json_files = {}
+
+def cached_json(path):
+    """JSON 파일 내용 (파일 수정 시각이 바뀔 때만 다시 읽음). 파일이 없거나 형식 오류면 예외."""
+    mtime = os.path.getmtime(path)
+    cached = _json_files.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    _json_files[path] = (mtime, data)
+    return data
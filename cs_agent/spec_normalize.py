@@ -0,0 +1,287 @@
+import zlib
+import numpy as np
+import pandas as pd
+
+# 부품 사양 문자열 정규화 (컬럼 단위)
+# 소켓, 폼팩터, 메모리 규격, 치수(mm), 전력(W) 문자열을 pandas str 연산으로 컬럼 전체를 한 번에 변환합니다.
+# 사양 문자열은 같은 값이 매우 많이 반복되므로 고유값만 변환한 뒤 원래 행으로 펼칩니다 (map_uniques,
+# bulk_loader 의 숫자 추출도 사용).
+#   - part_loader: 적재할 때 숫자 컬럼(mm, W)을 단위까지 반영해 변환하고,
+#     정규화 컬럼(socket_norm, length_mm, socket_code 등, NORMALIZED_COLUMNS)을 부품 테이블에 함께 저장
+#   - compatibility_engine / 05-8: 저장된 정규화 컬럼을 그대로 사용 (문자열 재파싱 없음)
+#   - sql_templates: 정수 정규화 컬럼으로 비교/조인 (범위 조건은 정렬 배치 + ASOF/범위 조인, 소켓은 정수 해시 조인)
+
+# 폼팩터 정규화 매핑 (값과 키 모두 공백/하이픈을 제거한 뒤 포함 여부로 판정, 앞쪽 우선)
+FORM_FACTOR_MAPPING = {
+    "MATX": "MICROATX",
+    "MICRO-ATX": "MICROATX",
+    "MICRO ATX": "MICROATX",
+    "M-ATX": "MICROATX",
+    "ITX": "MINIITX",
+    "MINI-ITX": "MINIITX",
+    "MINI ITX": "MINIITX",
+    "EATX": "EXTENDEDATX",
+    "E-ATX": "EXTENDEDATX",
+    "EXTENDED ATX": "EXTENDEDATX",
+    "EXTENDED-ATX": "EXTENDEDATX"
+}
+
+# 폼팩터 코드 (보드 크기 순서라 form_factor_code <= 3 처럼 범위 조건으로 "ATX 이하" 를 표현할 수 있음)
+FORM_FACTOR_CODES = {
+    "MINIITX": 1,
+    "MICROATX": 2,
+    "ATX": 3,
+    "EXTENDEDATX": 4
+}
+
+# 쿨러 시트의 소켓별 지원 여부 컬럼 (쿨러 socket_support 는 지원하는 이름을 ", " 로 연결한 문자열)
+# 목록 순서가 소켓 비트마스크(cooler_socket_mask, socket_support_mask)의 비트 번호이므로 새 소켓은 뒤에만 추가합니다.
+COOLER_SOCKETS = [
+    'LGA1851', 'LGA1700', 'LGA1200', 'LGA115(X)', 'AM4', 'AM5', 'LGA2011-V3', 'LGA2011', 'LGA2066',
+    'FM(X),AM(X)', 'LGA775', 'sTRX4', 'TR4', 'LGA1366', 'AM1', '소켓940', '소켓754', '소켓939', 'sWRX8',
+    'SP3', 'LGA4677', 'LGA4189-4/5', 'TR5(sTRX5/sWRX9)', 'SP6', 'SP5', '소켓478', 'LGA3647',
+    'LGA771'
+]
+
+# PSU 폼팩터 / 케이스 지원 파워 규격 비트 (문자열에 포함되면 켜짐, 같은 비트가 하나라도 겹치면 호환)
+PSU_FORM_BITS = {'atx': 1, 'sfx': 2}
+
+# 숫자 + 바로 뒤 단위 추출 패턴 (천 단위 콤마, 소수점 포함: "1,200(W)", "24.5cm", "2kW")
+# 단위는 숫자 바로 뒤(공백/괄호 허용)에 있을 때만 인정 ('including' 같은 단어의 'in' 을 인치로 보지 않음)
+DIMENSION_PATTERN = r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*\(?\s*(mm|cm|inch|in|")?'
+POWER_PATTERN = r'(\d+(?:,\d{3})*(?:\.\d+)?)\s*\(?\s*(kw)?'
+
+# 단위 -> 배율
+DIMENSION_SCALE = {'cm': 10.0, 'inch': 25.4, 'in': 25.4, '"': 25.4}
+POWER_SCALE = {'kw': 1000.0}
+
+def _as_text(series):
+    """결측값을 None으로 유지한 채 object Series로 변환 (인덱스는 0부터)"""
+    series = pd.Series(series, copy=False).reset_index(drop=True)
+    return series.astype(object).where(series.notna(), None)
+
+def map_uniques(series, convert, dtype=object):
+    """고유값에만 convert(고유값 Series -> 같은 길이 결과)를 적용하고 원래 행으로 펼침 (결측값은 결측)"""
+    text = _as_text(series)
+    codes, uniques = pd.factorize(text, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return pd.Series(None if dtype == object else np.nan, index=text.index, dtype=dtype)
+    converted = pd.Series(np.asarray(convert(pd.Series(uniques, dtype=object))), dtype=dtype)
+    if dtype == object:
+        converted = converted.where(converted.notna(), None)
+    converted = converted.to_numpy(dtype=dtype)
+    padded = np.append(converted, np.array([None if dtype == object else np.nan], dtype=dtype))
+    return pd.Series(padded[codes], index=text.index, dtype=dtype)
+
+def _blank_to_none(values):
+    return values.where(values.astype(str).str.len() > 0, None)
+
+def _socket(uniques):
+    normalized = uniques.astype(str).str.strip().str.upper().str.replace(" ", "", regex=False)
+    normalized = normalized.str.replace(r'LGA\s*(\d+)', r'LGA\1', regex=True)
+    normalized = normalized.str.replace(r'AM\s*(\d+)', r'AM\1', regex=True)
+    return _blank_to_none(normalized)
+
+def normalize_socket(series):
+    """소켓 타입 컬럼 정규화 (예: 'lga 1700' -> 'LGA1700', 빈 값은 None)"""
+    return map_uniques(series, _socket)
+
+def _form_factor(uniques):
+    normalized = uniques.astype(str).str.strip().str.upper().str.replace(r'[\s-]', '', regex=True)
+    result = pd.Series(None, index=normalized.index, dtype=object)
+    for key, value in FORM_FACTOR_MAPPING.items():
+        key = key.replace(" ", "").replace("-", "")
+        result = result.where(result.notna() | ~normalized.str.contains(key, regex=False), value)
+    result = result.where(result.notna() | ~normalized.str.contains('ATX', regex=False), 'ATX')
+    return result.where(result.notna(), normalized)
+
+def normalize_form_factor(series):
+    """보드 폼팩터 컬럼 정규화 (예: 'Micro-ATX', 'm-ATX' -> 'MICROATX', 'E-ATX' -> 'EXTENDEDATX')"""
+    return map_uniques(series, _form_factor)
+
+def normalize_memory_type(series):
+    """메모리 규격 컬럼에서 첫 DDR 세대 추출 (예: 'ddr5 (PC5)' -> 'DDR5', 없으면 None)"""
+    return map_uniques(series, lambda uniques: uniques.astype(str).str.upper().str.extract(r'(DDR\d)', expand=False))
+
+def _scaled_numbers(uniques, pattern, scales):
+    """첫 번째 숫자 x 단위 배율 (단위가 없거나 모르는 단위면 배율 1)"""
+    parts = uniques.astype(str).str.strip().str.lower().str.extract(pattern)
+    value = pd.to_numeric(parts[0].str.replace(',', '', regex=False), errors='coerce')
+    return value * parts[1].map(scales).fillna(1.0).astype(float)
+
+def _numeric_or(series, convert_text):
+    """숫자 값은 그대로 쓰고, 문자열 값만 고유값 단위로 convert_text 변환 (float 배열)"""
+    series = pd.Series(series, copy=False).reset_index(drop=True)
+    numeric = pd.to_numeric(series, errors='coerce').astype(float)
+    text_mask = numeric.isna() & series.notna()
+    if text_mask.any():
+        numeric[text_mask] = map_uniques(series[text_mask], convert_text, dtype=float).to_numpy()
+    return numeric.to_numpy(dtype=float)
+
+def to_mm(series):
+    """치수 컬럼(높이, 길이 등)을 mm 단위 float 배열로 변환 (cm, inch 단위 반영, 변환 불가 값은 NaN)"""
+    return _numeric_or(series, lambda uniques: _scaled_numbers(uniques, DIMENSION_PATTERN, DIMENSION_SCALE))
+
+def to_watts(series):
+    """전력 컬럼을 W 단위 float 배열로 변환 (kW 단위 반영, 변환 불가 값은 NaN)"""
+    return _numeric_or(series, lambda uniques: _scaled_numbers(uniques, POWER_PATTERN, POWER_SCALE))
+
+def millimeters(series):
+    """치수 컬럼 -> 반올림한 mm 정수 Series (Int64)"""
+    return pd.Series(to_mm(series)).round().astype('Int64')
+
+def watts(series):
+    """전력 컬럼 -> 반올림한 W 정수 Series (Int64)"""
+    return pd.Series(to_watts(series)).round().astype('Int64')
+
+def _socket_code(value):
+    # 정규화한 소켓 문자열의 crc32 (테이블/적재 시점과 무관하게 같은 소켓은 같은 코드)
+    return zlib.crc32(value.encode('utf-8')) & 0x7FFFFFFF
+
+def socket_code(series):
+    """소켓 컬럼 -> 정수 코드 Series (Int64, cpu.socket_code = motherboard.socket_code 로 정수 조인)"""
+    return normalize_socket(series).map(lambda value: None if value is None else _socket_code(value)).astype('Int64')
+
+def form_factor_code(series):
+    """보드 폼팩터 컬럼 -> FORM_FACTOR_CODES 정수 Series (Int64, 모르는 규격은 결측)"""
+    return normalize_form_factor(series).map(FORM_FACTOR_CODES).astype('Int64')
+
+def _masks(uniques, bits_of):
+    """고유값 -> bits_of(값) 비트들의 OR (float, 비트가 없으면 NaN)"""
+    return pd.Series([float(sum(bits_of(value))) or np.nan for value in uniques], index=uniques.index)
+
+def _cooler_socket_bits():
+    return {socket: 1 << bit for bit, socket in enumerate(_socket(pd.Series(COOLER_SOCKETS)))}
+
+def cooler_socket_mask(series):
+    """CPU 소켓 -> 이름에 그 소켓이 들어 있는 COOLER_SOCKETS 비트마스크 (Int64, 예: 'LGA2011' -> LGA2011-V3, LGA2011)"""
+    bits = _cooler_socket_bits()
+    normalized = normalize_socket(series)
+    masks = map_uniques(normalized, lambda uniques: _masks(
+        uniques, lambda socket: [bit for name, bit in bits.items() if socket in name]), dtype=float)
+    return masks.astype('Int64')
+
+def socket_support_mask(series):
+    """쿨러 socket_support ('LGA1700, AM4') -> 지원 소켓 COOLER_SOCKETS 비트마스크 (Int64, 모르는 이름은 무시)"""
+    bits = _cooler_socket_bits()
+    masks = map_uniques(series, lambda uniques: _masks(
+        uniques, lambda support: {bits.get(name, 0) for name in _socket(pd.Series(str(support).split(', '))) if name}),
+        dtype=float)
+    return masks.astype('Int64')
+
+def psu_form_mask(series):
+    """PSU 폼팩터 / 케이스 지원 파워 규격 -> PSU_FORM_BITS 비트마스크 (Int64, 예: 'M-ATX(SFX) 파워' -> 3)"""
+    masks = map_uniques(series, lambda uniques: _masks(
+        uniques, lambda text: [bit for key, bit in PSU_FORM_BITS.items() if key in str(text).lower()]), dtype=float)
+    return masks.astype('Int64')
+
+# 부품 테이블에 저장하는 정규화 컬럼
+# 테이블 -> {정규화 컬럼: (원본 컬럼, 정규화 함수, DB 타입)}
+# 같은 원본 컬럼의 문자열 정규화 컬럼(_norm)을 정수 컬럼보다 먼저 둡니다 (normalized_column 이 앞쪽을 사용).
+# 비트마스크 컬럼(_mask)은 두 부품의 마스크가 하나라도 겹치면 호환 ((a & b) <> 0).
+NORMALIZED_COLUMNS = {
+    'cpu': {
+        'socket_norm': ('socket_type', normalize_socket, 'VARCHAR'),
+        'socket_code': ('socket_type', socket_code, 'INTEGER'),
+        'cooler_socket_mask': ('socket_type', cooler_socket_mask, 'BIGINT'),
+        'tdp_w': ('tdp', watts, 'INTEGER')
+    },
+    'motherboard': {
+        'socket_norm': ('socket_type', normalize_socket, 'VARCHAR'),
+        'form_factor_norm': ('form_factor', normalize_form_factor, 'VARCHAR'),
+        'memory_type_norm': ('memory_support', normalize_memory_type, 'VARCHAR'),
+        'socket_code': ('socket_type', socket_code, 'INTEGER'),
+        'form_factor_code': ('form_factor', form_factor_code, 'TINYINT')
+    },
+    'memory': {
+        'memory_type_norm': ('memory_type', normalize_memory_type, 'VARCHAR')
+    },
+    'gpu': {
+        'length_mm': ('length', millimeters, 'INTEGER'),
+        'power_w': ('power_consumption', watts, 'INTEGER'),
+        'recommended_psu_w': ('recommended_psu', watts, 'INTEGER')
+    },
+    'case_chassis': {
+        'vga_length_mm': ('vga_length', millimeters, 'INTEGER'),
+        'cpu_cooler_height_mm': ('cpu_cooler_height', millimeters, 'INTEGER'),
+        'psu_support_mask': ('power_supply_type', psu_form_mask, 'TINYINT')
+    },
+    'power_supply': {
+        'wattage_w': ('wattage', watts, 'INTEGER'),
+        'psu_form_mask': ('form_factor', psu_form_mask, 'TINYINT')
+    },
+    'cpu_cooler': {
+        'height_mm': ('height', millimeters, 'INTEGER'),
+        'tdp_support_w': ('tdp_support', watts, 'INTEGER'),
+        'socket_support_mask': ('socket_support', socket_support_mask, 'BIGINT')
+    }
+}
+
+# 정렬 배치: 적재할 때 이 컬럼 순서로 행을 저장 (블록별 min/max 가 좁아져 범위 조건에서 블록을 건너뛰고,
+# 범위 조인/ASOF 조인의 정렬 비용도 줄어듦)
+SORT_COLUMNS = {
+    'cpu': 'socket_code',
+    'motherboard': 'socket_code',
+    'gpu': 'length_mm',
+    'case_chassis': 'vga_length_mm',
+    'power_supply': 'wattage_w',
+    'cpu_cooler': 'height_mm'
+}
+
+# 보조 인덱스 (등호 조건/조인 키, 선택도가 높은 범위 조건)
+NORMALIZED_INDEXES = {
+    'cpu': ['socket_code'],
+    'motherboard': ['socket_code', 'form_factor_code'],
+    'gpu': ['length_mm'],
+    'case_chassis': ['vga_length_mm'],
+    'power_supply': ['wattage_w'],
+    'cpu_cooler': ['height_mm']
+}
+
+def ensure_normalized_columns(conn, table_name):
+    """정규화 컬럼과 보조 인덱스가 없으면 테이블에 추가"""
+    for column, (_, _, col_type) in NORMALIZED_COLUMNS.get(table_name, {}).items():
+        conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN IF NOT EXISTS {column} {col_type}')
+    for column in NORMALIZED_INDEXES.get(table_name, []):
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table_name}_{column} ON "{table_name}" ({column})')
+
+def add_normalized_columns(table_name, data):
+    """DataFrame에 정규화 컬럼을 추가해 반환 (원본 컬럼이 없으면 건너뜀)"""
+    for column, (source, normalize, _) in NORMALIZED_COLUMNS.get(table_name, {}).items():
+        if source in data.columns:
+            data[column] = normalize(data[source]).set_axis(data.index)
+    return data
+
+def backfill_normalized_columns(conn, table_name):
+    """이미 적재된 테이블의 정규화 컬럼을 다시 계산해 채움 (다시 적재하지 않고 기존 DB에 적용할 때). 갱신 행 수 반환
+
+    정렬 배치(SORT_COLUMNS)는 part_loader 로 다시 적재할 때 적용됩니다.
+    """
+    columns = NORMALIZED_COLUMNS.get(table_name, {})
+    if not columns:
+        return 0
+    ensure_normalized_columns(conn, table_name)
+    id_col = conn.execute(f"SELECT name FROM pragma_table_info('{table_name}') WHERE pk").fetchone()[0]
+    existing = {row[0] for row in conn.execute(f"SELECT name FROM pragma_table_info('{table_name}')").fetchall()}
+    # 원본 컬럼이 없는 정규화 컬럼(예: 03-1 을 실행하지 않은 DB의 power_supply.form_factor)은 건너뜀
+    columns = {column: spec for column, spec in columns.items() if spec[0] in existing}
+    sources = sorted({source for source, _, _ in columns.values()})
+    data = conn.execute(f'SELECT "{id_col}", {", ".join(sources)} FROM "{table_name}"').df()
+    data = add_normalized_columns(table_name, data)[[id_col, *columns]]
+    conn.register('normalized_df', data)
+    assignments = ', '.join(f'{column} = CAST(d.{column} AS {col_type})' for column, (_, _, col_type) in columns.items())
+    conn.execute(f'UPDATE "{table_name}" SET {assignments} FROM normalized_df d WHERE "{table_name}"."{id_col}" = d."{id_col}"')
+    conn.unregister('normalized_df')
+    return len(data)
+
+def normalized_column(df, table_name, source, column=None):
+    """원본 컬럼의 정규화 값: 저장된 정규화 컬럼이 있으면 그대로, 없으면 여기서 정규화
+
+    column 을 주면 그 정규화 컬럼, 없으면 원본 컬럼의 첫 정규화 컬럼을 씁니다.
+    """
+    for name, (column_source, normalize, _) in NORMALIZED_COLUMNS.get(table_name, {}).items():
+        if column_source == source and column in (None, name):
+            if name in df.columns:
+                return _as_text(df[name])
+            return normalize(df[source])
+    return _as_text(df[source])
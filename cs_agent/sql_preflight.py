@@ -0,0 +1,167 @@
+import re
+import difflib
+import logging
+import threading
+from db_pool import DB_PATH
+from schema_cache import get_metadata
+
+# LLM이 만든 SQL 사전 검사 (EXPLAIN)
+# 잘못된 쿼리를 실행 -> 결과 확인 -> LLM 수정 라운드로 넘기기 전에, EXPLAIN 으로 파싱/바인딩만 해 보고
+# 흔한 오류는 규칙으로 바로 고칩니다. 고친 뒤 다시 EXPLAIN 해서 통과하면 LLM 수정 호출 한 번을 아낀 것으로 셉니다.
+#   - LIMIT ... UNION ALL 파서 오류: fix_union_query (UNION 앞 LIMIT 제거)
+#   - 없는 테이블: TABLE_SYNONYMS (에이전트의 table_mapping), DuckDB 가 제안한 테이블
+#   - 없는 컬럼: COLUMN_SYNONYMS (name -> model_name 등), 쿼리에 나온 테이블의 컬럼 중 철자가 가장 비슷한 컬럼
+# 테이블/컬럼 목록은 schema_cache (카탈로그 버전별 캐시) 를 씁니다. 통계는 preflight_stats() 로 확인합니다.
+#
+# 사용법:
+#   with pooled_cursor(DB_PATH) as conn:
+#       checked = preflight(conn, sql)   # {'sql', 'ok', 'fixes', 'error'}
+
+# 에이전트가 쓰는 테이블 이름 -> 실제 테이블
+TABLE_SYNONYMS = {
+    "cpu_support": "cpu_mb_compatibility",
+    "motherboard_compatibility": "cpu_mb_compatibility",
+    "cpu_motherboard": "cpu_mb_compatibility",
+    "mb": "motherboard",
+    "mainboard": "motherboard",
+    "case": "case_chassis",
+    "case_product": "case_chassis",
+    "cooler": "cpu_cooler",
+    "psu": "power_supply",
+    "ram": "memory",
+    "gpu_compatibility": "gpu_case_compatibility",
+    "cpu_compatibility": "cpu_mb_compatibility",
+    "gpu_mb_compatibility": "mb_gpu_compatibility",
+    "memory_mb_compatibility": "mb_memory_compatibility",
+    "cpu_cooler_compatibility": "cpu_cooler_compatibility",
+    "psu_compatibility": "psu_case_compatibility",
+    "storage_compatibility": "mb_storage_compatibility"
+}
+
+# LLM이 자주 쓰는 컬럼 이름 -> 실제 컬럼 (쿼리에 나온 테이블에 있을 때만 적용)
+COLUMN_SYNONYMS = {
+    "name": "model_name",
+    "model": "model_name",
+    "product_name": "model_name",
+    "brand": "manufacturer",
+    "maker": "manufacturer",
+    "company": "manufacturer",
+    "socket": "socket_type",
+    "memory_capacity": "capacity",
+    "capacity": "memory_capacity",
+    "vram": "memory_capacity",
+    "power": "wattage"
+}
+
+# 철자가 비슷한 컬럼으로 고치는 최소 유사도
+COLUMN_MATCH_CUTOFF = 0.8
+MAX_FIXES = 5
+
+_MISSING_TABLE = re.compile(r'Table with name (\w+) does not exist(?:.*?Did you mean "(\w+)")?', re.DOTALL)
+_MISSING_COLUMN = re.compile(r'Referenced column "?(\w+)"? not found|does not have a column named "(\w+)"')
+
+_stats = {'checked': 0, 'passed': 0, 'auto_fixed': 0, 'failed': 0, 'llm_calls_saved': 0}
+_stats_lock = threading.Lock()
+
+def fix_union_query(query):
+    """UNION ALL 앞 쿼리의 LIMIT 제거 (LIMIT ... UNION ALL 은 파서 오류)"""
+    pattern = r'(.*)\s+LIMIT\s+\d+\s+UNION ALL\s+(.*)'
+    replacement = r'\1 UNION ALL \2'
+    return re.sub(pattern, replacement, query, flags=re.IGNORECASE)
+
+def _replace_identifier(sql, old, new):
+    """작은따옴표 문자열 밖의 식별자 old 를 new 로 (대소문자 무시, 'c.old' 도 포함)"""
+    parts = re.split(r"('(?:[^']|'')*')", sql)
+    pattern = re.compile(rf'(?<![\w"]){re.escape(old)}(?![\w"])', re.IGNORECASE)
+    return ''.join(part if index % 2 else pattern.sub(new, part) for index, part in enumerate(parts))
+
+def _referenced_tables(sql, columns):
+    """쿼리에 이름이 나온 실제 테이블 목록"""
+    words = {word.lower() for word in re.findall(r'\w+', sql)}
+    return [table for table in columns if table.lower() in words]
+
+def _fix_table(error, columns):
+    match = _MISSING_TABLE.search(error)
+    if not match:
+        return None
+    missing, suggestion = match.group(1), match.group(2)
+    target = TABLE_SYNONYMS.get(missing.lower())
+    if target not in columns:
+        target = suggestion if suggestion in columns else None
+    if target is None:
+        return None
+    return missing, target
+
+def _fix_column(error, sql, columns):
+    match = _MISSING_COLUMN.search(error)
+    if not match:
+        return None
+    missing = match.group(1) or match.group(2)
+    available = []
+    for table in _referenced_tables(sql, columns):
+        available.extend(column for column in columns[table] if column not in available)
+    target = COLUMN_SYNONYMS.get(missing.lower())
+    if target not in available:
+        close = difflib.get_close_matches(missing.lower(), available, n=1, cutoff=COLUMN_MATCH_CUTOFF)
+        target = close[0] if close else None
+    if target is None:
+        return None
+    return missing, target
+
+def preflight(conn, sql, db_path=DB_PATH, max_fixes=MAX_FIXES):
+    """EXPLAIN 으로 검사하고 규칙으로 고친 결과 {'sql', 'ok', 'fixes': [고친 내용], 'error'}
+
+    처음 EXPLAIN 이 실패했는데 고쳐서 통과하면 LLM 수정 호출을 한 번 아낀 것으로 셉니다.
+    """
+    # 호출한 쪽이 빌린 커서로 읽음 (풀 커서를 하나 더 빌리면 POOL_SIZE 에서 교착될 수 있음)
+    columns = get_metadata(db_path, conn)['columns']
+    original = sql
+    sql = sql.strip().rstrip(';')
+    fixes = []
+    error = None
+    first_error = None
+    for _ in range(max_fixes + 1):
+        try:
+            conn.execute(f"EXPLAIN {sql}")
+            error = None
+            break
+        except Exception as e:
+            error = str(e)
+            first_error = first_error or error
+        fixed = fix_union_query(sql)
+        if fixed != sql:
+            sql = fixed
+            fixes.append("UNION ALL 앞 LIMIT 제거")
+            continue
+        replacement = _fix_table(error, columns) or _fix_column(error, sql, columns)
+        if replacement is None:
+            break
+        old, new = replacement
+        sql = _replace_identifier(sql, old, new)
+        fixes.append(f"{old} -> {new}")
+
+    ok = error is None
+    with _stats_lock:
+        _stats['checked'] += 1
+        if ok and not first_error:
+            _stats['passed'] += 1
+        elif ok:
+            _stats['auto_fixed'] += 1
+            _stats['llm_calls_saved'] += 1
+        else:
+            _stats['failed'] += 1
+    if ok and first_error:
+        logging.info(f"SQL 사전 검사 자동 수정 ({', '.join(fixes)}), LLM 수정 호출 생략")
+    return {'sql': sql if ok else original, 'ok': ok, 'fixes': fixes if ok else [], 'error': error}
+
+def preflight_stats():
+    """{'checked', 'passed', 'auto_fixed', 'failed', 'llm_calls_saved'} (프로세스 누적)"""
+    with _stats_lock:
+        return dict(_stats)
+
+def format_preflight_stats():
+    stats = preflight_stats()
+    return (
+        f"검사 {stats['checked']}개, 통과 {stats['passed']}개, 자동 수정 {stats['auto_fixed']}개, "
+        f"실패 {stats['failed']}개 (아낀 LLM 수정 호출 {stats['llm_calls_saved']}회)"
+    )
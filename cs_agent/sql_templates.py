@@ -0,0 +1,123 @@
+from model_resolver import PART_ID_COLUMNS, id_filter
+
+# 호환성 질의 SQL 템플릿 (06_Text2SQL.generate_queries 에서 사용)
+# {filter} 에는 검색한 부품 조건이 들어갑니다 (render_query). model_resolver 로 해석한 부품 ID가 있으면
+# ID 목록 조건, 없으면 모델명 LIKE 패턴 조건('%RTX%4070%' 등). default 템플릿의 {table_name} 에는 부품 테이블명이 들어갑니다.
+# 비교/조인은 적재할 때 만든 정수 정규화 컬럼(spec_normalize.NORMALIZED_COLUMNS)을 사용합니다.
+#   - 치수/전력: length_mm, vga_length_mm, power_w, wattage_w (단위가 통일된 정수, 정렬 배치 + 인덱스)
+#   - 소켓/폼팩터: socket_code, form_factor_code (정수 해시 조인, 표기 차이 없음)
+# gpu_case 는 "GPU마다 여유 공간이 가장 작은 케이스" 를 교차 조인 + ROW_NUMBER 대신 ASOF 조인
+# (정렬된 vga_length_mm 에서 length_mm 이상인 첫 케이스)으로 구합니다.
+# 성능 비교: python cs_agent/query_benchmark.py
+
+QUERY_TEMPLATES = {
+    # GPU와 케이스 호환성 (GPU마다 장착 가능한 케이스 중 여유 공간이 가장 작은 케이스)
+    "gpu_case": """
+        SELECT
+            g.model_name AS gpu_model,
+            g.length_mm AS gpu_length,
+            c.model_name AS case_model,
+            c.vga_length_mm AS available_gpu_length,
+            g.manufacturer AS gpu_manufacturer,
+            c.manufacturer AS case_manufacturer,
+            (c.vga_length_mm - g.length_mm) AS space_difference
+        FROM
+            gpu g
+            ASOF JOIN case_chassis c ON g.length_mm <= c.vga_length_mm
+        WHERE
+            {filter}
+        ORDER BY
+            CASE WHEN gpu_model LIKE '%Ti%' THEN 1 ELSE 0 END,
+            gpu_model
+        LIMIT 10
+    """,
+
+    # GPU와 전원 호환성 (GPU 소비전력이 정격출력의 70% 이하)
+    "gpu_psu": """
+        SELECT
+            g.model_name AS gpu_model,
+            g.power_w AS gpu_power,
+            p.model_name AS psu_model,
+            p.wattage_w AS psu_wattage,
+            g.manufacturer AS gpu_manufacturer,
+            p.manufacturer AS psu_manufacturer
+        FROM
+            gpu g
+            JOIN power_supply p ON g.power_w <= (p.wattage_w * 0.7)
+        WHERE
+            {filter}
+        LIMIT 10
+    """,
+
+    # CPU와 메인보드 호환성 (정규화한 소켓 코드가 같음)
+    "cpu_motherboard": """
+        SELECT
+            c.model_name AS cpu_model,
+            c.socket_type AS cpu_socket,
+            m.model_name AS motherboard_model,
+            m.socket_type AS mb_socket,
+            c.manufacturer AS cpu_manufacturer,
+            m.manufacturer AS mb_manufacturer
+        FROM
+            cpu c
+            JOIN motherboard m ON c.socket_code = m.socket_code
+        WHERE
+            {filter}
+        LIMIT 10
+    """,
+
+    # 메인보드와 케이스 호환성 (보드 폼팩터 코드 -> 케이스의 규격별 지원 여부)
+    "motherboard_case": """
+        SELECT
+            m.model_name AS motherboard_model,
+            m.form_factor AS mb_form_factor,
+            c.model_name AS case_model,
+            c.supported_mb_types AS case_supported_mb_types,
+            m.manufacturer AS mb_manufacturer,
+            c.manufacturer AS case_manufacturer
+        FROM
+            motherboard m, case_chassis c
+        WHERE
+            {filter}
+            AND (
+                (m.form_factor_code = 1 AND c.itx_support) OR
+                (m.form_factor_code = 2 AND c.matx_support) OR
+                (m.form_factor_code = 3 AND c.atx_support) OR
+                (m.form_factor_code = 4 AND c.eatx_support)
+            )
+        LIMIT 10
+    """,
+
+    # 기본 쿼리 템플릿
+    "default": """
+        SELECT * FROM {table_name}
+        WHERE {filter}
+        LIMIT 10
+    """
+}
+
+# 관계 -> (검색한 부품 테이블, 별칭, 모델명 패턴 조건)
+SEARCH_FILTERS = {
+    "gpu_case": ("gpu", "g", "g.model_name LIKE '%{pattern}%'"),
+    "gpu_psu": ("gpu", "g", "g.model_name LIKE '{pattern}'"),
+    "cpu_motherboard": ("cpu", "c", "(c.model_name LIKE '{pattern}' OR c.socket_type = '{pattern}')"),
+    "motherboard_case": ("motherboard", "m", "m.model_name LIKE '{pattern}'")
+}
+
+def search_table(relation, table_name=None):
+    """관계에서 검색하는 부품 테이블 (default 템플릿은 table_name)"""
+    return SEARCH_FILTERS[relation][0] if relation in SEARCH_FILTERS else table_name
+
+def render_query(relation, pattern=None, ids=None, table_name=None):
+    """관계의 SQL (ids 가 있으면 ID 목록 조건, 없으면 pattern 조건). 템플릿에 없는 관계는 table_name 으로 default 템플릿"""
+    if relation in SEARCH_FILTERS:
+        table, alias, pattern_filter = SEARCH_FILTERS[relation]
+        template = QUERY_TEMPLATES[relation]
+    else:
+        table, alias, pattern_filter = table_name, None, "model_name LIKE '{pattern}'"
+        template = QUERY_TEMPLATES["default"]
+    if ids and table in PART_ID_COLUMNS:
+        condition = id_filter(table, ids, alias)
+    else:
+        condition = pattern_filter.format(pattern=pattern)
+    return template.format(filter=condition, table_name=table_name)
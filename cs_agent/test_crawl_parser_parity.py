@@ -0,0 +1,134 @@
+import os
+import sys
+import glob
+import time
+import pytest
+from crawl_parsers import PARSER_BACKENDS, lxml, parse_last_page, parse_product_links, parse_category_name, parse_product_info
+
+# 파서 백엔드 결과 비교 (lxml vs bs4)
+# crawl_fixtures/*.html 에 모든 파싱 함수를 백엔드별로 실행해 결과가 같은지 확인하는 pytest 테스트입니다.
+# KNOWN_DIFFERENCES 에 적은 (파일, 함수) 는 반대로 결과가 달라야 통과합니다 (고쳐지면 목록에서 지워야 함을 알 수 있도록).
+# 크롤링 중 저장한 페이지(page_store.py export 로 꺼낸 HTML)는 직접 실행해 확인하고, 백엔드별 파싱 시간도 출력합니다.
+#
+# 사용법:
+#   python -m pytest -q cs_agent/test_crawl_parser_parity.py
+#   python cs_agent/test_crawl_parser_parity.py [HTML 파일 또는 디렉터리 ...] [--repeat N]
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_fixtures')
+
+# 알려진 차이 {(파일명, 파싱 함수): 이유}
+KNOWN_DIFFERENCES = {
+    ('detail_page_malformed.html', 'product_info'): "html.parser 는 닫히지 않은 tr/td 를 중첩시켜 행을 잃음 (lxml 은 브라우저처럼 복구)"
+}
+
+PARSE_FUNCTIONS = {
+    'last_page': parse_last_page,
+    'product_links': parse_product_links,
+    'category_name': parse_category_name,
+    'product_info': parse_product_info
+}
+
+def collect_pages(paths):
+    """HTML 파일 경로 목록 (디렉터리는 *.html)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '*.html'))))
+        else:
+            files.append(path)
+    return files
+
+def read_page(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def backend_results(html, name):
+    """파싱 함수의 백엔드별 결과 {백엔드: 결과}"""
+    return {backend: PARSE_FUNCTIONS[name](html, backend=backend) for backend in PARSER_BACKENDS}
+
+def compare_page(html):
+    """파싱 함수별로 백엔드 결과를 비교해 다른 항목 {함수: {백엔드: 결과}} 반환"""
+    differences = {}
+    for name in PARSE_FUNCTIONS:
+        results = backend_results(html, name)
+        if len({repr(result) for result in results.values()}) > 1:
+            differences[name] = results
+    return differences
+
+def time_backends(pages, repeat=5):
+    """백엔드별 전체 페이지 파싱 시간(초)"""
+    timings = {}
+    for backend in PARSER_BACKENDS:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for html in pages:
+                for function in PARSE_FUNCTIONS.values():
+                    function(html, backend=backend)
+        timings[backend] = time.perf_counter() - started
+    return timings
+
+FIXTURE_FILES = [os.path.basename(path) for path in collect_pages([FIXTURE_DIR])]
+
+def test_fixtures_exist():
+    assert FIXTURE_FILES, f"{FIXTURE_DIR} 에 HTML 페이지가 없습니다."
+
+def test_known_differences_have_fixtures():
+    for file_name, name in KNOWN_DIFFERENCES:
+        assert file_name in FIXTURE_FILES
+        assert name in PARSE_FUNCTIONS
+
+@pytest.mark.skipif(lxml is None, reason="lxml 이 없어 비교할 백엔드가 하나뿐입니다.")
+@pytest.mark.parametrize('name', list(PARSE_FUNCTIONS))
+@pytest.mark.parametrize('file_name', FIXTURE_FILES)
+def test_backend_parity(file_name, name):
+    results = backend_results(read_page(os.path.join(FIXTURE_DIR, file_name)), name)
+    different = len({repr(result) for result in results.values()}) > 1
+    if (file_name, name) in KNOWN_DIFFERENCES:
+        assert different, f"알려진 차이가 더 이상 나지 않습니다. KNOWN_DIFFERENCES 에서 지우세요: {file_name} {name}"
+    else:
+        assert not different, f"{file_name} {name} 백엔드 결과가 다릅니다: {results!r}"
+
+@pytest.mark.skipif(lxml is None, reason="lxml 이 없습니다.")
+def test_malformed_detail_page_recovers_rows_with_lxml():
+    info = parse_product_info(read_page(os.path.join(FIXTURE_DIR, 'detail_page_malformed.html')), backend='lxml')
+    assert info['제조회사'] == '마이크론'
+    assert info['폼팩터'] == 'M.2 2280'
+
+if __name__ == "__main__":
+    import logging
+    logging.basicConfig(level=logging.ERROR)
+
+    args = sys.argv[1:]
+    repeat = 5
+    if '--repeat' in args:
+        index = args.index('--repeat')
+        repeat = int(args[index + 1])
+        del args[index:index + 2]
+
+    files = collect_pages(args or [FIXTURE_DIR])
+    pages = []
+    mismatches = 0
+    for file_path in files:
+        html = read_page(file_path)
+        pages.append(html)
+        differences = compare_page(html)
+        file_name = os.path.basename(file_path)
+        unknown = {name: results for name, results in differences.items() if (file_name, name) not in KNOWN_DIFFERENCES}
+        if unknown:
+            mismatches += 1
+            print(f"❌ {file_path}")
+            for name, results in unknown.items():
+                for backend, result in results.items():
+                    print(f"   {name} [{backend}]: {result!r}")
+        elif differences:
+            reasons = ', '.join(KNOWN_DIFFERENCES[(file_name, name)] for name in differences)
+            print(f"⚠️ {file_path} (알려진 차이: {reasons})")
+        else:
+            print(f"✅ {file_path}")
+
+    timings = time_backends(pages, repeat)
+    print(f"\n{len(files)}개 페이지, {repeat}회 반복 파싱 시간: " + ", ".join(f"{backend} {seconds:.3f}초" for backend, seconds in timings.items()))
+    if mismatches:
+        print(f"{mismatches}개 페이지에서 백엔드 결과가 다릅니다.")
+        sys.exit(1)
+    print("모든 페이지에서 백엔드 결과가 같습니다.")